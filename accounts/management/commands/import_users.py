@@ -0,0 +1,74 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.services.bulk_import import BulkUserImportService, read_rows
+
+
+class Command(BaseCommand):
+    """Bulk onboard users from a CSV or JSONL file"""
+
+    help = (
+        "Import users from CSV/JSONL. Columns: email, password, first_name, "
+        "last_name, bio, location, birth_date, phone_number, avatar and an "
+        "optional `preferences` object (JSON encoded in CSV)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to the input file")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            help="Input format (defaults to the file extension)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--hash-workers",
+            type=int,
+            default=None,
+            help="Password hashing processes (default: CPU count, 0 = inline)",
+        )
+        parser.add_argument(
+            "--skip-verification-emails",
+            action="store_true",
+            help="Do not queue verification emails for imported users",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+
+        file_format = options["format"] or path.suffix.lstrip(".").lower()
+        if file_format not in ("csv", "jsonl"):
+            raise CommandError("Cannot detect format, pass --format csv|jsonl")
+
+        service = BulkUserImportService(
+            chunk_size=options["chunk_size"],
+            hash_workers=options["hash_workers"],
+            send_verification=not options["skip_verification_emails"],
+        )
+
+        with path.open(newline="", encoding="utf-8") as file_obj:
+            response = service.import_users(
+                read_rows(file_obj, file_format), progress_callback=self._progress
+            )
+
+        stats = response.data
+        summary = (
+            f"Imported {stats['created']} users "
+            f"({stats['preferences_created']} with preferences), "
+            f"skipped {stats['skipped']}, conflicts {stats['conflicts']}, "
+            f"failed {stats['failed']} "
+            f"in {stats['elapsed_seconds']}s ({stats['rows_per_second']} rows/sec)"
+        )
+        if response.success:
+            self.stdout.write(self.style.SUCCESS(summary))
+        else:
+            self.stdout.write(self.style.WARNING(summary))
+
+    def _progress(self, stats):
+        self.stdout.write(
+            f"  {stats['processed']} rows processed, {stats['created']} created "
+            f"({stats['rows_per_second']} rows/sec)"
+        )
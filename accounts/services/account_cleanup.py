@@ -0,0 +1,109 @@
+# Account maintenance: stale unverified accounts and expired JWTs
+import datetime
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from core.utils.data_classes import ServiceResponse
+from core.utils.logging import LoggingService
+
+TOKEN_BLACKLIST_APP = "rest_framework_simplejwt.token_blacklist"
+
+
+class AccountCleanupService:
+    """Periodic maintenance of accounts and tokens (see settings.TASK_SCHEDULE)"""
+
+    def __init__(self):
+        self.logger = LoggingService()
+
+    def delete_stale_unverified(
+        self, older_than_days: int, batch_size: int = 500
+    ) -> ServiceResponse:
+        """
+        Args:
+            older_than_days (int): verification email age after which an
+                unverified account is abandoned
+            batch_size (int): users deleted per transaction
+
+        Business logic:
+            Deletes, in batches, users whose profile is still unverified,
+            whose verification email is older than the cutoff and who never
+            logged in. Staff accounts are never touched.
+
+        Returns:
+            ServiceResponse: data["deleted"] is the number of users removed.
+        """
+        try:
+            cutoff = timezone.now() - datetime.timedelta(days=older_than_days)
+            stale = User.objects.filter(
+                userprofile__email_verified=False,
+                userprofile__email_verification_sent_at__lt=cutoff,
+                last_login__isnull=True,
+                is_staff=False,
+                is_superuser=False,
+            )
+            deleted = 0
+            while True:
+                with transaction.atomic():
+                    ids = list(stale.values_list("id", flat=True)[:batch_size])
+                    if not ids:
+                        break
+                    User.objects.filter(id__in=ids).delete()
+                deleted += len(ids)
+            return ServiceResponse(
+                success=True,
+                message="Stale unverified accounts deleted",
+                data={"deleted": deleted},
+                status_code=200,
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error deleting stale unverified accounts: {str(e)}",
+                level="error",
+                error=e,
+            )
+            return ServiceResponse(
+                success=False,
+                message="Failed to delete stale accounts",
+                status_code=500,
+            )
+
+    def prune_token_blacklist(self) -> ServiceResponse:
+        """
+        Delete expired outstanding tokens (and their blacklist entries, by
+        cascade), like simplejwt's flushexpiredtokens. A no-op until the
+        token_blacklist app is installed.
+
+        Returns:
+            ServiceResponse: data["deleted"] is the number of tokens removed.
+        """
+        if not apps.is_installed(TOKEN_BLACKLIST_APP):
+            return ServiceResponse(
+                success=True,
+                message="Token blacklist is not installed",
+                data={"deleted": 0},
+                status_code=200,
+            )
+        try:
+            from rest_framework_simplejwt.token_blacklist.models import (
+                OutstandingToken,
+            )
+
+            _, deleted = OutstandingToken.objects.filter(
+                expires_at__lt=timezone.now()
+            ).delete()
+            return ServiceResponse(
+                success=True,
+                message="Expired tokens pruned",
+                data={"deleted": deleted.get(OutstandingToken._meta.label, 0)},
+                status_code=200,
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error pruning token blacklist: {str(e)}", level="error", error=e
+            )
+            return ServiceResponse(
+                success=False, message="Failed to prune tokens", status_code=500
+            )
@@ -11,6 +11,7 @@ from accounts.utils.generate_token import TokenGenerator
 from accounts.utils.emails import AccountEmails
 from django.utils import timezone
 from django.conf import settings
+from payments.utils.entitlements import add_entitlement_claim
 
 
 class AuthenticationService:
@@ -69,7 +70,7 @@ class AuthenticationService:
             1. Validate the username and password.
             2. Authenticate the user.
             3. Generate a token using jwt.
-            4. Add email, user_id, profileId, role to token claims.
+            4. Add email, user_id, profileId, role and entitlement to token claims.
             5. Return refresh and access tokens.
 
         Returns:
@@ -97,6 +98,9 @@ class AuthenticationService:
             if hasattr(user, "userprofile"):
                 refresh["profile_id"] = user.userprofile.id
 
+            # Subscription entitlement, so gated views need no lookup
+            add_entitlement_claim(refresh, user.id)
+
             # Prepare response data with only tokens
             response_data = {
                 "refresh": str(refresh),
@@ -0,0 +1,298 @@
+# Bulk user import / onboarding pipeline
+import csv
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from accounts.tasks import send_verification_email
+from accounts.utils.generate_token import TokenGenerator
+from core.utils.data_classes import ServiceResponse
+from core.utils.logging import LoggingService
+from users.models import PreferenceSelection, UserPreferences, UserProfile
+from users.serializers import UserPreferencesSerializer
+
+PROFILE_FIELDS = ["bio", "location", "birth_date", "phone_number", "avatar"]
+
+
+def _init_hash_worker():
+    """Make sure Django is configured in spawned hashing processes."""
+    if not apps.ready:
+        django.setup()
+
+
+def read_rows(file_obj, file_format: str):
+    """
+    Stream rows from a CSV or JSONL file object without loading it in memory.
+
+    CSV rows may carry preferences as a JSON encoded `preferences` column,
+    JSONL rows as a nested `preferences` object.
+    """
+    if file_format == "csv":
+        for row in csv.DictReader(file_obj):
+            preferences = row.get("preferences")
+            if preferences:
+                row["preferences"] = json.loads(preferences)
+            yield row
+    elif file_format == "jsonl":
+        for line in file_obj:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+    else:
+        raise ValueError(f"Unsupported format '{file_format}'. Use 'csv' or 'jsonl'")
+
+
+def chunked(iterable, size: int):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class BulkUserImportService:
+    """
+    Create User + UserProfile (+ optional UserPreferences) rows in chunks.
+
+    Business logic:
+        1. Stream input rows and group them in chunks of `chunk_size`.
+        2. Drop rows without an email, or whose email (case-insensitively)
+           or username (the email) already exists.
+        3. Hash passwords in a process pool (the dominant per user cost).
+        4. bulk_create users, profiles and preferences in one transaction per
+           chunk. If a user taken meanwhile makes the users insert conflict,
+           the chunk's users are inserted one by one and only the
+           conflicting rows are reported, in `conflicts`.
+        5. Enqueue one verification email task per user in the same
+           transaction, so emails go out (from run_tasks workers, with
+           retries) exactly for the users that were committed.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        hash_workers: int = None,
+        send_verification: bool = True,
+    ):
+        self.logger = LoggingService()
+        self.token_generator = TokenGenerator()
+        self.chunk_size = chunk_size
+        self.hash_workers = hash_workers
+        self.send_verification = send_verification
+
+    def import_users(self, rows, progress_callback=None) -> ServiceResponse:
+        """
+        Args:
+            rows (iterable): dicts with email, password, first_name, last_name,
+                optional profile fields and an optional `preferences` dict.
+            progress_callback (callable): called with the running stats dict
+                after every chunk.
+        Returns:
+            ServiceResponse: data holds created/skipped/conflicts/failed counts,
+                elapsed seconds and rows_per_second.
+        """
+        stats = {
+            "processed": 0,
+            "created": 0,
+            "skipped": 0,
+            "conflicts": 0,
+            "failed": 0,
+            "preferences_created": 0,
+            "emails_queued": 0,
+            "elapsed_seconds": 0.0,
+            "rows_per_second": 0.0,
+        }
+        started = time.perf_counter()
+        hash_pool = (
+            ProcessPoolExecutor(
+                max_workers=self.hash_workers, initializer=_init_hash_worker
+            )
+            if self.hash_workers != 0
+            else None
+        )
+        seen_emails = set()
+
+        try:
+            for chunk in chunked(rows, self.chunk_size):
+                stats["processed"] += len(chunk)
+                valid_rows = self._filter_rows(chunk, seen_emails, stats)
+                try:
+                    created = self._create_rows(valid_rows, hash_pool, stats)
+                except Exception as e:
+                    self.logger.log(
+                        f"Error importing user chunk: {str(e)}", level="error", error=e
+                    )
+                    stats["failed"] += len(valid_rows)
+                    continue
+
+                stats["created"] += len(created)
+                if self.send_verification:
+                    stats["emails_queued"] += len(created)
+
+                elapsed = time.perf_counter() - started
+                stats["elapsed_seconds"] = round(elapsed, 3)
+                stats["rows_per_second"] = round(stats["processed"] / elapsed, 1)
+                if progress_callback:
+                    progress_callback(stats)
+        finally:
+            if hash_pool is not None:
+                hash_pool.shutdown()
+
+        elapsed = time.perf_counter() - started
+        stats["elapsed_seconds"] = round(elapsed, 3)
+        stats["rows_per_second"] = (
+            round(stats["processed"] / elapsed, 1) if elapsed else 0.0
+        )
+
+        self.logger.log(
+            f"Bulk import finished: {stats['created']} created, "
+            f"{stats['skipped']} skipped, {stats['conflicts']} conflicts, "
+            f"{stats['failed']} failed",
+            level="info",
+        )
+        return ServiceResponse(
+            success=stats["failed"] == 0,
+            message="Bulk import completed",
+            data=stats,
+            status_code=200,
+        )
+
+    def _create_rows(self, rows: list, hash_pool, stats) -> list:
+        """Hash passwords and insert one chunk; returns [(user, token), ...]"""
+        if not rows:
+            return []
+
+        passwords = [row.get("password") or None for row in rows]
+        if hash_pool is not None:
+            hashes = list(hash_pool.map(make_password, passwords, chunksize=64))
+        else:
+            hashes = [make_password(password) for password in passwords]
+
+        now = timezone.now()
+        with transaction.atomic():
+            rows, users = self._create_users(rows, hashes, stats)
+
+            tokens = [
+                self.token_generator.generate_email_verification_token(user.id)
+                for user in users
+            ]
+            profiles = UserProfile.objects.bulk_create(
+                [
+                    UserProfile(
+                        user=user,
+                        email_verification_token=token,
+                        email_verification_sent_at=(
+                            now if self.send_verification else None
+                        ),
+                        **{
+                            field: row[field]
+                            for field in PROFILE_FIELDS
+                            if row.get(field) not in (None, "")
+                        },
+                    )
+                    for row, user, token in zip(rows, users, tokens)
+                ]
+            )
+
+            preferences = [
+                UserPreferences(profile=profile, **row["_preferences"])
+                for row, profile in zip(rows, profiles)
+                if row.get("_preferences") is not None
+            ]
+            if preferences:
+                for instance in preferences:
+                    instance.refresh_completion(now=now)
+                UserPreferences.objects.bulk_create(preferences)
+                PreferenceSelection.sync(preferences)
+                stats["preferences_created"] += len(preferences)
+
+            if self.send_verification:
+                send_verification_email.enqueue_many(
+                    ((user.email, user.first_name, token), {})
+                    for user, token in zip(users, tokens)
+                )
+
+        return list(zip(users, tokens))
+
+    def _create_users(self, rows: list, hashes: list, stats) -> tuple:
+        """Insert the chunk's users; returns the (rows, users) that were created"""
+        users = [
+            User(
+                username=row["email"],
+                email=row["email"],
+                password=password_hash,
+                first_name=row.get("first_name") or "",
+                last_name=row.get("last_name") or "",
+            )
+            for row, password_hash in zip(rows, hashes)
+        ]
+        try:
+            with transaction.atomic():
+                return rows, User.objects.bulk_create(users)
+        except IntegrityError:
+            pass
+
+        created_rows, created_users = [], []
+        for row, user in zip(rows, users):
+            try:
+                with transaction.atomic():
+                    user.save()
+            except IntegrityError as e:
+                self.logger.log(
+                    f"Skipping {row['email']}: user already exists ({str(e)})",
+                    level="warning",
+                )
+                stats["conflicts"] += 1
+                continue
+            created_rows.append(row)
+            created_users.append(user)
+        return created_rows, created_users
+
+    def _filter_rows(self, chunk, seen_emails: set, stats) -> list:
+        """Normalise emails, drop duplicates and validate preferences payloads."""
+        candidates = []
+        for row in chunk:
+            email = (row.get("email") or "").strip().lower()
+            if not email or email in seen_emails:
+                stats["skipped"] += 1
+                continue
+            seen_emails.add(email)
+            candidates.append({**row, "email": email})
+
+        # New users get username=email, so a taken username conflicts too
+        emails = [row["email"] for row in candidates]
+        existing = set()
+        for email, username in (
+            User.objects.annotate(email_lower=Lower("email"))
+            .filter(Q(email_lower__in=emails) | Q(username__in=emails))
+            .values_list("email_lower", "username")
+        ):
+            existing.update([email, username])
+
+        rows = []
+        for row in candidates:
+            if row["email"] in existing:
+                stats["skipped"] += 1
+                continue
+
+            preferences_data = row.get("preferences")
+            if preferences_data:
+                serializer = UserPreferencesSerializer(data=preferences_data)
+                if not serializer.is_valid():
+                    self.logger.log(
+                        f"Invalid preferences for {row['email']}: {serializer.errors}",
+                        level="warning",
+                    )
+                    stats["failed"] += 1
+                    continue
+                row["_preferences"] = dict(serializer.validated_data)
+            rows.append(row)
+        return rows
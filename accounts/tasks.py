@@ -0,0 +1,38 @@
+# Background tasks of the accounts app
+from django.conf import settings
+
+from accounts.services.account_cleanup import AccountCleanupService
+from accounts.utils.emails import AccountEmails
+from tasks.registry import task
+
+
+@task(queue="emails")
+def send_verification_email(email: str, first_name: str, token: str):
+    """Send an email verification link; raising lets the worker retry."""
+    sent = AccountEmails().send_email_verification(
+        to_email=email,
+        first_name=first_name or "User",
+        verification_link=f"{settings.FRONTEND_URL}/verify-email?token={token}",
+    )
+    if not sent:
+        raise RuntimeError(f"Failed to send verification email to {email}")
+
+
+@task
+def delete_stale_unverified_accounts() -> int:
+    """Periodic: remove accounts never verified nor used; returns the count"""
+    response = AccountCleanupService().delete_stale_unverified(
+        settings.UNVERIFIED_ACCOUNT_RETENTION_DAYS
+    )
+    if not response.success:
+        raise RuntimeError(response.message)
+    return response.data["deleted"]
+
+
+@task
+def prune_token_blacklist() -> int:
+    """Periodic: delete expired JWTs from the blacklist tables"""
+    response = AccountCleanupService().prune_token_blacklist()
+    if not response.success:
+        raise RuntimeError(response.message)
+    return response.data["deleted"]
@@ -0,0 +1,169 @@
+from unittest.mock import patch
+
+from django.contrib.auth import authenticate
+from django.test import override_settings
+from django.conf import settings
+
+from core.tests.setup import BaseTestCase
+from core.utils.data_classes import ServiceResponse
+from core.utils.rate_limit import InMemoryRateLimitStore
+
+
+def throttle_rates(**rates):
+    """REST_FRAMEWORK settings with the given throttle rates swapped in."""
+    return {
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_RATES": {
+            **settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"],
+            **rates,
+        },
+    }
+
+
+class ThrottleTestCase(BaseTestCase):
+    """Every test starts with empty buckets in a store of its own."""
+
+    def setUp(self):
+        super().setUp()
+        store_patch = patch(
+            "accounts.utils.throttling.get_rate_limit_store",
+            return_value=InMemoryRateLimitStore(),
+        )
+        store_patch.start()
+        self.addCleanup(store_patch.stop)
+
+
+@override_settings(
+    REST_FRAMEWORK=throttle_rates(login_ip="5/min", login_account="3/min"),
+)
+class TestLoginThrottle(ThrottleTestCase):
+    """Test class for the login endpoint throttles."""
+
+    def setUp(self):
+        super().setUp()
+        self.login_url = "/api/v1/accounts/login/"
+
+    def _login(self, username, ip="10.0.0.1"):
+        return self.client.post(
+            self.login_url,
+            {"method": "password", "username": username, "password": "wrong"},
+            format="json",
+            REMOTE_ADDR=ip,
+        )
+
+    def test_account_throttled_after_limit(self):
+        """Test repeated attempts on one account are rejected with 429."""
+        for _ in range(3):
+            self.assertEqual(self._login(self.user.username).status_code, 401)
+
+        response = self._login(self.user.username)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
+    def test_account_throttle_spans_ips(self):
+        """Test the account bucket is shared by every client IP."""
+        for i in range(3):
+            self._login(self.user.username, ip=f"10.0.1.{i}")
+
+        self.assertEqual(
+            self._login(self.user.username, ip="10.0.2.1").status_code, 429
+        )
+
+    def test_ip_throttled_across_accounts(self):
+        """Test one IP spraying many accounts is throttled by the IP bucket."""
+        for i in range(5):
+            self.assertEqual(self._login(f"victim{i}").status_code, 401)
+
+        self.assertEqual(self._login("victim99").status_code, 429)
+        # Another client is unaffected
+        self.assertEqual(self._login("victim99", ip="10.0.0.2").status_code, 401)
+
+
+@override_settings(
+    REST_FRAMEWORK=throttle_rates(
+        password_reset_ip="2/hour",
+        signup_ip="2/hour",
+        resend_verification_account="1/hour",
+    ),
+)
+class TestAuthEndpointThrottles(ThrottleTestCase):
+    """Test class for the signup, password reset and resend verification throttles."""
+
+    @patch("accounts.services.auth.AccountEmails.send_password_reset_email")
+    def test_password_reset_throttled(self, send_email):
+        """Test password reset floods never reach the email provider."""
+        send_email.return_value = True
+        statuses = [
+            self.client.post(
+                "/api/v1/accounts/password-reset/",
+                {"email": f"user{i}@example.com"},
+                format="json",
+            ).status_code
+            for i in range(4)
+        ]
+        self.assertEqual(statuses, [200, 200, 429, 429])
+
+    @patch("accounts.views.auth_service.signup")
+    def test_signup_throttled_before_service(self, signup):
+        """Test rejected signups do not call the signup service."""
+        signup.return_value = ServiceResponse(
+            success=True, message="created", status_code=201
+        )
+        for i in range(3):
+            self.client.post(
+                "/api/v1/accounts/sign-up/",
+                {"method": "password", "email": f"new{i}@example.com"},
+                format="json",
+            )
+        self.assertEqual(signup.call_count, 2)
+
+    @patch("accounts.views.auth_service.sendVerificationEmail")
+    def test_resend_verification_throttled_per_user(self, send_verification):
+        """Test resend verification is limited per authenticated user."""
+        send_verification.return_value = ServiceResponse(
+            success=True, message="sent", status_code=200
+        )
+        self.client.force_authenticate(user=self.user)
+
+        first = self.client.post("/api/v1/accounts/resend-verification/")
+        second = self.client.post("/api/v1/accounts/resend-verification/")
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 429)
+
+
+@override_settings(
+    REST_FRAMEWORK=throttle_rates(login_ip="5/min", login_account="5/min"),
+)
+class TestCredentialStuffingBurst(ThrottleTestCase):
+    """
+    A credential stuffing burst from one IP never reaches password hashing.
+    The latency of rejected requests is benchmarked by the login_throttled
+    scenario (core.benchmarks), not asserted here.
+    """
+
+    BURST_SIZE = 300
+
+    def test_burst_rejected_before_password_hashing(self):
+        """Test only the bucket capacity reaches authenticate(), the rest get 429."""
+        rejected = []
+        with patch(
+            "accounts.services.auth.authenticate", wraps=authenticate
+        ) as authenticate_spy:
+            for i in range(self.BURST_SIZE):
+                response = self.client.post(
+                    "/api/v1/accounts/login/",
+                    {
+                        "method": "password",
+                        "username": f"leaked{i}@example.com",
+                        "password": "hunter2",
+                    },
+                    format="json",
+                    REMOTE_ADDR="203.0.113.7",
+                )
+                if response.status_code == 429:
+                    rejected.append(response)
+
+        self.assertEqual(authenticate_spy.call_count, 5)
+        self.assertEqual(len(rejected), self.BURST_SIZE - 5)
+        self.assertTrue(all("Retry-After" in response for response in rejected))
@@ -0,0 +1,49 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.services.account_cleanup import AccountCleanupService
+from accounts.tasks import delete_stale_unverified_accounts, prune_token_blacklist
+from users.models import UserProfile
+
+
+@override_settings(UNVERIFIED_ACCOUNT_RETENTION_DAYS=30)
+class TestAccountCleanup(TestCase):
+    """Test class for the periodic account maintenance jobs."""
+
+    def _user(self, username, sent_days_ago, verified=False, **fields):
+        user = User.objects.create_user(username, f"{username}@example.com", **fields)
+        UserProfile.objects.create(
+            user=user,
+            email_verified=verified,
+            email_verification_sent_at=timezone.now()
+            - datetime.timedelta(days=sent_days_ago),
+        )
+        return user
+
+    def test_deletes_only_stale_unverified_accounts(self):
+        """Test abandoned sign ups go; recent, verified, used or staff stay."""
+        self._user("stale1", 40)
+        self._user("stale2", 31)
+        self._user("recent", 2)
+        self._user("verified", 40, verified=True)
+        self._user("staff", 40, is_staff=True)
+        used = self._user("used", 40)
+        User.objects.filter(id=used.id).update(last_login=timezone.now())
+
+        deleted = delete_stale_unverified_accounts()
+
+        self.assertEqual(deleted, 2)
+        self.assertEqual(
+            sorted(User.objects.values_list("username", flat=True)),
+            ["recent", "staff", "used", "verified"],
+        )
+        self.assertEqual(
+            AccountCleanupService().delete_stale_unverified(30, batch_size=1).data,
+            {"deleted": 0},
+        )
+
+    def test_prune_without_blacklist_app_is_a_no_op(self):
+        self.assertEqual(prune_token_blacklist(), 0)
@@ -0,0 +1,183 @@
+import io
+import json
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from accounts.services.bulk_import import BulkUserImportService, read_rows
+from tasks.models import Task
+from tasks.services.worker import TaskWorker
+from users.models import UserPreferences, UserProfile
+
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+@patch("accounts.tasks.AccountEmails.send_email_verification")
+class TestImportUsers(TestCase):
+    """Test class for BulkUserImportService.import_users."""
+
+    def _rows(self, count, start=0):
+        return [
+            {
+                "email": f"Member{i}@Partner.com",
+                "password": f"s3cret-pass-{i}",
+                "first_name": f"Member{i}",
+                "location": "Kigali",
+            }
+            for i in range(start, start + count)
+        ]
+
+    def test_import_success(self, send_email):
+        """Test users and profiles are created in chunks and emails are queued."""
+        send_email.return_value = True
+        service = BulkUserImportService(chunk_size=2, hash_workers=0)
+
+        response = service.import_users(self._rows(5))
+
+        self.assertTrue(response.success)
+        self.assertEqual(response.data["created"], 5)
+        self.assertEqual(response.data["emails_queued"], 5)
+        self.assertGreater(response.data["rows_per_second"], 0)
+        send_email.assert_not_called()
+
+        self.assertEqual(TaskWorker(queues=["emails"]).run_batch().data["succeeded"], 5)
+        self.assertEqual(send_email.call_count, 5)
+
+        user = User.objects.get(email="member3@partner.com")
+        self.assertTrue(user.check_password("s3cret-pass-3"))
+        profile = UserProfile.objects.get(user=user)
+        self.assertEqual(profile.location, "Kigali")
+        self.assertIsNotNone(profile.email_verification_token)
+        self.assertIsNotNone(profile.email_verification_sent_at)
+
+    def test_import_with_hash_process_pool(self, send_email):
+        """Test passwords hashed in worker processes are valid."""
+        service = BulkUserImportService(
+            chunk_size=10, hash_workers=2, send_verification=False
+        )
+
+        response = service.import_users(self._rows(3))
+
+        self.assertEqual(response.data["created"], 3)
+        self.assertFalse(Task.objects.exists())
+        self.assertTrue(
+            User.objects.get(email="member1@partner.com").check_password(
+                "s3cret-pass-1"
+            )
+        )
+        send_email.assert_not_called()
+
+    def test_import_skips_duplicates(self, send_email):
+        """Test existing emails and repeated rows are skipped."""
+        User.objects.create_user(username="taken", email="member0@partner.com")
+        rows = self._rows(3) + self._rows(1, start=1) + [{"email": ""}]
+        service = BulkUserImportService(hash_workers=0, send_verification=False)
+
+        response = service.import_users(rows)
+
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["skipped"], 3)
+        self.assertEqual(User.objects.filter(email="member0@partner.com").count(), 1)
+
+    def test_import_skips_existing_emails_and_usernames_case_insensitively(
+        self, send_email
+    ):
+        """Test mixed-case emails and usernames equal to the email are skipped."""
+        User.objects.create_user(username="taken", email="Member0@PARTNER.com")
+        User.objects.create_user(username="member1@partner.com", email="")
+        service = BulkUserImportService(hash_workers=0, send_verification=False)
+
+        response = service.import_users(self._rows(3))
+
+        self.assertTrue(response.success)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["skipped"], 2)
+        self.assertTrue(User.objects.filter(username="member2@partner.com").exists())
+
+    def test_import_reports_conflicting_rows(self, send_email):
+        """Test a user taken during the import only drops its own row."""
+        service = BulkUserImportService(hash_workers=0, send_verification=False)
+
+        def take_member1(password):
+            # Signed up between the existence check and the insert
+            if password == "s3cret-pass-1":
+                User.objects.create_user(username="member1@partner.com")
+            return password
+
+        with patch("accounts.services.bulk_import.make_password", take_member1):
+            response = service.import_users(self._rows(3))
+
+        self.assertTrue(response.success)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["conflicts"], 1)
+        self.assertEqual(response.data["failed"], 0)
+        self.assertEqual(UserProfile.objects.count(), 2)
+
+    def test_import_with_preferences(self, send_email):
+        """Test valid preferences are bulk created and invalid ones fail the row."""
+        rows = self._rows(2)
+        rows[0]["preferences"] = {"age_range": "25-34", "top_hobbies": ["hiking"]}
+        rows[1]["preferences"] = {"age_range": "not-an-age"}
+        service = BulkUserImportService(hash_workers=0, send_verification=False)
+
+        response = service.import_users(rows)
+
+        self.assertFalse(response.success)
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["preferences_created"], 1)
+        self.assertEqual(response.data["failed"], 1)
+        preferences = UserPreferences.objects.get()
+        self.assertEqual(preferences.top_hobbies, ["hiking"])
+
+
+class TestReadRows(TestCase):
+    """Test class for read_rows."""
+
+    def test_read_csv(self):
+        """Test CSV rows decode the JSON preferences column."""
+        file_obj = io.StringIO(
+            'email,password,preferences\na@b.com,pw,"{""age_range"": ""18-24""}"\n'
+        )
+        rows = list(read_rows(file_obj, "csv"))
+        self.assertEqual(rows[0]["preferences"], {"age_range": "18-24"})
+
+    def test_read_jsonl(self):
+        """Test JSONL rows are streamed and blank lines ignored."""
+        file_obj = io.StringIO('{"email": "a@b.com"}\n\n{"email": "c@d.com"}\n')
+        self.assertEqual(len(list(read_rows(file_obj, "jsonl"))), 2)
+
+    def test_read_invalid_format(self):
+        """Test unsupported formats are rejected."""
+        with self.assertRaises(ValueError):
+            list(read_rows(io.StringIO(""), "xml"))
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class TestImportUsersCommand(TestCase):
+    """Test class for the import_users management command."""
+
+    def test_command_reports_rows_per_second(self):
+        """Test the command imports a JSONL file and reports throughput."""
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl") as file_obj:
+            for i in range(3):
+                file_obj.write(json.dumps({"email": f"cmd{i}@example.com"}) + "\n")
+            file_obj.flush()
+
+            out = io.StringIO()
+            call_command(
+                "import_users",
+                file_obj.name,
+                "--hash-workers=0",
+                "--skip-verification-emails",
+                stdout=out,
+            )
+
+        self.assertIn("Imported 3 users", out.getvalue())
+        self.assertIn("rows/sec", out.getvalue())
+        self.assertFalse(
+            User.objects.get(email="cmd0@example.com").has_usable_password()
+        )
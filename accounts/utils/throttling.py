@@ -0,0 +1,114 @@
+# Token bucket throttles for the unauthenticated auth endpoints
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from core.utils.rate_limit import get_rate_limit_store, parse_rate
+
+
+class AuthRateThrottle(BaseThrottle):
+    """
+    Base throttle for auth endpoints.
+
+    DRF runs throttles in `APIView.initial()`, before the view body, so a
+    rejected request never reaches password hashing, JWT signing or Postmark.
+
+    Rates are read from REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] using the key
+    "<scope>_<kind>", e.g. "login_ip" or "login_account".
+    """
+
+    scope = None
+    kind = None
+
+    def __init__(self):
+        self.result = None
+
+    def get_rate(self):
+        return api_settings.DEFAULT_THROTTLE_RATES.get(f"{self.scope}_{self.kind}")
+
+    def get_cache_key(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        rate = self.get_rate()
+        if rate is None:
+            return True
+
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        capacity, refill_rate = parse_rate(rate)
+        self.result = get_rate_limit_store().consume(
+            f"{self.scope}:{self.kind}:{key}", capacity, refill_rate
+        )
+        return self.result.allowed
+
+    def wait(self):
+        if self.result is None or self.result.allowed:
+            return None
+        return self.result.retry_after
+
+
+class IPRateThrottle(AuthRateThrottle):
+    """Bucket per client IP (honours NUM_PROXIES / X-Forwarded-For)"""
+
+    kind = "ip"
+
+    def get_cache_key(self, request, view):
+        return self.get_ident(request)
+
+
+class AccountRateThrottle(AuthRateThrottle):
+    """
+    Bucket per targeted account.
+    Authenticated requests are keyed by user id, anonymous ones by the
+    identifier submitted in the body (first of `account_fields` present).
+    """
+
+    kind = "account"
+    account_fields = ("email",)
+
+    def get_cache_key(self, request, view):
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return f"user:{user.pk}"
+
+        data = request.data if hasattr(request.data, "get") else {}
+        for field in self.account_fields:
+            value = data.get(field)
+            if value and isinstance(value, str):
+                return value.strip().lower()
+        return None
+
+
+class LoginIPThrottle(IPRateThrottle):
+    scope = "login"
+
+
+class LoginAccountThrottle(AccountRateThrottle):
+    scope = "login"
+    account_fields = ("username", "email")
+
+
+class SignupIPThrottle(IPRateThrottle):
+    scope = "signup"
+
+
+class SignupAccountThrottle(AccountRateThrottle):
+    scope = "signup"
+
+
+class ResendVerificationIPThrottle(IPRateThrottle):
+    scope = "resend_verification"
+
+
+class ResendVerificationAccountThrottle(AccountRateThrottle):
+    scope = "resend_verification"
+
+
+class PasswordResetIPThrottle(IPRateThrottle):
+    scope = "password_reset"
+
+
+class PasswordResetAccountThrottle(AccountRateThrottle):
+    scope = "password_reset"
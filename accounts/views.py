@@ -1,9 +1,19 @@
 # auth views
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from accounts.services.auth import AuthenticationService
+from accounts.utils.throttling import (
+    LoginIPThrottle,
+    LoginAccountThrottle,
+    SignupIPThrottle,
+    SignupAccountThrottle,
+    ResendVerificationIPThrottle,
+    ResendVerificationAccountThrottle,
+    PasswordResetIPThrottle,
+    PasswordResetAccountThrottle,
+)
 
 auth_service = AuthenticationService()
 
@@ -11,6 +21,7 @@ auth_service = AuthenticationService()
 # login view
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([LoginIPThrottle, LoginAccountThrottle])
 def login_view(request):
 
     data = request.data
@@ -42,6 +53,7 @@ def login_view(request):
 # signup view
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([SignupIPThrottle, SignupAccountThrottle])
 def signup_view(request):
 
     data = request.data
@@ -82,6 +94,7 @@ def verify_email_view(request):
 # Resend verification email view
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
+@throttle_classes([ResendVerificationIPThrottle, ResendVerificationAccountThrottle])
 def resend_verification_email_view(request):
     """Resend verification email to authenticated user"""
     user = request.user
@@ -103,6 +116,7 @@ def resend_verification_email_view(request):
 # Password reset request view
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([PasswordResetIPThrottle, PasswordResetAccountThrottle])
 def password_reset_request_view(request):
     """Request password reset for given email"""
     data = request.data
@@ -0,0 +1,108 @@
+# Insert throughput: BaseModel vs SlimBaseModel
+import time
+from functools import lru_cache
+
+from django.apps.registry import Apps
+from django.contrib.auth.models import User
+from django.db import connection, models, transaction
+
+from core.models import BaseModel, SlimBaseModel
+
+
+@lru_cache(maxsize=None)
+def benchmark_models() -> dict:
+    """
+    Two throwaway message-like models, one per base class.
+
+    They live in their own app registry so they never show up in
+    migrations; auth.User is registered there so the audit foreign keys
+    of BaseModel resolve.
+    """
+    registry = Apps()
+    registry.register_model("auth", User)
+
+    def build(name, base):
+        meta = type(
+            "Meta",
+            (),
+            {
+                "app_label": "core",
+                "apps": registry,
+                "db_table": f"benchmark_{name.lower()}",
+            },
+        )
+        return type(
+            name,
+            (base,),
+            {
+                "__module__": __name__,
+                "session_id": models.IntegerField(db_index=True),
+                "sender_id": models.IntegerField(),
+                "body": models.TextField(),
+                "Meta": meta,
+            },
+        )
+
+    return {
+        "base_model": build("BenchmarkBaseMessage", BaseModel),
+        "slim_base_model": build("BenchmarkSlimMessage", SlimBaseModel),
+    }
+
+
+def _rows(model, count):
+    return [
+        model(session_id=i % 50, sender_id=i % 7, body=f"message {i}")
+        for i in range(count)
+    ]
+
+
+def _constraint_count(model):
+    with connection.cursor() as cursor:
+        return len(
+            connection.introspection.get_constraints(cursor, model._meta.db_table)
+        )
+
+
+def measure_inserts(rows: int = 10000, batch_size: int = 1000) -> dict:
+    """
+    Insert the same rows into both models and report throughput.
+
+    Business logic:
+        1. Create each table with the schema editor.
+        2. Time bulk_create in batches of `batch_size`, then single-row
+           create() calls (a tenth of `rows`, like live chat traffic).
+        3. Drop the tables again.
+
+    Must run outside a transaction (schema changes on SQLite).
+
+    Returns:
+        dict: per model, rows/sec for both insert styles plus the number of
+        columns and of indexes/constraints
+    """
+    results = {}
+    single_rows = max(1, rows // 10)
+    for name, model in benchmark_models().items():
+        with connection.schema_editor() as editor:
+            editor.create_model(model)
+        try:
+            objs = _rows(model, rows)
+            started = time.perf_counter()
+            with transaction.atomic():
+                model.objects.bulk_create(objs, batch_size=batch_size)
+            bulk_elapsed = time.perf_counter() - started
+
+            started = time.perf_counter()
+            for obj in _rows(model, single_rows):
+                obj.save()
+            single_elapsed = time.perf_counter() - started
+
+            results[name] = {
+                "columns": len(model._meta.concrete_fields),
+                "constraints": _constraint_count(model),
+                "bulk_rows_per_second": round(rows / bulk_elapsed),
+                "single_rows_per_second": round(single_rows / single_elapsed),
+            }
+        finally:
+            with connection.schema_editor() as editor:
+                editor.delete_model(model)
+    return results
@@ -0,0 +1,238 @@
+# Offline matching evaluation: ranking quality versus latency per engine
+import gzip
+import json
+import math
+import platform
+import random
+import statistics
+import time
+from pathlib import Path
+
+from django.utils import timezone
+
+from core.benchmarks.runner import percentile
+from users.models import UserCompatibilityPreferences, UserPreferences
+from users.utils.compatibility_weights import get_weight_profile
+from users.utils.matching_engines import ENGINES, MatchCandidate, PairwiseEngine
+from users.utils.synthetic_data import SyntheticPreferencesGenerator
+
+REFERENCE_ENGINE = PairwiseEngine.name
+
+
+def synthetic_candidates(size: int, seed: int = 42) -> list:
+    """Unsaved synthetic users, generated like seed_scale_data does."""
+    generator = SyntheticPreferencesGenerator(seed=seed)
+    preferences = generator.preferences_batch([None] * size)
+    compatibility = generator.compatibility_batch(
+        [None] * size, [p.age_range for p in preferences]
+    )
+    return [
+        MatchCandidate(id=i + 1, preferences=preferences[i], compatibility=compat)
+        for i, compat in enumerate(compatibility)
+    ]
+
+
+def _read_jsonl(path: Path):
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as file_obj:
+        for line in file_obj:
+            yield json.loads(line)
+
+
+def _latest(directory: Path, prefix: str):
+    paths = sorted(directory.glob(f"{prefix}_*.jsonl*"))
+    return paths[-1] if paths else None
+
+
+def _instance(model, row: dict):
+    attnames = {field.attname for field in model._meta.concrete_fields}
+    return model(**{name: value for name, value in row.items() if name in attnames})
+
+
+def exported_candidates(directory) -> list:
+    """
+    Users from the newest export_preferences JSONL files in `directory`.
+
+    Use a full (non incremental) export; soft deleted rows are skipped.
+    """
+    directory = Path(directory)
+    preferences_path = _latest(directory, "preferences")
+    if preferences_path is None:
+        raise FileNotFoundError(f"No preferences_*.jsonl export in {directory}")
+
+    compatibility = {}
+    compatibility_path = _latest(directory, "compatibility")
+    if compatibility_path is not None:
+        for row in _read_jsonl(compatibility_path):
+            if not row.get("is_deleted"):
+                compatibility[row["profile_id"]] = _instance(
+                    UserCompatibilityPreferences, row
+                )
+
+    return [
+        MatchCandidate(
+            id=row["profile_id"],
+            preferences=_instance(UserPreferences, row),
+            compatibility=compatibility.get(row["profile_id"]),
+        )
+        for row in _read_jsonl(preferences_path)
+        if not row.get("is_deleted")
+    ]
+
+
+def topk_agreement(reference: list, result: list, reference_scores: dict) -> float:
+    """
+    Share of the engine's top-K that belongs in the reference top-K.
+
+    Candidates tied with the reference K-th score are interchangeable: the
+    reference breaks such ties by id, so an engine returning another member
+    of the tie is not penalised.
+    """
+    if not reference:
+        return 1.0
+    threshold = reference[-1][1]
+    hits = sum(1 for id, _ in result if reference_scores.get(id, -1) >= threshold)
+    return min(hits, len(reference)) / len(reference)
+
+
+def kendall_tau(x: list, y: list) -> float:
+    """Kendall tau-b rank correlation of two equally long lists (ties allowed)."""
+    concordant = discordant = ties_x = ties_y = 0
+    for i in range(len(x)):
+        for j in range(i + 1, len(x)):
+            a = x[i] - x[j]
+            b = y[i] - y[j]
+            if a == 0 and b == 0:
+                continue
+            if a == 0:
+                ties_x += 1
+            elif b == 0:
+                ties_y += 1
+            elif (a > 0) == (b > 0):
+                concordant += 1
+            else:
+                discordant += 1
+
+    denominator = math.sqrt(
+        (concordant + discordant + ties_x) * (concordant + discordant + ties_y)
+    )
+    if denominator == 0:
+        return 1.0
+    return (concordant - discordant) / denominator
+
+
+class MatchingEvaluation:
+    """
+    Replay a candidate pool through several matching engines.
+
+    Business logic:
+        1. Build every engine's index over the same pool (timed separately).
+        2. For `queries` sampled users, rank the pool with the reference
+           pairwise engine and then with each engine, timing each query.
+        3. Compare each engine's top-K against the reference scores of the
+           same query: top-K agreement (tie aware) and Kendall tau between
+           the engine's scores and the reference scores of what it returned
+           (score drift), averaged over the queries.
+
+    Returns a JSON serialisable report from run().
+    """
+
+    def __init__(
+        self,
+        candidates: list,
+        engine_names: list = None,
+        queries: int = 50,
+        k: int = 10,
+        seed: int = 42,
+        stdout=None,
+    ):
+        self.candidates = candidates
+        self.engine_names = [
+            name for name in (engine_names or list(ENGINES)) if name != REFERENCE_ENGINE
+        ]
+        unknown = set(self.engine_names) - set(ENGINES)
+        if unknown:
+            raise ValueError(f"Unknown engines: {', '.join(sorted(unknown))}")
+        self.k = k
+        self.queries = random.Random(seed).sample(
+            candidates, min(queries, len(candidates))
+        )
+        self.stdout = stdout
+
+    def _write(self, message: str):
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+    def run(self) -> dict:
+        report = {
+            "generated_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "candidates": len(self.candidates),
+            "queries": len(self.queries),
+            "k": self.k,
+            "weights_version": get_weight_profile().version,
+            "reference": REFERENCE_ENGINE,
+            "engines": {},
+        }
+
+        engines = {}
+        for name in [REFERENCE_ENGINE, *self.engine_names]:
+            try:
+                engine = ENGINES[name]()
+                started = time.perf_counter()
+                engine.build(self.candidates)
+            except ImportError as e:
+                self._write(f"  {name}: skipped ({e})")
+                report["engines"][name] = {"skipped": str(e)}
+                continue
+            engines[name] = engine
+            report["engines"][name] = {
+                "build_ms": round((time.perf_counter() - started) * 1000, 3)
+            }
+
+        samples = {name: [] for name in engines}
+        reference_engine = engines[REFERENCE_ENGINE]
+        for query in self.queries:
+            for name, engine in engines.items():
+                started = time.perf_counter()
+                result = engine.top_k(query, self.k)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                samples[name].append((result, elapsed_ms, engine.last_scored))
+
+            reference = samples[REFERENCE_ENGINE][-1][0]
+            reference_scores = reference_engine.last_scores
+            for name in engines:
+                result = samples[name][-1][0]
+                samples[name][-1] += (
+                    topk_agreement(reference, result, reference_scores),
+                    kendall_tau(
+                        [score for _, score in result],
+                        [reference_scores[id] for id, _ in result],
+                    ),
+                )
+
+        for name, engine_samples in samples.items():
+            report["engines"][name].update(self._summarize(engine_samples))
+            self._write(
+                f"  {name}: p50 {report['engines'][name]['p50_ms']}ms, "
+                f"{report['engines'][name]['queries_per_second']} q/s, "
+                f"{report['engines'][name]['mean_scored']} scored per query"
+            )
+        return report
+
+    @staticmethod
+    def _summarize(samples: list) -> dict:
+        _, timings_ms, scored, agreement, tau = zip(*samples)
+        ordered = sorted(timings_ms)
+        total_seconds = sum(timings_ms) / 1000
+        return {
+            "p50_ms": round(percentile(ordered, 50), 3),
+            "p95_ms": round(percentile(ordered, 95), 3),
+            "mean_ms": round(statistics.fmean(ordered), 3),
+            "queries_per_second": (
+                round(len(ordered) / total_seconds, 1) if total_seconds else 0.0
+            ),
+            "mean_scored": round(statistics.fmean(scored), 1),
+            "topk_agreement": round(statistics.fmean(agreement), 4),
+            "kendall_tau": round(statistics.fmean(tau), 4),
+        }
@@ -0,0 +1,211 @@
+# Benchmark runner: seeded datasets, latency percentiles, query counts
+import io
+import json
+import platform
+import statistics
+import time
+from contextlib import ExitStack
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.benchmarks.inserts import measure_inserts
+from core.benchmarks.scenarios import (
+    SCENARIOS,
+    SEED_PASSWORD,
+    SEED_PREFIX,
+    BenchmarkContext,
+)
+
+WARMUP_ITERATIONS = 2
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(
+        0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1)
+    )
+    return sorted_values[rank]
+
+
+def summarize(timings_ms: list, query_counts: list, status_codes: list) -> dict:
+    ordered = sorted(timings_ms)
+    return {
+        "iterations": len(ordered),
+        "p50_ms": round(percentile(ordered, 50), 3),
+        "p95_ms": round(percentile(ordered, 95), 3),
+        "p99_ms": round(percentile(ordered, 99), 3),
+        "mean_ms": round(statistics.fmean(ordered), 3) if ordered else 0.0,
+        "queries": max(query_counts) if query_counts else 0,
+        "status_codes": sorted(set(status_codes)),
+    }
+
+
+class BenchmarkRunner:
+    """
+    Run every scenario against seeded datasets of several sizes.
+
+    Business logic:
+        1. For each size, (re)seed the database with seed_scale_data
+           (unless `seed=False`, to reuse an already seeded database).
+        2. Run each scenario for a few warmup iterations, then measure
+           wall time and query count per iteration.
+        3. Optionally compare insert throughput of BaseModel and
+           SlimBaseModel tables (`insert_rows` > 0).
+        4. Return a JSON serialisable report keyed by scenario and size.
+
+    The runner writes to whatever database is configured, so callers are
+    expected to point it at a throwaway (test) database.
+    """
+
+    def __init__(
+        self,
+        sizes,
+        iterations=30,
+        scenario_names=None,
+        seed=True,
+        insert_rows=0,
+        stdout=None,
+    ):
+        self.sizes = sizes
+        self.seed = seed
+        self.insert_rows = insert_rows
+        self.iterations = iterations
+        self.scenarios = [
+            scenario
+            for scenario in SCENARIOS
+            if not scenario_names or scenario.name in scenario_names
+        ]
+        self.stdout = stdout
+
+    def _write(self, message: str):
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+    def run(self) -> dict:
+        report = {
+            "meta": {
+                "created_at": timezone.now().isoformat(),
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "sizes": self.sizes,
+                "iterations": self.iterations,
+            },
+            "results": {},
+        }
+
+        for size in self.sizes:
+            if self.seed:
+                self._write(f"Seeding {size} users...")
+                call_command(
+                    "seed_scale_data",
+                    users=size,
+                    prefix=SEED_PREFIX,
+                    password=SEED_PASSWORD,
+                    preferences_ratio=1.0,
+                    clear=True,
+                    stdout=io.StringIO(),
+                )
+            ctx = BenchmarkContext(size, self.iterations + WARMUP_ITERATIONS)
+
+            for scenario_class in self.scenarios:
+                scenario = scenario_class()
+                result = self.run_scenario(scenario, ctx)
+                report["results"].setdefault(scenario.name, {})[str(size)] = result
+                self._write(
+                    f"  {scenario.name:<22} n={size:<8} p50={result['p50_ms']:>9.3f}ms "
+                    f"p95={result['p95_ms']:>9.3f}ms p99={result['p99_ms']:>9.3f}ms "
+                    f"queries={result['queries']}"
+                )
+
+        if self.insert_rows:
+            report["inserts"] = measure_inserts(self.insert_rows)
+            for name, result in report["inserts"].items():
+                self._write(
+                    f"  insert {name:<15} columns={result['columns']:<3} "
+                    f"constraints={result['constraints']:<3} "
+                    f"bulk={result['bulk_rows_per_second']}/s "
+                    f"single={result['single_rows_per_second']}/s"
+                )
+        return report
+
+    def run_scenario(self, scenario, ctx: BenchmarkContext) -> dict:
+        iterations = self.iterations
+        if scenario.max_iterations:
+            iterations = min(iterations, scenario.max_iterations)
+
+        timings_ms, query_counts, status_codes = [], [], []
+        with ExitStack() as stack:
+            for scenario_patch in scenario.patches():
+                stack.enter_context(scenario_patch)
+            scenario.setup(ctx)
+
+            for i in range(WARMUP_ITERATIONS + iterations):
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    status_code = scenario.run(ctx, i)
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                if i < WARMUP_ITERATIONS:
+                    continue
+                timings_ms.append(elapsed_ms)
+                query_counts.append(len(queries))
+                status_codes.append(status_code)
+
+            plan = scenario.explain(ctx)
+
+        result = summarize(timings_ms, query_counts, status_codes)
+        if plan is not None:
+            result["plan"] = plan
+        return result
+
+
+def compare_to_baseline(
+    report: dict, baseline: dict, latency_tolerance=0.25, min_delta_ms=1.0
+) -> list:
+    """
+    Compare a report with a stored baseline.
+
+    A scenario regresses when its p95 grows by more than `latency_tolerance`
+    (and by at least `min_delta_ms`, to ignore sub-millisecond noise) or when
+    it issues more queries than the baseline.
+
+    Returns:
+        list: human readable regression descriptions (empty when clean)
+    """
+    regressions = []
+    for name, sizes in baseline.get("results", {}).items():
+        for size, expected in sizes.items():
+            actual = report["results"].get(name, {}).get(size)
+            if actual is None:
+                continue
+
+            allowed_p95 = expected["p95_ms"] * (1 + latency_tolerance)
+            if (
+                actual["p95_ms"] > allowed_p95
+                and actual["p95_ms"] - expected["p95_ms"] >= min_delta_ms
+            ):
+                regressions.append(
+                    f"{name}@{size}: p95 {actual['p95_ms']}ms > "
+                    f"baseline {expected['p95_ms']}ms (+{latency_tolerance:.0%})"
+                )
+            if actual["queries"] > expected["queries"]:
+                regressions.append(
+                    f"{name}@{size}: {actual['queries']} queries > "
+                    f"baseline {expected['queries']}"
+                )
+    return regressions
+
+
+def load_report(path) -> dict:
+    with open(path, encoding="utf-8") as file_obj:
+        return json.load(file_obj)
+
+
+def save_report(report: dict, path):
+    with open(path, "w", encoding="utf-8") as file_obj:
+        json.dump(report, file_obj, indent=2, sort_keys=True)
+        file_obj.write("\n")
@@ -0,0 +1,290 @@
+# Benchmark scenarios for the API hot paths
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.utils.rate_limit import get_rate_limit_store
+from users.models import UserPreferences
+from users.repositories.preferences_repository import PreferencesRepository
+from users.services.preferences_utils import PreferencesUtils
+
+SEED_PREFIX = "bench_user_"
+SEED_PASSWORD = "password123"
+
+PREFERENCES_PAYLOAD = {
+    "age_range": "25-34",
+    "current_location": "Kigali, Rwanda",
+    "life_situations": ["working_professional"],
+    "top_hobbies": ["hiking", "gaming"],
+    "conversation_style": "balanced",
+    "friendship_goals": ["casual_chats"],
+}
+
+
+class BenchmarkContext:
+    """Shared state for one dataset size: API client, seeded users and tokens."""
+
+    def __init__(self, size: int, iterations: int):
+        self.size = size
+        self.client = APIClient()
+        self.preferences = list(
+            UserPreferences.objects.select_related("profile__user").filter(
+                profile__user__username__startswith=SEED_PREFIX
+            )[: iterations * 2]
+        )
+        self.users = [preferences.profile.user for preferences in self.preferences]
+        self._tokens = {}
+
+    def user(self, i: int) -> User:
+        return self.users[i % len(self.users)]
+
+    def auth_headers(self, user: User) -> dict:
+        """Real JWT header so authentication cost is part of the measurement."""
+        if user.id not in self._tokens:
+            self._tokens[user.id] = str(RefreshToken.for_user(user).access_token)
+        return {"HTTP_AUTHORIZATION": f"Bearer {self._tokens[user.id]}"}
+
+    @staticmethod
+    def client_ip(i: int) -> dict:
+        """Spread requests over many IPs so auth throttles don't kick in."""
+        return {"REMOTE_ADDR": f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}"}
+
+
+class Scenario:
+    """
+    One benchmarked operation.
+
+    `run(ctx, i)` performs iteration i and returns an HTTP status code
+    (or 200 for non HTTP scenarios). `max_iterations` caps expensive
+    scenarios such as password hashing.
+    """
+
+    name = None
+    max_iterations = None
+
+    def patches(self) -> list:
+        """External dependencies to replace while the scenario runs."""
+        return []
+
+    def setup(self, ctx: BenchmarkContext):
+        pass
+
+    def run(self, ctx: BenchmarkContext, i: int) -> int:
+        raise NotImplementedError
+
+    def explain(self, ctx: BenchmarkContext):
+        """Query plan recorded next to the timings, for query scenarios."""
+        return None
+
+
+class LoginScenario(Scenario):
+    name = "login"
+    max_iterations = 10
+
+    def run(self, ctx, i):
+        return ctx.client.post(
+            "/api/v1/accounts/login/",
+            {
+                "method": "password",
+                "username": ctx.user(i).username,
+                "password": SEED_PASSWORD,
+            },
+            format="json",
+            **ctx.client_ip(i),
+        ).status_code
+
+
+class LoginThrottledScenario(Scenario):
+    """
+    Login attempts from one IP whose bucket is spent, as in a credential
+    stuffing burst: rejected before any query or password hashing.
+    """
+
+    name = "login_throttled"
+    ip = {"REMOTE_ADDR": "203.0.113.7"}
+
+    def _attempt(self, ctx, i):
+        return ctx.client.post(
+            "/api/v1/accounts/login/",
+            {
+                "method": "password",
+                "username": f"leaked{i}@example.com",
+                "password": "hunter2",
+            },
+            format="json",
+            **self.ip,
+        ).status_code
+
+    def setup(self, ctx):
+        get_rate_limit_store().reset()
+        with patch("accounts.services.auth.authenticate", return_value=None):
+            for i in range(100):
+                if self._attempt(ctx, i) == 429:
+                    break
+
+    def run(self, ctx, i):
+        return self._attempt(ctx, i)
+
+
+class SignupScenario(Scenario):
+    name = "signup"
+    max_iterations = 10
+
+    def patches(self):
+        return [
+            patch("core.utils.email_client.EmailClient.send_email", return_value=True)
+        ]
+
+    def run(self, ctx, i):
+        return ctx.client.post(
+            "/api/v1/accounts/sign-up/",
+            {
+                "method": "password",
+                "email": f"bench_signup_{ctx.size}_{i}@example.com",
+                "password": "Bench-password-123",
+                "first_name": "Bench",
+                "last_name": "User",
+            },
+            format="json",
+            **ctx.client_ip(i),
+        ).status_code
+
+
+class PreferencesGetScenario(Scenario):
+    name = "preferences_get"
+
+    def run(self, ctx, i):
+        return ctx.client.get(
+            "/api/v1/users/preferences/", **ctx.auth_headers(ctx.user(i))
+        ).status_code
+
+
+class PreferencesPutScenario(Scenario):
+    name = "preferences_put"
+
+    def run(self, ctx, i):
+        return ctx.client.put(
+            "/api/v1/users/preferences/",
+            PREFERENCES_PAYLOAD,
+            format="json",
+            **ctx.auth_headers(ctx.user(i)),
+        ).status_code
+
+
+class PreferencesPatchScenario(Scenario):
+    name = "preferences_patch"
+
+    def run(self, ctx, i):
+        return ctx.client.patch(
+            "/api/v1/users/preferences/",
+            {"current_location": f"City {i}"},
+            format="json",
+            **ctx.auth_headers(ctx.user(i)),
+        ).status_code
+
+
+class SectionUpdateScenario(Scenario):
+    name = "section_update"
+
+    def run(self, ctx, i):
+        return ctx.client.post(
+            "/api/v1/users/preferences/section/interests/",
+            {
+                "top_hobbies": ["reading", "music"],
+                "free_day_preference": "cozy_at_home",
+            },
+            format="json",
+            **ctx.auth_headers(ctx.user(i)),
+        ).status_code
+
+
+class ChoicesScenario(Scenario):
+    name = "choices"
+
+    def run(self, ctx, i):
+        return ctx.client.get("/api/v1/users/preferences/choices/").status_code
+
+
+class SectionsScenario(Scenario):
+    name = "sections"
+
+    def run(self, ctx, i):
+        return ctx.client.get("/api/v1/users/preferences/sections/").status_code
+
+
+class ValidateScenario(Scenario):
+    name = "validate"
+
+    def run(self, ctx, i):
+        return ctx.client.post(
+            "/api/v1/users/preferences/validate/", PREFERENCES_PAYLOAD, format="json"
+        ).status_code
+
+
+class CompatibilityScoreScenario(Scenario):
+    name = "compatibility_score"
+
+    def setup(self, ctx):
+        self.utils = PreferencesUtils()
+
+    def run(self, ctx, i):
+        preferences = ctx.preferences
+        response = self.utils.calculate_compatibility_score(
+            preferences[i % len(preferences)],
+            preferences[(i * 7 + 1) % len(preferences)],
+        )
+        return response.status_code
+
+
+class PreferencesFilterScenario(Scenario):
+    """Users who like hiking and want a gaming partner (JSON list filters)."""
+
+    name = "preferences_filter"
+
+    def setup(self, ctx):
+        self.repository = PreferencesRepository()
+
+    def queryset(self):
+        return self.repository.filter_preferences(
+            contains={"top_hobbies": ["hiking"]},
+            overlaps={"friendship_goals": ["gaming_partner", "casual_chats"]},
+        ).data.unordered()
+
+    def run(self, ctx, i):
+        list(self.queryset().values_list("id", flat=True)[:100])
+        return 200
+
+    def explain(self, ctx):
+        return self.queryset().explain()
+
+
+class RecentPreferencesScenario(Scenario):
+    """Newest live rows through the default manager (partial created_at index)."""
+
+    name = "recent_preferences"
+
+    def run(self, ctx, i):
+        list(UserPreferences.objects.all()[:50])
+        return 200
+
+    def explain(self, ctx):
+        return UserPreferences.objects.all()[:50].explain()
+
+
+SCENARIOS = [
+    LoginScenario,
+    LoginThrottledScenario,
+    SignupScenario,
+    PreferencesGetScenario,
+    PreferencesPutScenario,
+    PreferencesPatchScenario,
+    SectionUpdateScenario,
+    ChoicesScenario,
+    SectionsScenario,
+    ValidateScenario,
+    CompatibilityScoreScenario,
+    PreferencesFilterScenario,
+    RecentPreferencesScenario,
+]
@@ -0,0 +1,94 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks.matching import (
+    MatchingEvaluation,
+    exported_candidates,
+    synthetic_candidates,
+)
+from core.benchmarks.runner import save_report
+from users.utils.matching_engines import ENGINES
+
+
+class Command(BaseCommand):
+    """Compare matching engines against the reference scorer offline"""
+
+    help = (
+        "Replay synthetic or exported preferences through the matching engines "
+        "and report latency, throughput, top-K agreement and Kendall tau against "
+        "the pairwise reference implementation."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=2000,
+            help="Number of synthetic users (ignored with --export-dir)",
+        )
+        parser.add_argument(
+            "--export-dir",
+            help="Directory with a full export_preferences JSONL export to replay",
+        )
+        parser.add_argument("--queries", type=int, default=50)
+        parser.add_argument("--k", type=int, default=10)
+        parser.add_argument(
+            "--engines",
+            help=f"Comma separated subset of: {', '.join(ENGINES)} (default: all)",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--output", default="matching_eval.json")
+        parser.add_argument(
+            "--min-agreement",
+            type=float,
+            help="Fail if any engine's top-K agreement is below this (0-1)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            if options["export_dir"]:
+                candidates = exported_candidates(options["export_dir"])
+            else:
+                candidates = synthetic_candidates(options["size"], options["seed"])
+            evaluation = MatchingEvaluation(
+                candidates,
+                engine_names=(
+                    options["engines"].split(",") if options["engines"] else None
+                ),
+                queries=options["queries"],
+                k=options["k"],
+                seed=options["seed"],
+                stdout=self.stdout,
+            )
+        except (FileNotFoundError, ValueError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            f"Evaluating {len(evaluation.queries)} queries over "
+            f"{len(candidates)} users (k={options['k']})"
+        )
+        report = evaluation.run()
+        save_report(report, options["output"])
+
+        self.stdout.write(
+            f"{'engine':<12}{'p50 ms':>10}{'q/s':>10}{'top-K':>8}{'tau':>8}"
+        )
+        failures = []
+        for name, result in report["engines"].items():
+            if "skipped" in result:
+                continue
+            self.stdout.write(
+                f"{name:<12}{result['p50_ms']:>10}{result['queries_per_second']:>10}"
+                f"{result['topk_agreement']:>8}{result['kendall_tau']:>8}"
+            )
+            if (
+                options["min_agreement"] is not None
+                and result["topk_agreement"] < options["min_agreement"]
+            ):
+                failures.append(name)
+        self.stdout.write(f"Results written to {options['output']}")
+
+        if failures:
+            raise CommandError(
+                f"Top-K agreement below {options['min_agreement']}: "
+                f"{', '.join(failures)}"
+            )
@@ -0,0 +1,115 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from core.benchmarks.runner import (
+    BenchmarkRunner,
+    compare_to_baseline,
+    load_report,
+    save_report,
+)
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "core" / "benchmarks" / "baseline.json"
+
+
+class Command(BaseCommand):
+    """Benchmark the API hot paths and compare against a stored baseline"""
+
+    help = (
+        "Seed datasets of several sizes in a throwaway test database, record "
+        "p50/p95/p99 latency and query counts per scenario to JSON and flag "
+        "regressions against the baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="100,1000",
+            help="Comma separated dataset sizes (number of seeded users)",
+        )
+        parser.add_argument("--iterations", type=int, default=30)
+        parser.add_argument(
+            "--scenarios", help="Comma separated scenario names (default: all)"
+        )
+        parser.add_argument("--output", default="bench_output.json")
+        parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Overwrite the baseline with this run's results",
+        )
+        parser.add_argument("--latency-tolerance", type=float, default=0.25)
+        parser.add_argument(
+            "--insert-rows",
+            type=int,
+            default=10000,
+            help="Rows for the BaseModel vs SlimBaseModel insert benchmark (0 skips)",
+        )
+        parser.add_argument(
+            "--use-current-db",
+            action="store_true",
+            help="Run against the configured database instead of a test database",
+        )
+        parser.add_argument(
+            "--skip-seed",
+            action="store_true",
+            help="Reuse users seeded by a previous run (requires --use-current-db)",
+        )
+
+    def handle(self, *args, **options):
+        if options["skip_seed"] and not options["use_current_db"]:
+            raise CommandError("--skip-seed requires --use-current-db")
+
+        sizes = [int(size) for size in options["sizes"].split(",")]
+        scenario_names = (
+            options["scenarios"].split(",") if options["scenarios"] else None
+        )
+        runner = BenchmarkRunner(
+            sizes,
+            iterations=options["iterations"],
+            scenario_names=scenario_names,
+            seed=not options["skip_seed"],
+            insert_rows=options["insert_rows"],
+            stdout=self.stdout,
+        )
+
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        try:
+            if not options["use_current_db"]:
+                connection.creation.create_test_db(
+                    verbosity=0, autoclobber=True, serialize=False
+                )
+            report = runner.run()
+        finally:
+            if not options["use_current_db"]:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        save_report(report, options["output"])
+        self.stdout.write(f"Results written to {options['output']}")
+
+        if options["update_baseline"]:
+            save_report(report, options["baseline"])
+            self.stdout.write(self.style.SUCCESS("Baseline updated"))
+            return
+
+        if not Path(options["baseline"]).exists():
+            self.stdout.write(
+                self.style.WARNING("No baseline found, skipping comparison")
+            )
+            return
+
+        regressions = compare_to_baseline(
+            report,
+            load_report(options["baseline"]),
+            latency_tolerance=options["latency_tolerance"],
+        )
+        if regressions:
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(f"  REGRESSION {regression}"))
+            raise CommandError(f"{len(regressions)} benchmark regression(s) found")
+        self.stdout.write(self.style.SUCCESS("No regressions against baseline"))
@@ -1,5 +1,115 @@
 # base models
 from django.db import models
+from django.utils import timezone
+
+
+def _existing_fields(model, values: dict) -> dict:
+    """Keep only the entries of `values` that are concrete fields of `model`."""
+    names = {field.name for field in model._meta.concrete_fields}
+    return {name: value for name, value in values.items() if name in names}
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    def unordered(self):
+        """
+        Drop Meta.ordering for internal queries that don't need it.
+
+        Every BaseModel is ordered by -created_at, which adds a sort to
+        each unqualified query; hot paths that only iterate or aggregate
+        should opt out explicitly.
+        """
+        return self.order_by()
+
+    def soft_delete(self, user=None):
+        # update() skips auto_now, so updated_at is set here; incremental
+        # exports read soft deletes as changes
+        now = timezone.now()
+        return self.update(
+            **_existing_fields(
+                self.model,
+                {
+                    "is_deleted": True,
+                    "deleted_at": now,
+                    "deleted_by": user,
+                    "updated_at": now,
+                },
+            )
+        )
+
+    def archive(self, user=None):
+        # SlimBaseModel has no archive fields (nor updated_at): nothing to set
+        now = timezone.now()
+        values = _existing_fields(
+            self.model,
+            {
+                "is_archived": True,
+                "archived_at": now,
+                "archived_by": user,
+                "updated_at": now,
+            },
+        )
+        return self.update(**values) if values else 0
+
+    def create_or_restore(self, unique: dict, **values):
+        """
+        Create a row, reusing the deleted or archived row matching `unique`.
+
+        A hidden row still holds its unique slot (e.g. the one-to-one
+        profile), so a plain create() for it would raise IntegrityError.
+        That row is overwritten with `values` and field defaults instead,
+        and becomes visible again.
+        """
+        instance = self.model(**unique, **values)
+        hidden = (
+            self.model.all_objects.hidden()
+            .filter(**unique)
+            .values_list("pk", "created_at")
+            .first()
+        )
+        if hidden is None:
+            instance.save(force_insert=True, using=self.db)
+        else:
+            instance.pk, instance.created_at = hidden
+            instance.save(force_update=True, using=self.db)
+        return instance
+
+    def hidden(self):
+        """Deleted or archived rows (use on all_objects)."""
+        return self.filter(
+            models.Q(**_existing_fields(self.model, {"is_deleted": True}))
+            | models.Q(**_existing_fields(self.model, {"is_archived": True}))
+        )
+
+
+class SoftDeleteManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """Default manager: hides deleted and archived rows."""
+
+    def get_queryset(self):
+        return (
+            super()
+            .get_queryset()
+            .filter(
+                **_existing_fields(
+                    self.model, {"is_deleted": False, "is_archived": False}
+                )
+            )
+        )
+
+
+class AllObjectsManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """Every row, including deleted and archived ones."""
+
+
+def alive_index(name):
+    """
+    Partial index on created_at over rows that are not deleted.
+
+    Serves the default manager ordered by -created_at. Index names are
+    limited to 30 characters, so each concrete model declares its own.
+    """
+    return models.Index(
+        fields=["created_at"], condition=models.Q(is_deleted=False), name=name
+    )
 
 
 # Create your models here.
@@ -41,6 +151,31 @@ class BaseModel(models.Model):
         blank=True,
     )
 
+    objects = SoftDeleteManager()
+    all_objects = AllObjectsManager()
+
     class Meta:
         abstract = True
         ordering = ["-created_at"]
+
+
+class SlimBaseModel(models.Model):
+    """
+    Lightweight BaseModel variant for append-heavy tables.
+
+    Keeps created_at and soft deletion but drops updated_at, the active and
+    archive flags, notes and the four indexed audit foreign keys, which
+    otherwise cost a wider row and four index updates on every insert
+    (chat messages, session events, match scores). There is no default
+    ordering; order explicitly, usually by id.
+    """
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    is_deleted = models.BooleanField(default=False)
+    deleted_at = models.DateTimeField(blank=True, null=True)
+
+    objects = SoftDeleteManager()
+    all_objects = AllObjectsManager()
+
+    class Meta:
+        abstract = True
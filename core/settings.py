@@ -60,6 +60,7 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "rest_framework",
     "rest_framework_simplejwt",
+    "core",
     "accounts",
     "users",
     "feedback",
@@ -99,6 +100,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "core.wsgi.application"
+ASGI_APPLICATION = "core.asgi.application"
 
 
 # Database
@@ -119,6 +121,174 @@ else:
     }
 
 
+# Cache
+# A shared cache (Redis) is required in production so rate limit counters are
+# shared between workers; local memory is enough for development and tests.
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Process-local caches: dotted paths of callables that empty one. Query count
+# guards (core.tests.query_counts) call them so every run starts cold without
+# core importing the apps that own the caches.
+LOCAL_CACHE_RESET_HOOKS = [
+    "payments.utils.entitlements.clear_entitlement_cache",
+]
+
+# Channel layer for WebSocket fan-out (realtime app). The in-memory layer only
+# reaches consumers in the same process; every node must share Redis in
+# production. CHANNEL_LAYER_BACKEND overrides the choice.
+CHANNEL_LAYER_BACKEND = os.getenv(
+    "CHANNEL_LAYER_BACKEND",
+    (
+        "channels_redis.pubsub.RedisPubSubChannelLayer"
+        if REDIS_URL
+        else "realtime.layers.LocalChannelLayer"
+    ),
+)
+CHANNEL_LAYERS = {"default": {"BACKEND": CHANNEL_LAYER_BACKEND}}
+if CHANNEL_LAYER_BACKEND.startswith("channels_redis"):
+    CHANNEL_LAYERS["default"]["CONFIG"] = {"hosts": [REDIS_URL]}
+
+# Realtime chat limits (realtime.consumers)
+CHAT_MESSAGE_MAX_LENGTH = 2000
+CHAT_MESSAGE_RATE = os.getenv("CHAT_MESSAGE_RATE", "20/s")
+# Chat persistence batches (realtime.message_store): flush every N messages
+# or M milliseconds, whichever comes first
+CHAT_FLUSH_MAX_MESSAGES = int(os.getenv("CHAT_FLUSH_MAX_MESSAGES", "50"))
+CHAT_FLUSH_INTERVAL_MS = int(os.getenv("CHAT_FLUSH_INTERVAL_MS", "250"))
+CHAT_HISTORY_PAGE_SIZE = 50
+# Per-conversation seq counters (realtime.message_store.next_seq); must be
+# shared by every node (Redis) so messages are numbered once
+CHAT_SEQ_CACHE_ALIAS = "default"
+
+# Online presence (realtime.presence): a user is online while their sockets
+# heartbeat within PRESENCE_TTL_SECONDS. The in-memory store only sees this
+# process; multi-node deployments share the cache (Redis).
+PRESENCE_STORE = os.getenv(
+    "PRESENCE_STORE",
+    (
+        "realtime.presence.CachePresenceStore"
+        if REDIS_URL
+        else "realtime.presence.InMemoryPresenceStore"
+    ),
+)
+PRESENCE_CACHE_ALIAS = "default"
+PRESENCE_TTL_SECONDS = int(os.getenv("PRESENCE_TTL_SECONDS", "60"))
+
+# Background tasks (tasks app): a queue in the database, claimed by run_tasks
+# workers with SELECT ... FOR UPDATE SKIP LOCKED. TASK_BACKEND selects
+# another store implementing tasks.backends.BaseTaskBackend.
+TASK_BACKEND = os.getenv("TASK_BACKEND", "tasks.backends.DatabaseTaskBackend")
+TASK_DEFAULT_MAX_ATTEMPTS = 5
+# Retry n waits min(base * 2 ** (n - 1), max) seconds
+TASK_RETRY_BACKOFF_SECONDS = 10
+TASK_RETRY_BACKOFF_MAX_SECONDS = 3600
+# Running tasks older than this are assumed lost and queued again
+TASK_VISIBILITY_TIMEOUT_SECONDS = int(
+    os.getenv("TASK_VISIBILITY_TIMEOUT_SECONDS", "600")
+)
+TASK_RETENTION_DAYS = 7
+
+# Periodic jobs (tasks.services.scheduler): name -> task path and a cron
+# expression (minute hour day month weekday, in TIME_ZONE), optionally a
+# queue and "enabled". The run_scheduler leader enqueues due jobs for
+# run_tasks workers and records every run (admin: Periodic job runs).
+TASK_SCHEDULE = {
+    "rebuild_matches": {"task": "matches.tasks.rebuild_matches", "cron": "30 3 * * *"},
+    "prune_token_blacklist": {
+        "task": "accounts.tasks.prune_token_blacklist",
+        "cron": "0 4 * * *",
+    },
+    "delete_stale_unverified_accounts": {
+        "task": "accounts.tasks.delete_stale_unverified_accounts",
+        "cron": "15 4 * * *",
+    },
+    "process_feedback": {
+        "task": "feedback.tasks.process_feedback",
+        "cron": "*/5 * * * *",
+    },
+    # Catch-up for events no process_stripe_events --loop worker picked up
+    "process_stripe_events": {
+        "task": "payments.tasks.process_stripe_events",
+        "cron": "* * * * *",
+    },
+}
+# Unverified accounts that never logged in are deleted this long after their
+# verification email (accounts.services.account_cleanup)
+UNVERIFIED_ACCOUNT_RETENTION_DAYS = 30
+
+# Stripe webhooks (payments app): events are verified with the endpoint's
+# signing secret, stored, and applied by process_stripe_events in order per
+# customer. Signatures older than the tolerance are rejected as replays.
+STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET", "")
+STRIPE_WEBHOOK_TOLERANCE_SECONDS = 300
+# Failed events are retried with the TASK_RETRY_BACKOFF_* backoff
+STRIPE_EVENT_MAX_ATTEMPTS = 5
+
+# Entitlements (payments.utils.entitlements): users with a subscription in
+# one of these statuses are entitled (add "past_due" for a dunning grace).
+# Records are cached per process for the TTL; a change is published through
+# the shared cache and seen by every process within the check interval.
+ENTITLED_SUBSCRIPTION_STATUSES = ["active", "trialing"]
+ENTITLEMENT_CACHE_TTL_SECONDS = 300
+ENTITLEMENT_CACHE_MAX_ENTRIES = 100000
+ENTITLEMENT_VERSION_CHECK_SECONDS = 5
+# Tokens minted at sign in carry the entitlement; an active claim is trusted
+# without a lookup for this long after it was issued
+ENTITLEMENT_JWT_CLAIM = True
+ENTITLEMENT_CLAIM_MAX_AGE_SECONDS = 300
+
+# Rate limiting store (core.utils.rate_limit)
+RATE_LIMIT_STORE = os.getenv(
+    "RATE_LIMIT_STORE", "core.utils.rate_limit.CacheRateLimitStore"
+)
+RATE_LIMIT_CACHE_ALIAS = "default"
+
+# Seconds between checks for a newly activated compatibility weight version
+# (users.utils.compatibility_weights)
+COMPATIBILITY_WEIGHTS_CHECK_INTERVAL = int(
+    os.getenv("COMPATIBILITY_WEIGHTS_CHECK_INTERVAL", "30")
+)
+
+# Incremental preference exports (users export_preferences): each run re-reads
+# this many seconds before the previous watermark, so a row stamped before a
+# run but committed after it is not skipped. Consumers dedupe on
+# (id, updated_at)
+EXPORT_WATERMARK_OVERLAP_SECONDS = int(
+    os.getenv("EXPORT_WATERMARK_OVERLAP_SECONDS", "300")
+)
+
+# Incremental match updates (matches.services.match_updates)
+MATCH_UPDATE_ENGINE = os.getenv("MATCH_UPDATE_ENGINE", "exact")
+MATCHES_PER_USER = int(os.getenv("MATCHES_PER_USER", "20"))
+
+# Session events (sessions.serializers.SessionEventSerializer): how late a
+# client may report an event; older timestamps would land in rollup days
+# that dashboards already show
+SESSION_EVENT_MAX_DELAY_SECONDS = int(
+    os.getenv("SESSION_EVENT_MAX_DELAY_SECONDS", "300")
+)
+
+# Rating aggregation (feedback.services.feedback_aggregation): friends' mean
+# ratings are shrunk towards the global mean by this many pseudo-ratings, and
+# every score is refreshed once the global mean drifts by the tolerance
+FEEDBACK_PRIOR_WEIGHT = float(os.getenv("FEEDBACK_PRIOR_WEIGHT", "5"))
+FEEDBACK_PRIOR_TOLERANCE = 0.05
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -174,6 +344,17 @@ REST_FRAMEWORK = {
     "DEFAULT_PARSER_CLASSES": [
         "rest_framework.parsers.JSONParser",
     ],
+    # Token bucket rates for accounts.utils.throttling ("<scope>_<ip|account>")
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": "30/min",
+        "login_account": "10/min",
+        "signup_ip": "20/hour",
+        "signup_account": "5/hour",
+        "resend_verification_ip": "10/hour",
+        "resend_verification_account": "3/hour",
+        "password_reset_ip": "10/hour",
+        "password_reset_account": "3/hour",
+    },
 }
 
 # JWT Configuration
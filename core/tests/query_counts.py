@@ -0,0 +1,122 @@
+# Query count regression harness
+import json
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.module_loading import import_string
+
+SNAPSHOT_PATH = Path(__file__).parent / "snapshots" / "query_counts.json"
+UPDATE_SNAPSHOT_ENV = "UPDATE_QUERY_SNAPSHOTS"
+
+
+def reset_local_caches():
+    """Empty process-local caches through the LOCAL_CACHE_RESET_HOOKS callables"""
+    for path in getattr(settings, "LOCAL_CACHE_RESET_HOOKS", []):
+        import_string(path)()
+
+
+def load_snapshot() -> dict:
+    if not SNAPSHOT_PATH.exists():
+        return {}
+    with open(SNAPSHOT_PATH, encoding="utf-8") as file_obj:
+        return json.load(file_obj)
+
+
+def save_snapshot(counts: dict):
+    snapshot = load_snapshot()
+    snapshot.update(counts)
+    SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(SNAPSHOT_PATH, "w", encoding="utf-8") as file_obj:
+        json.dump(snapshot, file_obj, indent=2, sort_keys=True)
+        file_obj.write("\n")
+
+
+class QueryCountTestCase(TestCase):
+    """
+    Base class for query count guards.
+
+    Each check builds a dataset of N objects, performs one request and
+    records the exact queries it issued, for every N in `sizes`.
+
+    Business logic:
+        1. Fail when the query count at the largest size is higher than at
+           the smallest one (an N+1 or lazy load per row).
+        2. Fail when the counts differ from the committed snapshot in
+           core/tests/snapshots/query_counts.json.
+
+    Run with UPDATE_QUERY_SNAPSHOTS=1 to rewrite the snapshot after an
+    intentional change.
+    """
+
+    sizes = (1, 100)
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.snapshot = load_snapshot()
+        cls.recorded = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.environ.get(UPDATE_SNAPSHOT_ENV) and cls.recorded:
+            save_snapshot(cls.recorded)
+        super().tearDownClass()
+
+    def capture(self, build, perform):
+        """
+        Run `perform(build(size))` for every size inside a rolled back savepoint.
+
+        Returns:
+            dict: size -> list of executed SQL statements
+        """
+        captured = {}
+        for size in self.sizes:
+            savepoint = transaction.savepoint()
+            try:
+                context = build(size)
+                ContentType.objects.clear_cache()
+                reset_local_caches()
+                cache.clear()
+                with CaptureQueriesContext(connection) as queries:
+                    response = perform(context)
+                self.assertLess(
+                    getattr(response, "status_code", 200),
+                    500,
+                    f"request failed at size {size}",
+                )
+                captured[size] = [query["sql"] for query in queries.captured_queries]
+            finally:
+                transaction.savepoint_rollback(savepoint)
+        return captured
+
+    def assertConstantQueries(self, name, build, perform):
+        captured = self.capture(build, perform)
+        counts = {str(size): len(sql) for size, sql in captured.items()}
+        self.recorded[name] = counts
+
+        smallest, largest = min(self.sizes), max(self.sizes)
+        if len(captured[largest]) > len(captured[smallest]):
+            self.fail(
+                f"{name}: query count grows with N "
+                f"({len(captured[smallest])} at N={smallest}, "
+                f"{len(captured[largest])} at N={largest})\n"
+                + "\n".join(captured[largest])
+            )
+
+        if os.environ.get(UPDATE_SNAPSHOT_ENV):
+            return
+        expected = self.snapshot.get(name)
+        if expected is None:
+            self.fail(f"{name}: no snapshot, run with {UPDATE_SNAPSHOT_ENV}=1")
+        if counts != expected:
+            self.fail(
+                f"{name}: query counts {counts} differ from snapshot {expected}, "
+                f"run with {UPDATE_SNAPSHOT_ENV}=1 if intended\n"
+                + "\n".join(captured[largest])
+            )
@@ -0,0 +1,88 @@
+# Test the benchmark runner helpers
+import io
+
+from django.test import TestCase, TransactionTestCase
+
+from core.benchmarks.inserts import measure_inserts
+from core.benchmarks.runner import (
+    BenchmarkRunner,
+    compare_to_baseline,
+    percentile,
+    summarize,
+)
+
+
+def _report(p95_ms, queries):
+    return {
+        "results": {"preferences_get": {"100": {"p95_ms": p95_ms, "queries": queries}}}
+    }
+
+
+class TestBenchmarkHelpers(TestCase):
+    def test_percentile(self):
+        """Test nearest-rank percentiles on a sorted list."""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_summarize(self):
+        """Test the summary keeps the worst query count and distinct statuses."""
+        summary = summarize([3.0, 1.0, 2.0], [4, 5, 4], [200, 200, 429])
+        self.assertEqual(summary["iterations"], 3)
+        self.assertEqual(summary["p50_ms"], 2.0)
+        self.assertEqual(summary["queries"], 5)
+        self.assertEqual(summary["status_codes"], [200, 429])
+
+    def test_compare_flags_latency_and_query_regressions(self):
+        """Test slower p95 and extra queries are both reported."""
+        regressions = compare_to_baseline(_report(20.0, 6), _report(10.0, 5))
+        self.assertEqual(len(regressions), 2)
+
+    def test_compare_ignores_noise(self):
+        """Test small or sub-millisecond changes are not regressions."""
+        self.assertEqual(compare_to_baseline(_report(11.0, 5), _report(10.0, 5)), [])
+        self.assertEqual(compare_to_baseline(_report(0.9, 5), _report(0.2, 5)), [])
+
+
+class TestBenchmarkRunner(TestCase):
+    def test_run_small_dataset(self):
+        """Test a tiny run seeds data and records every requested scenario."""
+        runner = BenchmarkRunner(
+            [5],
+            iterations=3,
+            scenario_names=["preferences_get", "compatibility_score"],
+            stdout=io.StringIO(),
+        )
+        report = runner.run()
+
+        self.assertEqual(
+            set(report["results"]), {"preferences_get", "compatibility_score"}
+        )
+        result = report["results"]["preferences_get"]["5"]
+        self.assertEqual(result["iterations"], 3)
+        self.assertEqual(result["status_codes"], [200])
+        self.assertGreater(result["queries"], 0)
+
+    def test_throttled_logins_are_rejected_without_queries(self):
+        """Test the throttled login scenario measures 429s that skip the database."""
+        runner = BenchmarkRunner(
+            [5], iterations=3, scenario_names=["login_throttled"], stdout=io.StringIO()
+        )
+
+        result = runner.run()["results"]["login_throttled"]["5"]
+
+        self.assertEqual(result["status_codes"], [429])
+        self.assertEqual(result["queries"], 0)
+
+
+class TestInsertBenchmark(TransactionTestCase):
+    def test_measure_inserts(self):
+        """Test both base classes are measured and the slim table is narrower."""
+        results = measure_inserts(rows=50, batch_size=20)
+
+        base, slim = results["base_model"], results["slim_base_model"]
+        self.assertLess(slim["columns"], base["columns"])
+        self.assertLess(slim["constraints"], base["constraints"])
+        self.assertGreater(slim["bulk_rows_per_second"], 0)
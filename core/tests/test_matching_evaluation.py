@@ -0,0 +1,91 @@
+# Test the offline matching evaluation harness and engines
+import io
+import shutil
+import tempfile
+from unittest import skipIf
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.benchmarks.matching import (
+    MatchingEvaluation,
+    exported_candidates,
+    kendall_tau,
+    synthetic_candidates,
+    topk_agreement,
+)
+from users.models import UserCompatibilityPreferences, UserPreferences, UserProfile
+from users.utils import matching_engines
+from users.utils.compatibility_weights import weight_registry
+
+
+class TestMatchingMetrics(TestCase):
+    def test_topk_agreement_accepts_ties(self):
+        """Test another member of a tie at the K-th score counts as a hit."""
+        reference = [(1, 90.0), (2, 80.0)]
+        scores = {1: 90.0, 2: 80.0, 3: 80.0, 4: 10.0}
+
+        self.assertEqual(topk_agreement(reference, [(1, 90.0), (3, 80.0)], scores), 1)
+        self.assertEqual(topk_agreement(reference, [(1, 90.0), (4, 10.0)], scores), 0.5)
+
+    def test_kendall_tau(self):
+        """Test identical, reversed and tied orders."""
+        self.assertEqual(kendall_tau([3, 2, 1], [30, 20, 10]), 1.0)
+        self.assertEqual(kendall_tau([3, 2, 1], [10, 20, 30]), -1.0)
+        self.assertEqual(kendall_tau([1, 1], [5, 5]), 1.0)
+
+
+class TestMatchingEvaluation(TestCase):
+    def setUp(self):
+        cache.clear()
+        weight_registry.invalidate()
+        self.addCleanup(cache.clear)
+        self.candidates = synthetic_candidates(150, seed=3)
+
+    def test_reference_engines_agree_with_pairwise(self):
+        """Test every engine is measured and exact re-ranking never drifts."""
+        report = MatchingEvaluation(
+            self.candidates, queries=5, k=5, stdout=io.StringIO()
+        ).run()
+
+        self.assertEqual(report["candidates"], 150)
+        self.assertEqual(report["engines"]["pairwise"]["topk_agreement"], 1.0)
+        for name in ["prefilter", "ann"]:
+            result = report["engines"][name]
+            self.assertLessEqual(result["mean_scored"], 149)
+            self.assertEqual(result["kendall_tau"], 1.0)
+            self.assertIn("p95_ms", result)
+
+    @skipIf(matching_engines.numpy is None, "numpy is not installed")
+    def test_vectorized_matches_pairwise(self):
+        """Test the numpy engine returns exactly the reference top-K."""
+        pairwise = matching_engines.PairwiseEngine()
+        vectorized = matching_engines.VectorizedEngine()
+        pairwise.build(self.candidates)
+        vectorized.build(self.candidates)
+
+        for query in self.candidates[:10]:
+            self.assertEqual(
+                vectorized.top_k(query, 10), pairwise.top_k(query, 10), query.id
+            )
+
+    def test_replays_exported_data(self):
+        """Test candidates load from an export_preferences JSONL export."""
+        for i, hobbies in enumerate([["reading"], ["reading", "music"]]):
+            user = User.objects.create_user(f"member{i}", f"member{i}@example.com")
+            profile = UserProfile.objects.create(user=user)
+            UserPreferences.objects.create(profile=profile, top_hobbies=hobbies)
+            UserCompatibilityPreferences.objects.create(
+                profile=profile, hobby_importance=9
+            )
+        output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, output_dir)
+        call_command("export_preferences", output_dir=output_dir, stdout=io.StringIO())
+
+        candidates = exported_candidates(output_dir)
+
+        self.assertEqual(len(candidates), 2)
+        self.assertEqual(candidates[1].preferences.top_hobbies, ["reading", "music"])
+        self.assertEqual(candidates[0].compatibility.hobby_importance, 9)
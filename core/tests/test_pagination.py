@@ -0,0 +1,27 @@
+# Test the estimated count paginator
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from core.utils.pagination import EstimatedCountPaginator
+from users.models import UserProfile
+
+
+class TestEstimatedCountPaginator(TestCase):
+    def test_exact_count_outside_postgresql(self):
+        """Test SQLite and plain lists fall back to the exact count."""
+        for i in range(3):
+            User.objects.create_user(f"member{i}")
+
+        paginator = EstimatedCountPaginator(User.objects.order_by("id"), 2)
+        self.assertEqual(paginator.count, 3)
+        self.assertEqual(paginator.num_pages, 2)
+        self.assertEqual(EstimatedCountPaginator([1, 2, 3], 2).count, 3)
+
+    def test_soft_delete_filter_counts_as_unfiltered(self):
+        """Test the default manager's filter keeps the reltuples fast path."""
+        is_unfiltered = EstimatedCountPaginator._is_unfiltered
+
+        self.assertTrue(is_unfiltered(User.objects.all()))
+        self.assertTrue(is_unfiltered(UserProfile.objects.order_by("-id")))
+        self.assertFalse(is_unfiltered(UserProfile.objects.filter(location="Kigali")))
+        self.assertFalse(is_unfiltered(UserProfile.all_objects.filter(is_deleted=True)))
@@ -0,0 +1,681 @@
+# Query count guards for every endpoint and admin changelist
+import datetime
+import io
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import URLResolver, get_resolver, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.utils.generate_token import TokenGenerator
+from core.tests.query_counts import QueryCountTestCase, load_snapshot
+from feedback.models import FeedbackSubmission
+from matches.models import UserMatch
+from payments.fake_stripe import FakeStripeEvents, signed_delivery
+from payments.models import StripeCustomer, StripeEvent, Subscription
+from realtime.models import ChatMessage, Conversation
+from sessions.models import (
+    AvailabilitySlot,
+    ChatSession,
+    DailySessionStats,
+    SessionAttendee,
+    WeeklySessionStats,
+)
+from tasks.models import PeriodicJob, PeriodicJobRun
+from users.models import CompatibilityWeightProfile, UserPreferences
+
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+PREFIX = "qc_user_"
+PASSWORD = "password123"
+STRIPE_SECRET = "whsec_query_counts"
+# Fixed times, far from the real clock, for scheduling data
+MONDAY = datetime.datetime(2030, 1, 7, tzinfo=datetime.timezone.utc)
+
+
+def seed(size):
+    """Seed `size` users with profiles and preferences, return the first one."""
+    call_command(
+        "seed_scale_data",
+        users=size,
+        prefix=PREFIX,
+        password=PASSWORD,
+        preferences_ratio=1.0,
+        stdout=io.StringIO(),
+    )
+    return User.objects.get(username=f"{PREFIX}0")
+
+
+def unverified(size):
+    user = seed(size)
+    profile = user.userprofile
+    profile.email_verified = False
+    profile.email_verification_token = TokenGenerator.generate_email_verification_token(
+        user.id
+    )
+    profile.save()
+    return user
+
+
+def without_preferences(size):
+    user = seed(size)
+    UserPreferences.objects.filter(profile__user=user).delete()
+    return user
+
+
+def at(hours):
+    return MONDAY + datetime.timedelta(hours=hours)
+
+
+def _session(organizer, attendees, starts_at, ends_at):
+    session = ChatSession.objects.create(
+        organizer=organizer, starts_at=starts_at, ends_at=ends_at
+    )
+    SessionAttendee.objects.bulk_create(
+        SessionAttendee(
+            session=session, user=user, starts_at=starts_at, ends_at=ends_at
+        )
+        for user in attendees
+    )
+    return session
+
+
+def scheduled(size):
+    """
+    Two members, each with `size` half hour availability slots and `size`
+    half hour sessions together in the first week, and `size` days of stats.
+    """
+    me = seed(size)
+    friend = User.objects.create_user("qc_friend", "qc_friend@example.com")
+    AvailabilitySlot.objects.bulk_create(
+        AvailabilitySlot(user=user, starts_at=at(i), ends_at=at(i + 0.5))
+        for i in range(size)
+        for user in (me, friend)
+    )
+    sessions = [_session(me, [me, friend], at(i + 0.5), at(i + 1)) for i in range(size)]
+    DailySessionStats.objects.bulk_create(
+        DailySessionStats(
+            user=me,
+            day=MONDAY.date() + datetime.timedelta(days=i),
+            session_kind="text",
+            sessions_started=1,
+        )
+        for i in range(size)
+    )
+    WeeklySessionStats.objects.bulk_create(
+        WeeklySessionStats(
+            user=me,
+            week_start=MONDAY.date() + datetime.timedelta(weeks=i),
+            session_kind=kind,
+            sessions_started=1,
+        )
+        for i in range(min(size, 52))
+        for kind in ("text", "voice")
+    )
+    return SimpleNamespace(me=me, friend=friend, session=sessions[0])
+
+
+def in_progress(size):
+    """A session happening now, after `size` earlier ones"""
+    context = scheduled(size)
+    now = timezone.now()
+    context.session = _session(
+        context.me,
+        [context.me, context.friend],
+        now - datetime.timedelta(minutes=5),
+        now + datetime.timedelta(minutes=25),
+    )
+    return context
+
+
+def matched(size):
+    """The first seeded member matched with every other one"""
+    me = seed(size + 1)
+    UserMatch.objects.bulk_create(
+        UserMatch(
+            profile=me.userprofile,
+            candidate=user.userprofile,
+            score=i,
+            weights_version="qc",
+        )
+        for i, user in enumerate(
+            User.objects.filter(username__startswith=PREFIX)
+            .exclude(id=me.id)
+            .select_related("userprofile")
+        )
+    )
+    return me
+
+
+def chatted(size):
+    """A conversation of two members holding `size` messages"""
+    context = scheduled(1)
+    conversation = Conversation.objects.create(last_seq=size)
+    conversation.participants.add(context.me, context.friend)
+    ChatMessage.objects.bulk_create(
+        ChatMessage(
+            conversation=conversation,
+            seq=seq,
+            sender=context.me,
+            body=f"message {seq}",
+            sent_at=at(0),
+        )
+        for seq in range(1, size + 1)
+    )
+    context.conversation = conversation
+    return context
+
+
+def subscribed(size):
+    """`size` members, each a Stripe customer with a subscription and an event"""
+    me = seed(size)
+    fake = FakeStripeEvents(customers=size, prefix="qc")
+    users = list(User.objects.filter(username__startswith=PREFIX).order_by("id"))
+    StripeCustomer.objects.bulk_create(
+        StripeCustomer(customer_id=fake.customer_id(i), user=user)
+        for i, user in enumerate(users)
+    )
+    Subscription.objects.bulk_create(
+        Subscription(
+            subscription_id=fake.subscription_id(i),
+            customer_id=fake.customer_id(i),
+            user=user,
+            status="active",
+            price_id="price_plus",
+            current_period_end=timezone.now() + datetime.timedelta(days=30),
+            last_event_at=timezone.now(),
+        )
+        for i, user in enumerate(users)
+    )
+    StripeEvent.objects.bulk_create(
+        StripeEvent(
+            event_id=event["id"],
+            type=event["type"],
+            ordering_key=event["data"]["object"]["id"],
+            stripe_created=timezone.now(),
+            payload=event,
+        )
+        for event in (fake.next_event(i) for i in range(size))
+    )
+    return SimpleNamespace(me=me, fake=fake)
+
+
+def scheduled_jobs(size):
+    seed(1)
+    jobs = PeriodicJob.objects.bulk_create(
+        PeriodicJob(name=f"qc_job_{i}", task="qc.task", cron="* * * * *")
+        for i in range(size)
+    )
+    PeriodicJobRun.objects.bulk_create(
+        PeriodicJobRun(job=job, started_at=timezone.now(), status="succeeded")
+        for job in jobs
+    )
+
+
+def weight_profiles(size):
+    seed(1)
+    CompatibilityWeightProfile.objects.bulk_create(
+        CompatibilityWeightProfile(version=f"qc_{i}", weights={}) for i in range(size)
+    )
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+@patch("core.utils.email_client.EmailClient.send_email", return_value=True)
+class TestAccountsQueryCounts(QueryCountTestCase):
+    """Query counts of the accounts endpoints with N users in the database."""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def _authenticated(self, user):
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_login(self, send_email):
+        """Test login issues a constant number of queries."""
+        self.assertConstantQueries(
+            "accounts.login",
+            seed,
+            lambda user: self.client.post(
+                "/api/v1/accounts/login/",
+                {"method": "password", "username": user.username, "password": PASSWORD},
+                format="json",
+            ),
+        )
+
+    def test_sign_up(self, send_email):
+        """Test sign up issues a constant number of queries."""
+        self.assertConstantQueries(
+            "accounts.sign_up",
+            seed,
+            lambda user: self.client.post(
+                "/api/v1/accounts/sign-up/",
+                {
+                    "method": "password",
+                    "email": "new.member@example.com",
+                    "password": "New-member-123",
+                    "first_name": "New",
+                    "last_name": "Member",
+                },
+                format="json",
+            ),
+        )
+
+    def test_verify_email(self, send_email):
+        """Test email verification issues a constant number of queries."""
+        self.assertConstantQueries(
+            "accounts.verify_email",
+            unverified,
+            lambda user: self.client.post(
+                "/api/v1/accounts/verify-email/",
+                {"token": user.userprofile.email_verification_token},
+                format="json",
+            ),
+        )
+
+    def test_resend_verification(self, send_email):
+        """Test resending the verification email issues a constant number of queries."""
+
+        def perform(user):
+            self._authenticated(user)
+            return self.client.post("/api/v1/accounts/resend-verification/")
+
+        self.assertConstantQueries("accounts.resend_verification", unverified, perform)
+
+    def test_password_reset_request(self, send_email):
+        """Test password reset requests issue a constant number of queries."""
+        self.assertConstantQueries(
+            "accounts.password_reset_request",
+            seed,
+            lambda user: self.client.post(
+                "/api/v1/accounts/password-reset/",
+                {"email": user.email},
+                format="json",
+            ),
+        )
+
+    def test_password_reset_confirm(self, send_email):
+        """Test password reset confirmation issues a constant number of queries."""
+        self.assertConstantQueries(
+            "accounts.password_reset_confirm",
+            seed,
+            lambda user: self.client.post(
+                "/api/v1/accounts/password-reset-confirm/",
+                {
+                    "token": TokenGenerator.generate_password_reset_token(user.id),
+                    "new_password": "Reset-password-123",
+                },
+                format="json",
+            ),
+        )
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class TestPreferencesQueryCounts(QueryCountTestCase):
+    """Query counts of the preferences endpoints with N users in the database."""
+
+    url = "/api/v1/users/preferences/"
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def _request(self, method, path="", data=None, authenticated=True):
+        def perform(user):
+            if authenticated:
+                token = RefreshToken.for_user(user).access_token
+                self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+            return getattr(self.client, method)(
+                f"{self.url}{path}", data, format="json"
+            )
+
+        return perform
+
+    def test_get(self):
+        """Test reading preferences issues a constant number of queries."""
+        self.assertConstantQueries("users.preferences_get", seed, self._request("get"))
+
+    def test_create(self):
+        """Test creating preferences issues a constant number of queries."""
+        self.assertConstantQueries(
+            "users.preferences_create",
+            without_preferences,
+            self._request("post", data={"age_range": "25-34"}),
+        )
+
+    def test_update(self):
+        """Test full and partial updates issue a constant number of queries."""
+        data = {"age_range": "25-34", "top_hobbies": ["reading"]}
+        self.assertConstantQueries(
+            "users.preferences_put", seed, self._request("put", data=data)
+        )
+        self.assertConstantQueries(
+            "users.preferences_patch",
+            seed,
+            self._request("patch", data={"current_location": "Kigali"}),
+        )
+
+    def test_delete(self):
+        """Test deleting preferences issues a constant number of queries."""
+        self.assertConstantQueries(
+            "users.preferences_delete", seed, self._request("delete")
+        )
+
+    def test_status(self):
+        """Test the completion status issues a constant number of queries."""
+        self.assertConstantQueries(
+            "users.preferences_status", seed, self._request("get", "status/")
+        )
+
+    def test_section_update(self):
+        """Test section updates issue a constant number of queries."""
+        self.assertConstantQueries(
+            "users.preferences_section_update",
+            seed,
+            self._request(
+                "post",
+                "section/interests/",
+                {"top_hobbies": ["music"], "free_day_preference": "cozy_at_home"},
+            ),
+        )
+
+    def test_public_endpoints(self):
+        """Test choices, sections and validation do not touch the database."""
+        for name, perform in [
+            ("choices", self._request("get", "choices/", authenticated=False)),
+            ("sections", self._request("get", "sections/", authenticated=False)),
+            (
+                "validate",
+                self._request(
+                    "post", "validate/", {"age_range": "25-34"}, authenticated=False
+                ),
+            ),
+        ]:
+            self.assertConstantQueries(f"users.preferences_{name}", seed, perform)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class TestAdminChangelistQueryCounts(QueryCountTestCase):
+    """Query counts of the admin changelists listing N rows."""
+
+    def _changelist(self, model_name, app_label="users", rows=seed):
+        def build(size):
+            rows(size)
+            self.client.force_login(
+                User.objects.create_superuser(
+                    "qc_admin", "qc_admin@example.com", PASSWORD
+                )
+            )
+
+        def perform(context):
+            return self.client.get(
+                reverse(f"admin:{app_label}_{model_name}_changelist")
+            )
+
+        return build, perform
+
+    def test_user_profile_changelist(self):
+        """Test the profile changelist does not load users row by row."""
+        self.assertConstantQueries(
+            "admin.userprofile_changelist", *self._changelist("userprofile")
+        )
+
+    def test_user_preferences_changelist(self):
+        """Test the preferences changelist does not load profiles row by row."""
+        self.assertConstantQueries(
+            "admin.userpreferences_changelist", *self._changelist("userpreferences")
+        )
+
+    def test_compatibility_preferences_changelist(self):
+        """Test the compatibility changelist does not load profiles row by row."""
+        self.assertConstantQueries(
+            "admin.usercompatibilitypreferences_changelist",
+            *self._changelist("usercompatibilitypreferences"),
+        )
+
+    def test_weight_profile_changelist(self):
+        """Test the weight profile changelist issues a constant number of queries."""
+        self.assertConstantQueries(
+            "admin.compatibilityweightprofile_changelist",
+            *self._changelist("compatibilityweightprofile", rows=weight_profiles),
+        )
+
+    def test_payments_changelists(self):
+        """Test the Stripe changelists do not load users row by row."""
+        for model_name in ["stripeevent", "stripecustomer", "subscription"]:
+            self.assertConstantQueries(
+                f"admin.{model_name}_changelist",
+                *self._changelist(model_name, "payments", subscribed),
+            )
+
+    def test_tasks_changelists(self):
+        """Test the periodic job changelists do not load jobs row by row."""
+        for model_name in ["periodicjob", "periodicjobrun"]:
+            self.assertConstantQueries(
+                f"admin.{model_name}_changelist",
+                *self._changelist(model_name, "tasks", scheduled_jobs),
+            )
+
+
+@override_settings(
+    PASSWORD_HASHERS=FAST_HASHERS,
+    PRESENCE_STORE="realtime.presence.InMemoryPresenceStore",
+    STRIPE_WEBHOOK_SECRET=STRIPE_SECRET,
+)
+class TestAppEndpointQueryCounts(QueryCountTestCase):
+    """Query counts of the matches, sessions, feedback, chat and payments APIs."""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def _as(self, user):
+        self.client.force_authenticate(user)
+
+    def test_top_matches(self):
+        """Test top matches issue a constant number of queries."""
+
+        def perform(me):
+            self._as(me)
+            return self.client.get(
+                reverse("top_matches"), {"limit": 50, "online_first": "true"}
+            )
+
+        self.assertConstantQueries("matches.top_matches", matched, perform)
+
+    def test_availability(self):
+        """Test adding and removing availability issue a constant number of queries."""
+
+        def add(context):
+            self._as(context.me)
+            return self.client.post(
+                reverse("availability"),
+                {
+                    "slots": [
+                        {
+                            "starts_at": at(24 * 10).isoformat(),
+                            "ends_at": at(24 * 10 + 2).isoformat(),
+                        }
+                    ]
+                },
+                format="json",
+            )
+
+        def remove(context):
+            self._as(context.me)
+            slot = AvailabilitySlot.objects.filter(user=context.me).first()
+            return self.client.delete(reverse("availability_detail", args=[slot.id]))
+
+        self.assertConstantQueries("sessions.availability", scheduled, add)
+        self.assertConstantQueries("sessions.availability_detail", scheduled, remove)
+
+    def test_free_slots(self):
+        """Test the free slot search reads every member's week at once."""
+
+        def perform(context):
+            self._as(context.me)
+            return self.client.get(
+                reverse("free_slots"),
+                {
+                    "user_ids": f"{context.me.id},{context.friend.id}",
+                    "starts_at": at(0).isoformat(),
+                    "ends_at": at(24 * 7).isoformat(),
+                    "mutual": "true",
+                },
+            )
+
+        self.assertConstantQueries("sessions.free_slots", scheduled, perform)
+
+    def test_book_and_cancel_session(self):
+        """Test booking and cancelling issue a constant number of queries."""
+
+        def book(context):
+            self._as(context.me)
+            return self.client.post(
+                reverse("book_session"),
+                {
+                    "participant_ids": [context.friend.id],
+                    "kind": "video",
+                    "starts_at": at(24 * 10).isoformat(),
+                    "ends_at": at(24 * 10 + 1).isoformat(),
+                },
+                format="json",
+            )
+
+        def cancel(context):
+            self._as(context.me)
+            return self.client.post(
+                reverse("cancel_session", args=[context.session.id])
+            )
+
+        self.assertConstantQueries("sessions.book_session", scheduled, book)
+        self.assertConstantQueries("sessions.cancel_session", scheduled, cancel)
+
+    def test_session_events(self):
+        """Test logging a session event issues a constant number of queries."""
+
+        def perform(context):
+            self._as(context.friend)
+            return self.client.post(
+                reverse("session_events", args=[context.session.id]),
+                {"kind": "started", "occurred_at": timezone.now().isoformat()},
+                format="json",
+            )
+
+        self.assertConstantQueries("sessions.session_events", in_progress, perform)
+
+    def test_session_stats(self):
+        """Test the dashboards read their rollups in a constant number of queries."""
+        for period in ["daily", "weekly"]:
+
+            def perform(context, period=period):
+                self._as(context.me)
+                return self.client.get(
+                    reverse(f"session_stats_{period}"),
+                    {"start": "2030-01-01", "end": "2030-12-31"},
+                )
+
+            self.assertConstantQueries(
+                f"sessions.session_stats_{period}", scheduled, perform
+            )
+
+    def test_submit_feedback(self):
+        """Test a feedback submission stays a constant number of queries."""
+
+        def perform(context):
+            self._as(context.me)
+            return self.client.post(
+                reverse("submit_feedback"),
+                {
+                    "subject_id": context.friend.id,
+                    "session_id": context.session.id,
+                    "rating": 5,
+                },
+                format="json",
+            )
+
+        self.assertConstantQueries("feedback.submit_feedback", scheduled, perform)
+
+    def test_conversation_messages(self):
+        """Test a history page issues a constant number of queries."""
+
+        def perform(context):
+            self._as(context.me)
+            return self.client.get(
+                reverse("conversation_messages", args=[context.conversation.id])
+            )
+
+        self.assertConstantQueries("realtime.conversation_messages", chatted, perform)
+
+    def test_entitlement(self):
+        """Test an entitlement lookup issues a constant number of queries."""
+
+        def perform(context):
+            self._as(context.me)
+            return self.client.get(reverse("entitlement"))
+
+        self.assertConstantQueries("payments.entitlement", subscribed, perform)
+
+    def test_stripe_webhook(self):
+        """Test storing a webhook delivery issues a constant number of queries."""
+
+        def perform(context):
+            body, signature = signed_delivery(context.fake.next_event(0), STRIPE_SECRET)
+            return self.client.post(
+                reverse("stripe_webhook"),
+                data=body,
+                content_type="application/json",
+                HTTP_STRIPE_SIGNATURE=signature,
+            )
+
+        self.assertConstantQueries("payments.stripe_webhook", subscribed, perform)
+
+
+def _routes(patterns):
+    """(app, url name) of every API route; the admin is covered by changelists"""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.app_name != "admin":
+                yield from _routes(pattern.url_patterns)
+        else:
+            yield pattern.callback.__module__.split(".")[0], pattern.name
+
+
+def _project_models():
+    base_dir = Path(settings.BASE_DIR)
+    for model in admin.site._registry:
+        path = Path(model._meta.app_config.path)
+        if path.is_relative_to(base_dir) and "site-packages" not in path.parts:
+            yield model
+
+
+class TestQueryCountCoverage(TestCase):
+    """Every route and project changelist must have a query count snapshot."""
+
+    def test_every_route_has_a_snapshot(self):
+        """Test each API route is snapshotted as <app>.<url name>[_<variant>]."""
+        snapshot = load_snapshot()
+        missing = [
+            f"{app}.{name}"
+            for app, name in _routes(get_resolver().url_patterns)
+            if f"{app}.{name}" not in snapshot
+            and not any(key.startswith(f"{app}.{name}_") for key in snapshot)
+        ]
+
+        self.assertEqual(missing, [], "routes without a query count guard")
+
+    def test_every_changelist_has_a_snapshot(self):
+        """Test each admin changelist of a project app is snapshotted."""
+        snapshot = load_snapshot()
+        missing = [
+            f"admin.{model._meta.model_name}_changelist"
+            for model in _project_models()
+            if f"admin.{model._meta.model_name}_changelist" not in snapshot
+        ]
+
+        self.assertEqual(missing, [], "changelists without a query count guard")
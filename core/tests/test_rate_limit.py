@@ -0,0 +1,103 @@
+# Test token bucket rate limiting and its stores
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from core.utils.rate_limit import (
+    CacheRateLimitStore,
+    InMemoryRateLimitStore,
+    consume_token,
+    get_rate_limit_store,
+    parse_rate,
+)
+
+
+class TestParseRate(SimpleTestCase):
+    def test_parse_rate_success(self):
+        """Test rate strings are converted to capacity and refill per second."""
+        self.assertEqual(parse_rate("60/min"), (60, 1.0))
+        self.assertEqual(parse_rate("10/s"), (10, 10.0))
+        self.assertEqual(parse_rate("24/day"), (24, 24 / 86400))
+
+    def test_parse_rate_invalid_period(self):
+        """Test unknown periods are rejected."""
+        with self.assertRaises(KeyError):
+            parse_rate("5/week")
+
+
+class TestConsumeToken(SimpleTestCase):
+    def test_consume_until_empty(self):
+        """Test a full bucket allows `capacity` requests then rejects."""
+        state = None
+        for _ in range(3):
+            state, result = consume_token(state, 3, 1.0, now=100.0)
+            self.assertTrue(result.allowed)
+
+        state, result = consume_token(state, 3, 1.0, now=100.0)
+        self.assertFalse(result.allowed)
+        self.assertAlmostEqual(result.retry_after, 1.0)
+
+    def test_consume_refills_over_time(self):
+        """Test tokens come back at the refill rate without exceeding capacity."""
+        state = (0.0, 100.0)
+        state, result = consume_token(state, 3, 1.0, now=101.5)
+        self.assertTrue(result.allowed)
+        self.assertAlmostEqual(result.remaining, 0.5)
+
+        state, result = consume_token(state, 3, 1.0, now=1000.0)
+        self.assertTrue(result.allowed)
+        self.assertAlmostEqual(result.remaining, 2.0)
+
+
+class TestRateLimitStores(SimpleTestCase):
+    def _assert_store_limits(self, store):
+        store.reset()
+        results = [store.consume("k", 2, 0.001).allowed for _ in range(3)]
+        self.assertEqual(results, [True, True, False])
+
+        # Keys are isolated from each other
+        self.assertTrue(store.consume("other", 2, 0.001).allowed)
+
+        store.reset("k")
+        self.assertTrue(store.consume("k", 2, 0.001).allowed)
+
+    def test_in_memory_store(self):
+        """Test the in-process store enforces the bucket per key."""
+        self._assert_store_limits(InMemoryRateLimitStore())
+
+    def test_cache_store(self):
+        """Test the cache backed store enforces the bucket per key."""
+        self._assert_store_limits(CacheRateLimitStore())
+
+    def test_cache_store_is_atomic_under_concurrency(self):
+        """Test concurrent hits on one key never admit more than capacity."""
+        store = CacheRateLimitStore()
+        store.reset()
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(
+                pool.map(lambda _: store.consume("burst", 10, 0.001), range(200))
+            )
+
+        self.assertEqual(sum(result.allowed for result in results), 10)
+        rejected = next(result for result in results if not result.allowed)
+        self.assertGreater(rejected.retry_after, 0)
+
+    def test_cache_store_reset_keeps_other_cache_keys(self):
+        """Test resetting every bucket leaves the rest of the shared cache alone."""
+        store = CacheRateLimitStore()
+        store.consume("k", 1, 0.001)
+        cache.set("presence:unrelated", "kept")
+
+        store.reset()
+
+        self.assertEqual(cache.get("presence:unrelated"), "kept")
+        self.assertTrue(store.consume("k", 1, 0.001).allowed)
+        cache.delete("presence:unrelated")
+
+    @override_settings(RATE_LIMIT_STORE="core.utils.rate_limit.InMemoryRateLimitStore")
+    def test_get_rate_limit_store_uses_setting(self):
+        """Test the configured store is loaded once and reused."""
+        store = get_rate_limit_store()
+        self.assertIsInstance(store, InMemoryRateLimitStore)
+        self.assertIs(store, get_rate_limit_store())
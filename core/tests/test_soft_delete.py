@@ -0,0 +1,111 @@
+# Test the soft delete aware BaseModel managers
+import datetime
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from sessions.models import AvailabilitySlot
+from users.models import UserPreferences, UserProfile
+from users.repositories.preferences_repository import PreferencesRepository
+
+
+class TestSoftDeleteManagers(TestCase):
+    def setUp(self):
+        self.profiles = [
+            UserProfile.objects.create(
+                user=User.objects.create_user(f"member{i}", f"member{i}@example.com")
+            )
+            for i in range(3)
+        ]
+
+    def test_default_manager_hides_deleted_and_archived(self):
+        """Test deleted and archived rows are only visible through all_objects."""
+        UserProfile.objects.filter(pk=self.profiles[0].pk).soft_delete()
+        UserProfile.objects.filter(pk=self.profiles[1].pk).archive()
+
+        self.assertEqual(list(UserProfile.objects.all()), [self.profiles[2]])
+        self.assertEqual(UserProfile.all_objects.count(), 3)
+
+        deleted = UserProfile.all_objects.get(pk=self.profiles[0].pk)
+        self.assertTrue(deleted.is_deleted)
+        self.assertIsNotNone(deleted.deleted_at)
+
+    def test_soft_delete_and_archive_bump_updated_at(self):
+        """Test queryset soft deletes are visible to updated_at readers."""
+        before = UserProfile.all_objects.get(pk=self.profiles[0].pk).updated_at
+
+        UserProfile.objects.filter(pk=self.profiles[0].pk).soft_delete()
+        UserProfile.objects.filter(pk=self.profiles[1].pk).archive()
+
+        self.assertGreater(
+            UserProfile.all_objects.get(pk=self.profiles[0].pk).updated_at, before
+        )
+        self.assertGreater(
+            UserProfile.all_objects.get(pk=self.profiles[1].pk).updated_at, before
+        )
+
+    def test_slim_models_soft_delete_without_archive_fields(self):
+        """Test queryset helpers only set the fields a SlimBaseModel has."""
+        slots = [
+            AvailabilitySlot.objects.create(
+                user=self.profiles[i].user,
+                starts_at=timezone.now(),
+                ends_at=timezone.now() + datetime.timedelta(hours=1),
+            )
+            for i in range(2)
+        ]
+
+        self.assertEqual(AvailabilitySlot.objects.filter(pk=slots[0].pk).archive(), 0)
+        self.assertEqual(
+            AvailabilitySlot.objects.filter(pk=slots[1].pk).soft_delete(), 1
+        )
+
+        self.assertEqual(list(AvailabilitySlot.objects.all()), [slots[0]])
+
+    def test_create_restores_soft_deleted_row(self):
+        """Test re-creating one-to-one preferences reuses the deleted row."""
+        repository = PreferencesRepository()
+        profile = self.profiles[0]
+        first = repository.create_preferences(
+            profile, {"age_range": "25-34", "top_hobbies": ["hiking"]}
+        ).data
+        UserPreferences.objects.filter(pk=first.pk).soft_delete()
+
+        response = repository.create_preferences(profile, {"age_range": "35-44"})
+
+        self.assertTrue(response.success)
+        restored = UserPreferences.objects.get(profile=profile)
+        self.assertEqual(restored.pk, first.pk)
+        self.assertEqual(restored.age_range, "35-44")
+        self.assertEqual(restored.top_hobbies, [])
+        self.assertFalse(restored.is_deleted)
+        self.assertIsNone(restored.deleted_at)
+
+        # A live row is not overwritten
+        self.assertFalse(repository.create_preferences(profile, {}).success)
+
+    def test_related_access_still_sees_soft_deleted_rows(self):
+        """Test user.userprofile keeps working for a soft deleted profile."""
+        UserProfile.objects.filter(pk=self.profiles[0].pk).soft_delete()
+
+        user = User.objects.get(username="member0")
+        self.assertEqual(user.userprofile.pk, self.profiles[0].pk)
+
+    def test_unordered_skips_default_ordering(self):
+        """Test unordered() removes the implicit -created_at sort."""
+        self.assertTrue(UserPreferences.objects.all().ordered)
+        self.assertFalse(UserPreferences.objects.unordered().ordered)
+        self.assertFalse(
+            UserPreferences.objects.with_completion_at_least(0).unordered().ordered
+        )
+
+    def test_latest_rows_use_partial_index(self):
+        """Test the newest live rows are read through the partial index."""
+        plan = UserProfile.objects.all()[:10].explain()
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = UserProfile.objects.all()[:10].explain()
+        self.assertIn("users_profile_alive_idx", plan)
@@ -5,4 +5,9 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/accounts/", include("accounts.urls")),
     path("api/v1/users/", include("users.urls")),
+    path("api/v1/feedback/", include("feedback.urls")),
+    path("api/v1/matches/", include("matches.urls")),
+    path("api/v1/payments/", include("payments.urls")),
+    path("api/v1/realtime/", include("realtime.urls")),
+    path("api/v1/sessions/", include("sessions.urls")),
 ]
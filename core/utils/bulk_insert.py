@@ -0,0 +1,70 @@
+# Fast bulk inserts: PostgreSQL COPY with a bulk_create fallback
+import csv
+import io
+import json
+
+from django.db import connections, models
+
+COPY_NULL = "\\N"
+
+
+def _copy_value(field, value):
+    if value is None:
+        return COPY_NULL
+    if isinstance(field, models.JSONField):
+        return json.dumps(value)
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def copy_insert(model, objs: list, using: str = "default") -> int:
+    """
+    Insert unsaved model instances with a single PostgreSQL COPY.
+
+    auto_now / auto_now_add timestamps are filled through `pre_save` like a
+    normal save. Primary keys are not set on `objs` afterwards, so only use
+    this for leaf tables nothing else needs to reference in the same batch.
+    """
+    connection = connections[using]
+    fields = [
+        field
+        for field in model._meta.concrete_fields
+        if not (field.primary_key and isinstance(field, models.AutoField))
+    ]
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for obj in objs:
+        writer.writerow(
+            [_copy_value(field, field.pre_save(obj, add=True)) for field in fields]
+        )
+    buffer.seek(0)
+
+    table = connection.ops.quote_name(model._meta.db_table)
+    columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+            buffer,
+        )
+    return len(objs)
+
+
+def bulk_insert(
+    model, objs: list, use_copy: bool = True, batch_size: int = 1000, using="default"
+) -> int:
+    """
+    Insert `objs` with COPY on PostgreSQL and bulk_create everywhere else.
+
+    Returns:
+        int: number of inserted rows
+    """
+    if not objs:
+        return 0
+    if use_copy and connections[using].vendor == "postgresql":
+        return copy_insert(model, objs, using=using)
+    model.objects.using(using).bulk_create(objs, batch_size=batch_size)
+    return len(objs)
@@ -0,0 +1,119 @@
+# Chunked JSONL / Parquet writers for model exports
+import datetime
+import decimal
+import gzip
+import json
+
+from django.db import models
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+
+class ExportError(Exception):
+    pass
+
+
+def export_columns(model, exclude=()) -> list:
+    """Concrete fields of `model` to export, primary key first."""
+    fields = [
+        field
+        for field in model._meta.concrete_fields
+        if field.name not in exclude and field.attname not in exclude
+    ]
+    return sorted(fields, key=lambda field: not field.primary_key)
+
+
+def _json_default(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class JsonlExportWriter:
+    """One JSON object per line, optionally gzip compressed."""
+
+    extension = "jsonl"
+
+    def __init__(self, path, fields: list, compress: bool = False):
+        self.names = [field.attname for field in fields]
+        self.path = f"{path}.{self.extension}" + (".gz" if compress else "")
+        opener = gzip.open if compress else open
+        self._file = opener(self.path, "wt", encoding="utf-8")
+
+    def write_chunk(self, rows: list):
+        self._file.writelines(
+            json.dumps(dict(zip(self.names, row)), default=_json_default) + "\n"
+            for row in rows
+        )
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetExportWriter:
+    """
+    Columnar Parquet file, one row group per chunk.
+
+    The schema comes from the model fields rather than from the data, so
+    chunks with only NULLs in a column still line up. JSONFields are
+    expected to hold lists of strings (all questionnaire JSON fields do).
+    """
+
+    extension = "parquet"
+
+    def __init__(self, path, fields: list, compress: bool = False):
+        if pyarrow is None:
+            raise ExportError("Parquet export requires pyarrow (pip install pyarrow)")
+        self.names = [field.attname for field in fields]
+        self.schema = pyarrow.schema(
+            [(field.attname, self._arrow_type(field)) for field in fields]
+        )
+        self.path = f"{path}.{self.extension}"
+        self._writer = pyarrow.parquet.ParquetWriter(
+            self.path, self.schema, compression="zstd" if compress else "snappy"
+        )
+
+    @staticmethod
+    def _arrow_type(field):
+        if isinstance(field, models.BooleanField):
+            return pyarrow.bool_()
+        if isinstance(field, (models.IntegerField, models.AutoField)) or (
+            field.is_relation
+        ):
+            return pyarrow.int64()
+        if isinstance(field, (models.FloatField, models.DecimalField)):
+            return pyarrow.float64()
+        if isinstance(field, models.DateTimeField):
+            return pyarrow.timestamp("us", tz="UTC")
+        if isinstance(field, models.DateField):
+            return pyarrow.date32()
+        if isinstance(field, models.JSONField):
+            return pyarrow.list_(pyarrow.string())
+        return pyarrow.string()
+
+    def write_chunk(self, rows: list):
+        columns = list(zip(*rows)) if rows else [[] for _ in self.names]
+        self._writer.write_table(
+            pyarrow.Table.from_arrays(
+                [
+                    pyarrow.array(column, type=self.schema.field(i).type)
+                    for i, column in enumerate(columns)
+                ],
+                schema=self.schema,
+            )
+        )
+
+    def close(self):
+        self._writer.close()
+
+
+EXPORT_WRITERS = {
+    "jsonl": JsonlExportWriter,
+    "parquet": ParquetExportWriter,
+}
@@ -0,0 +1,40 @@
+# Keyset (seek) pagination helpers for streaming large tables
+
+
+def keyset_values(queryset, columns: list, key: str = "id", named: bool = False):
+    """values_list projection ordered by `key`, with `key` as the first column."""
+    columns = [key] + [column for column in columns if column != key]
+    return queryset.order_by(key).values_list(*columns, named=named)
+
+
+def stream_keyset(
+    queryset,
+    columns: list,
+    chunk_size: int = 2000,
+    after=0,
+    key: str = "id",
+    named: bool = False,
+):
+    """
+    Yield `columns` of every row in `queryset` in constant memory.
+
+    Business logic:
+        1. Seek in pages of `chunk_size` rows with `key > last ORDER BY key`,
+           which stays an index range scan at any depth (no OFFSET).
+        2. Read each page with iterator(chunk_size=...), which uses a
+           server-side cursor on PostgreSQL, so at most one page is held
+           in memory.
+
+    Each yielded row starts with the key column.
+    """
+    base = keyset_values(queryset, columns, key=key, named=named)
+    last = after
+    while True:
+        page = base.filter(**{f"{key}__gt": last})[:chunk_size]
+        count = 0
+        for row in page.iterator(chunk_size=chunk_size):
+            count += 1
+            last = row[0]
+            yield row
+        if count < chunk_size:
+            return
@@ -0,0 +1,192 @@
+# Token bucket rate limiting with pluggable counter stores
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+RATE_PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    remaining: float
+    retry_after: float = 0.0
+
+
+def parse_rate(rate: str) -> tuple:
+    """
+    Parse a DRF style rate string such as "5/min" or "100/hour".
+
+    Returns:
+        tuple: (capacity, refill_per_second)
+    """
+    num, period = rate.split("/")
+    capacity = int(num)
+    duration = RATE_PERIODS[period[0]]
+    return capacity, capacity / duration
+
+
+def consume_token(state, capacity: int, refill_rate: float, now: float, cost=1):
+    """
+    Apply one token bucket step to a stored (tokens, updated_at) state.
+
+    Business logic:
+        1. Refill the bucket for the time elapsed since the last update.
+        2. Take `cost` tokens if available, otherwise compute the wait time.
+
+    Returns:
+        tuple: (new_state, RateLimitResult)
+    """
+    if state is None:
+        tokens, updated_at = float(capacity), now
+    else:
+        tokens, updated_at = state
+        tokens = min(float(capacity), tokens + (now - updated_at) * refill_rate)
+
+    if tokens >= cost:
+        tokens -= cost
+        return (tokens, now), RateLimitResult(allowed=True, remaining=tokens)
+
+    retry_after = (cost - tokens) / refill_rate if refill_rate else float("inf")
+    return (tokens, now), RateLimitResult(
+        allowed=False, remaining=tokens, retry_after=retry_after
+    )
+
+
+class BaseRateLimitStore:
+    """
+    Storage backend for token bucket counters.
+    Subclasses decide where the (tokens, updated_at) state of each key lives.
+    """
+
+    def consume(
+        self, key: str, capacity: int, refill_rate: float, cost=1
+    ) -> RateLimitResult:
+        raise NotImplementedError
+
+    def reset(self, key: str = None):
+        raise NotImplementedError
+
+
+class InMemoryRateLimitStore(BaseRateLimitStore):
+    """
+    Process-local store, exact under threads. Used by tests and single node setups.
+    """
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def consume(
+        self, key: str, capacity: int, refill_rate: float, cost=1
+    ) -> RateLimitResult:
+        with self._lock:
+            state, result = consume_token(
+                self._buckets.get(key), capacity, refill_rate, time.monotonic(), cost
+            )
+            self._buckets[key] = state
+            return result
+
+    def reset(self, key: str = None):
+        with self._lock:
+            if key is None:
+                self._buckets.clear()
+            else:
+                self._buckets.pop(key, None)
+
+
+class CacheRateLimitStore(BaseRateLimitStore):
+    """
+    Store backed by a Django cache alias so every worker shares the same counters.
+    Point RATE_LIMIT_CACHE_ALIAS at Redis/Memcached in production.
+
+    A read-modify-write of the token bucket state would let concurrent hits on
+    one key all read the same state and all pass, which is exactly a credential
+    stuffing burst. Buckets are therefore approximated by fixed windows counted
+    with the cache's atomic primitives:
+        1. add() creates the window's counter (capacity / refill_rate seconds
+           long) on the first hit; only one concurrent caller wins it.
+        2. Every other hit incr()s the counter, atomically on Redis, Memcached
+           and LocMem. A hit is allowed while the count stays within capacity.
+    A client gets at most `capacity` requests per window, and at most twice
+    that across a window boundary.
+
+    Keys carry a generation stored in the cache, so reset() without a key
+    drops every counter of this store without touching the rest of the
+    shared cache (sessions, presence, weights, entitlements).
+    """
+
+    key_prefix = "ratelimit"
+
+    def __init__(self):
+        self.cache = caches[getattr(settings, "RATE_LIMIT_CACHE_ALIAS", "default")]
+
+    def consume(
+        self, key: str, capacity: int, refill_rate: float, cost=1
+    ) -> RateLimitResult:
+        window = capacity / refill_rate if refill_rate else None
+        timeout = int(window) + 1 if window else None
+        now = time.time()
+        cache_key = self._cache_key(key)
+        started_key = f"{cache_key}:started"
+
+        # A second round only runs if the window expired between add() and
+        # incr(); counting the hit as a window's first is then exact enough
+        count = cost
+        for _ in range(2):
+            if self.cache.add(cache_key, cost, timeout):
+                self.cache.set(started_key, now, timeout)
+                count = cost
+                break
+            try:
+                count = self.cache.incr(cache_key, cost)
+                break
+            except ValueError:
+                continue
+
+        if count <= capacity:
+            return RateLimitResult(allowed=True, remaining=float(capacity - count))
+
+        if window is None:
+            retry_after = float("inf")
+        else:
+            started = self.cache.get(started_key, now)
+            retry_after = max(0.0, started + window - now)
+        return RateLimitResult(allowed=False, remaining=0.0, retry_after=retry_after)
+
+    def reset(self, key: str = None):
+        if key is None:
+            try:
+                self.cache.incr(self._generation_key)
+            except ValueError:
+                self.cache.set(self._generation_key, 1, None)
+        else:
+            cache_key = self._cache_key(key)
+            self.cache.delete_many([cache_key, f"{cache_key}:started"])
+
+    @property
+    def _generation_key(self) -> str:
+        return f"{self.key_prefix}:generation"
+
+    def _cache_key(self, key: str) -> str:
+        generation = self.cache.get(self._generation_key, 0)
+        return f"{self.key_prefix}:{generation}:{key}"
+
+
+@lru_cache(maxsize=None)
+def _load_store(path: str) -> BaseRateLimitStore:
+    return import_string(path)()
+
+
+def get_rate_limit_store() -> BaseRateLimitStore:
+    """Return the configured store instance (one per process per backend path)."""
+    return _load_store(
+        getattr(
+            settings, "RATE_LIMIT_STORE", "core.utils.rate_limit.CacheRateLimitStore"
+        )
+    )
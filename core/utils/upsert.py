@@ -0,0 +1,44 @@
+# Atomic counter upserts for pre-aggregated tables
+from django.db import connection
+
+
+def upsert_increments(model, key_fields: list, counters: list, rows: dict) -> int:
+    """
+    Add counter deltas to rows of `model`, creating missing rows.
+
+    Args:
+        model: a model with a unique constraint on `key_fields`
+        counters (list): names of the numeric fields to increment
+        rows (dict): key tuple (values of key_fields) -> dict of counter deltas
+
+    Business logic:
+        One INSERT ... ON CONFLICT DO UPDATE SET c = c + excluded.c for the
+        whole batch (PostgreSQL and SQLite), so concurrent jobs add to the
+        same row atomically instead of overwriting each other.
+
+    Returns:
+        int: the number of rows inserted or updated
+    """
+    if not rows:
+        return 0
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    keys = [quote(model._meta.get_field(name).column) for name in key_fields]
+    columns = keys + [quote(model._meta.get_field(name).column) for name in counters]
+    placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES {', '.join([placeholders] * len(rows))} "
+        f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET "
+        + ", ".join(
+            f"{column} = {table}.{column} + excluded.{column}"
+            for column in columns[len(keys) :]
+        )
+    )
+    params = []
+    for key, deltas in rows.items():
+        params.extend(key)
+        params.extend(deltas.get(counter, 0) for counter in counters)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+    return len(rows)
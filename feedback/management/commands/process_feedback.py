@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from feedback.services.feedback_aggregation import FeedbackAggregationService
+
+
+class Command(BaseCommand):
+    """Aggregate submitted feedback into friend rating scores"""
+
+    help = (
+        "Process pending FeedbackSubmission rows in batches: validate them, "
+        "update each friend's rating count, mean and Bayesian score. Use "
+        "--loop to keep polling."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--loop", action="store_true", help="Keep polling for new feedback"
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to sleep when nothing is pending (with --loop)",
+        )
+
+    def handle(self, *args, **options):
+        service = FeedbackAggregationService()
+        while True:
+            response = service.process_pending(batch_size=options["batch_size"])
+            if not response.success:
+                raise CommandError(response.message)
+            counts = response.data
+            if counts["submissions"]:
+                self.stdout.write(
+                    f"{counts['submissions']} submissions: {counts['accepted']} "
+                    f"accepted, {counts['rejected']} rejected, "
+                    f"{counts['friends']} friends updated"
+                )
+            if counts["submissions"] < options["batch_size"]:
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
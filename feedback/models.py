@@ -1,3 +1,96 @@
 from django.db import models
+from django.db.models.functions import Now
 
-# Create your models here.
+from core.models import SlimBaseModel
+
+
+class FeedbackSubmission(SlimBaseModel):
+    """
+    Ingestion row for one rating (1-5) with an optional comment.
+
+    The submit endpoint only inserts this row; the aggregator
+    (process_feedback) validates it against the session later and folds
+    accepted ratings into FriendRatingAggregate.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("aggregated", "Aggregated"),
+        ("rejected", "Rejected"),
+    ]
+
+    reviewer = models.ForeignKey(
+        "auth.User", on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    # The friend being rated
+    subject = models.ForeignKey(
+        "auth.User", on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    # Required on submission; null for a session deleted since (or rows
+    # submitted before it was required, which the aggregator rejects)
+    session = models.ForeignKey(
+        "chat_sessions.ChatSession",
+        on_delete=models.SET_NULL,
+        related_name="+",
+        blank=True,
+        null=True,
+        db_index=False,
+    )
+    rating = models.PositiveSmallIntegerField()
+    comment = models.TextField(blank=True, default="")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    processed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(rating__gte=1, rating__lte=5),
+                name="feedback_rating_range",
+            ),
+            # One rating per reviewer, friend and session
+            models.UniqueConstraint(
+                fields=["reviewer", "subject", "session"],
+                condition=models.Q(session__isnull=False),
+                name="unique_session_feedback",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(processed_at__isnull=True),
+                name="feedback_pending_idx",
+            ),
+            models.Index(fields=["subject", "-id"], name="feedback_subject_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.reviewer_id} rated {self.subject_id}: {self.rating}"
+
+
+class FriendRatingAggregate(models.Model):
+    """
+    Precomputed rating features of one friend, read by the matcher.
+
+    bayesian_score shrinks the mean towards the global mean (prior_mean)
+    by FEEDBACK_PRIOR_WEIGHT pseudo-ratings, so a single 5 does not outrank
+    a long record of 4.8s.
+    """
+
+    user = models.OneToOneField(
+        "auth.User",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="rating_aggregate",
+    )
+    # Database defaults: rows are created by a raw counter upsert
+    ratings_count = models.PositiveIntegerField(db_default=0)
+    ratings_sum = models.PositiveIntegerField(db_default=0)
+    mean = models.FloatField(db_default=0.0)
+    bayesian_score = models.FloatField(db_default=0.0)
+    prior_mean = models.FloatField(db_default=0.0)
+    updated_at = models.DateTimeField(db_default=Now())
+
+    COUNTERS = ["ratings_count", "ratings_sum"]
+
+    def __str__(self):
+        return f"{self.user_id}: {self.bayesian_score:.2f} ({self.ratings_count})"
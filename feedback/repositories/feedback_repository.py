@@ -0,0 +1,208 @@
+# Feedback Repository
+from django.db import IntegrityError
+from django.db.models import F, FloatField, Q, Sum, Value
+from django.db.models.functions import Cast, Now
+from django.utils import timezone
+
+from core.utils.data_classes import RepositoryResponse
+from core.utils.logging import LoggingService
+from core.utils.upsert import upsert_increments
+from feedback.models import FeedbackSubmission, FriendRatingAggregate
+from sessions.models import SessionAttendee
+
+DUPLICATE = "duplicate"
+
+
+class FeedbackRepository:
+    """
+    Repository layer for feedback ingestion and friend rating aggregates
+    Returns RepositoryResponse with raw objects/querysets
+    """
+
+    def __init__(self):
+        self.logger = LoggingService()
+
+    def create_submission(self, reviewer_id: int, data: dict) -> RepositoryResponse:
+        """Insert one pending submission; no other query on the request path"""
+        try:
+            submission = FeedbackSubmission.objects.create(
+                reviewer_id=reviewer_id, **data
+            )
+            return RepositoryResponse(
+                success=True, message="Feedback received", data=submission
+            )
+        except IntegrityError:
+            # The unique constraint or a foreign key: checked by the
+            # database rather than extra lookups on the hot path
+            return RepositoryResponse(
+                success=False,
+                message="Feedback was already submitted or names an unknown "
+                "friend or session",
+                error=DUPLICATE,
+            )
+        except Exception as e:
+            self.logger.log(f"Error storing feedback: {str(e)}", level="error", error=e)
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def claim_pending(self, limit: int = 1000) -> RepositoryResponse:
+        """
+        Lock the oldest unprocessed submissions.
+
+        Must be called inside transaction.atomic(); rows locked by another
+        aggregator are skipped (SKIP LOCKED where the database supports it).
+        """
+        try:
+            submissions = list(
+                FeedbackSubmission.objects.filter(processed_at__isnull=True)
+                .select_for_update(skip_locked=True)
+                .order_by("id")
+                .only(
+                    "id",
+                    "reviewer_id",
+                    "subject_id",
+                    "session_id",
+                    "rating",
+                    "created_at",
+                )[:limit]
+            )
+            return RepositoryResponse(
+                success=True, message="Pending feedback claimed", data=submissions
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error claiming feedback: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def get_session_attendees(self, session_ids: list) -> RepositoryResponse:
+        """
+        Live attendances of many sessions in one query.
+
+        Returns:
+            RepositoryResponse: data is (session_id, user_id) -> session kind
+        """
+        try:
+            attendances = {
+                (session_id, user_id): kind
+                for session_id, user_id, kind in SessionAttendee.objects.filter(
+                    session_id__in=session_ids, is_cancelled=False
+                ).values_list("session_id", "user_id", "session__kind")
+            }
+            return RepositoryResponse(
+                success=True, message="Attendees retrieved", data=attendances
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error reading session attendees: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def mark_processed(self, accepted_ids: list, rejected_ids: list):
+        """Close a batch of submissions as aggregated or rejected"""
+        try:
+            now = timezone.now()
+            for status, ids in [
+                ("aggregated", accepted_ids),
+                ("rejected", rejected_ids),
+            ]:
+                if ids:
+                    FeedbackSubmission.objects.filter(id__in=ids).update(
+                        status=status, processed_at=now
+                    )
+            return RepositoryResponse(success=True, message="Feedback processed")
+        except Exception as e:
+            self.logger.log(
+                f"Error marking feedback processed: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def apply_ratings(
+        self, deltas: dict, prior_weight: float, tolerance: float
+    ) -> RepositoryResponse:
+        """
+        Add rating counts to friends' aggregates and refresh derived scores.
+
+        Args:
+            deltas (dict): user id -> {"ratings_count": n, "ratings_sum": s}
+            prior_weight (float): pseudo-ratings at the global mean
+            tolerance (float): global mean drift that triggers a full refresh
+
+        Business logic:
+            1. Increment counters with one atomic upsert.
+            2. Recompute the global mean from the aggregates (a small table,
+               never the raw submissions).
+            3. Recompute mean and Bayesian score in one UPDATE for the
+               friends in this batch, plus every friend whose score was
+               computed with a prior that has since drifted by `tolerance`.
+
+        Returns:
+            RepositoryResponse: data is the global mean used as the prior
+        """
+        try:
+            upsert_increments(
+                FriendRatingAggregate,
+                ["user"],
+                FriendRatingAggregate.COUNTERS,
+                {(user_id,): counts for user_id, counts in deltas.items()},
+            )
+
+            totals = FriendRatingAggregate.objects.aggregate(
+                count=Sum("ratings_count"), sum=Sum("ratings_sum")
+            )
+            prior = totals["sum"] / totals["count"] if totals["count"] else 0.0
+
+            FriendRatingAggregate.objects.filter(
+                Q(user_id__in=list(deltas))
+                | Q(prior_mean__gt=prior + tolerance)
+                | Q(prior_mean__lt=prior - tolerance)
+            ).update(
+                mean=Cast("ratings_sum", FloatField()) / F("ratings_count"),
+                bayesian_score=(
+                    Value(prior_weight * prior, output_field=FloatField())
+                    + Cast("ratings_sum", FloatField())
+                )
+                / (Value(prior_weight, output_field=FloatField()) + F("ratings_count")),
+                prior_mean=prior,
+                updated_at=Now(),
+            )
+            return RepositoryResponse(
+                success=True, message="Ratings applied", data=prior
+            )
+        except Exception as e:
+            self.logger.log(f"Error applying ratings: {str(e)}", level="error", error=e)
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def get_rating_scores(self, user_ids: list) -> RepositoryResponse:
+        """
+        Precomputed rating features of many friends in one primary key lookup.
+
+        Returns:
+            RepositoryResponse: data is user id -> (bayesian_score, mean, count)
+        """
+        try:
+            scores = {
+                user_id: (score, mean, count)
+                for user_id, score, mean, count in FriendRatingAggregate.objects.filter(
+                    user_id__in=user_ids
+                ).values_list("user_id", "bayesian_score", "mean", "ratings_count")
+            }
+            return RepositoryResponse(
+                success=True, message="Rating scores retrieved", data=scores
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error reading rating scores: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
@@ -0,0 +1,21 @@
+from rest_framework import serializers
+
+from feedback.models import FeedbackSubmission
+
+
+class FeedbackSubmissionSerializer(serializers.ModelSerializer):
+    """
+    Validates the payload without touching the database; the subject and
+    session are checked by foreign keys on insert and by the aggregator.
+    A rating always names the session it is about: the aggregator only
+    accepts it when reviewer and subject both attended that session.
+    """
+
+    subject_id = serializers.IntegerField()
+    session_id = serializers.IntegerField()
+    rating = serializers.IntegerField(min_value=1, max_value=5)
+    comment = serializers.CharField(required=False, allow_blank=True, max_length=2000)
+
+    class Meta:
+        model = FeedbackSubmission
+        fields = ["subject_id", "session_id", "rating", "comment"]
@@ -0,0 +1,130 @@
+# Feedback Aggregation Service
+from django.conf import settings
+from django.db import transaction
+
+from core.utils.data_classes import ServiceResponse
+from core.utils.logging import LoggingService
+from feedback.repositories.feedback_repository import FeedbackRepository
+from sessions.repositories.stats_repository import SessionStatsRepository
+from sessions.services.session_stats import add_to_buckets
+
+
+class FeedbackAggregationService:
+    """
+    Batch consumer of FeedbackSubmission rows that maintains
+    FriendRatingAggregate (count, mean, Bayesian score) for the matcher and
+    the ratings counters of the rated attendee's session stats.
+    Returns ServiceResponse with processing counts
+    """
+
+    def __init__(self):
+        self.repository = FeedbackRepository()
+        self.stats_repository = SessionStatsRepository()
+        self.logger = LoggingService()
+
+    def process_pending(self, batch_size: int = 1000) -> ServiceResponse:
+        """
+        Aggregate one batch of pending feedback.
+
+        Business logic:
+            1. Claim the oldest pending submissions.
+            2. Reject self ratings and feedback unless the reviewer and the
+               friend both attended its session (one query for the batch).
+            3. Sum accepted ratings per friend, apply them with one upsert and
+               refresh the derived scores.
+            4. Add accepted ratings to the friend's daily and weekly
+               session stats, bucketed by when the feedback arrived (so a
+               late rating never reopens a past day).
+            5. Close the batch. Steps 1-5 run in one transaction, so a
+               failure leaves the batch pending.
+
+        Returns:
+            ServiceResponse: data has submissions, accepted, rejected, friends
+        """
+        try:
+            with transaction.atomic():
+                claim_response = self.repository.claim_pending(batch_size)
+                if not claim_response.success:
+                    raise RuntimeError(claim_response.message)
+                submissions = claim_response.data
+
+                session_ids = {s.session_id for s in submissions if s.session_id}
+                attendees = {}
+                if session_ids:
+                    attendees_response = self.repository.get_session_attendees(
+                        list(session_ids)
+                    )
+                    if not attendees_response.success:
+                        raise RuntimeError(attendees_response.message)
+                    attendees = attendees_response.data
+
+                deltas, accepted, rejected = {}, [], []
+                daily, weekly = {}, {}
+                for submission in submissions:
+                    # Submissions from before session_id was required have none
+                    valid = (
+                        submission.reviewer_id != submission.subject_id
+                        and submission.session_id is not None
+                        and {
+                            (submission.session_id, submission.reviewer_id),
+                            (submission.session_id, submission.subject_id),
+                        }
+                        <= attendees.keys()
+                    )
+                    if not valid:
+                        rejected.append(submission.id)
+                        continue
+                    accepted.append(submission.id)
+                    counts = deltas.setdefault(
+                        submission.subject_id, {"ratings_count": 0, "ratings_sum": 0}
+                    )
+                    counts["ratings_count"] += 1
+                    counts["ratings_sum"] += submission.rating
+                    add_to_buckets(
+                        daily,
+                        weekly,
+                        submission.subject_id,
+                        submission.created_at,
+                        attendees[(submission.session_id, submission.subject_id)],
+                        {"ratings_count": 1, "ratings_sum": submission.rating},
+                    )
+
+                if deltas:
+                    apply_response = self.repository.apply_ratings(
+                        deltas,
+                        settings.FEEDBACK_PRIOR_WEIGHT,
+                        settings.FEEDBACK_PRIOR_TOLERANCE,
+                    )
+                    if not apply_response.success:
+                        raise RuntimeError(apply_response.message)
+                if daily:
+                    rollup_response = self.stats_repository.apply_rollups(daily, weekly)
+                    if not rollup_response.success:
+                        raise RuntimeError(rollup_response.message)
+                mark_response = self.repository.mark_processed(accepted, rejected)
+                if not mark_response.success:
+                    raise RuntimeError(mark_response.message)
+
+            counts = {
+                "submissions": len(submissions),
+                "accepted": len(accepted),
+                "rejected": len(rejected),
+                "friends": len(deltas),
+            }
+            if submissions:
+                self.logger.log(f"Feedback aggregated: {counts}")
+            return ServiceResponse(
+                success=True,
+                message="Feedback aggregated",
+                data=counts,
+                status_code=200,
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error aggregating feedback: {str(e)}", level="error", error=e
+            )
+            return ServiceResponse(
+                success=False,
+                message="An error occurred while aggregating feedback",
+                status_code=500,
+            )
@@ -0,0 +1,73 @@
+# Feedback Submission Service
+from core.utils.data_classes import ServiceResponse
+from core.utils.logging import LoggingService
+from feedback.repositories.feedback_repository import DUPLICATE, FeedbackRepository
+from feedback.serializers import FeedbackSubmissionSerializer
+
+
+class FeedbackService:
+    """
+    Service layer for submitting feedback
+    Returns ServiceResponse with serialized data for views
+    """
+
+    def __init__(self):
+        self.repository = FeedbackRepository()
+        self.logger = LoggingService()
+
+    def submit(self, user, data) -> ServiceResponse:
+        """
+        Args:
+            user: The reviewer.
+            data: subject_id, session_id, rating (1-5) and an optional comment.
+
+        Business logic:
+            1. Validate the payload in memory.
+            2. Insert one pending row and return 202; aggregation happens
+               later in batches (process_feedback), so bursts after popular
+               events cost the API one INSERT per submission.
+
+        Returns:
+            ServiceResponse: the submission id and status.
+        """
+        try:
+            serializer = FeedbackSubmissionSerializer(data=data)
+            if not serializer.is_valid():
+                return ServiceResponse(
+                    success=False,
+                    message="Invalid feedback",
+                    data={"errors": serializer.errors},
+                    status_code=400,
+                )
+            if serializer.validated_data["subject_id"] == user.id:
+                return ServiceResponse(
+                    success=False,
+                    message="You cannot rate yourself",
+                    status_code=400,
+                )
+
+            repo_response = self.repository.create_submission(
+                user.id, serializer.validated_data
+            )
+            if not repo_response.success:
+                if repo_response.error == DUPLICATE:
+                    return ServiceResponse(
+                        success=False, message=repo_response.message, status_code=409
+                    )
+                raise RuntimeError(repo_response.message)
+
+            return ServiceResponse(
+                success=True,
+                message="Feedback received",
+                data={"id": repo_response.data.id, "status": repo_response.data.status},
+                status_code=202,
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error submitting feedback: {str(e)}", level="error", error=e
+            )
+            return ServiceResponse(
+                success=False,
+                message="An error occurred while submitting feedback",
+                status_code=500,
+            )
@@ -0,0 +1,19 @@
+# Background tasks of the feedback app
+from feedback.services.feedback_aggregation import FeedbackAggregationService
+from tasks.registry import task
+
+BATCH_SIZE = 1000
+
+
+@task
+def process_feedback() -> int:
+    """Periodic: aggregate every pending submission; returns how many"""
+    service = FeedbackAggregationService()
+    processed = 0
+    while True:
+        response = service.process_pending(batch_size=BATCH_SIZE)
+        if not response.success:
+            raise RuntimeError(response.message)
+        processed += response.data["submissions"]
+        if response.data["submissions"] < BATCH_SIZE:
+            return processed
@@ -0,0 +1,147 @@
+# Test feedback ingestion and the batch rating aggregator
+import datetime
+import io
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from feedback.models import FeedbackSubmission, FriendRatingAggregate
+from feedback.services.feedback_aggregation import FeedbackAggregationService
+from feedback.services.feedback_service import FeedbackService
+from sessions.models import ChatSession, SessionAttendee
+
+START = datetime.datetime(2026, 10, 19, 9, tzinfo=datetime.timezone.utc)
+
+
+@override_settings(FEEDBACK_PRIOR_WEIGHT=2, FEEDBACK_PRIOR_TOLERANCE=0.05)
+class TestFeedback(TestCase):
+    """Test class for feedback submission and aggregation."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.users = [
+            User.objects.create_user(f"member{i}", f"member{i}@example.com")
+            for i in range(4)
+        ]
+        self.reviewer, self.friend, self.other, self.outsider = self.users
+        self.session = self._session([self.reviewer, self.friend, self.other])
+        self.later = self._session([self.outsider, self.friend, self.other], hours=2)
+        self.aggregator = FeedbackAggregationService()
+
+    def _session(self, attendees, hours=0):
+        starts_at = START + datetime.timedelta(hours=hours)
+        session = ChatSession.objects.create(
+            organizer=attendees[0],
+            starts_at=starts_at,
+            ends_at=starts_at + datetime.timedelta(hours=1),
+        )
+        for user in attendees:
+            SessionAttendee.objects.create(
+                session=session,
+                user=user,
+                starts_at=session.starts_at,
+                ends_at=session.ends_at,
+            )
+        return session
+
+    def _submit(self, reviewer, subject, rating, session):
+        self.client.force_authenticate(reviewer)
+        payload = {"subject_id": subject.id, "rating": rating, "comment": "Nice"}
+        if session is not None:
+            payload["session_id"] = session.id
+        return self.client.post(reverse("submit_feedback"), payload, format="json")
+
+    def _aggregate(self, friend):
+        return FriendRatingAggregate.objects.get(user=friend)
+
+    def test_submission_is_a_single_insert(self):
+        """Test the API only inserts and answers 202 before aggregation."""
+        with self.assertNumQueries(1):
+            response = FeedbackService().submit(
+                self.reviewer,
+                {
+                    "subject_id": self.friend.id,
+                    "session_id": self.session.id,
+                    "rating": 5,
+                },
+            )
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["status"], "pending")
+        self.assertFalse(FriendRatingAggregate.objects.exists())
+
+    def test_rejects_invalid_submissions(self):
+        self.assertEqual(
+            self._submit(self.reviewer, self.friend, 6, self.session).status_code, 400
+        )
+        self.assertEqual(
+            self._submit(self.reviewer, self.reviewer, 4, self.session).status_code,
+            400,
+        )
+        # Ratings must be about a shared session
+        self.assertEqual(
+            self._submit(self.reviewer, self.friend, 4, None).status_code, 400
+        )
+        self.assertEqual(
+            self._submit(self.reviewer, self.friend, 4, self.session).status_code, 202
+        )
+        self.assertEqual(
+            self._submit(self.reviewer, self.friend, 2, self.session).status_code, 409
+        )
+
+    def test_aggregates_count_mean_and_bayesian_score(self):
+        """Test scores shrink towards the global mean by the prior weight."""
+        self._submit(self.reviewer, self.friend, 5, self.session)
+        self._submit(self.reviewer, self.other, 3, self.session)
+        self._submit(self.outsider, self.other, 1, self.later)
+        # The outsider did not attend the first session
+        self._submit(self.outsider, self.friend, 1, self.session)
+
+        response = self.aggregator.process_pending()
+
+        self.assertEqual(
+            response.data,
+            {"submissions": 4, "accepted": 3, "rejected": 1, "friends": 2},
+        )
+        friend = self._aggregate(self.friend)
+        other = self._aggregate(self.other)
+        # Global mean (5 + 3 + 1) / 3 = 3
+        self.assertEqual((friend.ratings_count, friend.mean), (1, 5.0))
+        self.assertAlmostEqual(friend.bayesian_score, (2 * 3 + 5) / 3)
+        self.assertEqual((other.ratings_count, other.mean), (2, 2.0))
+        self.assertAlmostEqual(other.bayesian_score, (2 * 3 + 4) / 4)
+        self.assertEqual(
+            FeedbackSubmission.objects.filter(status="rejected").count(), 1
+        )
+
+    def test_batches_add_up_and_refresh_drifted_priors(self):
+        """Test later batches increment counts and rescore stale friends."""
+        self._submit(self.reviewer, self.friend, 5, self.session)
+        self._submit(self.reviewer, self.other, 3, self.session)
+        self.aggregator.process_pending()
+        self.assertEqual(self._aggregate(self.other).prior_mean, 4.0)
+
+        self._submit(self.outsider, self.friend, 1, self.later)
+        call_command("process_feedback", stdout=io.StringIO())
+
+        friend = self._aggregate(self.friend)
+        other = self._aggregate(self.other)
+        self.assertEqual((friend.ratings_count, friend.ratings_sum), (2, 6))
+        # The global mean moved from 4 to 3, so the untouched friend is rescored
+        self.assertEqual(other.prior_mean, 3.0)
+        self.assertAlmostEqual(other.bayesian_score, (2 * 3 + 3) / 3)
+        self.assertEqual(self.aggregator.process_pending().data["submissions"], 0)
+
+    def test_rejects_submissions_without_a_session(self):
+        """Test rows stored before session_id was required are not counted."""
+        FeedbackSubmission.objects.create(
+            reviewer=self.outsider, subject=self.friend, rating=1
+        )
+
+        response = self.aggregator.process_pending()
+
+        self.assertEqual(response.data["rejected"], 1)
+        self.assertFalse(FriendRatingAggregate.objects.exists())
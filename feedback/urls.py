@@ -0,0 +1,8 @@
+# feedback urls
+from django.urls import path
+
+from .views import submit_feedback_view
+
+urlpatterns = [
+    path("", submit_feedback_view, name="submit_feedback"),
+]
@@ -1,3 +1,21 @@
-from django.shortcuts import render
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
-# Create your views here.
+from feedback.services.feedback_service import FeedbackService
+
+# Initialize services
+feedback_service = FeedbackService()
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def submit_feedback_view(request):
+    """Submit a rating (1-5) and optional comment for a friend"""
+    service_response = feedback_service.submit(request.user, request.data)
+    if not service_response.success:
+        return Response(
+            {"message": service_response.message, **(service_response.data or {})},
+            status=service_response.status_code,
+        )
+    return Response(service_response.data, status=service_response.status_code)
@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from matches.services.match_updates import MatchUpdateService
+from users.utils.matching_engines import ENGINES
+
+
+class Command(BaseCommand):
+    """Consume preference change events and update stored matches"""
+
+    help = (
+        "Process pending PreferenceChangeEvent rows: re-score only the users "
+        "whose scored answers changed against the in-memory candidate index. "
+        "Use --loop to keep the index warm between batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--engine",
+            choices=sorted(ENGINES),
+            help="Candidate index engine (default: settings.MATCH_UPDATE_ENGINE)",
+        )
+        parser.add_argument(
+            "--loop", action="store_true", help="Keep polling for new events"
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Seconds to sleep when the queue is empty (with --loop)",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Recompute every match list first (after a weights change)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            service = MatchUpdateService(engine_name=options["engine"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options["rebuild"]:
+            response = service.rebuild_all()
+            if not response.success:
+                raise CommandError(response.message)
+            self.stdout.write(f"Rebuilt matches for {response.data['rescored']} users")
+
+        while True:
+            response = service.process_pending(batch_size=options["batch_size"])
+            if not response.success:
+                raise CommandError(response.message)
+            counts = response.data
+            if counts["events"]:
+                self.stdout.write(
+                    f"{counts['events']} events: {counts['rescored']} rescored, "
+                    f"{counts['skipped']} skipped, {counts['removed']} removed"
+                )
+            if counts["events"] < options["batch_size"]:
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
@@ -1,3 +1,35 @@
 from django.db import models
 
-# Create your models here.
+
+class UserMatch(models.Model):
+    """
+    Stored top matches of a profile, maintained incrementally from
+    PreferenceChangeEvent rows. Derived data: safe to rebuild at any time.
+    """
+
+    # Covered by the (profile, -score) index
+    profile = models.ForeignKey(
+        "users.UserProfile",
+        on_delete=models.CASCADE,
+        related_name="matches",
+        db_index=False,
+    )
+    candidate = models.ForeignKey(
+        "users.UserProfile", on_delete=models.CASCADE, related_name="+"
+    )
+    score = models.FloatField()
+    weights_version = models.CharField(max_length=50)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["profile", "candidate"], name="unique_user_match"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["profile", "-score"], name="matches_user_score_idx")
+        ]
+
+    def __str__(self):
+        return f"{self.profile_id} -> {self.candidate_id}: {self.score}"
@@ -0,0 +1,269 @@
+# Match Repository
+from django.db import transaction
+from django.utils import timezone
+
+from core.utils.data_classes import RepositoryResponse
+from core.utils.keyset import stream_keyset
+from core.utils.logging import LoggingService
+from matches.models import UserMatch
+from users.models import (
+    PreferenceChangeEvent,
+    UserCompatibilityPreferences,
+    UserPreferences,
+)
+from users.utils.compatibility_weights import IMPORTANCE_FIELDS
+from users.utils.matching_engines import MatchCandidate
+
+
+class MatchRepository:
+    """
+    Repository layer for preference change events and stored matches
+    Returns RepositoryResponse with raw objects/querysets
+    """
+
+    def __init__(self):
+        self.logger = LoggingService()
+
+    def claim_pending_events(self, limit: int = 100) -> RepositoryResponse:
+        """
+        Lock the oldest unprocessed change events.
+
+        Must be called inside transaction.atomic(); rows locked by another
+        consumer are skipped (SKIP LOCKED where the database supports it).
+        """
+        try:
+            events = list(
+                PreferenceChangeEvent.objects.filter(processed_at__isnull=True)
+                .select_for_update(skip_locked=True)
+                .order_by("id")[:limit]
+            )
+            return RepositoryResponse(
+                success=True, message="Pending events claimed", data=events
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error claiming change events: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def mark_processed(self, event_ids: list) -> RepositoryResponse:
+        """Mark change events as handled"""
+        try:
+            updated = PreferenceChangeEvent.objects.filter(id__in=event_ids).update(
+                processed_at=timezone.now()
+            )
+            return RepositoryResponse(
+                success=True, message="Events marked processed", data=updated
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error marking change events: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def load_candidates(
+        self, fields: list, profile_ids: list = None, chunk_size: int = 2000
+    ) -> RepositoryResponse:
+        """
+        Matching candidates (keyed by profile id) for live preferences.
+
+        Args:
+            fields (list): UserPreferences fields the scorer reads
+            profile_ids (list): only these profiles, default every profile
+
+        Business logic:
+            Reads narrow named rows with keyset pagination instead of model
+            instances, so the whole pool fits in memory.
+
+        Returns:
+            RepositoryResponse: data is a list of MatchCandidate
+        """
+        try:
+            preferences = UserPreferences.objects.all()
+            compatibility = UserCompatibilityPreferences.objects.all()
+            if profile_ids is not None:
+                preferences = preferences.filter(profile_id__in=profile_ids)
+                compatibility = compatibility.filter(profile_id__in=profile_ids)
+
+            importances = {
+                row.profile_id: row
+                for row in stream_keyset(
+                    compatibility.unordered(),
+                    ["profile_id", *IMPORTANCE_FIELDS],
+                    chunk_size=chunk_size,
+                    named=True,
+                )
+            }
+            candidates = [
+                MatchCandidate(
+                    id=row.profile_id,
+                    preferences=row,
+                    compatibility=importances.get(row.profile_id),
+                )
+                for row in stream_keyset(
+                    preferences.unordered(),
+                    ["profile_id", *fields],
+                    chunk_size=chunk_size,
+                    named=True,
+                )
+            ]
+            return RepositoryResponse(
+                success=True, message="Candidates loaded", data=candidates
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error loading match candidates: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def replace_matches(
+        self, profile_id: int, scored: list, weights_version: str
+    ) -> RepositoryResponse:
+        """Replace the stored matches of one profile with (candidate_id, score) pairs"""
+        try:
+            with transaction.atomic():
+                UserMatch.objects.filter(profile_id=profile_id).delete()
+                UserMatch.objects.bulk_create(
+                    [
+                        UserMatch(
+                            profile_id=profile_id,
+                            candidate_id=candidate_id,
+                            score=score,
+                            weights_version=weights_version,
+                        )
+                        for candidate_id, score in scored
+                    ]
+                )
+            return RepositoryResponse(
+                success=True, message="Matches replaced", data=len(scored)
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error replacing matches: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def get_top_matches(self, profile_id: int, limit: int) -> RepositoryResponse:
+        """
+        A profile's best stored matches, highest score first.
+
+        Returns:
+            RepositoryResponse: data is a list of (candidate_id,
+            candidate_user_id, score, rating_score) rows, read with one
+            indexed query; rating_score is the candidate's precomputed
+            feedback score (None before their first rating)
+        """
+        try:
+            rows = list(
+                UserMatch.objects.filter(profile_id=profile_id)
+                .order_by("-score", "candidate_id")
+                .values_list(
+                    "candidate_id",
+                    "candidate__user_id",
+                    "score",
+                    "candidate__user__rating_aggregate__bayesian_score",
+                )[:limit]
+            )
+            return RepositoryResponse(
+                success=True, message="Matches retrieved", data=rows
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error reading stored matches: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def profiles_matched_with(self, candidate_id: int) -> RepositoryResponse:
+        """Profiles whose stored matches include `candidate_id`"""
+        try:
+            profile_ids = list(
+                UserMatch.objects.filter(candidate_id=candidate_id).values_list(
+                    "profile_id", flat=True
+                )
+            )
+            return RepositoryResponse(
+                success=True, message="Profiles found", data=profile_ids
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error reading reverse matches: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def upsert_reverse_matches(
+        self, candidate_id: int, scored: list, weights_version: str, limit: int
+    ) -> RepositoryResponse:
+        """
+        Put `candidate_id` into the match lists of other profiles.
+
+        Args:
+            scored (list): (profile_id, score) pairs; scores are symmetric
+            limit (int): matches kept per profile, the lowest are trimmed
+
+        Business logic:
+            1. Upsert the (profile, candidate_id) rows with the new score.
+            2. Trim each touched profile back to its best `limit` matches.
+        """
+        try:
+            with transaction.atomic():
+                profile_ids = [profile_id for profile_id, _ in scored]
+                UserMatch.objects.filter(
+                    profile_id__in=profile_ids, candidate_id=candidate_id
+                ).delete()
+                UserMatch.objects.bulk_create(
+                    [
+                        UserMatch(
+                            profile_id=profile_id,
+                            candidate_id=candidate_id,
+                            score=score,
+                            weights_version=weights_version,
+                        )
+                        for profile_id, score in scored
+                    ]
+                )
+                trimmed = 0
+                for profile_id in profile_ids:
+                    surplus = UserMatch.objects.filter(profile_id=profile_id).order_by(
+                        "-score", "candidate_id"
+                    )[limit:]
+                    trimmed += UserMatch.objects.filter(
+                        id__in=list(surplus.values_list("id", flat=True))
+                    ).delete()[0]
+            return RepositoryResponse(
+                success=True, message="Reverse matches updated", data=trimmed
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error updating reverse matches: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def delete_matches_of(self, profile_id: int) -> RepositoryResponse:
+        """Remove a profile from every match list, in both directions"""
+        try:
+            deleted = (
+                UserMatch.objects.filter(profile_id=profile_id).delete()[0]
+                + UserMatch.objects.filter(candidate_id=profile_id).delete()[0]
+            )
+            return RepositoryResponse(
+                success=True, message="Matches deleted", data=deleted
+            )
+        except Exception as e:
+            self.logger.log(f"Error deleting matches: {str(e)}", level="error", error=e)
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
@@ -0,0 +1,91 @@
+# Match Query Service
+from django.conf import settings
+
+from core.utils.data_classes import ServiceResponse
+from core.utils.logging import LoggingService
+from matches.repositories.match_repository import MatchRepository
+from realtime.presence import get_presence_store
+
+
+class MatchQueryService:
+    """
+    Service layer for reading a user's stored matches
+    Returns ServiceResponse with plain data for views
+    """
+
+    def __init__(self):
+        self.repository = MatchRepository()
+        self.logger = LoggingService()
+
+    def get_top_matches(self, user, params) -> ServiceResponse:
+        """
+        Args:
+            user: The requesting user.
+            params: Query parameters: `limit` and `online_first`.
+
+        Business logic:
+            1. Read the stored top matches (kept up to date by
+               process_match_updates) with each candidate's precomputed
+               feedback score (process_feedback) in one query.
+            2. Flag who is online with one bulk presence lookup instead of a
+               query per candidate.
+            3. With online_first, move online candidates ahead of offline
+               ones, keeping score order within each group.
+
+        Returns:
+            ServiceResponse: matches with profile_id, user_id, score,
+            rating_score and online.
+        """
+        try:
+            if not hasattr(user, "userprofile"):
+                return ServiceResponse(
+                    success=False, message="User profile not found", status_code=404
+                )
+            matches_per_user = getattr(settings, "MATCHES_PER_USER", 20)
+            try:
+                limit = int(params.get("limit", matches_per_user))
+            except ValueError:
+                return ServiceResponse(
+                    success=False, message="limit must be an integer", status_code=400
+                )
+            limit = max(1, min(limit, matches_per_user))
+            online_first = params.get("online_first", "").lower() in ["1", "true"]
+
+            repo_response = self.repository.get_top_matches(
+                user.userprofile.id, matches_per_user if online_first else limit
+            )
+            if not repo_response.success:
+                raise RuntimeError(repo_response.message)
+
+            rows = repo_response.data
+            online = get_presence_store().online_among(
+                [user_id for _, user_id, _, _ in rows]
+            )
+            matches = [
+                {
+                    "profile_id": profile_id,
+                    "user_id": user_id,
+                    "score": score,
+                    "rating_score": (
+                        round(rating_score, 3) if rating_score is not None else None
+                    ),
+                    "online": user_id in online,
+                }
+                for profile_id, user_id, score, rating_score in rows
+            ]
+            if online_first:
+                # sorted() is stable, so score order holds within each group
+                matches = sorted(matches, key=lambda match: not match["online"])
+            return ServiceResponse(
+                success=True,
+                message="Matches retrieved successfully",
+                data={"matches": matches[:limit]},
+                status_code=200,
+            )
+        except Exception as e:
+            self.logger.log(f"Error getting matches: {str(e)}", level="error", error=e)
+            return ServiceResponse(
+                success=False,
+                message="An error occurred while retrieving matches",
+                status_code=500,
+            )
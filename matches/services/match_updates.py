@@ -0,0 +1,196 @@
+# Incremental Match Updates Service
+from django.conf import settings
+from django.db import transaction
+
+from core.utils.data_classes import ServiceResponse
+from core.utils.logging import LoggingService
+from matches.repositories.match_repository import MatchRepository
+from users.utils.compatibility_weights import IMPORTANCE_FIELDS, get_weight_profile
+from users.utils.matching_engines import ENGINES
+
+
+class MatchUpdateService:
+    """
+    Consumer of PreferenceChangeEvent rows that keeps UserMatch up to date.
+
+    Holds an in-memory candidate index (built once, then updated one user at
+    a time) so a questionnaire change costs one user scored against the
+    pool instead of a full N x N recomputation.
+    Returns ServiceResponse with processing counts
+    """
+
+    def __init__(self, engine_name: str = None, matches_per_user: int = None):
+        self.repository = MatchRepository()
+        self.logger = LoggingService()
+        self.engine_name = engine_name or getattr(
+            settings, "MATCH_UPDATE_ENGINE", "exact"
+        )
+        engine_class = ENGINES[self.engine_name]
+        if not hasattr(engine_class, "add"):
+            raise ValueError(
+                f"Engine '{self.engine_name}' cannot be updated incrementally"
+            )
+        self.engine_class = engine_class
+        self.matches_per_user = matches_per_user or getattr(
+            settings, "MATCHES_PER_USER", 20
+        )
+        self.engine = None
+
+    @staticmethod
+    def needs_rescore(event, scored_fields) -> bool:
+        """Creations and deletions always count, updates only if a scored field changed"""
+        if event.kind != "updated":
+            return True
+        return bool(set(event.changed_fields) & set(scored_fields))
+
+    def _ensure_index(self):
+        """Build the index on first use and whenever another weight version is active"""
+        profile = get_weight_profile()
+        if self.engine is not None and self.engine.profile is profile:
+            return
+        repo_response = self.repository.load_candidates(list(profile.fields))
+        if not repo_response.success:
+            raise RuntimeError(repo_response.message)
+        self.engine = self.engine_class()
+        self.engine.build(repo_response.data)
+
+    def _rescore(self, candidate):
+        """
+        Re-score one user and patch the stored match lists around them.
+
+        Business logic:
+            1. The user's own list is replaced by their new top matches.
+            2. Profiles that listed the user, plus the user's new top
+               matches, get the new (symmetric) score and are trimmed back
+               to MATCHES_PER_USER. Lists the user would newly enter without
+               being in either group catch up on their own next rescore.
+        """
+        version = self.engine.profile.version
+        top = self.engine.top_k(candidate, self.matches_per_user)
+        replace_response = self.repository.replace_matches(candidate.id, top, version)
+        if not replace_response.success:
+            raise RuntimeError(replace_response.message)
+
+        listed_response = self.repository.profiles_matched_with(candidate.id)
+        if not listed_response.success:
+            raise RuntimeError(listed_response.message)
+        reverse_ids = set(listed_response.data) | {id for id, _ in top}
+        reverse = self.engine.score_ids(candidate, reverse_ids)
+        reverse_response = self.repository.upsert_reverse_matches(
+            candidate.id,
+            [(id, round(score, 2)) for id, score in reverse],
+            version,
+            self.matches_per_user,
+        )
+        if not reverse_response.success:
+            raise RuntimeError(reverse_response.message)
+
+    def process_pending(self, batch_size: int = 100) -> ServiceResponse:
+        """
+        Handle one batch of pending change events.
+
+        Business logic:
+            1. Claim the oldest events; several events of one profile are
+               handled once.
+            2. Profiles whose events only touched unscored fields (e.g.
+               media_favorites) are skipped without any scoring. Changes of
+               compatibility importances count as scored.
+            3. Others are reloaded into the index and re-scored; profiles
+               without live preferences are removed from the index and from
+               every match list.
+            4. Events are marked processed in the same transaction, so a
+               failure leaves the whole batch pending for a retry.
+
+        Returns:
+            ServiceResponse: data has events, rescored, skipped, removed counts
+        """
+        try:
+            self._ensure_index()
+            # Importances scale the weights of the scored fields
+            scored_fields = (*self.engine.profile.fields, *IMPORTANCE_FIELDS)
+            with transaction.atomic():
+                claim_response = self.repository.claim_pending_events(batch_size)
+                if not claim_response.success:
+                    raise RuntimeError(claim_response.message)
+                events = claim_response.data
+
+                affected = {}
+                for event in events:
+                    affected.setdefault(event.profile_id, False)
+                    if self.needs_rescore(event, scored_fields):
+                        affected[event.profile_id] = True
+                profile_ids = [id for id, rescore in affected.items() if rescore]
+
+                load_response = self.repository.load_candidates(
+                    list(self.engine.profile.fields), profile_ids=profile_ids
+                )
+                if not load_response.success:
+                    raise RuntimeError(load_response.message)
+                candidates = {
+                    candidate.id: candidate for candidate in load_response.data
+                }
+
+                removed = 0
+                for profile_id in profile_ids:
+                    candidate = candidates.get(profile_id)
+                    if candidate is None:
+                        self.engine.remove(profile_id)
+                        self.repository.delete_matches_of(profile_id)
+                        removed += 1
+                    else:
+                        self.engine.add(candidate)
+                        self._rescore(candidate)
+
+                self.repository.mark_processed([event.id for event in events])
+
+            counts = {
+                "events": len(events),
+                "rescored": len(profile_ids) - removed,
+                "skipped": len(affected) - len(profile_ids),
+                "removed": removed,
+            }
+            if events:
+                self.logger.log(f"Match updates processed: {counts}")
+            return ServiceResponse(
+                success=True,
+                message="Match updates processed",
+                data=counts,
+                status_code=200,
+            )
+
+        except Exception as e:
+            self.logger.log(
+                f"Error processing match updates: {str(e)}", level="error", error=e
+            )
+            return ServiceResponse(
+                success=False,
+                message="An error occurred while processing match updates",
+                status_code=500,
+            )
+
+    def rebuild_all(self) -> ServiceResponse:
+        """Recompute every stored match list from scratch (e.g. after activating new weights)"""
+        try:
+            self.engine = None
+            self._ensure_index()
+            version = self.engine.profile.version
+            for candidate in list(self.engine.by_id.values()):
+                top = self.engine.top_k(candidate, self.matches_per_user)
+                response = self.repository.replace_matches(candidate.id, top, version)
+                if not response.success:
+                    raise RuntimeError(response.message)
+            return ServiceResponse(
+                success=True,
+                message="Matches rebuilt",
+                data={"rescored": len(self.engine.by_id)},
+                status_code=200,
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error rebuilding matches: {str(e)}", level="error", error=e
+            )
+            return ServiceResponse(
+                success=False,
+                message="An error occurred while rebuilding matches",
+                status_code=500,
+            )
@@ -0,0 +1,12 @@
+# Background tasks of the matches app
+from matches.services.match_updates import MatchUpdateService
+from tasks.registry import task
+
+
+@task
+def rebuild_matches() -> int:
+    """Periodic: recompute every stored match list; returns users rescored"""
+    response = MatchUpdateService().rebuild_all()
+    if not response.success:
+        raise RuntimeError(response.message)
+    return response.data["rescored"]
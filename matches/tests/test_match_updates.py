@@ -0,0 +1,160 @@
+# Test preference change events and incremental match updates
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from matches.models import UserMatch
+from users.models import (
+    PreferenceChangeEvent,
+    UserCompatibilityPreferences,
+    UserPreferences,
+    UserProfile,
+)
+from users.repositories.compatibility_repository import (
+    CompatibilityPreferencesRepository,
+)
+from users.repositories.preferences_repository import PreferencesRepository
+from matches.services.match_updates import MatchUpdateService
+from users.utils.compatibility_weights import weight_registry
+
+
+class TestMatchUpdates(TestCase):
+    """Test class for the match update consumer."""
+
+    def setUp(self):
+        cache.clear()
+        weight_registry.invalidate()
+        self.addCleanup(cache.clear)
+        self.repository = PreferencesRepository()
+        self.service = MatchUpdateService(matches_per_user=2)
+        self.profiles = []
+        for i, hobbies in enumerate(
+            [["reading"], ["reading", "music"], ["hiking"], ["reading"]]
+        ):
+            user = User.objects.create_user(f"member{i}", f"member{i}@example.com")
+            profile = UserProfile.objects.create(user=user)
+            self.repository.create_preferences(
+                profile, {"age_range": "25-34", "top_hobbies": hobbies}
+            )
+            self.profiles.append(profile)
+
+    def _matches(self, profile):
+        return list(
+            UserMatch.objects.filter(profile=profile)
+            .order_by("-score", "candidate_id")
+            .values_list("candidate_id", "score")
+        )
+
+    def _preferences(self, profile):
+        return UserPreferences.objects.get(profile=profile)
+
+    def test_save_path_records_changed_fields(self):
+        """Test create, update and delete each queue one event with the diff."""
+        preferences = self._preferences(self.profiles[0])
+        self.repository.update_preferences(
+            preferences, {"age_range": "25-34", "media_favorites": "Dune"}
+        )
+        self.repository.update_preferences(preferences, {"age_range": "25-34"})
+        self.repository.delete_preferences(preferences)
+
+        events = PreferenceChangeEvent.objects.filter(
+            profile=self.profiles[0]
+        ).order_by("id")
+        self.assertEqual(
+            [(event.kind, event.changed_fields) for event in events],
+            [
+                ("created", ["age_range", "top_hobbies"]),
+                ("updated", ["media_favorites"]),
+                ("deleted", []),
+            ],
+        )
+
+    def test_created_events_build_match_lists(self):
+        """Test the first batch scores every new user and trims to the limit."""
+        response = self.service.process_pending()
+
+        self.assertTrue(response.success)
+        self.assertEqual(response.data["rescored"], 4)
+        self.assertEqual(
+            self._matches(self.profiles[0]),
+            [(self.profiles[3].id, 100.0), (self.profiles[1].id, 66.67)],
+        )
+        self.assertFalse(
+            PreferenceChangeEvent.objects.filter(processed_at__isnull=True).exists()
+        )
+
+    def test_unscored_change_is_skipped(self):
+        """Test a change to an unscored text field does no scoring work."""
+        self.service.process_pending()
+        self.repository.update_preferences(
+            self._preferences(self.profiles[0]), {"media_favorites": "Dune"}
+        )
+
+        with self.assertNumQueries(4):
+            response = self.service.process_pending()
+
+        self.assertEqual(response.data["skipped"], 1)
+        self.assertEqual(response.data["rescored"], 0)
+
+    def test_scored_change_updates_both_directions(self):
+        """Test the changed user's list and the lists they appear in are patched."""
+        self.service.process_pending()
+        self.repository.update_preferences(
+            self._preferences(self.profiles[2]), {"top_hobbies": ["reading"]}
+        )
+
+        response = self.service.process_pending()
+
+        self.assertEqual(response.data["rescored"], 1)
+        self.assertEqual(
+            self._matches(self.profiles[2]),
+            [(self.profiles[0].id, 100.0), (self.profiles[3].id, 100.0)],
+        )
+        # profile 0 now ranks profile 2 ahead of profile 1 (66.67)
+        self.assertEqual(
+            self._matches(self.profiles[0]),
+            [(self.profiles[2].id, 100.0), (self.profiles[3].id, 100.0)],
+        )
+
+    def test_deleted_preferences_leave_every_list(self):
+        """Test deleting preferences removes the user from the index and lists."""
+        self.service.process_pending()
+        self.repository.delete_preferences(self._preferences(self.profiles[3]))
+
+        response = self.service.process_pending()
+
+        self.assertEqual(response.data["removed"], 1)
+        self.assertNotIn(self.profiles[3].id, self.service.engine.by_id)
+        self.assertFalse(UserMatch.objects.filter(candidate=self.profiles[3]).exists())
+
+    def test_soft_deleted_preferences_leave_every_list(self):
+        """Test a queryset soft delete queues an event like the repository."""
+        self.service.process_pending()
+        UserPreferences.objects.filter(profile=self.profiles[3]).soft_delete()
+
+        response = self.service.process_pending()
+
+        self.assertEqual(response.data["removed"], 1)
+        self.assertFalse(UserMatch.objects.filter(candidate=self.profiles[3]).exists())
+
+    def test_importance_changes_rescore(self):
+        """Test compatibility importances are scored, other criteria are not."""
+        self.service.process_pending()
+        compatibility = CompatibilityPreferencesRepository()
+        created = compatibility.create_preferences(self.profiles[1], {}).data
+
+        self.assertEqual(self.service.process_pending().data["rescored"], 1)
+
+        compatibility.update_preferences(created, {"geographic_preference": "Kigali"})
+        self.assertFalse(
+            PreferenceChangeEvent.objects.filter(processed_at__isnull=True).exists()
+        )
+        compatibility.update_preferences(created, {"lifestyle_importance": 10})
+        self.assertEqual(self.service.process_pending().data["rescored"], 1)
+
+        UserCompatibilityPreferences.objects.filter(pk=created.pk).soft_delete()
+        events = PreferenceChangeEvent.objects.filter(processed_at__isnull=True)
+        self.assertEqual(
+            [(event.kind, event.profile_id) for event in events],
+            [("updated", self.profiles[1].id)],
+        )
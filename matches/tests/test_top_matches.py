@@ -0,0 +1,79 @@
+# Test the top matches endpoint and its online-first ordering
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from feedback.models import FriendRatingAggregate
+from matches.models import UserMatch
+from realtime.presence import get_presence_store
+from users.models import UserProfile
+
+
+@override_settings(PRESENCE_STORE="realtime.presence.InMemoryPresenceStore")
+class TestTopMatchesEndpoint(TestCase):
+    """Test class for GET /api/v1/matches/."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.store = get_presence_store()
+        self.store.reset()
+        self.addCleanup(self.store.reset)
+        self.profiles = []
+        for i in range(5):
+            user = User.objects.create_user(f"member{i}", f"member{i}@example.com")
+            self.profiles.append(UserProfile.objects.create(user=user))
+        self.me = self.profiles[0]
+        for score, candidate in zip([90, 80, 70, 60], self.profiles[1:]):
+            UserMatch.objects.create(
+                profile=self.me, candidate=candidate, score=score, weights_version="v"
+            )
+        self.client.force_authenticate(self.me.user)
+
+    def _user_ids(self, response):
+        return [match["user_id"] for match in response.data["matches"]]
+
+    def test_flags_online_candidates_in_score_order(self):
+        """Test matches keep score order and report who is online."""
+        self.store.touch(self.profiles[3].user_id)
+
+        response = self.client.get(reverse("top_matches"), {"limit": 3})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self._user_ids(response), [p.user_id for p in self.profiles[1:4]]
+        )
+        self.assertEqual(
+            [match["online"] for match in response.data["matches"]],
+            [False, False, True],
+        )
+
+    def test_online_first_favours_available_friends(self):
+        """Test online candidates come first without a query per candidate."""
+        self.store.touch(self.profiles[4].user_id)
+        self.store.touch(self.profiles[2].user_id)
+
+        # The stored matches only; presence is one in-memory bulk lookup
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse("top_matches"), {"limit": 3, "online_first": "true"}
+            )
+
+        self.assertEqual(
+            self._user_ids(response),
+            [self.profiles[i].user_id for i in [2, 4, 1]],
+        )
+
+    def test_includes_precomputed_rating_scores(self):
+        """Test each candidate carries their feedback score from the same query."""
+        FriendRatingAggregate.objects.create(
+            user=self.profiles[1].user, ratings_count=3, bayesian_score=4.25
+        )
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("top_matches"), {"limit": 2})
+
+        self.assertEqual(
+            [match["rating_score"] for match in response.data["matches"]],
+            [4.25, None],
+        )
@@ -0,0 +1,8 @@
+# matches urls
+from django.urls import path
+
+from .views import top_matches_view
+
+urlpatterns = [
+    path("", top_matches_view, name="top_matches"),
+]
@@ -1,3 +1,21 @@
-from django.shortcuts import render
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
-# Create your views here.
+from matches.services.match_query import MatchQueryService
+
+# Initialize services
+match_query = MatchQueryService()
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def top_matches_view(request):
+    """Get the user's top matches (?limit=, ?online_first=true)"""
+    service_response = match_query.get_top_matches(request.user, request.query_params)
+    if not service_response.success:
+        return Response(
+            {"message": service_response.message},
+            status=service_response.status_code,
+        )
+    return Response(service_response.data, status=service_response.status_code)
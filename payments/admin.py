@@ -1,3 +1,76 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 
-# Register your models here.
+from core.utils.pagination import EstimatedCountPaginator
+from .models import StripeCustomer, StripeEvent, Subscription
+
+
+@admin.register(StripeEvent)
+class StripeEventAdmin(admin.ModelAdmin):
+    list_display = [
+        "event_id",
+        "type",
+        "ordering_key",
+        "status",
+        "attempts",
+        "stripe_created",
+        "processed_at",
+    ]
+    list_filter = ["status", "type", "livemode"]
+    search_fields = ["event_id", "ordering_key"]
+    ordering = ["-id"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    readonly_fields = [
+        "event_id",
+        "type",
+        "ordering_key",
+        "stripe_created",
+        "livemode",
+        "payload",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "last_error",
+        "processed_at",
+        "created_at",
+    ]
+    actions = ["reprocess"]
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Process selected events again")
+    def reprocess(self, request, queryset):
+        updated = queryset.update(
+            status="pending",
+            attempts=0,
+            next_attempt_at=None,
+            processed_at=None,
+        )
+        self.message_user(
+            request, f"{updated} event(s) queued for processing.", messages.SUCCESS
+        )
+
+
+@admin.register(StripeCustomer)
+class StripeCustomerAdmin(admin.ModelAdmin):
+    list_display = ["customer_id", "user", "email", "updated_at"]
+    list_select_related = ["user"]
+    search_fields = ["customer_id", "email"]
+    raw_id_fields = ["user"]
+
+
+@admin.register(Subscription)
+class SubscriptionAdmin(admin.ModelAdmin):
+    list_display = [
+        "subscription_id",
+        "customer_id",
+        "user",
+        "status",
+        "price_id",
+        "current_period_end",
+    ]
+    list_filter = ["status", "cancel_at_period_end"]
+    list_select_related = ["user"]
+    search_fields = ["subscription_id", "customer_id"]
+    raw_id_fields = ["user"]
@@ -0,0 +1,132 @@
+# Fake Stripe: signed webhook events for tests and load tests
+import json
+import random
+import time
+
+from payments.utils.signature import sign
+
+PRICES = ["price_basic", "price_plus", "price_pro"]
+STATUSES = ["active", "active", "active", "past_due", "trialing"]
+
+
+class FakeStripeEvents:
+    """
+    Generate realistic webhook events for `customers` fake customers.
+
+    Each customer starts with customer.created and
+    customer.subscription.created, then receives a random mix of
+    subscription updates, customer updates and event types the processor
+    ignores (invoice.paid). Each event is created a second after the
+    previous one, so per customer order is well defined. With
+    `duplicate_rate`, that share of deliveries repeats an event already
+    sent, as Stripe's at least once delivery does.
+
+    Ids carry `prefix` ("evt_<prefix>_...", "cus_<prefix>_...") so a run's
+    rows can be found and removed.
+    """
+
+    def __init__(
+        self,
+        customers: int = 100,
+        duplicate_rate: float = 0.0,
+        prefix: str = "fake",
+        user_ids: list = None,
+        seed: int = 0,
+    ):
+        self.customers = customers
+        self.duplicate_rate = duplicate_rate
+        self.prefix = prefix
+        self.user_ids = user_ids or []
+        self.random = random.Random(seed)
+        self.created = int(time.time()) - 3600
+        self.sequence = 0
+        self.started = set()
+
+    def customer_id(self, index: int) -> str:
+        return f"cus_{self.prefix}_{index}"
+
+    def subscription_id(self, index: int) -> str:
+        return f"sub_{self.prefix}_{index}"
+
+    def events(self, count: int):
+        """Yield `count` deliveries (event dicts, duplicates included)"""
+        sent = []
+        for _ in range(count):
+            if sent and self.random.random() < self.duplicate_rate:
+                yield self.random.choice(sent)
+                continue
+            event = self.next_event(self.random.randrange(self.customers))
+            sent.append(event)
+            yield event
+
+    def next_event(self, index: int) -> dict:
+        """The next event of customer `index`"""
+        if index not in self.started:
+            self.started.add(index)
+            return self.event("customer.created", self.customer(index))
+        if (index, "subscription") not in self.started:
+            self.started.add((index, "subscription"))
+            return self.event(
+                "customer.subscription.created", self.subscription(index, "active")
+            )
+        kind = self.random.random()
+        if kind < 0.6:
+            return self.event(
+                "customer.subscription.updated",
+                self.subscription(index, self.random.choice(STATUSES)),
+            )
+        if kind < 0.7:
+            return self.event("customer.updated", self.customer(index))
+        return self.event(
+            "invoice.paid",
+            {
+                "id": f"in_{self.prefix}_{self.sequence}",
+                "object": "invoice",
+                "customer": self.customer_id(index),
+                "amount_paid": 1500,
+            },
+        )
+
+    def customer(self, index: int) -> dict:
+        metadata = {}
+        if index < len(self.user_ids):
+            metadata["user_id"] = str(self.user_ids[index])
+        return {
+            "id": self.customer_id(index),
+            "object": "customer",
+            "email": f"{self.prefix}_{index}@example.com",
+            "metadata": metadata,
+        }
+
+    def subscription(self, index: int, status: str) -> dict:
+        return {
+            "id": self.subscription_id(index),
+            "object": "subscription",
+            "customer": self.customer_id(index),
+            "status": status,
+            "cancel_at_period_end": self.random.random() < 0.1,
+            "current_period_end": self.created + 30 * 86400,
+            "items": {
+                "object": "list",
+                "data": [{"price": {"id": self.random.choice(PRICES)}}],
+            },
+        }
+
+    def event(self, event_type: str, obj: dict) -> dict:
+        self.sequence += 1
+        self.created += 1
+        return {
+            "id": f"evt_{self.prefix}_{self.sequence}",
+            "object": "event",
+            "type": event_type,
+            "created": self.created,
+            "livemode": False,
+            "api_version": "2024-06-20",
+            "data": {"object": obj},
+        }
+
+
+def signed_delivery(event: dict, secret: str, timestamp: int = None) -> tuple:
+    """(raw body, Stripe-Signature header) of one webhook delivery"""
+    body = json.dumps(event, separators=(",", ":")).encode()
+    return body, sign(body, secret, timestamp)
@@ -0,0 +1,190 @@
+# Stripe webhook load test: acknowledgement latency at a fixed event rate
+import platform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from core.benchmarks.runner import percentile
+from payments.fake_stripe import FakeStripeEvents, signed_delivery
+from payments.models import StripeCustomer, StripeEvent, Subscription
+from payments.services.event_processor import StripeEventProcessor
+
+ID_PREFIX = "load"
+
+
+def remove_load_test_rows():
+    StripeEvent.all_objects.filter(event_id__startswith=f"evt_{ID_PREFIX}_").delete()
+    StripeCustomer.objects.filter(customer_id__startswith=f"cus_{ID_PREFIX}_").delete()
+    Subscription.objects.filter(
+        subscription_id__startswith=f"sub_{ID_PREFIX}_"
+    ).delete()
+
+
+class WebhookLoadTest:
+    """
+    Send signed fake Stripe events at a fixed rate and measure how fast the
+    webhook acknowledges them, then how fast the processor drains them.
+
+    Business logic:
+        1. Generate and sign `events` deliveries up front (duplicates
+           included), so the timed loop only sends.
+        2. Open loop: delivery i is due at start + i / rate whatever the
+           earlier responses did. In process, the calling thread posts
+           through django.test.Client; with `url`, `concurrency` threads
+           post over HTTP. Acknowledgement latency is timed per request;
+           the delay between a delivery's due time and its send shows
+           whether the endpoint kept up with the rate.
+        3. Run StripeEventProcessor until nothing is pending and report
+           events applied per second.
+
+    Returns a JSON serialisable report from run().
+    """
+
+    def __init__(
+        self,
+        events: int = 5000,
+        rate: float = 1000.0,
+        customers: int = 500,
+        duplicate_rate: float = 0.01,
+        secret: str = "",
+        url: str = None,
+        concurrency: int = 16,
+        batch_size: int = 500,
+        stdout=None,
+    ):
+        self.events = events
+        self.rate = rate
+        self.customers = customers
+        self.duplicate_rate = duplicate_rate
+        self.secret = secret
+        self.url = url
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.stdout = stdout
+
+    def _write(self, message: str):
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+    def run(self) -> dict:
+        generator = FakeStripeEvents(
+            self.customers, self.duplicate_rate, prefix=ID_PREFIX
+        )
+        timestamp = int(time.time())
+        deliveries = [
+            signed_delivery(event, self.secret, timestamp)
+            for event in generator.events(self.events)
+        ]
+        unique = generator.sequence
+
+        if self.url:
+            results = self._send_over_http(deliveries)
+        else:
+            results = self._send_in_process(deliveries)
+        send_seconds = max(end for _, _, end, _ in results) - results[0][0]
+        ack_ms = sorted((end - start) * 1000 for _, start, end, _ in results)
+        lag_ms = sorted(max(start - due, 0.0) * 1000 for due, start, _, _ in results)
+        errors = sum(1 for *_, status in results if status != 200)
+        self._write(
+            f"  {len(results)} deliveries in {send_seconds:.2f}s, {errors} errors"
+        )
+
+        stored = StripeEvent.all_objects.filter(
+            event_id__startswith=f"evt_{ID_PREFIX}_"
+        ).count()
+        processor = StripeEventProcessor()
+        drained = {"events": 0, "processed": 0, "ignored": 0, "retried": 0}
+        started = time.perf_counter()
+        while True:
+            response = processor.process_pending(batch_size=self.batch_size)
+            if not response.success:
+                raise RuntimeError(response.message)
+            for key in drained:
+                drained[key] += response.data[key]
+            if response.data["events"] == 0:
+                break
+        drain_seconds = time.perf_counter() - started
+        self._write(f"  {drained['events']} events applied in {drain_seconds:.2f}s")
+
+        return {
+            "generated_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "database": connection.vendor,
+            "transport": "network" if self.url else "in-process",
+            "target_rate": self.rate,
+            "deliveries": len(results),
+            "unique_events": unique,
+            "events_stored": stored,
+            "errors": errors,
+            "achieved_rate": (
+                round(len(results) / send_seconds, 1) if send_seconds else 0.0
+            ),
+            "ack_p50_ms": round(percentile(ack_ms, 50), 3),
+            "ack_p95_ms": round(percentile(ack_ms, 95), 3),
+            "ack_p99_ms": round(percentile(ack_ms, 99), 3),
+            "ack_max_ms": round(ack_ms[-1], 3) if ack_ms else 0.0,
+            "send_lag_p99_ms": round(percentile(lag_ms, 99), 3),
+            "events_applied": drained["processed"] + drained["ignored"],
+            "events_retried": drained["retried"],
+            "drain_events_per_second": (
+                round(drained["events"] / drain_seconds, 1) if drain_seconds else 0.0
+            ),
+        }
+
+    def _send_in_process(self, deliveries: list) -> list:
+        from django.test import Client
+
+        client = Client()
+        path = reverse("stripe_webhook")
+        results = []
+        start = time.perf_counter()
+        for index, (body, signature) in enumerate(deliveries):
+            due = start + index / self.rate
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            sent = time.perf_counter()
+            response = client.post(
+                path,
+                data=body,
+                content_type="application/json",
+                HTTP_STRIPE_SIGNATURE=signature,
+            )
+            results.append((due, sent, time.perf_counter(), response.status_code))
+        return results
+
+    def _send_over_http(self, deliveries: list) -> list:
+        import requests
+
+        url = self.url.rstrip("/") + reverse("stripe_webhook")
+        local = threading.local()
+
+        def post(due, body, signature):
+            if not hasattr(local, "session"):
+                local.session = requests.Session()
+            sent = time.perf_counter()
+            response = local.session.post(
+                url,
+                data=body,
+                headers={
+                    "Content-Type": "application/json",
+                    "Stripe-Signature": signature,
+                },
+                timeout=30,
+            )
+            return due, sent, time.perf_counter(), response.status_code
+
+        futures = []
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            start = time.perf_counter()
+            for index, (body, signature) in enumerate(deliveries):
+                due = start + index / self.rate
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                futures.append(pool.submit(post, due, body, signature))
+        return [future.result() for future in futures]
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from payments.services.event_processor import StripeEventProcessor
+
+
+class Command(BaseCommand):
+    """Apply received Stripe webhook events"""
+
+    help = (
+        "Process pending Stripe events in batches, in order per customer: "
+        "update customers and subscriptions, retrying failed events with "
+        "backoff. Use --loop to keep polling."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--loop", action="store_true", help="Keep polling for new events"
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep when nothing is pending (with --loop)",
+        )
+
+    def handle(self, *args, **options):
+        processor = StripeEventProcessor()
+        while True:
+            response = processor.process_pending(batch_size=options["batch_size"])
+            if not response.success:
+                raise CommandError(response.message)
+            counts = response.data
+            if counts["events"]:
+                self.stdout.write(
+                    f"{counts['events']} events of {counts['customers']} customers: "
+                    f"{counts['processed']} processed, {counts['ignored']} ignored, "
+                    f"{counts['retried']} retried, {counts['failed']} failed"
+                )
+            if counts["events"] < options["batch_size"]:
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
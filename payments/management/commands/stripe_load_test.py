@@ -0,0 +1,117 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from core.benchmarks.runner import save_report
+from payments.load_test import WebhookLoadTest, remove_load_test_rows
+
+# Signs in process runs when STRIPE_WEBHOOK_SECRET is not set
+LOAD_TEST_SECRET = "whsec_load_test"
+
+
+class Command(BaseCommand):
+    """Load test the Stripe webhook endpoint with fake signed events"""
+
+    help = (
+        "Send signed fake Stripe events to the webhook at --rate events/sec "
+        "(in process, or against --url), report p50/p95/p99 acknowledgement "
+        "latency, then drain the stored events and report events applied/sec."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=5000)
+        parser.add_argument(
+            "--rate", type=float, default=1000.0, help="Deliveries per second"
+        )
+        parser.add_argument("--customers", type=int, default=500)
+        parser.add_argument(
+            "--duplicates",
+            type=float,
+            default=0.01,
+            help="Share of deliveries repeating an earlier event",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=16,
+            help="Concurrent requests (with --url)",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="Processor batch size"
+        )
+        parser.add_argument(
+            "--url",
+            help="Base URL of a running server sharing STRIPE_WEBHOOK_SECRET; "
+            "implies --use-current-db",
+        )
+        parser.add_argument(
+            "--use-current-db",
+            action="store_true",
+            help="Use the configured database (load test rows are removed "
+            "afterwards)",
+        )
+        parser.add_argument("--output", help="Write the report to this JSON file")
+
+    def handle(self, *args, **options):
+        if options["events"] < 1 or options["rate"] <= 0:
+            raise CommandError("Need at least one event and a positive rate")
+        secret = settings.STRIPE_WEBHOOK_SECRET
+        if options["url"] and not secret:
+            raise CommandError("--url requires STRIPE_WEBHOOK_SECRET")
+        secret = secret or LOAD_TEST_SECRET
+        use_current_db = options["use_current_db"] or bool(options["url"])
+
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        try:
+            if not use_current_db:
+                connection.creation.create_test_db(
+                    verbosity=0, autoclobber=True, serialize=False
+                )
+            with override_settings(STRIPE_WEBHOOK_SECRET=secret):
+                report = WebhookLoadTest(
+                    events=options["events"],
+                    rate=options["rate"],
+                    customers=options["customers"],
+                    duplicate_rate=options["duplicates"],
+                    secret=secret,
+                    url=options["url"],
+                    concurrency=options["concurrency"],
+                    batch_size=options["batch_size"],
+                    stdout=self.stdout,
+                ).run()
+        finally:
+            if use_current_db:
+                remove_load_test_rows()
+            else:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        for key in [
+            "transport",
+            "database",
+            "deliveries",
+            "events_stored",
+            "achieved_rate",
+            "ack_p50_ms",
+            "ack_p95_ms",
+            "ack_p99_ms",
+            "send_lag_p99_ms",
+            "drain_events_per_second",
+        ]:
+            self.stdout.write(f"  {key}: {report[key]}")
+        if options["output"]:
+            save_report(report, options["output"])
+            self.stdout.write(f"Results written to {options['output']}")
+        if report["errors"]:
+            raise CommandError(f"{report['errors']} deliveries were not acknowledged")
+        if report["events_stored"] != report["unique_events"]:
+            raise CommandError(
+                f"{report['events_stored']} events stored for "
+                f"{report['unique_events']} unique events"
+            )
@@ -1,3 +1,95 @@
 from django.db import models
 
-# Create your models here.
+from core.models import SlimBaseModel
+
+
+class StripeEvent(SlimBaseModel):
+    """
+    A Stripe webhook event exactly as received, keyed by Stripe's event id.
+
+    The webhook endpoint only verifies the signature and inserts this row
+    (a redelivered event hits the unique event_id and is dropped), so it
+    answers in one query. process_stripe_events applies pending events in
+    order per ordering_key: the Stripe customer, or the event itself when
+    it concerns no customer.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("processed", "Processed"),
+        ("ignored", "Ignored"),
+        ("failed", "Failed"),
+    ]
+
+    event_id = models.CharField(max_length=255, unique=True)
+    type = models.CharField(max_length=100)
+    ordering_key = models.CharField(max_length=255)
+    # Stripe's creation time of the event (second resolution)
+    stripe_created = models.DateTimeField()
+    livemode = models.BooleanField(default=False)
+    payload = models.JSONField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Retry backoff: later events of the same customer wait behind this one
+    next_attempt_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True, default="")
+    processed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["ordering_key", "stripe_created", "id"],
+                condition=models.Q(processed_at__isnull=True),
+                name="payments_event_pending_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.event_id} ({self.type})"
+
+
+class StripeCustomer(models.Model):
+    """Link between a Stripe customer and a user (metadata.user_id)"""
+
+    customer_id = models.CharField(max_length=255, primary_key=True)
+    user = models.OneToOneField(
+        "auth.User",
+        on_delete=models.SET_NULL,
+        related_name="stripe_customer",
+        blank=True,
+        null=True,
+    )
+    email = models.EmailField(blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.customer_id
+
+
+class Subscription(models.Model):
+    """
+    Current state of a Stripe subscription, maintained from
+    customer.subscription.* events. last_event_at keeps an older event
+    (Stripe does not guarantee delivery order) from overwriting a newer
+    state.
+    """
+
+    subscription_id = models.CharField(max_length=255, primary_key=True)
+    customer_id = models.CharField(max_length=255, db_index=True)
+    user = models.ForeignKey(
+        "auth.User",
+        on_delete=models.SET_NULL,
+        related_name="subscriptions",
+        blank=True,
+        null=True,
+    )
+    # Stripe statuses: trialing, active, past_due, canceled, unpaid, ...
+    status = models.CharField(max_length=30)
+    price_id = models.CharField(max_length=255, blank=True, default="")
+    current_period_end = models.DateTimeField(blank=True, null=True)
+    cancel_at_period_end = models.BooleanField(default=False)
+    last_event_at = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.subscription_id} ({self.status})"
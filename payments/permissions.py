@@ -0,0 +1,22 @@
+# Subscription gating for views
+from rest_framework.permissions import BasePermission
+
+from payments.utils.entitlements import get_entitlement
+
+
+class HasActiveSubscription(BasePermission):
+    """
+    Allow authenticated users with an entitling subscription.
+
+    Answered from the access token's entitlement claim or the per-process
+    entitlement cache, so gating a view adds no query on the hot path.
+    """
+
+    message = "An active subscription is required"
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not user or not user.is_authenticated:
+            return False
+        token = request.auth if hasattr(request.auth, "get") else None
+        return get_entitlement(user.id, token).active
@@ -0,0 +1,248 @@
+# Stripe Repository
+from django.contrib.auth.models import User
+from django.db.models import F, Min
+
+from core.utils.data_classes import RepositoryResponse
+from core.utils.logging import LoggingService
+from payments.models import StripeCustomer, StripeEvent, Subscription
+
+# Columns process_stripe_events writes back after applying events
+EVENT_RESULT_FIELDS = [
+    "status",
+    "attempts",
+    "next_attempt_at",
+    "last_error",
+    "processed_at",
+]
+
+
+class StripeRepository:
+    """
+    Repository layer for received Stripe events and the billing state
+    they maintain (customers and subscriptions)
+    Returns RepositoryResponse with raw objects/querysets
+    """
+
+    def __init__(self):
+        self.logger = LoggingService()
+
+    def create_event(self, data: dict) -> RepositoryResponse:
+        """
+        Insert one received event; its only query on the webhook path.
+
+        INSERT ... ON CONFLICT DO NOTHING: a redelivered event hits the
+        unique event_id and is dropped without a lookup, and without an
+        IntegrityError aborting the surrounding transaction.
+        """
+        try:
+            StripeEvent.objects.bulk_create(
+                [StripeEvent(**data)], ignore_conflicts=True
+            )
+            return RepositoryResponse(success=True, message="Event received")
+        except Exception as e:
+            self.logger.log(
+                f"Error storing Stripe event: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def get_pending_keys(self, limit: int, now) -> RepositoryResponse:
+        """
+        Ordering keys with pending events, the longest waiting first. Keys
+        whose next event is backing off after a failure are left out.
+        """
+        try:
+            pending = StripeEvent.objects.filter(processed_at__isnull=True)
+            keys = list(
+                pending.exclude(
+                    ordering_key__in=pending.filter(next_attempt_at__gt=now).values(
+                        "ordering_key"
+                    )
+                )
+                .values("ordering_key")
+                .annotate(oldest=Min("stripe_created"))
+                .order_by("oldest")
+                .values_list("ordering_key", flat=True)[:limit]
+            )
+            return RepositoryResponse(
+                success=True, message="Pending keys retrieved", data=keys
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error listing pending Stripe events: {str(e)}",
+                level="error",
+                error=e,
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def claim_events(self, ordering_key: str, limit: int) -> RepositoryResponse:
+        """
+        Lock the pending events of one ordering key in Stripe's order.
+
+        Must be called inside transaction.atomic() while holding the key's
+        advisory lock. No SKIP LOCKED here: skipping a locked event would
+        let a later one of the same customer overtake it.
+        """
+        try:
+            events = list(
+                StripeEvent.objects.filter(
+                    ordering_key=ordering_key, processed_at__isnull=True
+                )
+                .select_for_update()
+                .order_by("stripe_created", "id")[:limit]
+            )
+            return RepositoryResponse(
+                success=True, message="Pending events claimed", data=events
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error claiming Stripe events: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def save_event_results(self, events: list) -> RepositoryResponse:
+        try:
+            # An upsert on the primary key, as DatabaseTaskBackend.finish:
+            # bulk_update's CASE per field and row costs more than the events
+            StripeEvent.all_objects.bulk_create(
+                events,
+                update_conflicts=True,
+                unique_fields=["id"],
+                update_fields=EVENT_RESULT_FIELDS,
+            )
+            return RepositoryResponse(
+                success=True, message="Event results saved", data=len(events)
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error saving Stripe event results: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def save_customer(
+        self, customer_id: str, user_id, email: str
+    ) -> RepositoryResponse:
+        """
+        Create or update a customer. `user_id` comes from the customer's
+        metadata; an id naming no user leaves the customer unlinked.
+        """
+        try:
+            if user_id is not None and not User.objects.filter(id=user_id).exists():
+                user_id = None
+            customer, _ = StripeCustomer.objects.update_or_create(
+                customer_id=customer_id, defaults={"user_id": user_id, "email": email}
+            )
+            return RepositoryResponse(
+                success=True, message="Customer saved", data=customer
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error saving Stripe customer: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def get_customer_user_id(self, customer_id: str) -> RepositoryResponse:
+        try:
+            user_id = (
+                StripeCustomer.objects.filter(customer_id=customer_id)
+                .values_list("user_id", flat=True)
+                .first()
+            )
+            return RepositoryResponse(
+                success=True, message="Customer user retrieved", data=user_id
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error retrieving Stripe customer: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def save_subscription(self, data: dict) -> RepositoryResponse:
+        """
+        Apply a subscription state unless a newer event already did.
+
+        Returns:
+            RepositoryResponse: data is the saved Subscription, or None when
+                the event was older than the stored state.
+        """
+        try:
+            subscription = (
+                Subscription.objects.select_for_update()
+                .filter(subscription_id=data["subscription_id"])
+                .first()
+            )
+            if subscription is None:
+                subscription = Subscription.objects.create(**data)
+            elif subscription.last_event_at > data["last_event_at"]:
+                return RepositoryResponse(
+                    success=True, message="Newer state already applied", data=None
+                )
+            else:
+                for field, value in data.items():
+                    setattr(subscription, field, value)
+                subscription.save()
+            return RepositoryResponse(
+                success=True, message="Subscription saved", data=subscription
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error saving subscription: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def link_subscriptions(self, customer_id: str, user_id) -> RepositoryResponse:
+        """Point the subscriptions of a customer at its (re)linked user"""
+        try:
+            updated = (
+                Subscription.objects.filter(customer_id=customer_id)
+                .exclude(user_id=user_id)
+                .update(user_id=user_id)
+            )
+            return RepositoryResponse(
+                success=True, message="Subscriptions linked", data=updated
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error linking subscriptions: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def get_entitlement_plan(self, user_id: int, statuses: list) -> RepositoryResponse:
+        """
+        Plan (price id) of the user's entitling subscription, the one paid
+        furthest ahead if several (one without a period end comes last, as
+        on SQLite; PostgreSQL sorts NULLs first by default); data is None
+        without one.
+        """
+        try:
+            plan = (
+                Subscription.objects.filter(user_id=user_id, status__in=statuses)
+                .order_by(F("current_period_end").desc(nulls_last=True))
+                .values_list("price_id", flat=True)
+                .first()
+            )
+            return RepositoryResponse(
+                success=True, message="Entitlement retrieved", data=plan
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error retrieving entitlement: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
@@ -0,0 +1,42 @@
+# Entitlement Service
+from core.utils.data_classes import ServiceResponse
+from core.utils.logging import LoggingService
+from payments.utils.entitlements import get_entitlement
+
+
+class EntitlementService:
+    """
+    Service layer for what a user's subscription entitles them to
+    Returns ServiceResponse with the entitlement
+    """
+
+    def __init__(self):
+        self.logger = LoggingService()
+
+    def get_entitlement(self, user, token=None) -> ServiceResponse:
+        """
+        Args:
+            user (User): The authenticated user.
+            token: The request's access token, whose entitlement claim is
+                used while fresh.
+
+        Returns:
+            ServiceResponse: data has active and plan
+        """
+        try:
+            entitlement = get_entitlement(user.id, token)
+        except Exception as e:
+            self.logger.log(
+                f"Error retrieving entitlement: {str(e)}", level="error", error=e
+            )
+            return ServiceResponse(
+                success=False,
+                message="Failed to retrieve entitlement",
+                status_code=500,
+            )
+        return ServiceResponse(
+            success=True,
+            message="Entitlement retrieved",
+            data={"active": entitlement.active, "plan": entitlement.plan},
+            status_code=200,
+        )
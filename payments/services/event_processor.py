@@ -0,0 +1,219 @@
+# Stripe Event Processing Service
+import datetime
+import traceback
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.utils.data_classes import ServiceResponse
+from core.utils.logging import LoggingService
+from payments.repositories.stripe_repository import StripeRepository
+from payments.utils.entitlements import invalidate_entitlements
+from tasks.locks import try_advisory_xact_lock
+from tasks.services.worker import retry_delay
+
+
+def _timestamp(value):
+    if value is None:
+        return None
+    return datetime.datetime.fromtimestamp(value, tz=datetime.timezone.utc)
+
+
+def _metadata_user_id(obj: dict):
+    try:
+        return int((obj.get("metadata") or {})["user_id"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class StripeEventProcessor:
+    """
+    Apply stored Stripe events to customers and subscriptions, in order per
+    customer.
+    Returns ServiceResponse with processing counts
+    """
+
+    def __init__(self):
+        self.repository = StripeRepository()
+        self.logger = LoggingService()
+        self.handlers = {
+            "customer.created": self._handle_customer,
+            "customer.updated": self._handle_customer,
+            "customer.subscription.created": self._handle_subscription,
+            "customer.subscription.updated": self._handle_subscription,
+            "customer.subscription.deleted": self._handle_subscription,
+        }
+
+    def process_pending(self, batch_size: int = 500) -> ServiceResponse:
+        """
+        Apply up to `batch_size` pending events.
+
+        Business logic:
+            1. List the ordering keys (customers) with pending events, the
+               longest waiting first, skipping keys backing off after a
+               failure.
+            2. Per key, in its own transaction: take the key's advisory lock
+               (a key another worker holds is skipped), lock its pending
+               events and apply them oldest first, each in a savepoint.
+               Events of types without a handler are marked ignored. The
+               entitlements of users whose subscriptions changed are
+               invalidated when the transaction commits.
+            3. An event that raises is retried with exponential backoff and
+               holds back the later events of its customer, so they never
+               apply out of order; after STRIPE_EVENT_MAX_ATTEMPTS it is
+               marked failed and the customer's queue moves on.
+
+        Returns:
+            ServiceResponse: data has events, processed, ignored, retried,
+                failed and customers counts.
+        """
+        counts = {
+            "events": 0,
+            "processed": 0,
+            "ignored": 0,
+            "retried": 0,
+            "failed": 0,
+            "customers": 0,
+        }
+        try:
+            keys_response = self.repository.get_pending_keys(batch_size, timezone.now())
+            if not keys_response.success:
+                raise RuntimeError(keys_response.message)
+
+            for key in keys_response.data:
+                remaining = batch_size - counts["events"]
+                if remaining <= 0:
+                    break
+                with transaction.atomic():
+                    if not try_advisory_xact_lock(f"stripe-customer:{key}"):
+                        continue
+                    claim_response = self.repository.claim_events(key, remaining)
+                    if not claim_response.success:
+                        raise RuntimeError(claim_response.message)
+
+                    applied = self._apply_in_order(claim_response.data, counts)
+                    save_response = self.repository.save_event_results(applied)
+                    if not save_response.success:
+                        raise RuntimeError(save_response.message)
+                    invalidate_entitlements(self._changed_users)
+                counts["customers"] += 1
+        except Exception as e:
+            self.logger.log(
+                f"Error processing Stripe events: {str(e)}", level="error", error=e
+            )
+            return ServiceResponse(
+                success=False,
+                message="Failed to process Stripe events",
+                data=counts,
+                status_code=500,
+            )
+
+        return ServiceResponse(
+            success=True,
+            message="Stripe events processed",
+            data=counts,
+            status_code=200,
+        )
+
+    def _apply_in_order(self, events: list, counts: dict) -> list:
+        """Apply one customer's events until the first one to retry"""
+        # The customer's linked user, looked up once for all its events
+        self._customer_users = {}
+        self._changed_users = set()
+        applied = []
+        for event in events:
+            now = timezone.now()
+            if event.next_attempt_at and event.next_attempt_at > now:
+                break
+            counts["events"] += 1
+            event.attempts += 1
+            applied.append(event)
+            handler = self.handlers.get(event.type)
+            try:
+                with transaction.atomic():
+                    if handler is not None:
+                        handler(event)
+            except Exception as e:
+                event.last_error = traceback.format_exc()
+                if event.attempts < settings.STRIPE_EVENT_MAX_ATTEMPTS:
+                    event.next_attempt_at = now + datetime.timedelta(
+                        seconds=retry_delay(event.attempts)
+                    )
+                    counts["retried"] += 1
+                    break
+                self.logger.log(
+                    f"Stripe event {event.event_id} failed after "
+                    f"{event.attempts} attempts: {str(e)}",
+                    level="error",
+                    error=e,
+                )
+                event.status = "failed"
+                event.processed_at = now
+                counts["failed"] += 1
+                continue
+
+            event.status = "processed" if handler is not None else "ignored"
+            event.processed_at = now
+            event.next_attempt_at = None
+            event.last_error = ""
+            counts[event.status] += 1
+        return applied
+
+    def _handle_customer(self, event):
+        customer = event.payload["data"]["object"]
+        previous_user_id = self._customer_user_id(customer["id"])
+        response = self.repository.save_customer(
+            customer["id"], _metadata_user_id(customer), customer.get("email") or ""
+        )
+        if not response.success:
+            raise RuntimeError(response.message)
+        user_id = response.data.user_id
+        if user_id != previous_user_id:
+            # The subscriptions, and so the entitlement, change hands
+            link_response = self.repository.link_subscriptions(customer["id"], user_id)
+            if not link_response.success:
+                raise RuntimeError(link_response.message)
+            self._changed_users.update([previous_user_id, user_id])
+        self._customer_users[customer["id"]] = user_id
+
+    def _customer_user_id(self, customer_id: str):
+        if customer_id not in self._customer_users:
+            response = self.repository.get_customer_user_id(customer_id)
+            if not response.success:
+                raise RuntimeError(response.message)
+            self._customer_users[customer_id] = response.data
+        return self._customer_users[customer_id]
+
+    def _handle_subscription(self, event):
+        subscription = event.payload["data"]["object"]
+        customer_id = subscription["customer"]
+        if isinstance(customer_id, dict):
+            customer_id = customer_id["id"]
+
+        user_id = self._customer_user_id(customer_id)
+
+        items = (subscription.get("items") or {}).get("data") or [{}]
+        price = items[0].get("price") or {}
+        response = self.repository.save_subscription(
+            {
+                "subscription_id": subscription["id"],
+                "customer_id": customer_id,
+                "user_id": user_id,
+                "status": subscription["status"],
+                "price_id": price.get("id") or "",
+                # Newer API versions moved the period onto the items
+                "current_period_end": _timestamp(
+                    subscription.get("current_period_end")
+                    or items[0].get("current_period_end")
+                ),
+                "cancel_at_period_end": bool(
+                    subscription.get("cancel_at_period_end", False)
+                ),
+                "last_event_at": event.stripe_created,
+            }
+        )
+        if not response.success:
+            raise RuntimeError(response.message)
+        if response.data is not None:
+            self._changed_users.add(user_id)
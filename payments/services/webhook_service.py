@@ -0,0 +1,100 @@
+# Stripe Webhook Service
+import datetime
+import json
+
+from django.conf import settings
+
+from core.utils.data_classes import ServiceResponse
+from core.utils.logging import LoggingService
+from payments.repositories.stripe_repository import StripeRepository
+from payments.utils.signature import SignatureVerificationError, verify_signature
+
+
+def ordering_key_for(event: dict) -> str:
+    """
+    The Stripe customer an event concerns, which orders its processing.
+    Events of no customer are ordered on their own.
+    """
+    obj = (event.get("data") or {}).get("object") or {}
+    if obj.get("object") == "customer":
+        customer = obj.get("id")
+    else:
+        customer = obj.get("customer")
+    if isinstance(customer, dict):
+        # An expanded customer object
+        customer = customer.get("id")
+    return customer or f"event:{event['id']}"
+
+
+class StripeWebhookService:
+    """
+    Receive Stripe webhooks: verify, store, acknowledge.
+    Returns ServiceResponse with the acknowledgement
+    """
+
+    def __init__(self):
+        self.repository = StripeRepository()
+        self.logger = LoggingService()
+
+    def ingest(self, payload: bytes, signature_header: str) -> ServiceResponse:
+        """
+        Store a webhook event for process_stripe_events.
+
+        Business logic:
+            1. Verify the Stripe-Signature header against the raw body and
+               STRIPE_WEBHOOK_SECRET; anything else is rejected with 400.
+            2. Insert the event keyed by its Stripe id: one query, so Stripe
+               is answered within milliseconds. No event is applied here.
+            3. A redelivered event id is acknowledged again without storing
+               it twice, so each event is applied once however often it is
+               sent.
+
+        Returns:
+            ServiceResponse: 200 when the event is stored (or already was)
+        """
+        secret = settings.STRIPE_WEBHOOK_SECRET
+        if not secret:
+            self.logger.log("STRIPE_WEBHOOK_SECRET is not configured", level="error")
+            return ServiceResponse(
+                success=False,
+                message="Webhook endpoint is not configured",
+                status_code=500,
+            )
+        try:
+            verify_signature(
+                payload,
+                signature_header,
+                secret,
+                settings.STRIPE_WEBHOOK_TOLERANCE_SECONDS,
+            )
+        except SignatureVerificationError as e:
+            return ServiceResponse(success=False, message=str(e), status_code=400)
+
+        try:
+            event = json.loads(payload)
+            data = {
+                "event_id": event["id"],
+                "type": event["type"],
+                "ordering_key": ordering_key_for(event),
+                "stripe_created": datetime.datetime.fromtimestamp(
+                    event["created"], tz=datetime.timezone.utc
+                ),
+                "livemode": bool(event.get("livemode", False)),
+                "payload": event,
+            }
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return ServiceResponse(
+                success=False, message="Malformed event", status_code=400
+            )
+
+        response = self.repository.create_event(data)
+        if not response.success:
+            return ServiceResponse(
+                success=False, message="Failed to store event", status_code=500
+            )
+        return ServiceResponse(
+            success=True,
+            message=response.message,
+            data={"received": True},
+            status_code=200,
+        )
@@ -0,0 +1,19 @@
+# Background tasks of the payments app
+from payments.services.event_processor import StripeEventProcessor
+from tasks.registry import task
+
+BATCH_SIZE = 500
+
+
+@task
+def process_stripe_events() -> int:
+    """Periodic: apply every pending Stripe event; returns how many"""
+    service = StripeEventProcessor()
+    processed = 0
+    while True:
+        response = service.process_pending(batch_size=BATCH_SIZE)
+        if not response.success:
+            raise RuntimeError(response.message)
+        processed += response.data["events"]
+        if response.data["events"] < BATCH_SIZE:
+            return processed
@@ -0,0 +1,175 @@
+# Test cached entitlements, their invalidation and the JWT claim
+import time
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.services.auth import AuthenticationService
+from payments.fake_stripe import FakeStripeEvents, signed_delivery
+from payments.models import Subscription
+from payments.permissions import HasActiveSubscription
+from payments.repositories.stripe_repository import StripeRepository
+from payments.services.event_processor import StripeEventProcessor
+from payments.services.webhook_service import StripeWebhookService
+from payments.utils.entitlements import (
+    CLAIM,
+    Entitlement,
+    EntitlementCache,
+    entitlement_cache,
+    get_entitlement,
+)
+
+SECRET = "whsec_test"
+
+
+@override_settings(STRIPE_WEBHOOK_SECRET=SECRET, ENTITLEMENT_VERSION_CHECK_SECONDS=0)
+class TestEntitlements(TestCase):
+    """Test class for entitlement caching, invalidation and claims."""
+
+    def setUp(self):
+        entitlement_cache.clear()
+        self.addCleanup(entitlement_cache.clear)
+        self.user = User.objects.create_user("member", "member@example.com", "pw")
+        self.other = User.objects.create_user("other", "other@example.com")
+        self.fake = FakeStripeEvents(
+            customers=2, user_ids=[self.user.id, self.other.id]
+        )
+        self.processor = StripeEventProcessor()
+
+    def _deliver(self, *events):
+        for event in events:
+            StripeWebhookService().ingest(*signed_delivery(event, SECRET))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.processor.process_pending()
+
+    def _subscribe(self, index=0, status="active"):
+        self._deliver(
+            self.fake.next_event(index),
+            self.fake.event(
+                "customer.subscription.created",
+                self.fake.subscription(index, status),
+            ),
+        )
+
+    def test_cached_after_one_query(self):
+        self._subscribe()
+
+        with self.assertNumQueries(1):
+            entitlement = get_entitlement(self.user.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_entitlement(self.user.id), entitlement)
+        self.assertTrue(entitlement.active)
+        self.assertEqual(entitlement.plan, Subscription.objects.get().price_id)
+        self.assertFalse(get_entitlement(self.other.id).active)
+
+    def test_webhook_processing_invalidates(self):
+        self.assertFalse(get_entitlement(self.user.id).active)
+
+        self._subscribe()
+        self.assertTrue(get_entitlement(self.user.id).active)
+
+        self._deliver(
+            self.fake.event(
+                "customer.subscription.deleted",
+                self.fake.subscription(0, "canceled"),
+            )
+        )
+        self.assertFalse(get_entitlement(self.user.id).active)
+
+    def test_other_processes_follow_the_shared_version(self):
+        """Test a process drops its records once another one invalidated."""
+        other_process = EntitlementCache()
+        self.assertFalse(other_process.get(self.user.id).active)
+
+        self._subscribe()
+
+        self.assertTrue(other_process.get(self.user.id).active)
+        with self.settings(ENTITLEMENT_VERSION_CHECK_SECONDS=60):
+            self._deliver(
+                self.fake.event(
+                    "customer.subscription.updated",
+                    self.fake.subscription(0, "unpaid"),
+                )
+            )
+            # Not checked again yet: the stale record is served
+            self.assertTrue(other_process.get(self.user.id).active)
+            other_process._checked_at = float("-inf")
+            self.assertFalse(other_process.get(self.user.id).active)
+
+    def test_relinked_customer_moves_the_entitlement(self):
+        self._subscribe()
+        self.assertTrue(get_entitlement(self.user.id).active)
+
+        customer = self.fake.customer(0)
+        customer["metadata"]["user_id"] = str(self.other.id)
+        self._deliver(self.fake.event("customer.updated", customer))
+
+        self.assertEqual(Subscription.objects.get().user, self.other)
+        self.assertFalse(get_entitlement(self.user.id).active)
+        self.assertTrue(get_entitlement(self.other.id).active)
+
+    def test_plan_of_the_subscription_paid_furthest_ahead(self):
+        """Test a subscription without a period end never outranks a dated one."""
+        for subscription_id, price_id, period_end in [
+            ("sub_undated", "price_basic", None),
+            ("sub_dated", "price_pro", timezone.now()),
+        ]:
+            Subscription.objects.create(
+                subscription_id=subscription_id,
+                customer_id="cus_1",
+                user=self.user,
+                status="active",
+                price_id=price_id,
+                current_period_end=period_end,
+                last_event_at=timezone.now(),
+            )
+
+        response = StripeRepository().get_entitlement_plan(self.user.id, ["active"])
+
+        self.assertEqual(response.data, "price_pro")
+
+    def test_record_limit(self):
+        with self.settings(ENTITLEMENT_CACHE_MAX_ENTRIES=1):
+            get_entitlement(self.user.id)
+            get_entitlement(self.other.id)
+        self.assertEqual(list(entitlement_cache._records), [self.other.id])
+
+    def test_signin_token_carries_the_entitlement(self):
+        self._subscribe()
+
+        response = AuthenticationService().signinWithPassword("member", "pw")
+
+        claim = AccessToken(response.data["access"])[CLAIM]
+        self.assertTrue(claim["active"])
+        self.assertEqual(claim["plan"], Subscription.objects.get().price_id)
+
+    def test_permission_trusts_fresh_active_claims(self):
+        permission = HasActiveSubscription()
+        request = APIRequestFactory().get("/")
+        request.user = self.other
+        token = AccessToken.for_user(self.other)
+
+        token[CLAIM] = Entitlement(active=True, plan="price_pro").as_claim()
+        request.auth = token
+        with self.assertNumQueries(0):
+            self.assertTrue(permission.has_permission(request, None))
+
+        # Old and inactive claims are checked against the cache
+        token[CLAIM] = Entitlement(active=True).as_claim(now=time.time() - 3600)
+        self.assertFalse(permission.has_permission(request, None))
+        token[CLAIM] = Entitlement().as_claim()
+        self._subscribe(index=1)
+        self.assertTrue(permission.has_permission(request, None))
+
+    def test_entitlement_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = reverse("entitlement")
+
+        self.assertEqual(client.get(url).json(), {"active": False, "plan": ""})
+        self._subscribe(status="trialing")
+        self.assertTrue(client.get(url).json()["active"])
@@ -0,0 +1,208 @@
+# Test Stripe webhook ingestion and ordered event processing
+import io
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from payments.fake_stripe import FakeStripeEvents, signed_delivery
+from payments.load_test import WebhookLoadTest
+from payments.models import StripeCustomer, StripeEvent, Subscription
+from payments.services.event_processor import StripeEventProcessor
+from payments.services.webhook_service import StripeWebhookService
+from payments.utils.signature import (
+    SignatureVerificationError,
+    sign,
+    verify_signature,
+)
+
+SECRET = "whsec_test"
+
+
+class TestSignature(TestCase):
+    def test_verifies_stripe_v1_signatures(self):
+        payload = b'{"id": "evt_1"}'
+        header = sign(payload, SECRET, timestamp=1000)
+
+        self.assertEqual(verify_signature(payload, header, SECRET, 300, now=1100), 1000)
+        # One matching signature of several (a secret being rolled) is enough
+        rolled = f"{header},v1={'0' * 64}"
+        self.assertEqual(verify_signature(payload, rolled, SECRET, 300, now=1100), 1000)
+
+    def test_rejects_bad_signatures(self):
+        payload = b'{"id": "evt_1"}'
+        header = sign(payload, SECRET, timestamp=1000)
+        cases = [
+            (payload, header, "whsec_other", 1000),
+            (b'{"id": "evt_2"}', header, SECRET, 1000),
+            (payload, header, SECRET, 1000 + 301),
+            (payload, "v1=abc", SECRET, 1000),
+            (payload, "t=1000", SECRET, 1000),
+            (payload, "", SECRET, 1000),
+        ]
+        for body, value, secret, now in cases:
+            with self.subTest(value), self.assertRaises(SignatureVerificationError):
+                verify_signature(body, value, secret, 300, now=now)
+
+
+@override_settings(STRIPE_WEBHOOK_SECRET=SECRET, STRIPE_EVENT_MAX_ATTEMPTS=2)
+class TestStripeWebhooks(TestCase):
+    """Test class for the webhook endpoint and StripeEventProcessor."""
+
+    def setUp(self):
+        self.user = User.objects.create_user("payer", "payer@example.com")
+        self.fake = FakeStripeEvents(customers=2, user_ids=[self.user.id])
+        self.processor = StripeEventProcessor()
+
+    def _post(self, event, secret=SECRET):
+        body, signature = signed_delivery(event, secret)
+        return self.client.post(
+            reverse("stripe_webhook"),
+            data=body,
+            content_type="application/json",
+            HTTP_STRIPE_SIGNATURE=signature,
+        )
+
+    def _subscription_event(self, event_type, status, **extra):
+        subscription = {**self.fake.subscription(0, status), **extra}
+        return self.fake.event(event_type, subscription)
+
+    def test_ingest_is_a_single_insert(self):
+        body, signature = signed_delivery(self.fake.next_event(0), SECRET)
+        with self.assertNumQueries(1):
+            response = StripeWebhookService().ingest(body, signature)
+
+        self.assertEqual(response.status_code, 200)
+        event = StripeEvent.objects.get()
+        self.assertEqual(event.ordering_key, "cus_fake_0")
+        self.assertIsNone(event.processed_at)
+        self.assertFalse(StripeCustomer.objects.exists())
+
+    def test_redelivered_events_are_stored_once(self):
+        event = self.fake.next_event(0)
+
+        self.assertEqual(self._post(event).status_code, 200)
+        response = self._post(event)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"received": True})
+        self.assertEqual(StripeEvent.objects.count(), 1)
+
+    def test_rejects_unsigned_and_malformed_events(self):
+        event = self.fake.next_event(0)
+        self.assertEqual(self._post(event, secret="whsec_other").status_code, 400)
+        response = self.client.post(
+            reverse("stripe_webhook"),
+            data=b"{}",
+            content_type="application/json",
+            HTTP_STRIPE_SIGNATURE=sign(b"{}", SECRET),
+        )
+        self.assertEqual(response.status_code, 400)
+        with self.settings(STRIPE_WEBHOOK_SECRET=""):
+            self.assertEqual(self._post(event).status_code, 500)
+        self.assertFalse(StripeEvent.objects.exists())
+
+    def test_applies_customer_events_in_order(self):
+        """Test events apply in Stripe's order, whatever the arrival order."""
+        created = self.fake.next_event(0)
+        subscribed = self.fake.next_event(0)
+        cancelled = self._subscription_event(
+            "customer.subscription.deleted", "canceled"
+        )
+        for event in [cancelled, subscribed, created, self.fake.next_event(1)]:
+            self._post(event)
+
+        counts = self.processor.process_pending().data
+
+        self.assertEqual((counts["events"], counts["customers"]), (4, 2))
+        self.assertEqual(StripeCustomer.objects.get(pk="cus_fake_0").user, self.user)
+        self.assertIsNone(StripeCustomer.objects.get(pk="cus_fake_1").user)
+        subscription = Subscription.objects.get()
+        self.assertEqual(subscription.status, "canceled")
+        self.assertEqual(subscription.user, self.user)
+        self.assertEqual(
+            StripeEvent.objects.filter(status="processed").count(), counts["events"]
+        )
+
+    def test_older_events_do_not_overwrite_newer_state(self):
+        self._post(self.fake.next_event(0))
+        self._post(self.fake.next_event(0))
+        self.processor.process_pending()
+
+        stale = self._subscription_event("customer.subscription.updated", "past_due")
+        stale["created"] -= 3600
+        self._post(stale)
+        self.processor.process_pending()
+
+        self.assertEqual(Subscription.objects.get().status, "active")
+
+    def test_failures_hold_back_later_events_of_the_customer(self):
+        """Test a failing event is retried before its customer's later events."""
+        self._post(self.fake.next_event(0))
+        self._post(self.fake.next_event(0))
+        self._post(self.fake.next_event(1))
+
+        with patch.object(
+            self.processor.repository,
+            "save_customer",
+            side_effect=RuntimeError("Stripe data unavailable"),
+        ):
+            counts = self.processor.process_pending().data
+        self.assertEqual((counts["retried"], counts["events"]), (2, 2))
+        self.assertFalse(Subscription.objects.exists())
+        first = StripeEvent.objects.get(event_id="evt_fake_1")
+        self.assertIn("Stripe data unavailable", first.last_error)
+        self.assertGreater(first.next_attempt_at, timezone.now())
+
+        # Nothing is due while the customer backs off
+        self.assertEqual(self.processor.process_pending().data["events"], 0)
+
+        StripeEvent.objects.update(next_attempt_at=None)
+        counts = self.processor.process_pending().data
+        self.assertEqual((counts["processed"], counts["failed"]), (3, 0))
+        self.assertEqual(Subscription.objects.get().user, self.user)
+
+    def test_gives_up_after_max_attempts(self):
+        self._post(self.fake.next_event(0))
+        self._post(self.fake.next_event(0))
+        self._post(self.fake.event("invoice.paid", {"customer": "cus_fake_0"}))
+
+        with patch.object(
+            self.processor.repository,
+            "save_subscription",
+            side_effect=ValueError("bad subscription"),
+        ):
+            self.processor.process_pending()
+            StripeEvent.objects.update(next_attempt_at=None)
+            counts = self.processor.process_pending().data
+
+        self.assertEqual((counts["failed"], counts["ignored"]), (1, 1))
+        statuses = dict(StripeEvent.objects.values_list("type", "status"))
+        self.assertEqual(statuses["customer.subscription.created"], "failed")
+        self.assertEqual(statuses["customer.created"], "processed")
+        self.assertFalse(StripeEvent.objects.filter(processed_at=None).exists())
+
+    def test_command_and_admin(self):
+        self._post(self.fake.next_event(0))
+        out = io.StringIO()
+        call_command("process_stripe_events", stdout=out)
+        self.assertIn("1 processed", out.getvalue())
+
+        admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(admin)
+        for name in ["stripeevent", "stripecustomer", "subscription"]:
+            response = self.client.get(reverse(f"admin:payments_{name}_changelist"))
+            self.assertEqual(response.status_code, 200)
+
+    def test_load_test_report(self):
+        report = WebhookLoadTest(
+            events=200, rate=100000, customers=20, secret=SECRET
+        ).run()
+
+        self.assertEqual(report["errors"], 0)
+        self.assertEqual(report["events_stored"], report["unique_events"])
+        self.assertEqual(report["events_applied"], report["unique_events"])
+        self.assertGreater(report["ack_p99_ms"], 0)
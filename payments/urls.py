@@ -0,0 +1,9 @@
+# payments urls
+from django.urls import path
+
+from .views import entitlement_view, stripe_webhook_view
+
+urlpatterns = [
+    path("entitlement/", entitlement_view, name="entitlement"),
+    path("webhooks/stripe/", stripe_webhook_view, name="stripe_webhook"),
+]
@@ -0,0 +1,196 @@
+# Per-user entitlements from Stripe subscriptions, cached in process
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from core.utils.logging import LoggingService
+from payments.repositories.stripe_repository import StripeRepository
+
+# JWT claim carrying the entitlement (see add_entitlement_claim)
+CLAIM = "entitlement"
+# Bumped whenever any entitlement changes; processes drop their records when
+# it moves
+VERSION_CACHE_KEY = "entitlements:version"
+
+
+@dataclass(frozen=True)
+class Entitlement:
+    """
+    What a user may use: whether they hold an entitling subscription, and
+    its plan (Stripe price id). Small enough to cache per user and to carry
+    as a JWT claim.
+    """
+
+    active: bool = False
+    plan: str = ""
+
+    def as_claim(self, now: float = None) -> dict:
+        issued_at = int(time.time() if now is None else now)
+        return {"active": self.active, "plan": self.plan, "at": issued_at}
+
+    @classmethod
+    def from_claim(cls, claim, max_age: float, now: float = None):
+        """The entitlement of a token claim, or None if missing or older than max_age"""
+        if not isinstance(claim, dict):
+            return None
+        now = time.time() if now is None else now
+        try:
+            if now - claim["at"] > max_age:
+                return None
+            return cls(active=bool(claim["active"]), plan=str(claim["plan"]))
+        except (KeyError, TypeError):
+            return None
+
+
+NO_ENTITLEMENT = Entitlement()
+
+
+class EntitlementCache:
+    """
+    Process-local entitlement records with a TTL.
+
+    Business logic:
+        1. get() answers from a dict of user id -> (Entitlement, expiry); a
+           missing or expired record costs one query, then serves every
+           request of that user for ENTITLEMENT_CACHE_TTL_SECONDS.
+        2. invalidate() drops records of this process and bumps a version
+           in the shared cache. At most every ENTITLEMENT_VERSION_CHECK_SECONDS
+           each process reads that version (one cache GET, no query) and
+           drops all its records when it moved, so a subscription change
+           reaches every worker within that interval; changes are rare next
+           to checks. The TTL bounds staleness if the shared cache is down.
+        3. The dict holds at most ENTITLEMENT_CACHE_MAX_ENTRIES records;
+           when full, expired ones are swept, then all are dropped.
+    """
+
+    def __init__(self):
+        self.logger = LoggingService()
+        self.repository = StripeRepository()
+        self._records = {}
+        self._version = None
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Entitlement:
+        now = time.monotonic()
+        if now - self._checked_at >= settings.ENTITLEMENT_VERSION_CHECK_SECONDS:
+            self._check_version(now)
+
+        record = self._records.get(user_id)
+        if record is not None and record[1] > now:
+            return record[0]
+
+        response = self.repository.get_entitlement_plan(
+            user_id, settings.ENTITLED_SUBSCRIPTION_STATUSES
+        )
+        if not response.success:
+            # Do not cache a failed lookup; deny until the database answers
+            return NO_ENTITLEMENT
+        entitlement = (
+            NO_ENTITLEMENT
+            if response.data is None
+            else Entitlement(active=True, plan=response.data)
+        )
+        if len(self._records) >= settings.ENTITLEMENT_CACHE_MAX_ENTRIES:
+            self._sweep(now)
+        self._records[user_id] = (
+            entitlement,
+            now + settings.ENTITLEMENT_CACHE_TTL_SECONDS,
+        )
+        return entitlement
+
+    def invalidate(self, user_ids):
+        """Drop the records of `user_ids` here and tell other processes"""
+        for user_id in user_ids:
+            self._records.pop(user_id, None)
+        try:
+            try:
+                cache.incr(VERSION_CACHE_KEY)
+            except ValueError:
+                # incr fails on a missing key
+                cache.set(VERSION_CACHE_KEY, 1, None)
+        except Exception as e:
+            self.logger.log(
+                f"Error publishing entitlement changes: {str(e)}",
+                level="error",
+                error=e,
+            )
+
+    def clear(self):
+        self._records = {}
+        self._checked_at = float("-inf")
+
+    def _check_version(self, now: float):
+        with self._lock:
+            if now - self._checked_at < settings.ENTITLEMENT_VERSION_CHECK_SECONDS:
+                return
+            self._checked_at = now
+            try:
+                version = cache.get(VERSION_CACHE_KEY)
+            except Exception as e:
+                self.logger.log(
+                    f"Error reading entitlement version: {str(e)}",
+                    level="error",
+                    error=e,
+                )
+                return
+            if version != self._version:
+                self._records = {}
+                self._version = version
+
+    def _sweep(self, now: float):
+        records = {
+            user_id: record
+            for user_id, record in self._records.items()
+            if record[1] > now
+        }
+        if len(records) >= settings.ENTITLEMENT_CACHE_MAX_ENTRIES:
+            records = {}
+        self._records = records
+
+
+entitlement_cache = EntitlementCache()
+
+
+def get_entitlement(user_id: int, token=None) -> Entitlement:
+    """
+    The entitlement of `user_id` without a query on the hot path.
+
+    An active entitlement carried by the request's access token is trusted
+    for ENTITLEMENT_CLAIM_MAX_AGE_SECONDS after it was issued. Anything
+    else (no claim, an old one, or an inactive one, so a fresh purchase
+    counts at once) is answered by the process cache.
+    """
+    if token is not None and settings.ENTITLEMENT_JWT_CLAIM:
+        claimed = Entitlement.from_claim(
+            token.get(CLAIM), settings.ENTITLEMENT_CLAIM_MAX_AGE_SECONDS
+        )
+        if claimed is not None and claimed.active:
+            return claimed
+    return entitlement_cache.get(user_id)
+
+
+def invalidate_entitlements(user_ids):
+    """
+    Forget the cached entitlements of `user_ids` once the current
+    transaction commits (at once outside one), so no process reloads the
+    state being replaced.
+    """
+    user_ids = [user_id for user_id in set(user_ids) if user_id is not None]
+    if user_ids:
+        transaction.on_commit(lambda: entitlement_cache.invalidate(user_ids))
+
+
+def clear_entitlement_cache():
+    """Drop every entitlement record of this process (LOCAL_CACHE_RESET_HOOKS)"""
+    entitlement_cache.clear()
+
+
+def add_entitlement_claim(token, user_id: int):
+    """Put the user's current entitlement on a token next to role and profile_id"""
+    if settings.ENTITLEMENT_JWT_CLAIM:
+        token[CLAIM] = entitlement_cache.get(user_id).as_claim()
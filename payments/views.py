@@ -1,3 +1,47 @@
-from django.shortcuts import render
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    permission_classes,
+)
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
 
-# Create your views here.
+from payments.services.entitlement_service import EntitlementService
+from payments.services.webhook_service import StripeWebhookService
+
+# Initialize services
+webhook_service = StripeWebhookService()
+entitlement_service = EntitlementService()
+
+
+@api_view(["POST"])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def stripe_webhook_view(request):
+    """
+    Stripe webhook endpoint: authenticated by its Stripe-Signature header,
+    which signs the raw body, so the body is never parsed by DRF
+    """
+    service_response = webhook_service.ingest(
+        request.body, request.headers.get("Stripe-Signature", "")
+    )
+    if not service_response.success:
+        return Response(
+            {"message": service_response.message, **(service_response.data or {})},
+            status=service_response.status_code,
+        )
+    return Response(service_response.data, status=service_response.status_code)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def entitlement_view(request):
+    """Whether the current user has an active subscription, and its plan"""
+    token = request.auth if hasattr(request.auth, "get") else None
+    service_response = entitlement_service.get_entitlement(request.user, token)
+    if not service_response.success:
+        return Response(
+            {"message": service_response.message, **(service_response.data or {})},
+            status=service_response.status_code,
+        )
+    return Response(service_response.data, status=service_response.status_code)
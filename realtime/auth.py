@@ -0,0 +1,86 @@
+# JWT authentication for WebSocket handshakes
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from core.utils.logging import LoggingService
+
+logger = LoggingService()
+
+
+# Browsers cannot set headers on a WebSocket, so they send the access token
+# as the second of two offered subprotocols:
+#   new WebSocket(url, ["access_token", token])
+# The server echoes TOKEN_SUBPROTOCOL back. A query string token would end up
+# in proxy and server access logs, so it is not accepted.
+TOKEN_SUBPROTOCOL = "access_token"
+
+
+def token_from_scope(scope) -> str:
+    """
+    The raw access token of a handshake, from the `access_token` subprotocol
+    pair or an `Authorization: Bearer` header (non-browser clients).
+    """
+    subprotocols = list(scope.get("subprotocols") or [])
+    if TOKEN_SUBPROTOCOL in subprotocols:
+        index = subprotocols.index(TOKEN_SUBPROTOCOL)
+        if index + 1 < len(subprotocols):
+            return subprotocols[index + 1]
+
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            parts = value.decode().split()
+            if len(parts) == 2 and parts[0].lower() == "bearer":
+                return parts[1]
+    return None
+
+
+def accepted_subprotocol(scope) -> str:
+    """
+    The subprotocol to echo on accept(): a browser that offered subprotocols
+    drops a handshake that does not select one of them.
+    """
+    if TOKEN_SUBPROTOCOL in (scope.get("subprotocols") or []):
+        return TOKEN_SUBPROTOCOL
+    return None
+
+
+@database_sync_to_async
+def authenticate_token(raw_token: str):
+    """
+    Args:
+        raw_token (str): An access token minted by AuthenticationService.
+
+    Business logic:
+        1. Validate the signature and expiry like the REST API does.
+        2. Load the user named by the token.
+
+    Returns:
+        tuple: (user, claims) or (AnonymousUser, {}) when the token is rejected.
+    """
+    authentication = JWTAuthentication()
+    try:
+        validated = authentication.get_validated_token(raw_token)
+        return authentication.get_user(validated), dict(validated.payload)
+    except (InvalidToken, AuthenticationFailed) as e:
+        logger.log(f"Rejected WebSocket token: {str(e)}", level="warning")
+        return AnonymousUser(), {}
+
+
+class JwtAuthMiddleware(BaseMiddleware):
+    """
+    Populate scope["user"] and scope["token_claims"] (email, user_id, role,
+    profile_id) from the handshake token. Consumers decide whether to
+    accept an anonymous connection.
+    """
+
+    async def __call__(self, scope, receive, send):
+        scope = dict(scope)
+        raw_token = token_from_scope(scope)
+        if raw_token:
+            scope["user"], scope["token_claims"] = await authenticate_token(raw_token)
+        else:
+            scope["user"], scope["token_claims"] = AnonymousUser(), {}
+        return await super().__call__(scope, receive, send)
@@ -0,0 +1,194 @@
+# WebSocket consumers: chat (one channel layer group per conversation) and presence
+import datetime
+import time
+
+from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.conf import settings
+
+from core.utils.rate_limit import consume_token, parse_rate
+from realtime.auth import accepted_subprotocol
+from realtime.message_store import MessageBuffer, next_seq
+from realtime.presence import get_presence_store
+from realtime.repositories.message_repository import MessageRepository
+
+# Application close codes (4000-4999), mirroring the HTTP status they stand for
+CLOSE_UNAUTHENTICATED = 4401
+CLOSE_FORBIDDEN = 4403
+
+
+def conversation_group(conversation_id) -> str:
+    return f"chat.{conversation_id}"
+
+
+@database_sync_to_async
+def is_participant(conversation_id: int, user_id: int) -> bool:
+    repo_response = MessageRepository().is_participant(conversation_id, user_id)
+    return repo_response.success and repo_response.data
+
+
+class PresenceMixin:
+    """
+    Keep the connected user online in the presence store: announced on
+    connect, refreshed by every {"type": "ping"} heartbeat (clients ping
+    well within PRESENCE_TTL_SECONDS), released on disconnect (the user
+    goes offline with their last socket). Store calls may hit Redis, so
+    they run off the event loop.
+    """
+
+    async def presence_join(self):
+        await sync_to_async(get_presence_store().join, thread_sensitive=False)(
+            self.scope["user"].id
+        )
+
+    async def presence_touch(self):
+        await sync_to_async(get_presence_store().touch, thread_sensitive=False)(
+            self.scope["user"].id
+        )
+
+    async def presence_leave(self):
+        await sync_to_async(get_presence_store().leave, thread_sensitive=False)(
+            self.scope["user"].id
+        )
+
+    async def heartbeat(self, content):
+        await self.presence_touch()
+        await self.send_json({"type": "pong", "sent_at": content.get("sent_at")})
+
+
+class PresenceConsumer(PresenceMixin, AsyncJsonWebsocketConsumer):
+    """Presence only socket (ws/presence/) for clients with no chat open"""
+
+    async def connect(self):
+        user = self.scope.get("user")
+        if user is None or not user.is_authenticated:
+            await self.close(code=CLOSE_UNAUTHENTICATED)
+            return
+        await self.accept(subprotocol=accepted_subprotocol(self.scope))
+        await self.presence_join()
+
+    async def disconnect(self, code):
+        user = self.scope.get("user")
+        if user is not None and user.is_authenticated:
+            await self.presence_leave()
+
+    async def receive_json(self, content, **kwargs):
+        if isinstance(content, dict) and content.get("type") == "ping":
+            await self.heartbeat(content)
+
+
+class ChatConsumer(PresenceMixin, AsyncJsonWebsocketConsumer):
+    """
+    Live text chat over ws/chat/<conversation_id>/.
+
+    Business logic:
+        1. Reject anonymous handshakes (4401) and users outside the
+           conversation (4403); JwtAuthMiddleware has resolved scope["user"].
+        2. Join the conversation group on the configured channel layer, so
+           fan-out works the same with the in-memory layer and a shared broker.
+        3. Relay {"type": "message", "body": ...} frames to the group after a
+           length check and a per-connection token bucket (CHAT_MESSAGE_RATE).
+           Each message gets its conversation seq before it is broadcast and
+           is queued for batched persistence (MessageBuffer); while unsaved
+           messages back up, new ones are refused with a retry_after.
+        4. Keep the user online while connected (PresenceMixin).
+    """
+
+    async def connect(self):
+        user = self.scope.get("user")
+        if user is None or not user.is_authenticated:
+            await self.close(code=CLOSE_UNAUTHENTICATED)
+            return
+
+        self.conversation_id = self.scope["url_route"]["kwargs"]["conversation_id"]
+        if not await is_participant(self.conversation_id, user.id):
+            await self.close(code=CLOSE_FORBIDDEN)
+            return
+
+        self.group_name = conversation_group(self.conversation_id)
+        self.rate_capacity, self.rate_refill = parse_rate(settings.CHAT_MESSAGE_RATE)
+        self.rate_state = None
+        self.message_buffer = MessageBuffer()
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept(subprotocol=accepted_subprotocol(self.scope))
+        await self.presence_join()
+
+    async def disconnect(self, code):
+        if hasattr(self, "group_name"):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+            await self.message_buffer.close()
+            await self.presence_leave()
+
+    async def receive_json(self, content, **kwargs):
+        kind = content.get("type") if isinstance(content, dict) else None
+        if kind == "ping":
+            await self.heartbeat(content)
+            return
+        if kind != "message":
+            await self.send_error("Unknown message type")
+            return
+
+        body = content.get("body")
+        if not isinstance(body, str) or not body.strip():
+            await self.send_error("Message body is required")
+            return
+        if len(body) > settings.CHAT_MESSAGE_MAX_LENGTH:
+            await self.send_error(
+                f"Message exceeds {settings.CHAT_MESSAGE_MAX_LENGTH} characters"
+            )
+            return
+
+        self.rate_state, result = consume_token(
+            self.rate_state, self.rate_capacity, self.rate_refill, time.monotonic()
+        )
+        if not result.allowed:
+            await self.send_error(
+                "Rate limit exceeded", retry_after=round(result.retry_after, 3)
+            )
+            return
+
+        if self.message_buffer.full:
+            await self.send_error(
+                "Messages cannot be saved right now",
+                retry_after=self.message_buffer.max_delay,
+            )
+            return
+        # A cache INCR; the database is only read to seed the counter
+        seq = await database_sync_to_async(next_seq)(self.conversation_id)
+        if seq is None:
+            await self.send_error("Message could not be sent")
+            return
+
+        sent_at = time.time()
+        client_id = content.get("client_id")
+        await self.message_buffer.add(
+            {
+                "conversation_id": self.conversation_id,
+                "seq": seq,
+                "sender_id": self.scope["user"].id,
+                "body": body,
+                "client_id": str(client_id)[:64] if client_id is not None else None,
+                "sent_at": datetime.datetime.fromtimestamp(
+                    sent_at, tz=datetime.timezone.utc
+                ),
+            }
+        )
+        await self.channel_layer.group_send(
+            self.group_name,
+            {
+                "type": "chat.message",
+                "conversation_id": self.conversation_id,
+                "seq": seq,
+                "sender_id": self.scope["user"].id,
+                "body": body,
+                "client_id": client_id,
+                "sent_at": sent_at,
+            },
+        )
+
+    async def chat_message(self, event):
+        await self.send_json({**event, "type": "message"})
+
+    async def send_error(self, message: str, **extra):
+        await self.send_json({"type": "error", "message": message, **extra})
@@ -0,0 +1,162 @@
+# Channel layers for the realtime app
+import asyncio
+import random
+import string
+import time
+from collections import deque
+from copy import deepcopy
+
+from channels.exceptions import ChannelFull
+from channels.layers import BaseChannelLayer
+
+
+class LocalChannelLayer(BaseChannelLayer):
+    """
+    Process-local channel layer for tests and single node deployments.
+
+    Channels' InMemoryChannelLayer sweeps every channel and every group
+    membership for expired entries on each receive() and group_send(), so
+    with N open sockets each message costs O(N) before it is delivered.
+    Messages expire after `expiry` (60s) and memberships after
+    `group_expiry` (a day), so sweeping at most once per `clean_interval`
+    seconds keeps the same semantics at O(1) amortised cost per operation.
+
+    The layer is written against the public BaseChannelLayer API only (no
+    InMemoryChannelLayer internals), so Channels upgrades cannot change it.
+    A message sent to a channel with a pending receive() is handed over
+    directly; otherwise it waits in the channel's queue until received or
+    expired.
+    """
+
+    extensions = ["groups", "flush"]
+
+    def __init__(
+        self,
+        expiry=60,
+        group_expiry=86400,
+        capacity=100,
+        channel_capacity=None,
+        clean_interval=1.0,
+        **kwargs,
+    ):
+        super().__init__(
+            expiry=expiry,
+            capacity=capacity,
+            channel_capacity=channel_capacity,
+            **kwargs,
+        )
+        self.group_expiry = group_expiry
+        self.clean_interval = clean_interval
+        # channel -> deque of (expires_at, message)
+        self.channels = {}
+        # channel -> deque of futures of pending receive() calls
+        self.receivers = {}
+        # group -> {channel: joined_at}
+        self.groups = {}
+        self._next_clean = 0.0
+
+    async def send(self, channel, message):
+        assert isinstance(message, dict), "message is not a dict"
+        self.require_valid_channel_name(channel)
+        assert "__asgi_channel__" not in message
+
+        message = deepcopy(message)
+        receivers = self.receivers.get(channel)
+        while receivers:
+            receiver = receivers.popleft()
+            if not receiver.done():
+                receiver.set_result(message)
+                return
+
+        queue = self.channels.setdefault(channel, deque())
+        if len(queue) >= self.get_capacity(channel):
+            raise ChannelFull(channel)
+        queue.append((time.time() + self.expiry, message))
+
+    async def receive(self, channel):
+        self.require_valid_channel_name(channel)
+        self._sweep()
+
+        queue = self.channels.get(channel)
+        if queue:
+            _, message = queue.popleft()
+            if not queue:
+                del self.channels[channel]
+            return message
+
+        receiver = asyncio.get_running_loop().create_future()
+        receivers = self.receivers.setdefault(channel, deque())
+        receivers.append(receiver)
+        try:
+            return await receiver
+        finally:
+            if receiver in receivers:
+                receivers.remove(receiver)
+            if not receivers:
+                self.receivers.pop(channel, None)
+
+    async def new_channel(self, prefix="specific."):
+        suffix = "".join(random.choice(string.ascii_letters) for _ in range(12))
+        return f"{prefix}.local!{suffix}"
+
+    async def flush(self):
+        self.channels = {}
+        self.groups = {}
+        self._next_clean = 0.0
+
+    async def close(self):
+        pass
+
+    async def group_add(self, group, channel):
+        self.require_valid_group_name(group)
+        self.require_valid_channel_name(channel)
+        self.groups.setdefault(group, {})[channel] = time.time()
+
+    async def group_discard(self, group, channel):
+        self.require_valid_channel_name(channel)
+        self.require_valid_group_name(group)
+        members = self.groups.get(group)
+        if members:
+            members.pop(channel, None)
+            if not members:
+                del self.groups[group]
+
+    async def group_send(self, group, message):
+        assert isinstance(message, dict), "Message is not a dict"
+        self.require_valid_group_name(group)
+        self._sweep()
+
+        for channel in list(self.groups.get(group, ())):
+            try:
+                await self.send(channel, message)
+            except ChannelFull:
+                pass
+
+    def _sweep(self):
+        """
+        Drop expired messages (their channel leaves every group, like in
+        Channels' layers) and expired group memberships, at most once per
+        `clean_interval`.
+        """
+        now = time.monotonic()
+        if now < self._next_clean:
+            return
+        self._next_clean = now + self.clean_interval
+
+        wall_now = time.time()
+        for channel, queue in list(self.channels.items()):
+            expired = False
+            while queue and queue[0][0] < wall_now:
+                queue.popleft()
+                expired = True
+            if expired:
+                for members in self.groups.values():
+                    members.pop(channel, None)
+            if not queue:
+                del self.channels[channel]
+
+        joined_before = wall_now - self.group_expiry
+        for members in self.groups.values():
+            for channel, joined_at in list(members.items()):
+                if joined_at < joined_before:
+                    del members[channel]
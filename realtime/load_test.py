@@ -0,0 +1,286 @@
+# Chat load test: hold many WebSocket connections and measure fan-out latency
+import asyncio
+import json
+import platform
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.benchmarks.runner import percentile
+from realtime.auth import TOKEN_SUBPROTOCOL
+from realtime.models import Conversation
+
+USERNAME_PREFIX = "chat_load_"
+
+
+def access_token_for(user) -> str:
+    """An access token carrying the same claims AuthenticationService mints."""
+    refresh = RefreshToken.for_user(user)
+    refresh["email"] = user.email
+    refresh["user_id"] = user.id
+    refresh["role"] = getattr(user, "role", "user")
+    return str(refresh.access_token)
+
+
+def seed_conversations(connections: int, group_size: int) -> list:
+    """
+    Create `connections` users split into conversations of `group_size`.
+
+    Returns:
+        list: (conversation_id, user_id, access_token) per connection.
+    """
+    User.objects.bulk_create(
+        [
+            User(
+                username=f"{USERNAME_PREFIX}{i}",
+                email=f"{USERNAME_PREFIX}{i}@example.com",
+            )
+            for i in range(connections)
+        ]
+    )
+    # bulk_create does not return primary keys on every backend
+    users = list(
+        User.objects.filter(username__startswith=USERNAME_PREFIX).order_by("id")
+    )
+    Conversation.objects.bulk_create(
+        [
+            Conversation(title=f"{USERNAME_PREFIX}{i}")
+            for i in range(0, len(users), group_size)
+        ]
+    )
+    conversations = list(
+        Conversation.objects.filter(title__startswith=USERNAME_PREFIX).order_by("id")
+    )
+
+    Participant = Conversation.participants.through
+    rows, members = [], []
+    for index, user in enumerate(users):
+        conversation = conversations[index // group_size]
+        rows.append(Participant(conversation_id=conversation.id, user_id=user.id))
+        members.append((conversation.id, user.id, access_token_for(user)))
+    Participant.objects.bulk_create(rows, batch_size=2000)
+    return members
+
+
+def remove_seeded():
+    Conversation.all_objects.filter(title__startswith=USERNAME_PREFIX).delete()
+    User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+
+class InProcessClient:
+    """A connection driven through channels.testing, no network involved."""
+
+    def __init__(self, application, conversation_id: int, token: str):
+        from channels.testing import WebsocketCommunicator
+
+        self.communicator = WebsocketCommunicator(
+            application,
+            f"/ws/chat/{conversation_id}/",
+            subprotocols=[TOKEN_SUBPROTOCOL, token],
+        )
+
+    async def connect(self, timeout: float):
+        connected, code = await self.communicator.connect(timeout=timeout)
+        if not connected:
+            raise ConnectionError(f"Handshake rejected ({code})")
+
+    async def send(self, payload: dict):
+        await self.communicator.send_json_to(payload)
+
+    async def receive(self, timeout: float) -> dict:
+        return await self.communicator.receive_json_from(timeout=timeout)
+
+    async def close(self):
+        await self.communicator.disconnect()
+
+
+class NetworkClient:
+    """A real socket against a running ASGI server (requires `websockets`)."""
+
+    def __init__(self, url: str, conversation_id: int, token: str):
+        self.url = f"{url.rstrip('/')}/ws/chat/{conversation_id}/"
+        self.token = token
+        self.connection = None
+
+    async def connect(self, timeout: float):
+        import websockets
+
+        self.connection = await asyncio.wait_for(
+            websockets.connect(
+                self.url,
+                subprotocols=[TOKEN_SUBPROTOCOL, self.token],
+                open_timeout=None,
+            ),
+            timeout,
+        )
+
+    async def send(self, payload: dict):
+        await self.connection.send(json.dumps(payload))
+
+    async def receive(self, timeout: float) -> dict:
+        return json.loads(await asyncio.wait_for(self.connection.recv(), timeout))
+
+    async def close(self):
+        await self.connection.close()
+
+
+class ChatLoadTest:
+    """
+    Measure message fan-out over many concurrent chat connections.
+
+    Business logic:
+        1. Open one connection per seeded member, `connect_batch` at a time,
+           and keep all of them open for the whole run.
+        2. In every conversation, `senders` members each post `messages`
+           messages; all members (senders included) receive each one.
+        3. Fan-out latency is measured per delivery on the client clock, from
+           the moment the sender wrote the frame to the moment a member read it.
+
+    Returns a JSON serialisable report from run().
+    """
+
+    def __init__(
+        self,
+        members: list,
+        group_size: int,
+        messages: int = 1,
+        senders: int = 1,
+        url: str = None,
+        connect_batch: int = 500,
+        timeout: float = 30.0,
+        stdout=None,
+    ):
+        self.members = members
+        self.group_size = group_size
+        self.messages = messages
+        self.senders = senders
+        self.url = url
+        self.connect_batch = connect_batch
+        self.timeout = timeout
+        self.stdout = stdout
+        self.sent_at = {}
+
+    def _write(self, message: str):
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+    def _client(self, conversation_id: int, token: str):
+        if self.url:
+            return NetworkClient(self.url, conversation_id, token)
+
+        from channels.routing import URLRouter
+
+        from realtime.auth import JwtAuthMiddleware
+        from realtime.routing import websocket_urlpatterns
+
+        if not hasattr(self, "_application"):
+            self._application = JwtAuthMiddleware(URLRouter(websocket_urlpatterns))
+        return InProcessClient(self._application, conversation_id, token)
+
+    def run(self) -> dict:
+        return asyncio.run(self._run())
+
+    async def _run(self) -> dict:
+        clients, connect_ms = [], []
+        started = time.perf_counter()
+        for offset in range(0, len(self.members), self.connect_batch):
+            batch = [
+                (conversation_id, self._client(conversation_id, token))
+                for conversation_id, _, token in self.members[
+                    offset : offset + self.connect_batch
+                ]
+            ]
+            connect_ms.extend(
+                await asyncio.gather(*(self._connect(client) for _, client in batch))
+            )
+            clients.extend(batch)
+        connect_seconds = time.perf_counter() - started
+        self._write(f"  {len(clients)} connections open in {connect_seconds:.2f}s")
+
+        by_conversation = {}
+        for conversation_id, client in clients:
+            by_conversation.setdefault(conversation_id, []).append(client)
+
+        latencies_ms = []
+        receivers = [
+            asyncio.create_task(
+                self._receive(
+                    client, self.messages * min(self.senders, len(group)), latencies_ms
+                )
+            )
+            for group in by_conversation.values()
+            for client in group
+        ]
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                self._send(client, conversation_id, index)
+                for conversation_id, group in by_conversation.items()
+                for index, client in enumerate(group[: self.senders])
+            )
+        )
+        received = await asyncio.gather(*receivers)
+        fanout_seconds = time.perf_counter() - started
+
+        await asyncio.gather(*(client.close() for _, client in clients))
+
+        expected = sum(
+            len(group) * self.messages * min(self.senders, len(group))
+            for group in by_conversation.values()
+        )
+        ordered = sorted(latencies_ms)
+        connect_ms.sort()
+        return {
+            "generated_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "transport": "network" if self.url else "in-process",
+            "channel_layer": settings.CHANNEL_LAYERS["default"]["BACKEND"],
+            "connections": len(clients),
+            "conversations": len(by_conversation),
+            "group_size": self.group_size,
+            "messages_sent": len(self.sent_at),
+            "deliveries_expected": expected,
+            "deliveries": sum(received),
+            "connect_p50_ms": round(percentile(connect_ms, 50), 3),
+            "connect_p95_ms": round(percentile(connect_ms, 95), 3),
+            "connect_seconds": round(connect_seconds, 3),
+            "fanout_p50_ms": round(percentile(ordered, 50), 3),
+            "fanout_p95_ms": round(percentile(ordered, 95), 3),
+            "fanout_p99_ms": round(percentile(ordered, 99), 3),
+            "fanout_max_ms": round(ordered[-1], 3) if ordered else 0.0,
+            "deliveries_per_second": (
+                round(len(ordered) / fanout_seconds, 1) if fanout_seconds else 0.0
+            ),
+        }
+
+    async def _connect(self, client) -> float:
+        started = time.perf_counter()
+        await client.connect(self.timeout)
+        return (time.perf_counter() - started) * 1000
+
+    async def _send(self, client, conversation_id: int, sender_index: int):
+        for sequence in range(self.messages):
+            client_id = f"{conversation_id}:{sender_index}:{sequence}"
+            self.sent_at[client_id] = time.perf_counter()
+            await client.send(
+                {"type": "message", "body": "ping", "client_id": client_id}
+            )
+
+    async def _receive(self, client, expected: int, latencies_ms: list) -> int:
+        received = 0
+        while received < expected:
+            try:
+                event = await client.receive(self.timeout)
+            except asyncio.TimeoutError:
+                break
+            if event.get("type") != "message":
+                continue
+            latencies_ms.append(
+                (time.perf_counter() - self.sent_at[event["client_id"]]) * 1000
+            )
+            received += 1
+        return received
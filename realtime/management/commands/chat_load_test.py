@@ -0,0 +1,108 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from core.benchmarks.runner import save_report
+from realtime.load_test import ChatLoadTest, remove_seeded, seed_conversations
+
+
+class Command(BaseCommand):
+    """Hold many concurrent chat connections and report fan-out latency"""
+
+    help = (
+        "Seed users and conversations, open one WebSocket per user (in process "
+        "through the configured channel layer, or against --url), send messages "
+        "and report p50/p95/p99 fan-out latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--connections", type=int, default=10000)
+        parser.add_argument(
+            "--group-size", type=int, default=10, help="Members per conversation"
+        )
+        parser.add_argument(
+            "--senders",
+            type=int,
+            default=1,
+            help="Members posting in each conversation",
+        )
+        parser.add_argument(
+            "--messages",
+            type=int,
+            default=1,
+            help="Messages per sender (keep within CHAT_MESSAGE_RATE)",
+        )
+        parser.add_argument("--connect-batch", type=int, default=500)
+        parser.add_argument("--timeout", type=float, default=30.0)
+        parser.add_argument(
+            "--url",
+            help="ws:// base URL of a running ASGI server; implies --use-current-db "
+            "(requires the `websockets` package)",
+        )
+        parser.add_argument(
+            "--use-current-db",
+            action="store_true",
+            help="Seed the configured database (seeded rows are removed afterwards)",
+        )
+        parser.add_argument("--output", help="Write the report to this JSON file")
+
+    def handle(self, *args, **options):
+        if options["connections"] < 1 or options["group_size"] < 2:
+            raise CommandError("Need at least one connection and groups of 2+")
+        if options["url"]:
+            try:
+                import websockets  # noqa: F401
+            except ImportError as e:
+                raise CommandError(
+                    "--url requires the websockets package (pip install websockets)"
+                ) from e
+        use_current_db = options["use_current_db"] or bool(options["url"])
+
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        try:
+            if not use_current_db:
+                connection.creation.create_test_db(
+                    verbosity=0, autoclobber=True, serialize=False
+                )
+            members = seed_conversations(options["connections"], options["group_size"])
+            self.stdout.write(
+                f"Seeded {len(members)} users in groups of {options['group_size']}"
+            )
+            report = ChatLoadTest(
+                members,
+                options["group_size"],
+                messages=options["messages"],
+                senders=options["senders"],
+                url=options["url"],
+                connect_batch=options["connect_batch"],
+                timeout=options["timeout"],
+                stdout=self.stdout,
+            ).run()
+        finally:
+            if use_current_db:
+                remove_seeded()
+            else:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        for key in [
+            "transport",
+            "channel_layer",
+            "connections",
+            "deliveries",
+            "deliveries_expected",
+            "fanout_p50_ms",
+            "fanout_p95_ms",
+            "fanout_p99_ms",
+            "deliveries_per_second",
+        ]:
+            self.stdout.write(f"  {key}: {report[key]}")
+        if options["output"]:
+            save_report(report, options["output"])
+            self.stdout.write(f"Results written to {options['output']}")
+        if report["deliveries"] < report["deliveries_expected"]:
+            raise CommandError(
+                f"Only {report['deliveries']} of {report['deliveries_expected']} "
+                "messages were delivered"
+            )
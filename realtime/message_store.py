@@ -0,0 +1,134 @@
+# Buffered chat message persistence for WebSocket consumers
+import asyncio
+
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+from core.utils.logging import LoggingService
+from realtime.repositories.message_repository import MessageRepository
+
+SEQ_KEY_PREFIX = "chat:seq"
+
+
+def _seq_cache():
+    return caches[getattr(settings, "CHAT_SEQ_CACHE_ALIAS", "default")]
+
+
+def next_seq(conversation_id: int):
+    """
+    Hand out the conversation's next seq, before the message is broadcast.
+
+    Business logic:
+        1. One atomic cache incr() per message (INCR on Redis), so senders
+           are neither serialized on the conversation row nor charged a
+           database round trip; Conversation.last_seq only catches up when
+           MessageBuffer flushes.
+        2. On a miss (first message since a restart or eviction) the
+           counter is seeded from last_seq with add(), which one concurrent
+           caller wins, then incremented.
+        3. The key never expires; if it is lost anyway while messages are
+           unsaved, the reseeded counter repeats their seqs and
+           append_messages renumbers the conflicting batch.
+
+    Returns:
+        int: the seq, or None when it cannot be seeded
+    """
+    cache, key = _seq_cache(), f"{SEQ_KEY_PREFIX}:{conversation_id}"
+    for _ in range(2):
+        try:
+            return cache.incr(key)
+        except ValueError:
+            repo_response = MessageRepository().get_last_seq(conversation_id)
+            if not repo_response.success or repo_response.data is None:
+                return None
+            cache.add(key, repo_response.data, None)
+    return None
+
+
+def forget_seqs(conversation_ids):
+    """Drop cached counters so the next message reseeds from last_seq"""
+    _seq_cache().delete_many(
+        [f"{SEQ_KEY_PREFIX}:{conversation_id}" for conversation_id in conversation_ids]
+    )
+
+
+class MessageBuffer:
+    """
+    Collect a consumer's outgoing messages and persist them in batches.
+
+    Business logic:
+        1. add() queues a message; reaching `max_messages` flushes at once,
+           otherwise the first queued message arms a timer that flushes
+           after `max_delay_ms`.
+        2. A flush writes the whole batch with one bulk_create
+           (MessageRepository.append_messages); flushes of one buffer never
+           overlap, so a sender's messages keep their order.
+        3. A failed flush puts the batch back and retries after
+           `max_delay_ms`. Queued messages were already broadcast, so none
+           is ever dropped; instead the buffer is `full` at `max_pending`
+           messages and the consumer refuses new ones until a flush
+           succeeds (backpressure).
+        4. close() flushes whatever is left (consumer disconnect); if that
+           fails the retry timer keeps going.
+    """
+
+    def __init__(
+        self, max_messages: int = None, max_delay_ms: int = None, max_pending=None
+    ):
+        self.max_messages = max_messages or settings.CHAT_FLUSH_MAX_MESSAGES
+        self.max_delay = (max_delay_ms or settings.CHAT_FLUSH_INTERVAL_MS) / 1000
+        self.max_pending = max_pending or self.max_messages * 20
+        self.pending = []
+        self.repository = MessageRepository()
+        self.logger = LoggingService()
+        self._lock = asyncio.Lock()
+        self._timer = None
+
+    @property
+    def full(self) -> bool:
+        return len(self.pending) >= self.max_pending
+
+    async def add(self, message: dict):
+        self.pending.append(message)
+        if len(self.pending) >= self.max_messages:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.ensure_future(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.max_delay)
+        self._timer = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """Write everything queued so far; returns the number of rows stored"""
+        async with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            batch, self.pending = self.pending, []
+            if not batch:
+                return 0
+
+            repo_response = await database_sync_to_async(
+                self.repository.append_messages
+            )(batch)
+            if repo_response.success:
+                if repo_response.message == "Messages renumbered":
+                    # The counter is behind the renumbered rows
+                    await database_sync_to_async(forget_seqs)(
+                        {message["conversation_id"] for message in batch}
+                    )
+                return len(repo_response.data)
+
+            self.pending[:0] = batch
+            self.logger.log(
+                f"Chat flush failed, {len(self.pending)} messages pending",
+                level="warning",
+            )
+            self._timer = asyncio.ensure_future(self._flush_later())
+            return 0
+
+    async def close(self):
+        await self.flush()
@@ -1,3 +1,67 @@
 from django.db import models
 
-# Create your models here.
+from core.models import BaseModel, SlimBaseModel, alive_index
+
+
+class Conversation(BaseModel):
+    """
+    A chat between friends. WebSocket clients may only join conversations
+    they participate in (realtime.consumers.ChatConsumer).
+    """
+
+    participants = models.ManyToManyField(
+        "auth.User", related_name="conversations", blank=True
+    )
+    title = models.CharField(max_length=200, blank=True, null=True)
+    # Highest ChatMessage.seq stored; seeds the cached per-conversation
+    # counter that numbers messages before broadcast (message_store.next_seq)
+    last_seq = models.PositiveBigIntegerField(default=0)
+
+    class Meta(BaseModel.Meta):
+        indexes = [alive_index("realtime_conv_alive_idx")]
+
+    def __str__(self):
+        return self.title or f"Conversation {self.pk}"
+
+
+class ChatMessage(SlimBaseModel):
+    """
+    Append-only chat history, written in batches by MessageBuffer.
+
+    seq numbers messages 1, 2, 3... within a conversation and is the order
+    clients display. It is reserved when a message arrives and sent with
+    the live event, so a gap only marks a message that was broadcast but
+    could not be stored. History is read by keyset on (conversation, seq),
+    which the unique constraint indexes.
+    """
+
+    # Covered by the (conversation, seq) unique index
+    conversation = models.ForeignKey(
+        Conversation,
+        on_delete=models.CASCADE,
+        related_name="messages",
+        db_index=False,
+    )
+    seq = models.PositiveBigIntegerField()
+    sender = models.ForeignKey(
+        "auth.User",
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+        db_index=False,
+    )
+    body = models.TextField()
+    # Client generated id, lets senders reconcile live echoes with history
+    client_id = models.CharField(max_length=64, blank=True, null=True)
+    # When the server received the message; created_at is the flush time
+    sent_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["conversation", "seq"], name="realtime_message_seq_unique"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.conversation_id}#{self.seq}"
@@ -0,0 +1,198 @@
+# Online presence from WebSocket heartbeats, with pluggable stores
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+
+class BasePresenceStore:
+    """
+    Storage backend for "user X has an open socket seen within the last ttl
+    seconds". Consumers call join() on connect, touch() on every heartbeat
+    and leave() on disconnect; readers call is_online() and online_among().
+
+    A user may have several sockets (tabs, devices, a chat and the presence
+    socket), so stores count connections per user and leave() only takes
+    the user offline when their last one closes. The count expires with the
+    heartbeat ttl, so sockets lost without a leave() (a crashed node) do not
+    keep a user online; a heartbeat after such an expiry re-announces the
+    user with a count of one.
+    """
+
+    def join(self, user_id: int, ttl: float = None):
+        raise NotImplementedError
+
+    def touch(self, user_id: int, ttl: float = None):
+        raise NotImplementedError
+
+    def leave(self, user_id: int):
+        raise NotImplementedError
+
+    def is_online(self, user_id: int) -> bool:
+        raise NotImplementedError
+
+    def online_among(self, user_ids) -> set:
+        """The subset of `user_ids` that is online, in one pass / round trip"""
+        raise NotImplementedError
+
+    def reset(self):
+        raise NotImplementedError
+
+    @staticmethod
+    def default_ttl() -> float:
+        return settings.PRESENCE_TTL_SECONDS
+
+
+class InMemoryPresenceStore(BasePresenceStore):
+    """
+    Process-local store: dicts of user id -> expiry on the monotonic clock
+    and user id -> open connections. Only sees sockets served by this
+    process, so it suits tests and single node setups (like the in-memory
+    channel layer).
+
+    Lookups compare one expiry, so is_online is O(1) and online_among is
+    O(len(user_ids)); expired entries are swept at most once per ttl.
+    """
+
+    def __init__(self):
+        self._expires = {}
+        self._connections = {}
+        self._lock = threading.Lock()
+        self._next_sweep = 0.0
+
+    def join(self, user_id: int, ttl: float = None):
+        self._announce(user_id, ttl, opened=1)
+
+    def touch(self, user_id: int, ttl: float = None):
+        self._announce(user_id, ttl, opened=0)
+
+    def _announce(self, user_id: int, ttl: float, opened: int):
+        now = time.monotonic()
+        ttl = ttl or self.default_ttl()
+        with self._lock:
+            if now >= self._next_sweep:
+                self._next_sweep = now + ttl
+                self._expires = {
+                    id: expires
+                    for id, expires in self._expires.items()
+                    if expires > now
+                }
+                self._connections = {
+                    id: count
+                    for id, count in self._connections.items()
+                    if id in self._expires
+                }
+            self._expires[user_id] = now + ttl
+            self._connections[user_id] = max(
+                self._connections.get(user_id, 0) + opened, 1
+            )
+
+    def leave(self, user_id: int):
+        with self._lock:
+            remaining = self._connections.get(user_id, 0) - 1
+            if remaining > 0:
+                self._connections[user_id] = remaining
+            else:
+                self._connections.pop(user_id, None)
+                self._expires.pop(user_id, None)
+
+    def is_online(self, user_id: int) -> bool:
+        return self._expires.get(user_id, 0.0) > time.monotonic()
+
+    def online_among(self, user_ids) -> set:
+        now = time.monotonic()
+        expires = self._expires
+        return {id for id in user_ids if expires.get(id, 0.0) > now}
+
+    def reset(self):
+        with self._lock:
+            self._expires.clear()
+            self._connections.clear()
+
+
+class CachePresenceStore(BasePresenceStore):
+    """
+    Store backed by a Django cache alias so every node sees the same users.
+    Each user is one counter of open connections whose timeout is the
+    heartbeat ttl, so the cache expires stale users itself. join()/leave()
+    use the cache's atomic add()/incr()/decr() (Redis, Memcached, LocMem),
+    so nodes opening and closing sockets at once keep an exact count.
+
+    Keys carry a generation stored in the cache, so reset() drops every
+    presence key without touching the rest of the shared cache. Reading it
+    costs one extra get; online_among is otherwise a single get_many (one
+    MGET on Redis) however many ids are asked about.
+    """
+
+    key_prefix = "presence"
+
+    def __init__(self):
+        self.cache = caches[getattr(settings, "PRESENCE_CACHE_ALIAS", "default")]
+
+    def _key(self, user_id: int, prefix: str = None) -> str:
+        return f"{prefix or self._prefix()}:{user_id}"
+
+    def _prefix(self) -> str:
+        generation = self.cache.get(self._generation_key, 0)
+        return f"{self.key_prefix}:{generation}"
+
+    @property
+    def _generation_key(self) -> str:
+        return f"{self.key_prefix}:generation"
+
+    def join(self, user_id: int, ttl: float = None):
+        key, timeout = self._key(user_id), int(ttl or self.default_ttl())
+        # A second round only runs if the key expired between add() and incr()
+        for _ in range(2):
+            if self.cache.add(key, 1, timeout):
+                return
+            try:
+                self.cache.incr(key)
+                break
+            except ValueError:
+                continue
+        self.cache.touch(key, timeout)
+
+    def touch(self, user_id: int, ttl: float = None):
+        key, timeout = self._key(user_id), int(ttl or self.default_ttl())
+        if not self.cache.touch(key, timeout):
+            self.cache.add(key, 1, timeout)
+
+    def leave(self, user_id: int):
+        key = self._key(user_id)
+        try:
+            if self.cache.decr(key) <= 0:
+                self.cache.delete(key)
+        except ValueError:
+            pass
+
+    def is_online(self, user_id: int) -> bool:
+        return (self.cache.get(self._key(user_id)) or 0) > 0
+
+    def online_among(self, user_ids) -> set:
+        prefix = self._prefix()
+        keys = {self._key(id, prefix): id for id in user_ids}
+        return {
+            keys[key]
+            for key, count in self.cache.get_many(list(keys)).items()
+            if count > 0
+        }
+
+    def reset(self):
+        try:
+            self.cache.incr(self._generation_key)
+        except ValueError:
+            self.cache.set(self._generation_key, 1, None)
+
+
+@lru_cache(maxsize=None)
+def _load_store(path: str) -> BasePresenceStore:
+    return import_string(path)()
+
+
+def get_presence_store() -> BasePresenceStore:
+    """Return the configured store instance (one per process per backend path)."""
+    return _load_store(settings.PRESENCE_STORE)
@@ -0,0 +1,194 @@
+# Chat Message Repository
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+
+from core.utils.data_classes import RepositoryResponse
+from core.utils.logging import LoggingService
+from realtime.models import ChatMessage, Conversation
+
+
+class MessageRepository:
+    """
+    Repository layer for conversations and their append-only chat history
+    Returns RepositoryResponse with raw objects/querysets
+    """
+
+    def __init__(self):
+        self.logger = LoggingService()
+
+    def is_participant(self, conversation_id: int, user_id: int) -> RepositoryResponse:
+        """Whether the user takes part in the conversation"""
+        try:
+            exists = Conversation.objects.filter(
+                id=conversation_id, participants__id=user_id
+            ).exists()
+            return RepositoryResponse(
+                success=True, message="Participation checked", data=exists
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error checking participation: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def get_last_seq(self, conversation_id: int) -> RepositoryResponse:
+        """
+        The highest seq stored or handed out for a conversation; seeds the
+        cached seq counter (realtime.message_store.next_seq).
+
+        Returns:
+            RepositoryResponse: data is last_seq, None for an unknown conversation
+        """
+        try:
+            last_seq = (
+                Conversation.all_objects.filter(id=conversation_id)
+                .values_list("last_seq", flat=True)
+                .first()
+            )
+            return RepositoryResponse(
+                success=True, message="Last seq retrieved", data=last_seq
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error reading chat sequence: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def append_messages(self, messages: list) -> RepositoryResponse:
+        """
+        Persist a batch of messages with per-conversation sequence numbers.
+
+        Args:
+            messages (list): dicts with conversation_id, sender_id, body,
+                client_id, sent_at and usually the seq handed out by
+                next_seq() before broadcasting, in the order they were received
+
+        Business logic:
+            1. Messages without a seq get one here: per conversation, a block
+               is reserved with a single UPDATE last_seq = last_seq + n (the
+               row lock it takes orders concurrent reservations) and numbered
+               in arrival order.
+            2. Every row is inserted with one bulk_create, and last_seq is
+               raised to the highest seq stored, so a counter reseeded from
+               it continues after them; all in one transaction.
+            3. A seq already taken (the cached counter was lost and reseeded
+               behind unsaved messages) fails the insert; the batch is then
+               numbered afresh as in step 1 rather than never stored, and
+               the message is "Messages renumbered".
+
+        Returns:
+            RepositoryResponse: data is the list of created ChatMessage
+        """
+        try:
+            try:
+                with transaction.atomic():
+                    created = self._insert(messages)
+                outcome = "Messages stored"
+            except IntegrityError as e:
+                if all(message.get("seq") is None for message in messages):
+                    raise
+                self.logger.log(
+                    f"Chat seq conflict, renumbering {len(messages)} messages: "
+                    f"{str(e)}",
+                    level="warning",
+                )
+                with transaction.atomic():
+                    created = self._insert(
+                        [{**message, "seq": None} for message in messages]
+                    )
+                outcome = "Messages renumbered"
+
+            return RepositoryResponse(success=True, message=outcome, data=created)
+        except Exception as e:
+            self.logger.log(
+                f"Error storing chat messages: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def _insert(self, messages: list) -> list:
+        unnumbered = Counter(
+            message["conversation_id"]
+            for message in messages
+            if message.get("seq") is None
+        )
+        next_seq = {
+            conversation_id: self._reserve(conversation_id, count)
+            for conversation_id, count in unnumbered.items()
+        }
+
+        rows, highest = [], {}
+        for message in messages:
+            seq = message.get("seq")
+            if seq is None:
+                seq = next_seq[message["conversation_id"]]
+                next_seq[message["conversation_id"]] += 1
+            else:
+                highest[message["conversation_id"]] = max(
+                    seq, highest.get(message["conversation_id"], 0)
+                )
+            rows.append(ChatMessage(**{**message, "seq": seq}))
+        created = ChatMessage.objects.bulk_create(rows)
+
+        for conversation_id, seq in highest.items():
+            Conversation.all_objects.filter(id=conversation_id).update(
+                last_seq=Greatest(F("last_seq"), Value(seq))
+            )
+        return created
+
+    @staticmethod
+    def _reserve(conversation_id: int, count: int) -> int:
+        """Bump last_seq by `count` (caller's transaction); returns the first seq"""
+        Conversation.all_objects.filter(id=conversation_id).update(
+            last_seq=F("last_seq") + count
+        )
+        last_seq = Conversation.all_objects.values_list("last_seq", flat=True).get(
+            id=conversation_id
+        )
+        return last_seq - count + 1
+
+    def get_history(
+        self, conversation_id: int, before: int = None, after: int = None, limit=50
+    ) -> RepositoryResponse:
+        """
+        One page of a conversation's history by keyset on (conversation, seq).
+
+        Args:
+            before (int): newest page older than this seq (scrollback)
+            after (int): oldest page newer than this seq (catching up)
+            limit (int): page size
+
+        Business logic:
+            Seeks the (conversation, seq) index from the given seq instead of
+            counting an OFFSET, so every page costs O(limit) at any depth.
+            Without a cursor the newest page is returned.
+
+        Returns:
+            RepositoryResponse: data is a list of ChatMessage in seq order
+        """
+        try:
+            queryset = ChatMessage.objects.filter(conversation_id=conversation_id)
+            if after is not None:
+                page = list(queryset.filter(seq__gt=after).order_by("seq")[:limit])
+            else:
+                if before is not None:
+                    queryset = queryset.filter(seq__lt=before)
+                page = list(queryset.order_by("-seq")[:limit])[::-1]
+            return RepositoryResponse(
+                success=True, message="History retrieved", data=page
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error retrieving chat history: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
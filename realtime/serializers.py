@@ -0,0 +1,9 @@
+from rest_framework import serializers
+
+from realtime.models import ChatMessage
+
+
+class ChatMessageSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ChatMessage
+        fields = ["seq", "sender", "body", "client_id", "sent_at"]
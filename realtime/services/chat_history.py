@@ -0,0 +1,93 @@
+# Chat History Service
+from django.conf import settings
+
+from core.utils.data_classes import ServiceResponse
+from core.utils.logging import LoggingService
+from realtime.repositories.message_repository import MessageRepository
+from realtime.serializers import ChatMessageSerializer
+
+MAX_PAGE_SIZE = 200
+
+
+class ChatHistoryService:
+    """
+    Service layer for reading conversation history
+    Returns ServiceResponse with serialized data for views
+    """
+
+    def __init__(self):
+        self.repository = MessageRepository()
+        self.logger = LoggingService()
+
+    def get_history(self, user, conversation_id: int, params) -> ServiceResponse:
+        """
+        Args:
+            user: The requesting user.
+            conversation_id (int): The conversation to read.
+            params: Query parameters: `before` or `after` (a seq) and `limit`.
+
+        Business logic:
+            1. Only participants may read a conversation.
+            2. Read one keyset page and return the cursor for the next one:
+               `next_before` when scrolling back, `next_after` when catching up.
+
+        Returns:
+            ServiceResponse: messages in seq order plus the next cursor.
+        """
+        try:
+            try:
+                before = int(params["before"]) if params.get("before") else None
+                after = int(params["after"]) if params.get("after") else None
+                limit = int(params.get("limit", settings.CHAT_HISTORY_PAGE_SIZE))
+            except ValueError:
+                return ServiceResponse(
+                    success=False,
+                    message="before, after and limit must be integers",
+                    status_code=400,
+                )
+            if before is not None and after is not None:
+                return ServiceResponse(
+                    success=False,
+                    message="Use either before or after, not both",
+                    status_code=400,
+                )
+            limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+            repo_response = self.repository.is_participant(conversation_id, user.id)
+            if not repo_response.success:
+                raise RuntimeError(repo_response.message)
+            if not repo_response.data:
+                return ServiceResponse(
+                    success=False, message="Conversation not found", status_code=404
+                )
+
+            repo_response = self.repository.get_history(
+                conversation_id, before=before, after=after, limit=limit
+            )
+            if not repo_response.success:
+                raise RuntimeError(repo_response.message)
+
+            messages = repo_response.data
+            full_page = len(messages) == limit
+            data = {
+                "messages": ChatMessageSerializer(messages, many=True).data,
+                "next_before": messages[0].seq if full_page and after is None else None,
+                "next_after": (
+                    messages[-1].seq if full_page and after is not None else None
+                ),
+            }
+            return ServiceResponse(
+                success=True,
+                message="Chat history retrieved successfully",
+                data=data,
+                status_code=200,
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error getting chat history: {str(e)}", level="error", error=e
+            )
+            return ServiceResponse(
+                success=False,
+                message="An error occurred while retrieving chat history",
+                status_code=500,
+            )
@@ -0,0 +1,187 @@
+# Test the WebSocket chat consumer, its JWT handshake and the load test client
+import asyncio
+
+from channels.layers import channel_layers
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from realtime.auth import TOKEN_SUBPROTOCOL, JwtAuthMiddleware
+from realtime.consumers import CLOSE_FORBIDDEN, CLOSE_UNAUTHENTICATED
+from realtime.layers import LocalChannelLayer
+from realtime.load_test import ChatLoadTest, access_token_for, seed_conversations
+from realtime.models import ChatMessage, Conversation
+from realtime.routing import websocket_urlpatterns
+
+IN_MEMORY_LAYER = {"default": {"BACKEND": "realtime.layers.LocalChannelLayer"}}
+
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_LAYER, CHAT_MESSAGE_RATE="2/m")
+class TestChatConsumer(TestCase):
+    """Test class for ChatConsumer over the in-memory channel layer."""
+
+    def setUp(self):
+        cache.clear()
+        channel_layers.backends.clear()
+        self.addCleanup(channel_layers.backends.clear)
+        self.application = JwtAuthMiddleware(URLRouter(websocket_urlpatterns))
+        self.alice = User.objects.create_user("alice", "alice@example.com")
+        self.bob = User.objects.create_user("bob", "bob@example.com")
+        self.eve = User.objects.create_user("eve", "eve@example.com")
+        self.conversation = Conversation.objects.create()
+        self.conversation.participants.add(self.alice, self.bob)
+
+    def _communicator(self, user=None, token=None):
+        token = token or (access_token_for(user) if user else None)
+        return WebsocketCommunicator(
+            self.application,
+            f"/ws/chat/{self.conversation.id}/",
+            subprotocols=[TOKEN_SUBPROTOCOL, token] if token else None,
+        )
+
+    async def test_rejects_missing_or_invalid_token(self):
+        """Test anonymous and forged handshakes are closed with 4401."""
+        for communicator in [
+            self._communicator(),
+            self._communicator(token="not-a-jwt"),
+        ]:
+            connected, code = await communicator.connect()
+            self.assertFalse(connected)
+            self.assertEqual(code, CLOSE_UNAUTHENTICATED)
+
+    async def test_token_subprotocol_is_echoed(self):
+        """Test the token subprotocol is selected, so browsers keep the socket."""
+        communicator = self._communicator(self.alice)
+        connected, subprotocol = await communicator.connect()
+
+        self.assertTrue(connected)
+        self.assertEqual(subprotocol, TOKEN_SUBPROTOCOL)
+        await communicator.disconnect()
+
+    async def test_ignores_query_string_token(self):
+        """Test a token in the URL (and so in access logs) is not accepted."""
+        communicator = WebsocketCommunicator(
+            self.application,
+            f"/ws/chat/{self.conversation.id}/?token={access_token_for(self.alice)}",
+        )
+        connected, code = await communicator.connect()
+
+        self.assertFalse(connected)
+        self.assertEqual(code, CLOSE_UNAUTHENTICATED)
+
+    async def test_rejects_non_participant(self):
+        """Test a valid user outside the conversation is closed with 4403."""
+        communicator = self._communicator(self.eve)
+        connected, code = await communicator.connect()
+
+        self.assertFalse(connected)
+        self.assertEqual(code, CLOSE_FORBIDDEN)
+
+    async def test_accepts_bearer_header(self):
+        """Test the token may also come from an Authorization header."""
+        communicator = WebsocketCommunicator(
+            self.application,
+            f"/ws/chat/{self.conversation.id}/",
+            headers=[
+                (b"authorization", f"Bearer {access_token_for(self.bob)}".encode())
+            ],
+        )
+        connected, _ = await communicator.connect()
+
+        self.assertTrue(connected)
+        await communicator.disconnect()
+
+    async def test_fans_out_to_conversation_members(self):
+        """Test a message reaches every member, sender included."""
+        alice = self._communicator(self.alice)
+        bob = self._communicator(self.bob)
+        self.assertTrue((await alice.connect())[0])
+        self.assertTrue((await bob.connect())[0])
+
+        await alice.send_json_to({"type": "message", "body": "hi", "client_id": "1"})
+
+        for communicator in [alice, bob]:
+            event = await communicator.receive_json_from()
+            self.assertEqual(event["type"], "message")
+            self.assertEqual(event["body"], "hi")
+            self.assertEqual(event["sender_id"], self.alice.id)
+            self.assertEqual(event["client_id"], "1")
+            self.assertEqual(event["seq"], 1)
+        await alice.disconnect()
+        await bob.disconnect()
+
+        message = await ChatMessage.objects.aget(conversation=self.conversation)
+        self.assertEqual((message.seq, message.body), (1, "hi"))
+
+    async def test_validates_and_rate_limits_messages(self):
+        """Test empty, oversized and over-rate messages are refused."""
+        alice = self._communicator(self.alice)
+        await alice.connect()
+
+        await alice.send_json_to({"type": "message", "body": " "})
+        self.assertEqual((await alice.receive_json_from())["type"], "error")
+        await alice.send_json_to({"type": "message", "body": "x" * 2001})
+        self.assertEqual((await alice.receive_json_from())["type"], "error")
+
+        for _ in range(2):
+            await alice.send_json_to({"type": "message", "body": "hi"})
+            self.assertEqual((await alice.receive_json_from())["type"], "message")
+        await alice.send_json_to({"type": "message", "body": "hi"})
+        error = await alice.receive_json_from()
+        self.assertEqual(error["message"], "Rate limit exceeded")
+        self.assertGreater(error["retry_after"], 0)
+        await alice.disconnect()
+
+
+@override_settings(CHANNEL_LAYERS=IN_MEMORY_LAYER)
+class TestChatLoadTest(TransactionTestCase):
+    """The load test runs its own event loop, outside the test transaction."""
+
+    def setUp(self):
+        cache.clear()
+        channel_layers.backends.clear()
+        self.addCleanup(channel_layers.backends.clear)
+
+    def test_in_process_run_delivers_every_message(self):
+        """Test the load test reports one delivery per member per message."""
+        members = seed_conversations(12, group_size=4)
+
+        report = ChatLoadTest(members, group_size=4, messages=2, senders=2).run()
+
+        self.assertEqual(report["connections"], 12)
+        self.assertEqual(report["conversations"], 3)
+        self.assertEqual(report["deliveries_expected"], 48)
+        self.assertEqual(report["deliveries"], 48)
+        self.assertGreaterEqual(report["fanout_p99_ms"], report["fanout_p50_ms"])
+
+
+class TestLocalChannelLayer(TestCase):
+    async def test_sweeps_expired_entries_at_most_once_per_interval(self):
+        """Test expiry still happens, just not on every operation."""
+        layer = LocalChannelLayer(expiry=-1, clean_interval=60)
+        await layer.group_add("chat.1", "specific.a")
+        await layer.send("specific.a", {"type": "chat.message"})
+
+        await layer.group_send("chat.2", {"type": "chat.message"})
+        self.assertNotIn("specific.a", layer.channels)
+        self.assertNotIn("specific.a", layer.groups["chat.1"])
+
+        await layer.group_add("chat.1", "specific.b")
+        await layer.send("specific.b", {"type": "chat.message"})
+        await layer.group_send("chat.2", {"type": "chat.message"})
+        self.assertIn("specific.b", layer.channels)
+
+    async def test_hands_messages_to_pending_receivers(self):
+        """Test a waiting receive() gets the message without queueing it."""
+        layer = LocalChannelLayer()
+        channel = await layer.new_channel()
+        receiver = asyncio.ensure_future(layer.receive(channel))
+        await asyncio.sleep(0)
+
+        await layer.send(channel, {"type": "chat.message", "body": "hi"})
+
+        self.assertEqual((await receiver)["body"], "hi")
+        self.assertNotIn(channel, layer.channels)
+        self.assertNotIn(channel, layer.receivers)
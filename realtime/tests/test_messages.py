@@ -0,0 +1,197 @@
+# Test batched chat message persistence and keyset history
+import asyncio
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.utils.data_classes import RepositoryResponse
+from realtime.message_store import MessageBuffer, forget_seqs, next_seq
+from realtime.models import ChatMessage, Conversation
+from realtime.repositories.message_repository import MessageRepository
+
+
+def _message(conversation, sender, body):
+    return {
+        "conversation_id": conversation.id,
+        "sender_id": sender.id,
+        "body": body,
+        "client_id": None,
+        "sent_at": timezone.now(),
+    }
+
+
+class TestMessagePersistence(TestCase):
+    """Test class for MessageRepository and MessageBuffer."""
+
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user("alice", "alice@example.com")
+        self.first = Conversation.objects.create()
+        self.second = Conversation.objects.create()
+        self.repository = MessageRepository()
+
+    def _seqs(self, conversation):
+        return list(
+            ChatMessage.objects.filter(conversation=conversation)
+            .order_by("seq")
+            .values_list("seq", "body")
+        )
+
+    def test_sequences_are_gap_free_per_conversation(self):
+        """Test each batch continues its conversation's numbering in order."""
+        self.repository.append_messages(
+            [
+                _message(self.first, self.alice, "a"),
+                _message(self.second, self.alice, "x"),
+                _message(self.first, self.alice, "b"),
+            ]
+        )
+        self.repository.append_messages([_message(self.first, self.alice, "c")])
+
+        self.assertEqual(self._seqs(self.first), [(1, "a"), (2, "b"), (3, "c")])
+        self.assertEqual(self._seqs(self.second), [(1, "x")])
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.last_seq, 3)
+
+    def test_batch_is_one_insert(self):
+        """Test a flushed batch costs a constant number of queries."""
+        messages = [_message(self.first, self.alice, str(i)) for i in range(30)]
+
+        # savepoint, UPDATE last_seq, SELECT last_seq, INSERT, release
+        with self.assertNumQueries(5):
+            self.repository.append_messages(messages)
+
+    def test_seqs_come_from_the_cache_not_the_database(self):
+        """Test numbering N messages costs one seeding query, not N round trips."""
+        self.repository.append_messages([_message(self.first, self.alice, "a")])
+
+        with self.assertNumQueries(1):
+            seqs = [next_seq(self.first.id) for _ in range(50)]
+
+        self.assertEqual(seqs, list(range(2, 52)))
+
+    def test_stores_seqs_handed_out_before_broadcast(self):
+        """Test stored rows keep their seqs and last_seq catches up with them."""
+        first_seq, second_seq = next_seq(self.first.id), next_seq(self.first.id)
+        self.repository.append_messages(
+            [
+                {**_message(self.first, self.alice, "b"), "seq": second_seq},
+                {**_message(self.first, self.alice, "a"), "seq": first_seq},
+            ]
+        )
+        self.repository.append_messages([_message(self.first, self.alice, "c")])
+
+        self.assertEqual(self._seqs(self.first), [(1, "a"), (2, "b"), (3, "c")])
+
+    def test_renumbers_after_a_lost_counter(self):
+        """Test a reseeded counter repeating unsaved seqs cannot block a flush."""
+        unsaved = {
+            **_message(self.first, self.alice, "a"),
+            "seq": next_seq(self.first.id),
+        }
+        forget_seqs([self.first.id])
+        saved = {
+            **_message(self.first, self.alice, "b"),
+            "seq": next_seq(self.first.id),
+        }
+        self.repository.append_messages([saved])
+
+        response = self.repository.append_messages([unsaved])
+
+        self.assertEqual(response.message, "Messages renumbered")
+        self.assertEqual(self._seqs(self.first), [(1, "b"), (2, "a")])
+
+    async def test_failed_flushes_keep_messages_and_fill_the_buffer(self):
+        """Test unsaved (already broadcast) messages are retried, never dropped."""
+        buffer = MessageBuffer(max_messages=2, max_delay_ms=10, max_pending=4)
+        append_messages = buffer.repository.append_messages
+        buffer.repository.append_messages = lambda messages: RepositoryResponse(
+            success=False, message="Database error occurred"
+        )
+
+        for body in "abcd":
+            await buffer.add(_message(self.first, self.alice, body))
+        self.assertTrue(buffer.full)
+        self.assertEqual([message["body"] for message in buffer.pending], list("abcd"))
+
+        buffer.repository.append_messages = append_messages
+        await buffer.close()
+        self.assertFalse(buffer.full)
+        self.assertEqual(await ChatMessage.objects.acount(), 4)
+
+    async def test_buffer_flushes_by_size_and_by_time(self):
+        """Test N queued messages flush at once and fewer flush after M ms."""
+        buffer = MessageBuffer(max_messages=3, max_delay_ms=20)
+
+        for body in ["a", "b"]:
+            await buffer.add(_message(self.first, self.alice, body))
+        self.assertEqual(await ChatMessage.objects.acount(), 0)
+        await buffer.add(_message(self.first, self.alice, "c"))
+        self.assertEqual(await ChatMessage.objects.acount(), 3)
+
+        await buffer.add(_message(self.first, self.alice, "d"))
+        await asyncio.sleep(0.1)
+        self.assertEqual(await ChatMessage.objects.acount(), 4)
+
+        await buffer.add(_message(self.first, self.alice, "e"))
+        await buffer.close()
+        self.assertEqual(await ChatMessage.objects.acount(), 5)
+
+
+@override_settings(CHAT_HISTORY_PAGE_SIZE=2)
+class TestChatHistoryEndpoint(TestCase):
+    """Test class for the conversation history endpoint."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.alice = User.objects.create_user("alice", "alice@example.com")
+        self.eve = User.objects.create_user("eve", "eve@example.com")
+        self.conversation = Conversation.objects.create()
+        self.conversation.participants.add(self.alice)
+        MessageRepository().append_messages(
+            [_message(self.conversation, self.alice, str(i)) for i in range(1, 6)]
+        )
+        self.url = reverse("conversation_messages", args=[self.conversation.id])
+
+    def _bodies(self, response):
+        return [message["body"] for message in response.data["messages"]]
+
+    def test_scrolls_back_by_seq(self):
+        """Test pages go newest first with a before cursor, each in seq order."""
+        self.client.force_authenticate(self.alice)
+
+        response = self.client.get(self.url)
+        self.assertEqual(self._bodies(response), ["4", "5"])
+        self.assertEqual(response.data["next_before"], 4)
+
+        response = self.client.get(self.url, {"before": 4})
+        self.assertEqual(self._bodies(response), ["2", "3"])
+
+        response = self.client.get(self.url, {"before": 2})
+        self.assertEqual(self._bodies(response), ["1"])
+        self.assertIsNone(response.data["next_before"])
+
+    def test_catches_up_after_seq(self):
+        """Test an after cursor returns the next messages in order."""
+        self.client.force_authenticate(self.alice)
+
+        response = self.client.get(self.url, {"after": 1})
+
+        self.assertEqual(self._bodies(response), ["2", "3"])
+        self.assertEqual(response.data["next_after"], 3)
+
+    def test_rejects_non_participants_and_bad_cursors(self):
+        """Test outsiders get 404 and malformed cursors 400."""
+        self.client.force_authenticate(self.eve)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+        self.client.force_authenticate(self.alice)
+        self.assertEqual(self.client.get(self.url, {"before": "x"}).status_code, 400)
+        self.assertEqual(
+            self.client.get(self.url, {"before": 3, "after": 1}).status_code, 400
+        )
@@ -0,0 +1,149 @@
+# Test presence stores and heartbeat tracking by the WebSocket consumers
+import time
+
+from channels.layers import channel_layers
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from realtime.auth import TOKEN_SUBPROTOCOL, JwtAuthMiddleware
+from realtime.load_test import access_token_for
+from realtime.models import Conversation
+from realtime.presence import (
+    CachePresenceStore,
+    InMemoryPresenceStore,
+    get_presence_store,
+)
+from realtime.routing import websocket_urlpatterns
+
+
+class TestPresenceStores(SimpleTestCase):
+    def _check_store(self, store):
+        store.reset()
+        store.touch(1)
+        store.touch(2)
+        store.touch(3, ttl=1)
+
+        self.assertTrue(store.is_online(1))
+        self.assertFalse(store.is_online(4))
+        self.assertEqual(store.online_among(range(1, 501)), {1, 2, 3})
+
+        store.leave(2)
+        self.assertFalse(store.is_online(2))
+        time.sleep(1.1)
+        self.assertEqual(store.online_among([1, 2, 3]), {1})
+        store.reset()
+
+    def _check_connections(self, store):
+        store.reset()
+        store.join(1)
+        store.join(1)
+
+        store.leave(1)
+        self.assertTrue(store.is_online(1))
+        store.leave(1)
+        self.assertFalse(store.is_online(1))
+        store.reset()
+
+    def test_in_memory_store(self):
+        """Test heartbeats expire and bulk checks return the online subset."""
+        self._check_store(InMemoryPresenceStore())
+
+    def test_cache_store(self):
+        """Test the shared store behaves the same through the Django cache."""
+        self._check_store(CachePresenceStore())
+
+    def test_user_stays_online_until_last_connection_leaves(self):
+        """Test one closing socket does not hide a user with another open."""
+        self._check_connections(InMemoryPresenceStore())
+        self._check_connections(CachePresenceStore())
+
+    def test_cache_store_reset_keeps_other_keys(self):
+        """Test reset() only forgets presence, not the rest of the shared cache."""
+        store = CachePresenceStore()
+        store.cache.set("unrelated", "kept")
+        self.addCleanup(store.cache.delete, "unrelated")
+        store.touch(1)
+
+        store.reset()
+
+        self.assertFalse(store.is_online(1))
+        self.assertEqual(store.cache.get("unrelated"), "kept")
+
+    def test_in_memory_store_sweeps_expired_users(self):
+        """Test expired users are dropped from memory, not just ignored."""
+        store = InMemoryPresenceStore()
+        store.touch(1, ttl=0.01)
+        time.sleep(0.02)
+        store.touch(2, ttl=0.01)
+
+        self.assertEqual(list(store._expires), [2])
+
+
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "realtime.layers.LocalChannelLayer"}},
+    PRESENCE_STORE="realtime.presence.InMemoryPresenceStore",
+)
+class TestConsumerPresence(TestCase):
+    """Test class for presence tracking by ChatConsumer and PresenceConsumer."""
+
+    def setUp(self):
+        channel_layers.backends.clear()
+        self.addCleanup(channel_layers.backends.clear)
+        self.store = get_presence_store()
+        self.store.reset()
+        self.addCleanup(self.store.reset)
+        self.application = JwtAuthMiddleware(URLRouter(websocket_urlpatterns))
+        self.alice = User.objects.create_user("alice", "alice@example.com")
+        self.conversation = Conversation.objects.create()
+        self.conversation.participants.add(self.alice)
+
+    def _communicator(self, path):
+        return WebsocketCommunicator(
+            self.application,
+            path,
+            subprotocols=[TOKEN_SUBPROTOCOL, access_token_for(self.alice)],
+        )
+
+    async def test_chat_connection_marks_user_online(self):
+        """Test joining a chat announces the user and leaving removes them."""
+        communicator = self._communicator(f"/ws/chat/{self.conversation.id}/")
+        await communicator.connect()
+        self.assertTrue(self.store.is_online(self.alice.id))
+
+        await communicator.disconnect()
+        self.assertFalse(self.store.is_online(self.alice.id))
+
+    async def test_user_stays_online_while_another_socket_is_open(self):
+        """Test closing the chat keeps a user with a presence socket online."""
+        chat = self._communicator(f"/ws/chat/{self.conversation.id}/")
+        presence = self._communicator("/ws/presence/")
+        await chat.connect()
+        await presence.connect()
+
+        await chat.disconnect()
+        self.assertTrue(self.store.is_online(self.alice.id))
+        await presence.disconnect()
+        self.assertFalse(self.store.is_online(self.alice.id))
+
+    async def test_presence_socket_heartbeat(self):
+        """Test a ping on the presence socket refreshes the user's expiry."""
+        communicator = self._communicator("/ws/presence/")
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        self.store.leave(self.alice.id)
+
+        await communicator.send_json_to({"type": "ping", "sent_at": 1})
+        self.assertEqual(
+            await communicator.receive_json_from(), {"type": "pong", "sent_at": 1}
+        )
+        self.assertTrue(self.store.is_online(self.alice.id))
+        await communicator.disconnect()
+
+    async def test_presence_socket_rejects_anonymous(self):
+        """Test presence requires a valid token."""
+        communicator = WebsocketCommunicator(self.application, "/ws/presence/")
+        connected, _ = await communicator.connect()
+
+        self.assertFalse(connected)
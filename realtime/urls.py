@@ -0,0 +1,12 @@
+# realtime urls
+from django.urls import path
+
+from .views import conversation_messages_view
+
+urlpatterns = [
+    path(
+        "conversations/<int:conversation_id>/messages/",
+        conversation_messages_view,
+        name="conversation_messages",
+    ),
+]
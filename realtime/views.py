@@ -1,3 +1,23 @@
-from django.shortcuts import render
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
-# Create your views here.
+from realtime.services.chat_history import ChatHistoryService
+
+# Initialize services
+chat_history = ChatHistoryService()
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def conversation_messages_view(request, conversation_id):
+    """Page through a conversation's history (?before=<seq> or ?after=<seq>)"""
+    service_response = chat_history.get_history(
+        request.user, conversation_id, request.query_params
+    )
+    if not service_response.success:
+        return Response(
+            {"message": service_response.message},
+            status=service_response.status_code,
+        )
+    return Response(service_response.data, status=service_response.status_code)
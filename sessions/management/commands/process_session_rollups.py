@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sessions.services.session_stats import SessionStatsService
+
+
+class Command(BaseCommand):
+    """Fold new session events into the dashboard rollup tables"""
+
+    help = (
+        "Process SessionEvent rows not yet rolled up: add their counts and "
+        "durations to the per day and per week stats tables in batches "
+        "(ratings are added by process_feedback). Use --loop to keep polling."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--loop", action="store_true", help="Keep polling for new events"
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to sleep when the log is drained (with --loop)",
+        )
+
+    def handle(self, *args, **options):
+        service = SessionStatsService()
+        while True:
+            response = service.process_pending(batch_size=options["batch_size"])
+            if not response.success:
+                raise CommandError(response.message)
+            counts = response.data
+            if counts["events"]:
+                self.stdout.write(
+                    f"{counts['events']} events into {counts['buckets']} buckets"
+                )
+            if counts["events"] < options["batch_size"]:
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
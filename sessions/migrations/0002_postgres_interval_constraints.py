@@ -0,0 +1,46 @@
+# Range indexes and the double-booking exclusion constraint on PostgreSQL
+
+from django.db import migrations
+
+AVAILABILITY_TABLE = "chat_sessions_availabilityslot"
+ATTENDEE_TABLE = "chat_sessions_sessionattendee"
+
+
+def create_range_constraints(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    # btree_gist lets the plain user_id column share a GiST index with a range
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    schema_editor.execute(
+        f'CREATE INDEX IF NOT EXISTS "sessions_avail_range_gist" '
+        f'ON "{AVAILABILITY_TABLE}" USING gist '
+        f'("user_id", tstzrange("starts_at", "ends_at"))'
+    )
+    # No user may attend two live sessions whose [starts_at, ends_at) overlap;
+    # concurrent bookings conflict on the index instead of a table lock
+    schema_editor.execute(
+        f'ALTER TABLE "{ATTENDEE_TABLE}" ADD CONSTRAINT "sessions_attendee_no_overlap" '
+        f'EXCLUDE USING gist ("user_id" WITH =, tstzrange("starts_at", "ends_at") WITH &&) '
+        f'WHERE (NOT "is_cancelled")'
+    )
+
+
+def drop_range_constraints(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f'ALTER TABLE "{ATTENDEE_TABLE}" '
+        f'DROP CONSTRAINT IF EXISTS "sessions_attendee_no_overlap"'
+    )
+    schema_editor.execute('DROP INDEX IF EXISTS "sessions_avail_range_gist"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat_sessions", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_range_constraints, drop_range_constraints),
+    ]
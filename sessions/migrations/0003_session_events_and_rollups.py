@@ -0,0 +1,192 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat_sessions", "0002_postgres_interval_constraints"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailySessionStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "session_kind",
+                    models.CharField(
+                        choices=[
+                            ("text", "Text"),
+                            ("voice", "Voice"),
+                            ("video", "Video"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("sessions_started", models.PositiveIntegerField(default=0)),
+                ("sessions_ended", models.PositiveIntegerField(default=0)),
+                ("sessions_dropped", models.PositiveIntegerField(default=0)),
+                ("total_duration_seconds", models.PositiveBigIntegerField(default=0)),
+                ("ratings_count", models.PositiveIntegerField(default=0)),
+                ("ratings_sum", models.PositiveIntegerField(default=0)),
+                ("day", models.DateField()),
+                (
+                    "user",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "day", "session_kind"),
+                        name="unique_daily_session_stats",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="SessionEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("is_deleted", models.BooleanField(default=False)),
+                ("deleted_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("started", "Started"),
+                            ("ended", "Ended"),
+                            ("dropped", "Dropped"),
+                            ("rated", "Rated"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "session_kind",
+                    models.CharField(
+                        choices=[
+                            ("text", "Text"),
+                            ("voice", "Voice"),
+                            ("video", "Video"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("occurred_at", models.DateTimeField()),
+                (
+                    "duration_seconds",
+                    models.PositiveIntegerField(blank=True, null=True),
+                ),
+                ("rating", models.PositiveSmallIntegerField(blank=True, null=True)),
+                ("rolled_up_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "session",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="events",
+                        to="chat_sessions.chatsession",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["session", "user", "kind"],
+                        name="sessions_event_lookup_idx",
+                    ),
+                    models.Index(
+                        condition=models.Q(("rolled_up_at__isnull", True)),
+                        fields=["id"],
+                        name="sessions_event_pending_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="WeeklySessionStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "session_kind",
+                    models.CharField(
+                        choices=[
+                            ("text", "Text"),
+                            ("voice", "Voice"),
+                            ("video", "Video"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("sessions_started", models.PositiveIntegerField(default=0)),
+                ("sessions_ended", models.PositiveIntegerField(default=0)),
+                ("sessions_dropped", models.PositiveIntegerField(default=0)),
+                ("total_duration_seconds", models.PositiveBigIntegerField(default=0)),
+                ("ratings_count", models.PositiveIntegerField(default=0)),
+                ("ratings_sum", models.PositiveIntegerField(default=0)),
+                ("week_start", models.DateField()),
+                (
+                    "user",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "week_start", "session_kind"),
+                        name="unique_weekly_session_stats",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.6 on 2026-10-19 08:24
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def drop_rated_and_duplicate_events(apps, schema_editor):
+    # Rated events were counted on the rater's buckets; ratings now come from
+    # feedback, credited to the rated attendee, so the old counts are dropped
+    SessionEvent = apps.get_model("chat_sessions", "SessionEvent")
+    for name in ["DailySessionStats", "WeeklySessionStats"]:
+        apps.get_model("chat_sessions", name).objects.update(
+            ratings_count=0, ratings_sum=0
+        )
+    SessionEvent.objects.filter(kind="rated").delete()
+
+    # Keep the first of repeated (session, user, kind) events
+    first_ids = (
+        SessionEvent.objects.values("session_id", "user_id", "kind")
+        .annotate(first_id=Min("id"))
+        .values_list("first_id", flat=True)
+    )
+    SessionEvent.objects.exclude(id__in=list(first_ids)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat_sessions", "0003_session_events_and_rollups"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            drop_rated_and_duplicate_events, migrations.RunPython.noop
+        ),
+        migrations.RemoveIndex(
+            model_name="sessionevent",
+            name="sessions_event_lookup_idx",
+        ),
+        migrations.RemoveField(
+            model_name="sessionevent",
+            name="rating",
+        ),
+        migrations.AlterField(
+            model_name="sessionevent",
+            name="kind",
+            field=models.CharField(
+                choices=[
+                    ("started", "Started"),
+                    ("ended", "Ended"),
+                    ("dropped", "Dropped"),
+                ],
+                max_length=10,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="sessionevent",
+            constraint=models.UniqueConstraint(
+                fields=("session", "user", "kind"), name="unique_session_event"
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-19 08:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat_sessions", "0004_session_event_unique_kind"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="chatsession",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["created_at"],
+                name="sessions_session_alive_idx",
+            ),
+        ),
+    ]
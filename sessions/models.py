@@ -1,3 +1,225 @@
 from django.db import models
 
-# Create your models here.
+from core.models import BaseModel, SlimBaseModel, alive_index
+
+
+class AvailabilitySlot(SlimBaseModel):
+    """
+    A time interval [starts_at, ends_at) in which a user is open to chat.
+
+    Overlap searches ("slots of these users intersecting this week") use the
+    (user, starts_at, ends_at) index everywhere and a GiST index on
+    (user_id, tstzrange) on PostgreSQL (migration 0002).
+    """
+
+    # Covered by the (user, starts_at, ends_at) index
+    user = models.ForeignKey(
+        "auth.User",
+        on_delete=models.CASCADE,
+        related_name="availability_slots",
+        db_index=False,
+    )
+    starts_at = models.DateTimeField()
+    ends_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user", "starts_at", "ends_at"],
+                name="sessions_avail_user_time_idx",
+            )
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(ends_at__gt=models.F("starts_at")),
+                name="sessions_avail_positive_length",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}: {self.starts_at} - {self.ends_at}"
+
+
+class ChatSession(BaseModel):
+    """A booked text, voice or video chat between friends"""
+
+    KIND_CHOICES = [
+        ("text", "Text"),
+        ("voice", "Voice"),
+        ("video", "Video"),
+    ]
+    STATUS_CHOICES = [
+        ("booked", "Booked"),
+        ("cancelled", "Cancelled"),
+    ]
+
+    organizer = models.ForeignKey(
+        "auth.User", on_delete=models.CASCADE, related_name="organized_sessions"
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default="text")
+    starts_at = models.DateTimeField()
+    ends_at = models.DateTimeField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="booked")
+
+    class Meta(BaseModel.Meta):
+        indexes = [alive_index("sessions_session_alive_idx")]
+
+    def __str__(self):
+        return f"{self.kind} session {self.pk} at {self.starts_at}"
+
+
+class SessionAttendee(models.Model):
+    """
+    One row per person in a session (organizer included), carrying a copy
+    of the session interval. Double-booking is a per-user overlap, which
+    PostgreSQL rejects with an exclusion constraint on these rows
+    (migration 0002) and other backends check under per-user row locks
+    (SessionRepository.book_session).
+    """
+
+    session = models.ForeignKey(
+        ChatSession, on_delete=models.CASCADE, related_name="attendees"
+    )
+    # Covered by the (user, starts_at, ends_at) index
+    user = models.ForeignKey(
+        "auth.User",
+        on_delete=models.CASCADE,
+        related_name="session_attendances",
+        db_index=False,
+    )
+    starts_at = models.DateTimeField()
+    ends_at = models.DateTimeField()
+    is_cancelled = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["session", "user"], name="unique_session_attendee"
+            ),
+            models.CheckConstraint(
+                condition=models.Q(ends_at__gt=models.F("starts_at")),
+                name="sessions_attendee_positive_length",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "starts_at", "ends_at"],
+                name="sessions_attendee_time_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} in session {self.session_id}"
+
+
+class SessionEvent(SlimBaseModel):
+    """
+    Append-only lifecycle log of a session, one row per attendee action.
+
+    Each attendee logs each kind at most once per session (the unique
+    constraint), so client retries cannot count a session twice. Rows are
+    never updated except for rolled_up_at, set once the rollup job
+    (process_session_rollups) has folded them into the stats tables below.
+    The session kind is copied in so rollups need no join. Ratings are not
+    lifecycle events: they come from feedback (process_feedback), credited
+    to the rated attendee.
+    """
+
+    KIND_CHOICES = [
+        ("started", "Started"),
+        ("ended", "Ended"),
+        ("dropped", "Dropped"),
+    ]
+
+    # Covered by the (session, user, kind) unique index
+    session = models.ForeignKey(
+        ChatSession, on_delete=models.CASCADE, related_name="events", db_index=False
+    )
+    user = models.ForeignKey(
+        "auth.User", on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    session_kind = models.CharField(max_length=10, choices=ChatSession.KIND_CHOICES)
+    occurred_at = models.DateTimeField()
+    # Set on ended/dropped events: seconds since the user's started event
+    duration_seconds = models.PositiveIntegerField(blank=True, null=True)
+    rolled_up_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["session", "user", "kind"], name="unique_session_event"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(rolled_up_at__isnull=True),
+                name="sessions_event_pending_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.session_id} by {self.user_id}"
+
+
+class SessionStats(models.Model):
+    """
+    Additive counters of one pre-aggregated bucket. Averages are derived on
+    read (total / count), so buckets can be incremented in any order.
+    """
+
+    session_kind = models.CharField(max_length=10, choices=ChatSession.KIND_CHOICES)
+    sessions_started = models.PositiveIntegerField(default=0)
+    sessions_ended = models.PositiveIntegerField(default=0)
+    sessions_dropped = models.PositiveIntegerField(default=0)
+    total_duration_seconds = models.PositiveBigIntegerField(default=0)
+    # Ratings the user received for sessions (feedback.process_feedback)
+    ratings_count = models.PositiveIntegerField(default=0)
+    ratings_sum = models.PositiveIntegerField(default=0)
+
+    COUNTERS = [
+        "sessions_started",
+        "sessions_ended",
+        "sessions_dropped",
+        "total_duration_seconds",
+        "ratings_count",
+        "ratings_sum",
+    ]
+
+    class Meta:
+        abstract = True
+
+
+class DailySessionStats(SessionStats):
+    """Per friend per day rollup for the friend dashboard"""
+
+    user = models.ForeignKey(
+        "auth.User", on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    day = models.DateField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "day", "session_kind"],
+                name="unique_daily_session_stats",
+            )
+        ]
+
+
+class WeeklySessionStats(SessionStats):
+    """Per user per ISO week (keyed by its Monday) rollup for manager dashboards"""
+
+    user = models.ForeignKey(
+        "auth.User", on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    week_start = models.DateField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "week_start", "session_kind"],
+                name="unique_weekly_session_stats",
+            )
+        ]
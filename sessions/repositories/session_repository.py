@@ -0,0 +1,238 @@
+# Session Scheduling Repository
+from django.contrib.auth.models import User
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import Q, Value
+
+from core.utils.data_classes import RepositoryResponse
+from core.utils.logging import LoggingService
+from sessions.models import AvailabilitySlot, ChatSession, SessionAttendee
+
+CONFLICT = "conflict"
+
+
+def _overlapping(start, end) -> Q:
+    """Rows whose [starts_at, ends_at) intersects [start, end)"""
+    return Q(starts_at__lt=end, ends_at__gt=start)
+
+
+class SessionRepository:
+    """
+    Repository layer for availability intervals and booked chat sessions
+    Returns RepositoryResponse with raw objects/querysets
+    """
+
+    def __init__(self):
+        self.logger = LoggingService()
+
+    def add_availability(self, user_id: int, intervals: list) -> RepositoryResponse:
+        """Store (starts_at, ends_at) intervals for a user with one bulk insert"""
+        try:
+            slots = AvailabilitySlot.objects.bulk_create(
+                [
+                    AvailabilitySlot(user_id=user_id, starts_at=start, ends_at=end)
+                    for start, end in intervals
+                ]
+            )
+            return RepositoryResponse(
+                success=True, message="Availability added", data=slots
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error adding availability: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def get_availability(self, user_id: int, start, end) -> RepositoryResponse:
+        """A user's availability slots intersecting [start, end)"""
+        try:
+            slots = list(
+                AvailabilitySlot.objects.filter(
+                    _overlapping(start, end), user_id=user_id
+                ).order_by("starts_at")
+            )
+            return RepositoryResponse(
+                success=True, message="Availability retrieved", data=slots
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error retrieving availability: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def delete_availability(self, user_id: int, slot_id: int) -> RepositoryResponse:
+        """Soft delete one of the user's slots"""
+        try:
+            deleted = AvailabilitySlot.objects.filter(
+                id=slot_id, user_id=user_id
+            ).soft_delete()
+            if not deleted:
+                return RepositoryResponse(
+                    success=False, message="Availability slot not found"
+                )
+            return RepositoryResponse(success=True, message="Availability removed")
+        except Exception as e:
+            self.logger.log(
+                f"Error removing availability: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def get_schedule(self, user_ids: list, start, end) -> RepositoryResponse:
+        """
+        Availability and live bookings of many users within [start, end).
+
+        Business logic:
+            Reads both tables in one UNION ALL query; each branch is an
+            overlap range scan of a (user, starts_at, ends_at) index.
+
+        Returns:
+            RepositoryResponse: data is (available, busy), each a dict of
+            user id -> list of (starts_at, ends_at)
+        """
+        try:
+            busy_flag = models.BooleanField()
+            available_rows = (
+                AvailabilitySlot.objects.filter(
+                    _overlapping(start, end), user_id__in=user_ids
+                )
+                .annotate(busy=Value(False, output_field=busy_flag))
+                .values_list("user_id", "starts_at", "ends_at", "busy")
+            )
+            busy_rows = (
+                SessionAttendee.objects.filter(
+                    _overlapping(start, end), user_id__in=user_ids, is_cancelled=False
+                )
+                .annotate(busy=Value(True, output_field=busy_flag))
+                .values_list("user_id", "starts_at", "ends_at", "busy")
+            )
+
+            available = {user_id: [] for user_id in user_ids}
+            busy = {user_id: [] for user_id in user_ids}
+            for user_id, starts_at, ends_at, is_busy in available_rows.union(
+                busy_rows, all=True
+            ):
+                (busy if is_busy else available)[user_id].append((starts_at, ends_at))
+            return RepositoryResponse(
+                success=True, message="Schedule retrieved", data=(available, busy)
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error retrieving schedule: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def book_session(
+        self, organizer_id: int, attendee_ids: list, kind: str, starts_at, ends_at
+    ) -> RepositoryResponse:
+        """
+        Book a session unless one of its attendees is already booked then.
+
+        Business logic:
+            1. On PostgreSQL the sessions_attendee_no_overlap exclusion
+               constraint arbitrates concurrent bookings: the losing insert
+               fails and no table is locked.
+            2. Elsewhere the attendees' user rows are locked (in id order, so
+               concurrent bookings cannot deadlock) before checking overlaps,
+               which serialises bookings per person only.
+            3. Session and attendee rows are written in one transaction.
+
+        Returns:
+            RepositoryResponse: data is the ChatSession, or on a double
+            booking error="conflict" with the busy user ids as data
+        """
+        attendee_ids = sorted(set(attendee_ids) | {organizer_id})
+        try:
+            with transaction.atomic():
+                users = User.objects.filter(id__in=attendee_ids).order_by("id")
+                if connection.vendor != "postgresql":
+                    users = users.select_for_update()
+                if len(list(users.values_list("id", flat=True))) != len(attendee_ids):
+                    return RepositoryResponse(
+                        success=False, message="Unknown participant"
+                    )
+
+                busy = sorted(
+                    set(
+                        SessionAttendee.objects.filter(
+                            _overlapping(starts_at, ends_at),
+                            user_id__in=attendee_ids,
+                            is_cancelled=False,
+                        ).values_list("user_id", flat=True)
+                    )
+                )
+                if busy:
+                    return RepositoryResponse(
+                        success=False,
+                        message="A participant is already booked at that time",
+                        data=busy,
+                        error=CONFLICT,
+                    )
+
+                session = ChatSession.objects.create(
+                    organizer_id=organizer_id,
+                    kind=kind,
+                    starts_at=starts_at,
+                    ends_at=ends_at,
+                    created_by_id=organizer_id,
+                )
+                SessionAttendee.objects.bulk_create(
+                    [
+                        SessionAttendee(
+                            session=session,
+                            user_id=user_id,
+                            starts_at=starts_at,
+                            ends_at=ends_at,
+                        )
+                        for user_id in attendee_ids
+                    ]
+                )
+            return RepositoryResponse(
+                success=True, message="Session booked", data=session
+            )
+        except IntegrityError as e:
+            # Lost a race for the exclusion constraint
+            self.logger.log(f"Concurrent booking rejected: {str(e)}", level="info")
+            return RepositoryResponse(
+                success=False,
+                message="A participant is already booked at that time",
+                data=[],
+                error=CONFLICT,
+            )
+        except Exception as e:
+            self.logger.log(f"Error booking session: {str(e)}", level="error", error=e)
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def cancel_session(self, session_id: int, user_id: int) -> RepositoryResponse:
+        """Cancel a booked session the user attends and free its attendees"""
+        try:
+            with transaction.atomic():
+                session = ChatSession.objects.filter(
+                    id=session_id, attendees__user_id=user_id
+                ).first()
+                if session is None:
+                    return RepositoryResponse(
+                        success=False, message="Session not found"
+                    )
+                session.status = "cancelled"
+                session.updated_by_id = user_id
+                session.save(update_fields=["status", "updated_by", "updated_at"])
+                session.attendees.update(is_cancelled=True)
+            return RepositoryResponse(
+                success=True, message="Session cancelled", data=session
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error cancelling session: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
@@ -0,0 +1,204 @@
+# Session Events and Stats Repository
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from core.utils.data_classes import RepositoryResponse
+from core.utils.logging import LoggingService
+from core.utils.upsert import upsert_increments
+from sessions.models import (
+    DailySessionStats,
+    SessionAttendee,
+    SessionEvent,
+    SessionStats,
+    WeeklySessionStats,
+)
+
+
+class SessionStatsRepository:
+    """
+    Repository layer for the session event log and its rollup tables
+    Returns RepositoryResponse with raw objects/querysets
+    """
+
+    def __init__(self):
+        self.logger = LoggingService()
+
+    def record_event(
+        self, session_id: int, user_id: int, kind: str, occurred_at
+    ) -> RepositoryResponse:
+        """
+        Append a lifecycle event for one attendee of a session.
+
+        Business logic:
+            1. Only attendees of a booked session may log events.
+            2. Each kind is logged once per attendee: a repeated event (a
+               client retry) returns the stored one, message "Event already
+               recorded", and is not counted again.
+            3. ended/dropped need an earlier started event of the same user;
+               their duration is measured from it.
+
+        Returns:
+            RepositoryResponse: data is the SessionEvent
+        """
+        try:
+            attendee = (
+                SessionAttendee.objects.filter(
+                    session_id=session_id, user_id=user_id, is_cancelled=False
+                )
+                .select_related("session")
+                .first()
+            )
+            if attendee is None:
+                return RepositoryResponse(success=False, message="Session not found")
+
+            logged = {
+                event.kind: event
+                for event in SessionEvent.objects.filter(
+                    session_id=session_id, user_id=user_id, kind__in=[kind, "started"]
+                )
+            }
+            if kind in logged:
+                return RepositoryResponse(
+                    success=True, message="Event already recorded", data=logged[kind]
+                )
+
+            duration = None
+            if kind in ["ended", "dropped"]:
+                started = logged.get("started")
+                if started is None or started.occurred_at > occurred_at:
+                    return RepositoryResponse(
+                        success=False, message="Session was not started"
+                    )
+                duration = int((occurred_at - started.occurred_at).total_seconds())
+
+            try:
+                with transaction.atomic():
+                    event = SessionEvent.objects.create(
+                        session_id=session_id,
+                        user_id=user_id,
+                        kind=kind,
+                        session_kind=attendee.session.kind,
+                        occurred_at=occurred_at,
+                        duration_seconds=duration,
+                    )
+            except IntegrityError:
+                # A concurrent retry inserted it first
+                return RepositoryResponse(
+                    success=True,
+                    message="Event already recorded",
+                    data=SessionEvent.objects.get(
+                        session_id=session_id, user_id=user_id, kind=kind
+                    ),
+                )
+            return RepositoryResponse(
+                success=True, message="Event recorded", data=event
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error recording session event: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def claim_pending_events(self, limit: int = 500) -> RepositoryResponse:
+        """
+        Lock the oldest events not yet rolled up.
+
+        Must be called inside transaction.atomic(); rows locked by another
+        job are skipped (SKIP LOCKED where the database supports it).
+        """
+        try:
+            events = list(
+                SessionEvent.objects.filter(rolled_up_at__isnull=True)
+                .select_for_update(skip_locked=True)
+                .order_by("id")
+                .only(
+                    "id",
+                    "user_id",
+                    "kind",
+                    "session_kind",
+                    "occurred_at",
+                    "duration_seconds",
+                )[:limit]
+            )
+            return RepositoryResponse(
+                success=True, message="Pending events claimed", data=events
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error claiming session events: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def apply_rollups(self, daily: dict, weekly: dict) -> RepositoryResponse:
+        """Add aggregated deltas to the daily and weekly stats tables"""
+        try:
+            counters = SessionStats.COUNTERS
+            buckets = upsert_increments(
+                DailySessionStats, ["user", "day", "session_kind"], counters, daily
+            ) + upsert_increments(
+                WeeklySessionStats,
+                ["user", "week_start", "session_kind"],
+                counters,
+                weekly,
+            )
+            return RepositoryResponse(
+                success=True, message="Rollups applied", data=buckets
+            )
+        except Exception as e:
+            self.logger.log(f"Error applying rollups: {str(e)}", level="error", error=e)
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def mark_rolled_up(self, event_ids: list) -> RepositoryResponse:
+        """Mark events as folded into the rollups"""
+        try:
+            updated = SessionEvent.objects.filter(id__in=event_ids).update(
+                rolled_up_at=timezone.now()
+            )
+            return RepositoryResponse(
+                success=True, message="Events marked rolled up", data=updated
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error marking session events: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def get_stats(self, period: str, user_id: int, start, end) -> RepositoryResponse:
+        """
+        Rollup rows of one user between two dates (inclusive).
+
+        Args:
+            period (str): "daily" or "weekly"
+
+        Returns:
+            RepositoryResponse: data is a list of stats rows, oldest first
+        """
+        try:
+            model, date_field = {
+                "daily": (DailySessionStats, "day"),
+                "weekly": (WeeklySessionStats, "week_start"),
+            }[period]
+            rows = list(
+                model.objects.filter(
+                    user_id=user_id,
+                    **{f"{date_field}__gte": start, f"{date_field}__lte": end},
+                ).order_by(date_field, "session_kind")
+            )
+            return RepositoryResponse(
+                success=True, message="Stats retrieved", data=rows
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error retrieving session stats: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
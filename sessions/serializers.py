@@ -0,0 +1,179 @@
+import datetime
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import serializers
+
+from sessions.models import AvailabilitySlot, ChatSession, SessionEvent
+
+MAX_SLOT_LENGTH = datetime.timedelta(days=1)
+MAX_SESSION_LENGTH = datetime.timedelta(hours=4)
+MAX_WINDOW_LENGTH = datetime.timedelta(days=14)
+MAX_FREE_SLOT_USERS = 50
+MAX_SESSION_PARTICIPANTS = 10
+MAX_STATS_RANGE = datetime.timedelta(days=366)
+
+
+def _validate_interval(starts_at, ends_at, max_length, label="interval"):
+    if ends_at <= starts_at:
+        raise serializers.ValidationError("ends_at must be after starts_at")
+    if ends_at - starts_at > max_length:
+        raise serializers.ValidationError(f"The {label} may not exceed {max_length}")
+
+
+class AvailabilitySlotSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AvailabilitySlot
+        fields = ["id", "starts_at", "ends_at"]
+
+    def validate(self, attrs):
+        _validate_interval(
+            attrs["starts_at"], attrs["ends_at"], MAX_SLOT_LENGTH, "slot"
+        )
+        return attrs
+
+
+class AvailabilityFromPreferencesSerializer(serializers.Serializer):
+    """Expand preferred_chat_times into slots for the window [starts_at, ends_at)"""
+
+    starts_at = serializers.DateTimeField()
+    ends_at = serializers.DateTimeField()
+
+    def validate(self, attrs):
+        _validate_interval(
+            attrs["starts_at"], attrs["ends_at"], MAX_WINDOW_LENGTH, "window"
+        )
+        return attrs
+
+
+class FreeSlotsQuerySerializer(serializers.Serializer):
+    user_ids = serializers.CharField(help_text="Comma separated user ids")
+    starts_at = serializers.DateTimeField()
+    ends_at = serializers.DateTimeField()
+    min_minutes = serializers.IntegerField(min_value=1, max_value=24 * 60, default=30)
+    mutual = serializers.BooleanField(default=False)
+
+    def validate_user_ids(self, value):
+        try:
+            user_ids = list(dict.fromkeys(int(id) for id in value.split(",") if id))
+        except ValueError:
+            raise serializers.ValidationError(
+                "user_ids must be comma separated integers"
+            )
+        if not user_ids or len(user_ids) > MAX_FREE_SLOT_USERS:
+            raise serializers.ValidationError(
+                f"Give between 1 and {MAX_FREE_SLOT_USERS} user ids"
+            )
+        return user_ids
+
+    def validate(self, attrs):
+        _validate_interval(
+            attrs["starts_at"], attrs["ends_at"], MAX_WINDOW_LENGTH, "window"
+        )
+        return attrs
+
+
+class BookingSerializer(serializers.Serializer):
+    participant_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        min_length=1,
+        max_length=MAX_SESSION_PARTICIPANTS,
+    )
+    kind = serializers.ChoiceField(choices=ChatSession.KIND_CHOICES, default="text")
+    starts_at = serializers.DateTimeField()
+    ends_at = serializers.DateTimeField()
+
+    def validate(self, attrs):
+        _validate_interval(
+            attrs["starts_at"], attrs["ends_at"], MAX_SESSION_LENGTH, "session"
+        )
+        return attrs
+
+
+class ChatSessionSerializer(serializers.ModelSerializer):
+    participant_ids = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ChatSession
+        fields = [
+            "id",
+            "organizer",
+            "kind",
+            "starts_at",
+            "ends_at",
+            "status",
+            "participant_ids",
+        ]
+
+    def get_participant_ids(self, obj):
+        return sorted(attendee.user_id for attendee in obj.attendees.all())
+
+
+class SessionEventSerializer(serializers.Serializer):
+    """
+    occurred_at lets clients report an event a little late (a flaky
+    connection), but rollups of past days are already on dashboards: a
+    timestamp older than SESSION_EVENT_MAX_DELAY_SECONDS is refused, and
+    one in the future (clock skew) is clamped to now.
+    """
+
+    kind = serializers.ChoiceField(choices=SessionEvent.KIND_CHOICES)
+    occurred_at = serializers.DateTimeField(required=False)
+
+    def validate_occurred_at(self, value):
+        max_delay = datetime.timedelta(seconds=settings.SESSION_EVENT_MAX_DELAY_SECONDS)
+        if value < timezone.now() - max_delay:
+            raise serializers.ValidationError(
+                f"Events may be reported at most {max_delay} late"
+            )
+        return value
+
+    def validate(self, attrs):
+        now = timezone.now()
+        attrs["occurred_at"] = min(attrs.get("occurred_at", now), now)
+        return attrs
+
+
+class StatsQuerySerializer(serializers.Serializer):
+    user_id = serializers.IntegerField(required=False)
+    start = serializers.DateField()
+    end = serializers.DateField()
+
+    def validate(self, attrs):
+        if attrs["end"] < attrs["start"]:
+            raise serializers.ValidationError("end must not be before start")
+        if attrs["end"] - attrs["start"] > MAX_STATS_RANGE:
+            raise serializers.ValidationError(
+                f"The range may not exceed {MAX_STATS_RANGE.days} days"
+            )
+        return attrs
+
+
+class SessionStatsSerializer(serializers.Serializer):
+    """A rollup row with the derived averages"""
+
+    session_kind = serializers.CharField()
+    sessions_started = serializers.IntegerField()
+    sessions_ended = serializers.IntegerField()
+    sessions_dropped = serializers.IntegerField()
+    total_duration_seconds = serializers.IntegerField()
+    average_duration_seconds = serializers.SerializerMethodField()
+    ratings_count = serializers.IntegerField()
+    average_rating = serializers.SerializerMethodField()
+
+    def get_average_duration_seconds(self, obj):
+        finished = obj.sessions_ended + obj.sessions_dropped
+        return round(obj.total_duration_seconds / finished, 1) if finished else None
+
+    def get_average_rating(self, obj):
+        return (
+            round(obj.ratings_sum / obj.ratings_count, 2) if obj.ratings_count else None
+        )
+
+
+class DailySessionStatsSerializer(SessionStatsSerializer):
+    day = serializers.DateField()
+
+
+class WeeklySessionStatsSerializer(SessionStatsSerializer):
+    week_start = serializers.DateField()
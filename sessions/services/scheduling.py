@@ -0,0 +1,253 @@
+# Session Scheduling Service
+import datetime
+
+from core.utils.data_classes import ServiceResponse
+from core.utils.logging import LoggingService
+from sessions.repositories.session_repository import CONFLICT, SessionRepository
+from sessions.serializers import (
+    AvailabilityFromPreferencesSerializer,
+    AvailabilitySlotSerializer,
+    BookingSerializer,
+    ChatSessionSerializer,
+    FreeSlotsQuerySerializer,
+)
+from sessions.utils.intervals import (
+    chat_time_windows,
+    clip,
+    intersect,
+    merge,
+    subtract,
+)
+
+
+class SchedulingService:
+    """
+    Service layer for availability and session booking
+    Returns ServiceResponse with serialized data for views
+    """
+
+    def __init__(self):
+        self.repository = SessionRepository()
+        self.logger = LoggingService()
+
+    def add_availability(self, user, data) -> ServiceResponse:
+        """
+        Args:
+            user: The requesting user.
+            data: {"slots": [{"starts_at", "ends_at"}, ...]} or
+                {"from_preferences": {"starts_at", "ends_at"}}.
+
+        Business logic:
+            1. Validate explicit slots, or expand the user's
+               preferred_chat_times over the given window.
+            2. Store them with one bulk insert.
+
+        Returns:
+            ServiceResponse: the created slots.
+        """
+        try:
+            if "from_preferences" in data:
+                serializer = AvailabilityFromPreferencesSerializer(
+                    data=data["from_preferences"]
+                )
+                if not serializer.is_valid():
+                    return self._invalid(serializer.errors)
+                preferences = getattr(
+                    getattr(user, "userprofile", None), "questionnaire", None
+                )
+                intervals = chat_time_windows(
+                    getattr(preferences, "preferred_chat_times", None) or [],
+                    serializer.validated_data["starts_at"],
+                    serializer.validated_data["ends_at"],
+                )
+            else:
+                serializer = AvailabilitySlotSerializer(
+                    data=data.get("slots", []), many=True
+                )
+                if not serializer.is_valid():
+                    return self._invalid(serializer.errors)
+                intervals = [
+                    (slot["starts_at"], slot["ends_at"])
+                    for slot in serializer.validated_data
+                ]
+
+            repo_response = self.repository.add_availability(user.id, intervals)
+            if not repo_response.success:
+                raise RuntimeError(repo_response.message)
+            return ServiceResponse(
+                success=True,
+                message="Availability added successfully",
+                data={
+                    "slots": AvailabilitySlotSerializer(
+                        repo_response.data, many=True
+                    ).data
+                },
+                status_code=201,
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error adding availability: {str(e)}", level="error", error=e
+            )
+            return ServiceResponse(
+                success=False,
+                message="An error occurred while adding availability",
+                status_code=500,
+            )
+
+    def remove_availability(self, user, slot_id: int) -> ServiceResponse:
+        """Remove one of the user's availability slots"""
+        repo_response = self.repository.delete_availability(user.id, slot_id)
+        if not repo_response.success:
+            return ServiceResponse(
+                success=False,
+                message=repo_response.message,
+                status_code=500 if repo_response.error else 404,
+            )
+        return ServiceResponse(
+            success=True, message="Availability removed successfully", status_code=204
+        )
+
+    def get_free_slots(self, user, params) -> ServiceResponse:
+        """
+        Args:
+            user: The requesting user.
+            params: user_ids (comma separated, up to 50), starts_at, ends_at,
+                min_minutes, mutual.
+
+        Business logic:
+            1. Load availability and live bookings of every user in one query.
+            2. Per user: merge availability, subtract bookings, clip to the
+               window and drop gaps shorter than min_minutes.
+            3. With mutual, intersect each friend's free time with the
+               requesting user's.
+
+        Returns:
+            ServiceResponse: {"free_slots": {user_id: [{starts_at, ends_at}]}}
+        """
+        try:
+            serializer = FreeSlotsQuerySerializer(data=params)
+            if not serializer.is_valid():
+                return self._invalid(serializer.errors)
+            query = serializer.validated_data
+            start, end = query["starts_at"], query["ends_at"]
+            min_length = datetime.timedelta(minutes=query["min_minutes"])
+            user_ids = query["user_ids"]
+            if query["mutual"] and user.id not in user_ids:
+                user_ids = user_ids + [user.id]
+
+            repo_response = self.repository.get_schedule(user_ids, start, end)
+            if not repo_response.success:
+                raise RuntimeError(repo_response.message)
+            available, busy = repo_response.data
+
+            free = {
+                user_id: clip(
+                    subtract(merge(available[user_id]), merge(busy[user_id])),
+                    start,
+                    end,
+                )
+                for user_id in user_ids
+            }
+            own = free[user.id] if query["mutual"] else None
+            free_slots = {}
+            for user_id in query["user_ids"]:
+                slots = free[user_id]
+                if own is not None and user_id != user.id:
+                    slots = intersect(slots, own)
+                free_slots[str(user_id)] = [
+                    {"starts_at": slot_start, "ends_at": slot_end}
+                    for slot_start, slot_end in clip(slots, start, end, min_length)
+                ]
+
+            return ServiceResponse(
+                success=True,
+                message="Free slots retrieved successfully",
+                data={"free_slots": free_slots},
+                status_code=200,
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error getting free slots: {str(e)}", level="error", error=e
+            )
+            return ServiceResponse(
+                success=False,
+                message="An error occurred while retrieving free slots",
+                status_code=500,
+            )
+
+    def book_session(self, user, data) -> ServiceResponse:
+        """
+        Args:
+            user: The organizer.
+            data: participant_ids, kind, starts_at, ends_at.
+
+        Business logic:
+            Books the session for the organizer and participants, refusing
+            with 409 if any of them already has a session at that time.
+
+        Returns:
+            ServiceResponse: the booked session, or the busy user ids.
+        """
+        try:
+            serializer = BookingSerializer(data=data)
+            if not serializer.is_valid():
+                return self._invalid(serializer.errors)
+            booking = serializer.validated_data
+
+            repo_response = self.repository.book_session(
+                user.id,
+                booking["participant_ids"],
+                booking["kind"],
+                booking["starts_at"],
+                booking["ends_at"],
+            )
+            if not repo_response.success:
+                if repo_response.error == CONFLICT:
+                    return ServiceResponse(
+                        success=False,
+                        message=repo_response.message,
+                        data={"busy_user_ids": repo_response.data},
+                        status_code=409,
+                    )
+                if repo_response.error is None:
+                    return self._invalid({"participant_ids": [repo_response.message]})
+                raise RuntimeError(repo_response.message)
+
+            return ServiceResponse(
+                success=True,
+                message="Session booked successfully",
+                data=ChatSessionSerializer(repo_response.data).data,
+                status_code=201,
+            )
+        except Exception as e:
+            self.logger.log(f"Error booking session: {str(e)}", level="error", error=e)
+            return ServiceResponse(
+                success=False,
+                message="An error occurred while booking the session",
+                status_code=500,
+            )
+
+    def cancel_session(self, user, session_id: int) -> ServiceResponse:
+        """Cancel a session the user attends"""
+        repo_response = self.repository.cancel_session(session_id, user.id)
+        if not repo_response.success:
+            return ServiceResponse(
+                success=False,
+                message=repo_response.message,
+                status_code=500 if repo_response.error else 404,
+            )
+        return ServiceResponse(
+            success=True,
+            message="Session cancelled successfully",
+            data=ChatSessionSerializer(repo_response.data).data,
+            status_code=200,
+        )
+
+    @staticmethod
+    def _invalid(errors) -> ServiceResponse:
+        return ServiceResponse(
+            success=False,
+            message="Invalid scheduling data",
+            data={"errors": errors},
+            status_code=400,
+        )
@@ -0,0 +1,235 @@
+# Session Events and Stats Service
+import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.utils.data_classes import ServiceResponse
+from core.utils.logging import LoggingService
+from sessions.repositories.stats_repository import SessionStatsRepository
+from sessions.serializers import (
+    DailySessionStatsSerializer,
+    SessionEventSerializer,
+    StatsQuerySerializer,
+    WeeklySessionStatsSerializer,
+)
+
+# Groups whose members may read other users' dashboards
+STATS_VIEWER_GROUPS = ["User manager", "Admin"]
+
+STATS_SERIALIZERS = {
+    "daily": DailySessionStatsSerializer,
+    "weekly": WeeklySessionStatsSerializer,
+}
+
+
+def event_deltas(event) -> dict:
+    """Counter increments one event contributes to its buckets"""
+    if event.kind == "started":
+        return {"sessions_started": 1}
+    if event.kind in ["ended", "dropped"]:
+        return {
+            f"sessions_{event.kind}": 1,
+            "total_duration_seconds": event.duration_seconds or 0,
+        }
+    return {}
+
+
+def add_to_buckets(daily: dict, weekly: dict, user_id, at, session_kind, deltas):
+    """
+    Sum counter deltas into the (user, day, kind) and (user, week, kind)
+    buckets of SessionStatsRepository.apply_rollups; days and weeks are
+    local (TIME_ZONE) dates.
+    """
+    day = timezone.localtime(at).date()
+    week_start = day - datetime.timedelta(days=day.weekday())
+    for buckets, key in [
+        (daily, (user_id, day, session_kind)),
+        (weekly, (user_id, week_start, session_kind)),
+    ]:
+        totals = buckets.setdefault(key, {})
+        for counter, delta in deltas.items():
+            totals[counter] = totals.get(counter, 0) + delta
+
+
+class SessionStatsService:
+    """
+    Service layer for the session event log and dashboard rollups
+    Returns ServiceResponse with serialized data for views
+    """
+
+    def __init__(self):
+        self.repository = SessionStatsRepository()
+        self.logger = LoggingService()
+
+    def record_event(self, user, session_id: int, data) -> ServiceResponse:
+        """
+        Log a started/ended/dropped event of the user in a session; a
+        repeated event answers 200 with the stored one instead of 201.
+        """
+        try:
+            serializer = SessionEventSerializer(data=data)
+            if not serializer.is_valid():
+                return ServiceResponse(
+                    success=False,
+                    message="Invalid session event",
+                    data={"errors": serializer.errors},
+                    status_code=400,
+                )
+            event = serializer.validated_data
+            repo_response = self.repository.record_event(
+                session_id,
+                user.id,
+                event["kind"],
+                event["occurred_at"],
+            )
+            if not repo_response.success:
+                if repo_response.error:
+                    raise RuntimeError(repo_response.message)
+                return ServiceResponse(
+                    success=False,
+                    message=repo_response.message,
+                    status_code=(
+                        404 if repo_response.message == "Session not found" else 400
+                    ),
+                )
+            created = repo_response.message != "Event already recorded"
+            return ServiceResponse(
+                success=True,
+                message=(
+                    "Session event recorded successfully"
+                    if created
+                    else "Session event was already recorded"
+                ),
+                data={"id": repo_response.data.id, "kind": repo_response.data.kind},
+                status_code=201 if created else 200,
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error recording session event: {str(e)}", level="error", error=e
+            )
+            return ServiceResponse(
+                success=False,
+                message="An error occurred while recording the session event",
+                status_code=500,
+            )
+
+    def process_pending(self, batch_size: int = 500) -> ServiceResponse:
+        """
+        Fold one batch of new session events into the rollup tables.
+
+        Business logic:
+            1. Claim the oldest events not yet rolled up.
+            2. Sum their counter deltas per (user, day, kind) and per
+               (user, week, kind) in memory.
+            3. Add each bucket's deltas with one upsert per table and mark
+               the events, all in one transaction: a failure leaves the batch
+               pending and the rollups untouched, so nothing is counted twice.
+
+        Returns:
+            ServiceResponse: data has events and buckets counts
+        """
+        try:
+            with transaction.atomic():
+                claim_response = self.repository.claim_pending_events(batch_size)
+                if not claim_response.success:
+                    raise RuntimeError(claim_response.message)
+                events = claim_response.data
+
+                daily, weekly = {}, {}
+                for event in events:
+                    add_to_buckets(
+                        daily,
+                        weekly,
+                        event.user_id,
+                        event.occurred_at,
+                        event.session_kind,
+                        event_deltas(event),
+                    )
+
+                rollup_response = self.repository.apply_rollups(daily, weekly)
+                if not rollup_response.success:
+                    raise RuntimeError(rollup_response.message)
+                self.repository.mark_rolled_up([event.id for event in events])
+
+            counts = {"events": len(events), "buckets": rollup_response.data}
+            if events:
+                self.logger.log(f"Session rollups processed: {counts}")
+            return ServiceResponse(
+                success=True,
+                message="Session rollups processed",
+                data=counts,
+                status_code=200,
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error processing session rollups: {str(e)}", level="error", error=e
+            )
+            return ServiceResponse(
+                success=False,
+                message="An error occurred while processing session rollups",
+                status_code=500,
+            )
+
+    @staticmethod
+    def can_view_others(user) -> bool:
+        return (
+            user.is_staff or user.groups.filter(name__in=STATS_VIEWER_GROUPS).exists()
+        )
+
+    def get_stats(self, user, period: str, params) -> ServiceResponse:
+        """
+        Args:
+            user: The requesting user.
+            period (str): "daily" (per day buckets) or "weekly" (per week).
+            params: start and end dates, optional user_id.
+
+        Business logic:
+            Reads only the pre-aggregated rollup rows of one user, never raw
+            events. Reading someone else's stats needs staff or a manager group.
+
+        Returns:
+            ServiceResponse: {"stats": [...]} oldest bucket first.
+        """
+        try:
+            serializer = StatsQuerySerializer(data=params)
+            if not serializer.is_valid():
+                return ServiceResponse(
+                    success=False,
+                    message="Invalid stats query",
+                    data={"errors": serializer.errors},
+                    status_code=400,
+                )
+            query = serializer.validated_data
+            user_id = query.get("user_id", user.id)
+            if user_id != user.id and not self.can_view_others(user):
+                return ServiceResponse(
+                    success=False,
+                    message="You may only view your own stats",
+                    status_code=403,
+                )
+
+            repo_response = self.repository.get_stats(
+                period, user_id, query["start"], query["end"]
+            )
+            if not repo_response.success:
+                raise RuntimeError(repo_response.message)
+            return ServiceResponse(
+                success=True,
+                message="Session stats retrieved successfully",
+                data={
+                    "stats": STATS_SERIALIZERS[period](
+                        repo_response.data, many=True
+                    ).data
+                },
+                status_code=200,
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error getting session stats: {str(e)}", level="error", error=e
+            )
+            return ServiceResponse(
+                success=False,
+                message="An error occurred while retrieving session stats",
+                status_code=500,
+            )
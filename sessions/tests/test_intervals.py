@@ -0,0 +1,57 @@
+# Test interval arithmetic used by the scheduling engine
+import datetime
+
+from django.test import SimpleTestCase
+
+from sessions.utils.intervals import (
+    chat_time_windows,
+    clip,
+    intersect,
+    merge,
+    subtract,
+)
+
+MONDAY = datetime.datetime(2026, 10, 19, tzinfo=datetime.timezone.utc)
+
+
+def at(hour, day=0):
+    return MONDAY + datetime.timedelta(days=day, hours=hour)
+
+
+class TestIntervals(SimpleTestCase):
+    def test_merge_coalesces_overlapping_and_touching(self):
+        self.assertEqual(
+            merge(
+                [(at(9), at(10)), (at(8), at(9)), (at(12), at(14)), (at(13), at(13.5))]
+            ),
+            [(at(8), at(10)), (at(12), at(14))],
+        )
+
+    def test_subtract_bookings(self):
+        """Test bookings carve holes, including ones spanning several slots."""
+        free = subtract(
+            [(at(8), at(12)), (at(14), at(18))],
+            [(at(9), at(10)), (at(11), at(15)), (at(17), at(17.5))],
+        )
+
+        self.assertEqual(
+            free,
+            [(at(8), at(9)), (at(10), at(11)), (at(15), at(17)), (at(17.5), at(18))],
+        )
+
+    def test_intersect_and_clip(self):
+        overlaps = intersect([(at(8), at(12)), (at(14), at(18))], [(at(11), at(15))])
+
+        self.assertEqual(overlaps, [(at(11), at(12)), (at(14), at(15))])
+        self.assertEqual(
+            clip(overlaps, at(11.5), at(24), datetime.timedelta(minutes=45)),
+            [(at(14), at(15))],
+        )
+
+    def test_chat_time_windows(self):
+        """Test mornings/evenings cover weekdays and weekends cover Sat-Sun."""
+        windows = chat_time_windows(["mornings", "weekends"], at(0), at(0, day=7))
+
+        self.assertEqual(len(windows), 7)
+        self.assertEqual(windows[0], (at(8), at(12)))
+        self.assertEqual(windows[5], (at(10, day=5), at(22, day=5)))
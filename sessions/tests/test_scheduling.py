@@ -0,0 +1,142 @@
+# Test availability, free slot search and double-booking protection
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from sessions.models import AvailabilitySlot, SessionAttendee
+from sessions.services.scheduling import SchedulingService
+from users.models import UserPreferences, UserProfile
+
+MONDAY = datetime.datetime(2026, 10, 19, tzinfo=datetime.timezone.utc)
+
+
+def at(hour, day=0):
+    return MONDAY + datetime.timedelta(days=day, hours=hour)
+
+
+class TestScheduling(TestCase):
+    """Test class for the sessions scheduling endpoints."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.users = [
+            User.objects.create_user(f"member{i}", f"member{i}@example.com")
+            for i in range(4)
+        ]
+        self.me, self.friend, self.other, self.outsider = self.users
+        for user in self.users:
+            AvailabilitySlot.objects.create(user=user, starts_at=at(8), ends_at=at(12))
+        AvailabilitySlot.objects.create(
+            user=self.friend, starts_at=at(18), ends_at=at(20)
+        )
+        self.client.force_authenticate(self.me)
+
+    def _book(self, participants, start, end):
+        return self.client.post(
+            reverse("book_session"),
+            {
+                "participant_ids": [user.id for user in participants],
+                "kind": "video",
+                "starts_at": start.isoformat(),
+                "ends_at": end.isoformat(),
+            },
+            format="json",
+        )
+
+    def _free(self, user_ids, **extra):
+        return self.client.get(
+            reverse("free_slots"),
+            {
+                "user_ids": ",".join(str(id) for id in user_ids),
+                "starts_at": at(0).isoformat(),
+                "ends_at": at(0, day=7).isoformat(),
+                **extra,
+            },
+        )
+
+    def test_add_availability_from_preferred_chat_times(self):
+        """Test preferred_chat_times expand into concrete weekly slots."""
+        profile = UserProfile.objects.create(user=self.outsider)
+        UserPreferences.objects.create(
+            profile=profile, preferred_chat_times=["evenings"]
+        )
+        self.client.force_authenticate(self.outsider)
+
+        response = self.client.post(
+            reverse("availability"),
+            {
+                "from_preferences": {
+                    "starts_at": at(0).isoformat(),
+                    "ends_at": at(0, day=7).isoformat(),
+                }
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data["slots"]), 5)
+        self.assertEqual(AvailabilitySlot.objects.filter(user=self.outsider).count(), 6)
+
+    def test_free_slots_subtract_bookings_in_one_query(self):
+        """Test free time is availability minus sessions, read in one query."""
+        self.assertEqual(self._book([self.friend], at(9), at(10)).status_code, 201)
+        service = SchedulingService()
+        params = {
+            "user_ids": f"{self.friend.id},{self.other.id}",
+            "starts_at": at(0).isoformat(),
+            "ends_at": at(0, day=7).isoformat(),
+        }
+
+        with self.assertNumQueries(1):
+            response = service.get_free_slots(self.me, params)
+
+        free = response.data["free_slots"]
+        self.assertEqual(
+            [
+                (slot["starts_at"], slot["ends_at"])
+                for slot in free[str(self.friend.id)]
+            ],
+            [(at(8), at(9)), (at(10), at(12)), (at(18), at(20))],
+        )
+        self.assertEqual(len(free[str(self.other.id)]), 1)
+
+    def test_mutual_free_slots(self):
+        """Test mutual intersects each friend's free time with the requester's."""
+        response = self._free([self.friend.id], mutual="true", min_minutes=60)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["free_slots"][str(self.friend.id)]), 1)
+
+    def test_prevents_double_booking(self):
+        """Test an overlapping booking for any attendee is refused with 409."""
+        self.assertEqual(self._book([self.friend], at(9), at(10)).status_code, 201)
+
+        self.client.force_authenticate(self.other)
+        response = self._book([self.friend], at(9.5), at(11))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["busy_user_ids"], [self.friend.id])
+
+        # Back to back is fine
+        self.assertEqual(self._book([self.friend], at(10), at(11)).status_code, 201)
+
+    def test_cancelled_sessions_free_the_slot(self):
+        session_id = self._book([self.friend], at(9), at(10)).data["id"]
+
+        response = self.client.post(reverse("cancel_session", args=[session_id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(SessionAttendee.objects.filter(is_cancelled=False).exists())
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self._book([self.friend], at(9), at(10)).status_code, 201)
+
+    def test_rejects_invalid_requests(self):
+        self.assertEqual(self._book([self.friend], at(10), at(9)).status_code, 400)
+        self.assertEqual(self._book([User(id=999)], at(9), at(10)).status_code, 400)
+        self.assertEqual(self._free(range(1, 60)).status_code, 400)
+        self.client.force_authenticate(self.outsider)
+        self.assertEqual(
+            self.client.post(reverse("cancel_session", args=[1])).status_code, 404
+        )
@@ -0,0 +1,191 @@
+# Test the session event log and its daily/weekly rollups
+import datetime
+import io
+from unittest import mock
+
+from django.contrib.auth.models import Group, User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from feedback.models import FeedbackSubmission
+from feedback.services.feedback_aggregation import FeedbackAggregationService
+from sessions.models import (
+    ChatSession,
+    DailySessionStats,
+    SessionAttendee,
+    SessionEvent,
+    WeeklySessionStats,
+)
+from sessions.services.session_stats import SessionStatsService
+
+MONDAY = datetime.datetime(2026, 10, 19, 9, tzinfo=datetime.timezone.utc)
+
+
+class TestSessionStats(TestCase):
+    """Test class for session events and dashboard rollups."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.friend = User.objects.create_user("friend", "friend@example.com")
+        self.user = User.objects.create_user("user", "user@example.com")
+        self.service = SessionStatsService()
+
+    def _session(self, start, kind="voice"):
+        session = ChatSession.objects.create(
+            organizer=self.user,
+            kind=kind,
+            starts_at=start,
+            ends_at=start + datetime.timedelta(hours=1),
+        )
+        for attendee in [self.user, self.friend]:
+            SessionAttendee.objects.create(
+                session=session,
+                user=attendee,
+                starts_at=session.starts_at,
+                ends_at=session.ends_at,
+            )
+        return session
+
+    def _event(self, session, kind, minutes=0, late=0):
+        """Post an event `minutes` into the session, reported `late` minutes later"""
+        occurred_at = session.starts_at + datetime.timedelta(minutes=minutes)
+        with mock.patch(
+            "django.utils.timezone.now",
+            return_value=occurred_at + datetime.timedelta(minutes=late),
+        ):
+            return self.client.post(
+                reverse("session_events", args=[session.id]),
+                {"kind": kind, "occurred_at": occurred_at.isoformat()},
+                format="json",
+            )
+
+    def _rate(self, session, reviewer, subject, rating, minutes=0):
+        """Rate an attendee through feedback, as clients do after a session"""
+        with mock.patch(
+            "django.utils.timezone.now",
+            return_value=session.starts_at + datetime.timedelta(minutes=minutes),
+        ):
+            FeedbackSubmission.objects.create(
+                reviewer=reviewer, subject=subject, session=session, rating=rating
+            )
+        FeedbackAggregationService().process_pending()
+
+    def _stats(self, period, **params):
+        return self.client.get(
+            reverse(f"session_stats_{period}"),
+            {"start": "2026-10-01", "end": "2026-10-31", **params},
+        )
+
+    def test_events_record_duration_and_validate(self):
+        """Test ended events measure from start; bad events are refused."""
+        session = self._session(MONDAY)
+        self.client.force_authenticate(self.friend)
+
+        self.assertEqual(self._event(session, "ended", 30).status_code, 400)
+        self.assertEqual(self._event(session, "started").status_code, 201)
+        self.assertEqual(self._event(session, "ended", 30).status_code, 201)
+        self.assertEqual(self._event(session, "rated").status_code, 400)
+        # Too late: the event would land in an already reported rollup
+        self.assertEqual(self._event(session, "dropped", 30, late=6).status_code, 400)
+
+        ended = SessionEvent.objects.get(kind="ended")
+        self.assertEqual(ended.duration_seconds, 1800)
+        self.assertEqual(ended.session_kind, "voice")
+
+        self.client.force_authenticate(User.objects.create_user("x", "x@example.com"))
+        self.assertEqual(self._event(session, "started").status_code, 404)
+
+    def test_repeated_events_are_recorded_once(self):
+        """Test a retried event answers 200 with the stored row."""
+        session = self._session(MONDAY)
+        self.client.force_authenticate(self.friend)
+
+        first = self._event(session, "started")
+        retry = self._event(session, "started", 1)
+
+        self.assertEqual((first.status_code, retry.status_code), (201, 200))
+        self.assertEqual(retry.data["id"], first.data["id"])
+        self.assertEqual(SessionEvent.objects.filter(kind="started").count(), 1)
+
+    def test_future_timestamps_are_clamped(self):
+        """Test a client clock ahead of the server cannot date events forward."""
+        session = self._session(MONDAY)
+        self.client.force_authenticate(self.friend)
+
+        self._event(session, "started", 60 * 24, late=-60 * 24)
+
+        self.assertEqual(
+            SessionEvent.objects.get(kind="started").occurred_at, session.starts_at
+        )
+
+    def test_rollups_add_up_incrementally(self):
+        """Test batches increment buckets and never count an event twice."""
+        self.client.force_authenticate(self.friend)
+        first = self._session(MONDAY)
+        self._event(first, "started")
+        self._event(first, "ended", 40)
+        self._rate(first, self.user, self.friend, 4, 41)
+
+        self.assertEqual(self.service.process_pending(batch_size=1).data["events"], 1)
+        self.assertEqual(self.service.process_pending().data["events"], 1)
+        self.assertEqual(self.service.process_pending().data["events"], 0)
+
+        second = self._session(MONDAY + datetime.timedelta(days=2))
+        self._event(second, "started")
+        self._event(second, "dropped", 20)
+        self._rate(second, self.user, self.friend, 2, 21)
+        call_command("process_session_rollups", stdout=io.StringIO())
+
+        daily = DailySessionStats.objects.get(user=self.friend, day=MONDAY.date())
+        self.assertEqual(
+            (daily.sessions_started, daily.sessions_ended, daily.ratings_sum),
+            (1, 1, 4),
+        )
+        weekly = WeeklySessionStats.objects.get(user=self.friend)
+        self.assertEqual(weekly.week_start, MONDAY.date())
+        self.assertEqual(
+            (
+                weekly.sessions_started,
+                weekly.sessions_ended,
+                weekly.sessions_dropped,
+                weekly.total_duration_seconds,
+                weekly.ratings_count,
+                weekly.ratings_sum,
+            ),
+            (2, 1, 1, 3600, 2, 6),
+        )
+        # Ratings are credited to the rated attendee, never to the rater
+        self.assertFalse(
+            WeeklySessionStats.objects.filter(user=self.user, ratings_count__gt=0)
+        )
+
+    def test_dashboards_read_rollups_only(self):
+        """Test stats endpoints serve pre-aggregated rows with averages."""
+        self.client.force_authenticate(self.friend)
+        session = self._session(MONDAY)
+        self._event(session, "started")
+        self._event(session, "ended", 30)
+        self._rate(session, self.user, self.friend, 5, 31)
+        self.service.process_pending()
+
+        # The rollup rows only: no SessionEvent query
+        with self.assertNumQueries(1):
+            response = self.service.get_stats(
+                self.friend, "daily", {"start": "2026-10-01", "end": "2026-10-31"}
+            )
+
+        self.assertEqual(len(response.data["stats"]), 1)
+        row = response.data["stats"][0]
+        self.assertEqual(row["day"], "2026-10-19")
+        self.assertEqual(row["average_duration_seconds"], 1800)
+        self.assertEqual(row["average_rating"], 5)
+
+    def test_only_managers_view_other_users(self):
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self._stats("weekly", user_id=self.friend.id).status_code, 403)
+
+        self.user.groups.add(Group.objects.create(name="User manager"))
+        self.assertEqual(self._stats("weekly", user_id=self.friend.id).status_code, 200)
+        self.assertEqual(self._stats("daily", end="2026-09-01").status_code, 400)
@@ -0,0 +1,28 @@
+# sessions urls
+from django.urls import path
+
+from .views import (
+    availability_detail_view,
+    availability_view,
+    book_session_view,
+    cancel_session_view,
+    daily_stats_view,
+    free_slots_view,
+    session_event_view,
+    weekly_stats_view,
+)
+
+urlpatterns = [
+    path("", book_session_view, name="book_session"),
+    path("<int:session_id>/cancel/", cancel_session_view, name="cancel_session"),
+    path("<int:session_id>/events/", session_event_view, name="session_events"),
+    path("stats/daily/", daily_stats_view, name="session_stats_daily"),
+    path("stats/weekly/", weekly_stats_view, name="session_stats_weekly"),
+    path("availability/", availability_view, name="availability"),
+    path(
+        "availability/<int:slot_id>/",
+        availability_detail_view,
+        name="availability_detail",
+    ),
+    path("availability/free/", free_slots_view, name="free_slots"),
+]
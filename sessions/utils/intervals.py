@@ -0,0 +1,108 @@
+# Half-open [start, end) interval arithmetic for availability and bookings
+import datetime
+
+from django.utils import timezone
+
+# Local hours each UserPreferences.CHAT_TIME_CHOICES value stands for
+CHAT_TIME_WINDOWS = {
+    "mornings": [(8, 12)],
+    "evenings": [(18, 22)],
+}
+WEEKEND_HOURS = (10, 22)
+
+
+def merge(intervals) -> list:
+    """Sort and coalesce overlapping or touching intervals"""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract(intervals: list, busy: list) -> list:
+    """
+    Parts of merged `intervals` not covered by merged `busy`, in one sweep
+    over both sorted lists (O(n + m)).
+    """
+    free = []
+    index = 0
+    for start, end in intervals:
+        while index < len(busy) and busy[index][1] <= start:
+            index += 1
+        cursor, scan = start, index
+        while scan < len(busy) and busy[scan][0] < end:
+            if busy[scan][0] > cursor:
+                free.append((cursor, busy[scan][0]))
+            cursor = max(cursor, busy[scan][1])
+            scan += 1
+        if cursor < end:
+            free.append((cursor, end))
+    return free
+
+
+def intersect(first: list, second: list) -> list:
+    """Overlaps of two merged interval lists (two pointer sweep)"""
+    overlaps = []
+    i = j = 0
+    while i < len(first) and j < len(second):
+        start = max(first[i][0], second[j][0])
+        end = min(first[i][1], second[j][1])
+        if start < end:
+            overlaps.append((start, end))
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+    return overlaps
+
+
+def clip(intervals: list, start, end, min_length=None) -> list:
+    """Restrict intervals to [start, end) and drop those shorter than min_length"""
+    clipped = []
+    for interval_start, interval_end in intervals:
+        interval_start, interval_end = max(interval_start, start), min(
+            interval_end, end
+        )
+        if interval_end > interval_start and (
+            min_length is None or interval_end - interval_start >= min_length
+        ):
+            clipped.append((interval_start, interval_end))
+    return clipped
+
+
+def chat_time_windows(preferred_chat_times: list, start, end) -> list:
+    """
+    Expand UserPreferences.preferred_chat_times into concrete intervals
+    between `start` and `end`, in the current time zone. Mornings and
+    evenings apply on weekdays, weekends cover Saturday and Sunday daytime.
+    """
+    tz = timezone.get_current_timezone()
+    windows = []
+    day = timezone.localtime(start, tz).date()
+    last_day = timezone.localtime(end, tz).date()
+    while day <= last_day:
+        if day.weekday() >= 5:
+            hours = [WEEKEND_HOURS] if "weekends" in preferred_chat_times else []
+        else:
+            hours = [
+                window
+                for choice in preferred_chat_times
+                for window in CHAT_TIME_WINDOWS.get(choice, [])
+            ]
+        for first_hour, last_hour in hours:
+            windows.append(
+                (
+                    timezone.make_aware(
+                        datetime.datetime.combine(day, datetime.time(first_hour)), tz
+                    ),
+                    timezone.make_aware(
+                        datetime.datetime.combine(day, datetime.time(last_hour)), tz
+                    ),
+                )
+            )
+        day += datetime.timedelta(days=1)
+    return clip(merge(windows), start, end)
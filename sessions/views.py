@@ -1,3 +1,79 @@
-from django.shortcuts import render
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
-# Create your views here.
+from sessions.services.scheduling import SchedulingService
+from sessions.services.session_stats import SessionStatsService
+
+# Initialize services
+scheduling = SchedulingService()
+session_stats = SessionStatsService()
+
+
+def _response(service_response):
+    if not service_response.success:
+        return Response(
+            {"message": service_response.message, **(service_response.data or {})},
+            status=service_response.status_code,
+        )
+    return Response(service_response.data, status=service_response.status_code)
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def availability_view(request):
+    """Add availability slots, explicitly or from preferred chat times"""
+    return _response(scheduling.add_availability(request.user, request.data))
+
+
+@api_view(["DELETE"])
+@permission_classes([IsAuthenticated])
+def availability_detail_view(request, slot_id):
+    """Remove an availability slot"""
+    return _response(scheduling.remove_availability(request.user, slot_id))
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def free_slots_view(request):
+    """Free time of up to 50 users within a window"""
+    return _response(scheduling.get_free_slots(request.user, request.query_params))
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def book_session_view(request):
+    """Book a chat session with friends"""
+    return _response(scheduling.book_session(request.user, request.data))
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def cancel_session_view(request, session_id):
+    """Cancel a booked session"""
+    return _response(scheduling.cancel_session(request.user, session_id))
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def session_event_view(request, session_id):
+    """Log a started/ended/dropped event for a session"""
+    return _response(session_stats.record_event(request.user, session_id, request.data))
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def daily_stats_view(request):
+    """Per day session stats (friend dashboard)"""
+    return _response(
+        session_stats.get_stats(request.user, "daily", request.query_params)
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def weekly_stats_view(request):
+    """Per week session stats (manager dashboard)"""
+    return _response(
+        session_stats.get_stats(request.user, "weekly", request.query_params)
+    )
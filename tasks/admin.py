@@ -1,3 +1,74 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.utils import timezone
 
-# Register your models here.
+from core.utils.pagination import EstimatedCountPaginator
+from .models import PeriodicJob, PeriodicJobRun
+
+
+@admin.register(PeriodicJob)
+class PeriodicJobAdmin(admin.ModelAdmin):
+    """Definitions live in settings.TASK_SCHEDULE; the admin only triggers runs"""
+
+    list_display = [
+        "name",
+        "cron",
+        "enabled",
+        "next_run_at",
+        "last_run_at",
+        "last_status",
+    ]
+    list_filter = ["enabled", "last_status"]
+    readonly_fields = [
+        "name",
+        "task",
+        "cron",
+        "queue",
+        "enabled",
+        "next_run_at",
+        "last_enqueued_at",
+        "last_run_at",
+        "last_status",
+        "updated_at",
+    ]
+    actions = ["run_now"]
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Run selected jobs at the next scheduler tick")
+    def run_now(self, request, queryset):
+        updated = queryset.filter(enabled=True).update(next_run_at=timezone.now())
+        self.message_user(
+            request, f"{updated} job(s) will run at the next tick.", messages.SUCCESS
+        )
+
+
+@admin.register(PeriodicJobRun)
+class PeriodicJobRunAdmin(admin.ModelAdmin):
+    list_display = [
+        "job",
+        "status",
+        "scheduled_for",
+        "started_at",
+        "duration_ms",
+        "rows_processed",
+    ]
+    list_filter = ["status", "job"]
+    list_select_related = ["job"]
+    ordering = ["-id"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    readonly_fields = [
+        "job",
+        "scheduled_for",
+        "started_at",
+        "finished_at",
+        "duration_ms",
+        "rows_processed",
+        "status",
+        "error",
+        "created_at",
+    ]
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,137 @@
+# Task queue throughput benchmark: tasks/sec per worker and batch size
+import platform
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.registry import task
+from tasks.services.worker import TaskWorker
+
+BENCHMARK_QUEUE = "benchmark"
+
+
+@task(queue=BENCHMARK_QUEUE)
+def noop(*args, **kwargs):
+    """Does nothing, so a run measures the queue's own overhead."""
+
+
+def remove_benchmark_tasks():
+    Task.all_objects.filter(queue=BENCHMARK_QUEUE).delete()
+
+
+class TaskThroughputBenchmark:
+    """
+    Measure how many tasks per second workers drain from the queue.
+
+    Business logic:
+        1. For each batch size, enqueue `tasks` no-op tasks in bulk (timed
+           as the enqueue rate).
+        2. Start `workers` workers on the benchmark queue (the calling
+           thread for one worker, one thread and connection each otherwise)
+           and let each claim batches until the queue is empty.
+        3. Report overall tasks/sec and tasks/sec per worker, then delete
+           the benchmark rows.
+
+    Several workers need row locks (PostgreSQL); on SQLite they would
+    claim the same rows.
+
+    Returns a JSON serialisable report from run().
+    """
+
+    def __init__(self, tasks: int = 5000, batch_sizes=(10,), workers=1, stdout=None):
+        self.tasks = tasks
+        self.batch_sizes = list(batch_sizes)
+        self.workers = workers
+        self.stdout = stdout
+
+    def _write(self, message: str):
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+    def run(self) -> dict:
+        report = {
+            "generated_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "database": connection.vendor,
+            "backend": settings.TASK_BACKEND,
+            "tasks": self.tasks,
+            "workers": self.workers,
+            "results": {},
+        }
+        for batch_size in self.batch_sizes:
+            result = self.run_once(batch_size)
+            report["results"][str(batch_size)] = result
+            self._write(
+                f"  batch={batch_size:<5} enqueue={result['enqueue_per_second']}/s "
+                f"drain={result['tasks_per_second']}/s "
+                f"per worker={result['tasks_per_second_per_worker']}/s"
+            )
+        return report
+
+    def run_once(self, batch_size: int) -> dict:
+        remove_benchmark_tasks()
+        started = time.perf_counter()
+        noop.enqueue_many([((i,), {}) for i in range(self.tasks)])
+        enqueue_seconds = time.perf_counter() - started
+
+        results = [None] * self.workers
+        started = time.perf_counter()
+        if self.workers == 1:
+            self._drain(0, batch_size, results)
+        else:
+            threads = [
+                threading.Thread(target=self._drain, args=(i, batch_size, results))
+                for i in range(self.workers)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        drain_seconds = time.perf_counter() - started
+
+        processed = sum(count for count, _ in results)
+        succeeded = Task.objects.filter(
+            queue=BENCHMARK_QUEUE, status="succeeded"
+        ).count()
+        remove_benchmark_tasks()
+        per_worker = [count / seconds for count, seconds in results if seconds]
+        return {
+            "processed": processed,
+            "succeeded": succeeded,
+            "enqueue_seconds": round(enqueue_seconds, 3),
+            "enqueue_per_second": (
+                round(self.tasks / enqueue_seconds, 1) if enqueue_seconds else 0.0
+            ),
+            "drain_seconds": round(drain_seconds, 3),
+            "tasks_per_second": (
+                round(processed / drain_seconds, 1) if drain_seconds else 0.0
+            ),
+            "tasks_per_second_per_worker": (
+                round(sum(per_worker) / len(per_worker), 1) if per_worker else 0.0
+            ),
+        }
+
+    def _drain(self, index: int, batch_size: int, results: list):
+        worker = TaskWorker(
+            queues=[BENCHMARK_QUEUE],
+            batch_size=batch_size,
+            worker_id=f"benchmark-{index}",
+        )
+        processed = 0
+        started = time.perf_counter()
+        try:
+            while True:
+                response = worker.run_batch()
+                if not response.success:
+                    raise RuntimeError(response.message)
+                processed += response.data["claimed"]
+                if response.data["claimed"] < batch_size:
+                    break
+        finally:
+            results[index] = (processed, time.perf_counter() - started)
+            if self.workers > 1:
+                connection.close()
@@ -0,0 +1,97 @@
+# Minimal cron expressions for periodic jobs
+import datetime
+
+from django.utils import timezone
+
+# (name, lowest, highest) of the five cron fields
+FIELDS = [
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    # 7 is accepted for Sunday too
+    ("weekday", 0, 7),
+]
+
+# No schedule needs more than this many years to find a match ("0 0 29 2 *"
+# fires every four years); anything longer is an impossible date like 31/2
+SEARCH_YEARS = 5
+
+
+def _parse_field(text: str, lowest: int, highest: int) -> set:
+    values = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"Invalid step in '{text}'")
+        if part == "*":
+            start, end = lowest, highest
+        elif "-" in part:
+            start, end = (int(bound) for bound in part.split("-", 1))
+        else:
+            start = int(part)
+            end = highest if step > 1 else start
+        if start < lowest or end > highest or start > end:
+            raise ValueError(f"'{text}' is outside {lowest}-{highest}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """
+    A five field cron expression: minute hour day-of-month month day-of-week.
+
+    Fields accept *, numbers, ranges (1-5), lists (1,15) and steps (*/10,
+    8-18/2). Weekdays run 0-7 from Sunday (0 and 7). As in cron,
+    when both day-of-month and day-of-week are restricted a day matching
+    either fires. Times are wall clock in settings.TIME_ZONE.
+    """
+
+    def __init__(self, expression: str):
+        parts = expression.split()
+        if len(parts) != len(FIELDS):
+            raise ValueError(f"Cron expression '{expression}' needs 5 fields")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            _parse_field(part, lowest, highest)
+            for part, (_, lowest, highest) in zip(parts, FIELDS)
+        )
+        self.weekdays = {weekday % 7 for weekday in self.weekdays}
+        self.any_day = parts[2] == "*"
+        self.any_weekday = parts[4] == "*"
+
+    def __repr__(self):
+        return f"<CronSchedule '{self.expression}'>"
+
+    def _day_matches(self, value: datetime.datetime) -> bool:
+        day = value.day in self.days
+        weekday = (value.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, value: datetime.datetime) -> datetime.datetime:
+        """The first matching minute strictly after `value` (aware)"""
+        current_timezone = timezone.get_current_timezone()
+        local = timezone.localtime(value, current_timezone).replace(
+            second=0, microsecond=0, tzinfo=None
+        ) + datetime.timedelta(minutes=1)
+        limit = local + datetime.timedelta(days=366 * SEARCH_YEARS)
+
+        while local < limit:
+            if local.month not in self.months:
+                local = (local.replace(day=1) + datetime.timedelta(days=32)).replace(
+                    day=1, hour=0, minute=0
+                )
+            elif not self._day_matches(local):
+                local = (local + datetime.timedelta(days=1)).replace(hour=0, minute=0)
+            elif local.hour not in self.hours:
+                local = (local + datetime.timedelta(hours=1)).replace(minute=0)
+            elif local.minute not in self.minutes:
+                local += datetime.timedelta(minutes=1)
+            else:
+                return timezone.make_aware(local, current_timezone)
+        raise ValueError(f"Cron expression '{self.expression}' never fires")
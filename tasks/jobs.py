@@ -0,0 +1,14 @@
+# Background tasks of the tasks app
+from tasks.registry import task
+from tasks.services.periodic_jobs import PeriodicJobService
+
+
+@task(queue="periodic", max_attempts=1)
+def run_periodic_job(name: str, scheduled_for: str = None):
+    """
+    Run a scheduled job and record it. Not retried: a failed run is in
+    the run history and the job fires again at its next cron time.
+    """
+    response = PeriodicJobService().run_job(name, scheduled_for)
+    if not response.success:
+        raise RuntimeError(response.message)
@@ -0,0 +1,26 @@
+# Database advisory locks for leader election
+import hashlib
+
+from django.db import connection
+
+
+def lock_key(name: str) -> int:
+    """A stable signed 64 bit key for `name` (PostgreSQL lock keys are bigint)"""
+    digest = hashlib.blake2b(name.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def try_advisory_xact_lock(name: str) -> bool:
+    """
+    Try to take the transaction scoped advisory lock `name` without waiting.
+
+    Must run inside transaction.atomic(); the lock is released when that
+    transaction ends, so a node that dies mid tick frees it at once. Only
+    PostgreSQL has advisory locks: other databases always return True and
+    are only safe with a single node (SQLite serialises writers anyway).
+    """
+    if connection.vendor != "postgresql":
+        return True
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", [lock_key(name)])
+        return cursor.fetchone()[0]
@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from core.benchmarks.runner import save_report
+from tasks.benchmark import TaskThroughputBenchmark
+
+
+class Command(BaseCommand):
+    """Measure task queue throughput (tasks/sec per worker)"""
+
+    help = (
+        "Enqueue no-op tasks and drain them with one or more workers for each "
+        "batch size, reporting enqueue rate and tasks/sec overall and per "
+        "worker. Runs in a throwaway test database unless --use-current-db."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=5000)
+        parser.add_argument(
+            "--batch-sizes",
+            default="1,10,100",
+            help="Comma separated claim batch sizes",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Concurrent worker threads (more than one requires PostgreSQL)",
+        )
+        parser.add_argument(
+            "--use-current-db",
+            action="store_true",
+            help="Run against the configured database (benchmark rows are removed)",
+        )
+        parser.add_argument("--output", help="Write the report to this JSON file")
+
+    def handle(self, *args, **options):
+        if options["tasks"] < 1 or options["workers"] < 1:
+            raise CommandError("Need at least one task and one worker")
+        if options["workers"] > 1 and connection.vendor != "postgresql":
+            raise CommandError(
+                "Several workers need row locks (SKIP LOCKED); use PostgreSQL"
+            )
+        benchmark = TaskThroughputBenchmark(
+            tasks=options["tasks"],
+            batch_sizes=[int(size) for size in options["batch_sizes"].split(",")],
+            workers=options["workers"],
+            stdout=self.stdout,
+        )
+
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        try:
+            if not options["use_current_db"]:
+                connection.creation.create_test_db(
+                    verbosity=0, autoclobber=True, serialize=False
+                )
+            report = benchmark.run()
+        finally:
+            if not options["use_current_db"]:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options["output"]:
+            save_report(report, options["output"])
+            self.stdout.write(f"Results written to {options['output']}")
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.services.scheduler import PeriodicScheduler
+
+# Seconds between purges of old run history
+HOUSEKEEPING_INTERVAL = 3600.0
+
+
+class Command(BaseCommand):
+    """Enqueue periodic jobs from settings.TASK_SCHEDULE when they are due"""
+
+    help = (
+        "Check the cron schedule and enqueue due jobs for run_tasks workers. "
+        "Safe to run on every node: an advisory lock (PostgreSQL) elects one "
+        "leader per tick (other databases: run one scheduler only). Use "
+        "--loop to keep checking."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop", action="store_true", help="Keep checking the schedule"
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=30.0,
+            help="Seconds between checks (with --loop)",
+        )
+
+    def handle(self, *args, **options):
+        scheduler = PeriodicScheduler()
+        next_housekeeping = 0.0
+        while True:
+            if time.monotonic() >= next_housekeeping:
+                next_housekeeping = time.monotonic() + HOUSEKEEPING_INTERVAL
+                scheduler.purge_runs()
+
+            response = scheduler.tick()
+            if not response.success:
+                raise CommandError(response.message)
+            if response.data["enqueued"]:
+                self.stdout.write(f"Enqueued {', '.join(response.data['enqueued'])}")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.services.worker import TaskWorker
+
+# Seconds between housekeeping passes (stale task requeue, purge)
+HOUSEKEEPING_INTERVAL = 60.0
+
+
+class Command(BaseCommand):
+    """Run queued background tasks"""
+
+    help = (
+        "Claim ready tasks in batches (highest priority first) and run them, "
+        "retrying failures with exponential backoff. Use --loop to keep "
+        "polling; run several workers to process queues in parallel."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--queues", help="Comma separated queue names (default: every queue)"
+        )
+        parser.add_argument("--batch-size", type=int, default=10)
+        parser.add_argument(
+            "--loop", action="store_true", help="Keep polling for new tasks"
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep when no task is ready (with --loop)",
+        )
+        parser.add_argument("--worker-id", help="Default: hostname:pid")
+
+    def handle(self, *args, **options):
+        worker = TaskWorker(
+            queues=options["queues"].split(",") if options["queues"] else None,
+            batch_size=options["batch_size"],
+            worker_id=options["worker_id"],
+        )
+        next_housekeeping = 0.0
+        while True:
+            if time.monotonic() >= next_housekeeping:
+                next_housekeeping = time.monotonic() + HOUSEKEEPING_INTERVAL
+                requeued = worker.requeue_stale()
+                if requeued:
+                    self.stdout.write(f"Requeued {requeued} stale tasks")
+                worker.purge_finished()
+
+            response = worker.run_batch()
+            if not response.success:
+                raise CommandError(response.message)
+            counts = response.data
+            if counts["claimed"]:
+                self.stdout.write(
+                    f"{counts['claimed']} tasks: {counts['succeeded']} succeeded, "
+                    f"{counts['retried']} retried, {counts['failed']} failed"
+                )
+            if counts["claimed"] < options["batch_size"]:
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
@@ -0,0 +1,36 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.services.task_metrics import TaskMetricsService
+
+
+class Command(BaseCommand):
+    """Show counts and timings of recently finished tasks"""
+
+    help = (
+        "Per task name: succeeded and failed counts with mean/max run time "
+        "and queue wait in milliseconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hours", type=float, default=24)
+        parser.add_argument("--json", action="store_true", help="Print raw JSON")
+
+    def handle(self, *args, **options):
+        response = TaskMetricsService().get_metrics(hours=options["hours"])
+        if not response.success:
+            raise CommandError(response.message)
+        if options["json"]:
+            self.stdout.write(json.dumps(response.data, indent=2, sort_keys=True))
+            return
+
+        for name, statuses in response.data["tasks"].items():
+            for status, figures in statuses.items():
+                self.stdout.write(
+                    f"  {name} {status}: {figures['count']} tasks, "
+                    f"run mean {figures['mean_duration_ms']}ms "
+                    f"max {figures['max_duration_ms']}ms, "
+                    f"wait mean {figures['mean_wait_ms']}ms "
+                    f"max {figures['max_wait_ms']}ms"
+                )
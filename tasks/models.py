@@ -1,3 +1,115 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+from core.models import SlimBaseModel
+
+
+class Task(SlimBaseModel):
+    """
+    One queued call of a registered task function (tasks.registry).
+
+    Workers claim ready rows with SELECT ... FOR UPDATE SKIP LOCKED, mark
+    them running, execute them outside the claiming transaction and write
+    the outcome and timings back in one bulk update. Delivery is at least
+    once: a worker that dies leaves its rows running until they are
+    requeued after TASK_VISIBILITY_TIMEOUT_SECONDS, so tasks must be safe
+    to run twice.
+    """
+
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("succeeded", "Succeeded"),
+        ("failed", "Failed"),
+    ]
+
+    name = models.CharField(max_length=200)
+    queue = models.CharField(max_length=50, default="default")
+    # Higher runs first
+    priority = models.SmallIntegerField(default=0)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="queued")
+    # Not claimed before this time (delayed tasks and retry backoff)
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    last_error = models.TextField(blank=True, default="")
+    locked_by = models.CharField(max_length=100, blank=True, default="")
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    # Timings of the last attempt: time spent running, and time between
+    # becoming due (run_at) and being picked up
+    duration_ms = models.FloatField(blank=True, null=True)
+    wait_ms = models.FloatField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            # The claim query: ready rows of a queue by priority, then age
+            models.Index(
+                fields=["queue", "-priority", "run_at", "id"],
+                condition=models.Q(status="queued"),
+                name="tasks_ready_idx",
+            ),
+            models.Index(
+                fields=["started_at"],
+                condition=models.Q(status="running"),
+                name="tasks_running_idx",
+            ),
+            models.Index(fields=["finished_at", "name"], name="tasks_finished_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.id} ({self.status})"
+
+
+class PeriodicJob(models.Model):
+    """
+    Scheduler state of one entry of settings.TASK_SCHEDULE.
+
+    Settings own the definition (task, cron, queue); the scheduler syncs
+    them into this table on every tick and keeps next_run_at here, so
+    every node agrees on what is due.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    task = models.CharField(max_length=200)
+    cron = models.CharField(max_length=100)
+    queue = models.CharField(max_length=50, default="periodic")
+    enabled = models.BooleanField(default=True)
+    next_run_at = models.DateTimeField(blank=True, null=True)
+    last_enqueued_at = models.DateTimeField(blank=True, null=True)
+    last_run_at = models.DateTimeField(blank=True, null=True)
+    last_status = models.CharField(max_length=10, blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.cron})"
+
+
+class PeriodicJobRun(SlimBaseModel):
+    """One execution of a periodic job, written by the worker running it"""
+
+    STATUS_CHOICES = [
+        ("running", "Running"),
+        ("succeeded", "Succeeded"),
+        ("failed", "Failed"),
+    ]
+
+    # Covered by the (job, -id) index
+    job = models.ForeignKey(
+        PeriodicJob, on_delete=models.CASCADE, related_name="runs", db_index=False
+    )
+    scheduled_for = models.DateTimeField(blank=True, null=True)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(blank=True, null=True)
+    duration_ms = models.FloatField(blank=True, null=True)
+    rows_processed = models.PositiveIntegerField(blank=True, null=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="running")
+    error = models.TextField(blank=True, default="")
+
+    class Meta:
+        indexes = [models.Index(fields=["job", "-id"], name="tasks_job_runs_idx")]
+
+    def __str__(self):
+        return f"{self.job_id} at {self.started_at} ({self.status})"
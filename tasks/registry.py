@@ -0,0 +1,121 @@
+# Task registration and enqueueing
+import datetime
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from tasks.backends import get_task_backend
+from tasks.models import Task
+
+_registry = {}
+
+
+class TaskDefinition:
+    """
+    A function that can run in a worker; created by the @task decorator.
+
+    Calling it runs the function inline. delay() / enqueue() store a call
+    for a worker instead; arguments must be JSON serialisable (pass ids,
+    not model instances).
+    """
+
+    def __init__(self, func, name: str, queue: str, priority: int, max_attempts):
+        self.func = func
+        self.name = name
+        self.queue = queue
+        self.priority = priority
+        self.max_attempts = max_attempts
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<TaskDefinition {self.name}>"
+
+    def build(
+        self,
+        args=(),
+        kwargs=None,
+        priority: int = None,
+        run_at: datetime.datetime = None,
+        countdown: float = None,
+        queue: str = None,
+    ) -> Task:
+        """An unsaved Task row for one call"""
+        if run_at is None:
+            run_at = timezone.now()
+            if countdown:
+                run_at += datetime.timedelta(seconds=countdown)
+        return Task(
+            name=self.name,
+            queue=queue or self.queue,
+            priority=self.priority if priority is None else priority,
+            args=list(args),
+            kwargs=kwargs or {},
+            run_at=run_at,
+            max_attempts=self.max_attempts or settings.TASK_DEFAULT_MAX_ATTEMPTS,
+        )
+
+    def delay(self, *args, **kwargs) -> Task:
+        return self.enqueue(args, kwargs)
+
+    def enqueue(self, args=(), kwargs=None, **options) -> Task:
+        """
+        Args:
+            args, kwargs: arguments of the call
+            priority (int): overrides the task's priority (higher runs first)
+            run_at (datetime) / countdown (seconds): delay the first attempt
+            queue (str): overrides the task's queue
+        """
+        return get_task_backend().enqueue([self.build(args, kwargs, **options)])[0]
+
+    def enqueue_many(self, calls, **options) -> list:
+        """Store many (args, kwargs) calls in one batched insert"""
+        return get_task_backend().enqueue(
+            [self.build(args, kwargs, **options) for args, kwargs in calls]
+        )
+
+
+def task(
+    func=None,
+    *,
+    name: str = None,
+    queue: str = "default",
+    priority: int = 0,
+    max_attempts: int = None,
+):
+    """
+    Register a function as a task.
+
+    The name defaults to the function's dotted path, which lets a worker
+    import the defining module on first use.
+    """
+
+    def decorator(func):
+        definition = TaskDefinition(
+            func,
+            name or f"{func.__module__}.{func.__qualname__}",
+            queue,
+            priority,
+            max_attempts,
+        )
+        _registry[definition.name] = definition
+        return definition
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def get_task(name: str) -> TaskDefinition:
+    """Look up a registered task, importing its module if needed."""
+    if name not in _registry:
+        try:
+            definition = import_string(name)
+        except ImportError as e:
+            raise LookupError(f"Unknown task '{name}'") from e
+        if not isinstance(definition, TaskDefinition):
+            raise LookupError(f"'{name}' is not a task")
+        _registry.setdefault(name, definition)
+    return _registry[name]
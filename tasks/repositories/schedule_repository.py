@@ -0,0 +1,106 @@
+# Schedule Repository
+from django.utils import timezone
+
+from core.utils.data_classes import RepositoryResponse
+from core.utils.logging import LoggingService
+from tasks.models import PeriodicJob, PeriodicJobRun
+
+JOB_FIELDS = ["task", "cron", "queue", "enabled", "next_run_at"]
+
+
+class ScheduleRepository:
+    """
+    Repository layer for periodic jobs and their run history
+    Returns RepositoryResponse with raw objects/querysets
+    """
+
+    def __init__(self):
+        self.logger = LoggingService()
+
+    def get_jobs(self) -> RepositoryResponse:
+        """Every job row, locked when called inside transaction.atomic()"""
+        try:
+            jobs = list(PeriodicJob.objects.select_for_update().order_by("id"))
+            return RepositoryResponse(success=True, message="Jobs loaded", data=jobs)
+        except Exception as e:
+            self.logger.log(
+                f"Error loading periodic jobs: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def save_jobs(self, created: list, updated: list) -> RepositoryResponse:
+        try:
+            PeriodicJob.objects.bulk_create(created)
+            if updated:
+                PeriodicJob.objects.bulk_update(
+                    updated, JOB_FIELDS + ["last_enqueued_at"]
+                )
+            return RepositoryResponse(
+                success=True, message="Jobs saved", data=created + updated
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error saving periodic jobs: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def start_run(self, name: str, scheduled_for) -> RepositoryResponse:
+        try:
+            job = PeriodicJob.objects.get(name=name)
+            run = PeriodicJobRun.objects.create(
+                job=job, scheduled_for=scheduled_for, started_at=timezone.now()
+            )
+            return RepositoryResponse(success=True, message="Run started", data=run)
+        except PeriodicJob.DoesNotExist:
+            return RepositoryResponse(
+                success=False, message=f"Unknown periodic job '{name}'"
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error starting periodic job run: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def finish_run(self, run: PeriodicJobRun) -> RepositoryResponse:
+        """Save the outcome of a run and mirror it on its job for the admin"""
+        try:
+            run.save(
+                update_fields=[
+                    "finished_at",
+                    "duration_ms",
+                    "rows_processed",
+                    "status",
+                    "error",
+                ]
+            )
+            PeriodicJob.objects.filter(id=run.job_id).update(
+                last_run_at=run.started_at, last_status=run.status
+            )
+            return RepositoryResponse(success=True, message="Run saved", data=run)
+        except Exception as e:
+            self.logger.log(
+                f"Error saving periodic job run: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
+
+    def purge_runs(self, started_before) -> RepositoryResponse:
+        try:
+            deleted, _ = PeriodicJobRun.objects.filter(
+                started_at__lt=started_before
+            ).delete()
+            return RepositoryResponse(success=True, message="Runs purged", data=deleted)
+        except Exception as e:
+            self.logger.log(
+                f"Error purging periodic job runs: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Database error occurred", error=str(e)
+            )
@@ -0,0 +1,130 @@
+# Periodic Job Scheduler Service
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.utils.data_classes import ServiceResponse
+from core.utils.logging import LoggingService
+from tasks.cron import CronSchedule
+from tasks.jobs import run_periodic_job
+from tasks.locks import try_advisory_xact_lock
+from tasks.models import PeriodicJob
+from tasks.repositories.schedule_repository import ScheduleRepository
+
+SCHEDULER_LOCK = "tasks.scheduler"
+
+
+class PeriodicScheduler:
+    """
+    Fire the jobs of settings.TASK_SCHEDULE on their cron schedules.
+
+    Business logic:
+        1. In one transaction, try the scheduler's advisory lock; a node
+           that does not get it is not the leader this tick and stops.
+        2. Sync job rows with the schedule: add new jobs, apply changed
+           definitions (recomputing next_run_at) and disable removed ones.
+        3. Enqueue run_periodic_job for every enabled job whose next_run_at
+           has passed and move next_run_at to the next cron time after now;
+           runs missed while no scheduler was up fire once, not per miss.
+
+    Enqueueing and advancing next_run_at commit together, so each due time
+    fires exactly once however many nodes tick.
+    """
+
+    def __init__(self, schedule: dict = None):
+        self.logger = LoggingService()
+        self.repository = ScheduleRepository()
+        self.schedule = settings.TASK_SCHEDULE if schedule is None else schedule
+
+    def tick(self, now=None) -> ServiceResponse:
+        """
+        Returns:
+            ServiceResponse: data["leader"] tells whether this node held the
+                lock, data["enqueued"] lists the jobs fired.
+        """
+        now = now or timezone.now()
+        try:
+            with transaction.atomic():
+                if not try_advisory_xact_lock(SCHEDULER_LOCK):
+                    return ServiceResponse(
+                        success=True,
+                        message="Another node is scheduling",
+                        data={"leader": False, "enqueued": []},
+                        status_code=200,
+                    )
+
+                jobs = self._sync(now)
+                due = [
+                    job
+                    for job in jobs
+                    if job.enabled and job.next_run_at and job.next_run_at <= now
+                ]
+                for job in due:
+                    run_periodic_job.enqueue(
+                        [job.name, job.next_run_at.isoformat()], queue=job.queue
+                    )
+                    job.last_enqueued_at = now
+                    job.next_run_at = CronSchedule(job.cron).next_after(now)
+                response = self.repository.save_jobs([], due)
+                if not response.success:
+                    raise RuntimeError(response.message)
+        except Exception as e:
+            self.logger.log(
+                f"Error scheduling periodic jobs: {str(e)}", level="error", error=e
+            )
+            return ServiceResponse(
+                success=False, message="Failed to schedule jobs", status_code=500
+            )
+
+        return ServiceResponse(
+            success=True,
+            message="Schedule checked",
+            data={"leader": True, "enqueued": [job.name for job in due]},
+            status_code=200,
+        )
+
+    def _sync(self, now) -> list:
+        response = self.repository.get_jobs()
+        if not response.success:
+            raise RuntimeError(response.message)
+        existing = {job.name: job for job in response.data}
+
+        created, updated = [], []
+        for name, definition in self.schedule.items():
+            values = {
+                "task": definition["task"],
+                "cron": definition["cron"],
+                "queue": definition.get("queue", run_periodic_job.queue),
+                "enabled": definition.get("enabled", True),
+            }
+            job = existing.get(name)
+            if job is None:
+                job = PeriodicJob(name=name, **values)
+                job.next_run_at = CronSchedule(job.cron).next_after(now)
+                created.append(job)
+                continue
+            if any(getattr(job, field) != value for field, value in values.items()):
+                if job.cron != values["cron"] or job.next_run_at is None:
+                    job.next_run_at = CronSchedule(values["cron"]).next_after(now)
+                for field, value in values.items():
+                    setattr(job, field, value)
+                updated.append(job)
+
+        for name, job in existing.items():
+            if name not in self.schedule and job.enabled:
+                job.enabled = False
+                updated.append(job)
+
+        response = self.repository.save_jobs(created, updated)
+        if not response.success:
+            raise RuntimeError(response.message)
+        return list(existing.values()) + created
+
+    def purge_runs(self) -> int:
+        """Delete run history older than TASK_RETENTION_DAYS"""
+        response = self.repository.purge_runs(
+            timezone.now() - datetime.timedelta(days=settings.TASK_RETENTION_DAYS)
+        )
+        return response.data if response.success else 0
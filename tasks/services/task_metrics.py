@@ -0,0 +1,48 @@
+# Task Metrics Service
+import datetime
+
+from django.utils import timezone
+
+from core.utils.data_classes import ServiceResponse
+from core.utils.logging import LoggingService
+from tasks.backends import get_task_backend
+
+
+class TaskMetricsService:
+    """Per task timing and outcome figures of recently finished tasks"""
+
+    def __init__(self):
+        self.logger = LoggingService()
+        self.backend = get_task_backend()
+
+    def get_metrics(self, hours: float = 24) -> ServiceResponse:
+        """
+        Args:
+            hours (float): look back this far (by finished_at)
+
+        Returns:
+            ServiceResponse: data["tasks"] maps each task name to its
+                succeeded/failed counts and mean/max duration and wait in ms.
+        """
+        try:
+            since = timezone.now() - datetime.timedelta(hours=hours)
+            tasks = {}
+            for row in self.backend.metrics(since):
+                tasks.setdefault(row["name"], {})[row["status"]] = {
+                    key: round(value, 3) if isinstance(value, float) else value
+                    for key, value in row.items()
+                    if key not in ["name", "status"]
+                }
+            return ServiceResponse(
+                success=True,
+                message="Task metrics retrieved",
+                data={"since": since.isoformat(), "tasks": tasks},
+                status_code=200,
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error reading task metrics: {str(e)}", level="error", error=e
+            )
+            return ServiceResponse(
+                success=False, message="Failed to read task metrics", status_code=500
+            )
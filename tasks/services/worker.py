@@ -0,0 +1,155 @@
+# Task Worker Service
+import datetime
+import os
+import socket
+import time
+import traceback
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.utils.data_classes import ServiceResponse
+from core.utils.logging import LoggingService
+from tasks.backends import get_task_backend
+from tasks.registry import get_task
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff: seconds before retrying after `attempts` tries"""
+    return min(
+        settings.TASK_RETRY_BACKOFF_SECONDS * 2 ** max(attempts - 1, 0),
+        settings.TASK_RETRY_BACKOFF_MAX_SECONDS,
+    )
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class TaskWorker:
+    """
+    Claim and execute queued tasks in batches.
+
+    Business logic:
+        1. Claim up to `batch_size` ready tasks of `queues` (every queue by
+           default), highest priority first, and mark them running.
+        2. Run each task, timing it; a task that raises is requeued with
+           exponential backoff until it has used max_attempts, then failed.
+        3. Write every outcome and timing back in one bulk update.
+    """
+
+    def __init__(self, queues: list = None, batch_size: int = 10, worker_id=None):
+        self.logger = LoggingService()
+        self.backend = get_task_backend()
+        self.queues = queues or []
+        self.batch_size = batch_size
+        self.worker_id = worker_id or default_worker_id()
+
+    def run_batch(self) -> ServiceResponse:
+        """
+        Returns:
+            ServiceResponse: data holds claimed/succeeded/retried/failed
+                counts of this batch.
+        """
+        counts = {"claimed": 0, "succeeded": 0, "retried": 0, "failed": 0}
+        try:
+            tasks = self.backend.claim(self.queues, self.batch_size, self.worker_id)
+        except Exception as e:
+            self.logger.log(f"Error claiming tasks: {str(e)}", level="error", error=e)
+            return ServiceResponse(
+                success=False, message="Failed to claim tasks", status_code=500
+            )
+
+        counts["claimed"] = len(tasks)
+        for claimed in tasks:
+            counts[self._execute(claimed)] += 1
+
+        if tasks:
+            try:
+                self.backend.finish(tasks)
+            except Exception as e:
+                self.logger.log(
+                    f"Error saving task results: {str(e)}", level="error", error=e
+                )
+                return ServiceResponse(
+                    success=False,
+                    message="Failed to save task results",
+                    data=counts,
+                    status_code=500,
+                )
+        return ServiceResponse(
+            success=True, message="Tasks processed", data=counts, status_code=200
+        )
+
+    def _execute(self, claimed) -> str:
+        started_at = claimed.started_at or timezone.now()
+        claimed.wait_ms = max((started_at - claimed.run_at).total_seconds() * 1000, 0.0)
+        started = time.perf_counter()
+        try:
+            definition = get_task(claimed.name)
+        except LookupError as e:
+            # Retrying cannot help a task no worker knows about
+            definition = None
+            claimed.attempts = claimed.max_attempts
+            error = e
+        try:
+            if definition is None:
+                raise error
+            definition.func(*claimed.args, **claimed.kwargs)
+        except Exception as e:
+            claimed.duration_ms = (time.perf_counter() - started) * 1000
+            claimed.last_error = traceback.format_exc()
+            claimed.locked_by = ""
+            if claimed.attempts < claimed.max_attempts:
+                claimed.status = "queued"
+                claimed.run_at = timezone.now() + datetime.timedelta(
+                    seconds=retry_delay(claimed.attempts)
+                )
+                return "retried"
+
+            self.logger.log(
+                f"Task {claimed.name} #{claimed.id} failed after "
+                f"{claimed.attempts} attempts: {str(e)}",
+                level="error",
+                error=e,
+            )
+            claimed.status = "failed"
+            claimed.finished_at = timezone.now()
+            return "failed"
+
+        claimed.duration_ms = (time.perf_counter() - started) * 1000
+        claimed.status = "succeeded"
+        claimed.last_error = ""
+        claimed.locked_by = ""
+        claimed.finished_at = timezone.now()
+        return "succeeded"
+
+    def requeue_stale(self) -> int:
+        """
+        Requeue tasks running for longer than TASK_VISIBILITY_TIMEOUT_SECONDS,
+        whose worker most likely died mid batch. The timeout must exceed
+        the slowest batch, or live tasks run twice.
+        """
+        older_than = timezone.now() - datetime.timedelta(
+            seconds=settings.TASK_VISIBILITY_TIMEOUT_SECONDS
+        )
+        try:
+            return self.backend.requeue_stale(older_than)
+        except Exception as e:
+            self.logger.log(
+                f"Error requeueing stale tasks: {str(e)}", level="error", error=e
+            )
+            return 0
+
+    def purge_finished(self) -> int:
+        """Delete finished tasks older than TASK_RETENTION_DAYS"""
+        finished_before = timezone.now() - datetime.timedelta(
+            days=settings.TASK_RETENTION_DAYS
+        )
+        try:
+            return self.backend.purge(finished_before)
+        except Exception as e:
+            self.logger.log(
+                f"Error purging finished tasks: {str(e)}", level="error", error=e
+            )
+            return 0
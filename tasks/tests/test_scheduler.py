@@ -0,0 +1,149 @@
+# Test cron parsing, the periodic scheduler and recorded job runs
+import datetime
+import io
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from tasks.cron import CronSchedule
+from tasks.jobs import run_periodic_job
+from tasks.locks import lock_key
+from tasks.models import PeriodicJob, PeriodicJobRun, Task
+from tasks.registry import get_task, task
+from tasks.services.scheduler import PeriodicScheduler
+from tasks.services.worker import TaskWorker
+
+UTC = datetime.timezone.utc
+# A Friday
+NOW = datetime.datetime(2026, 10, 16, 10, 7, 30, tzinfo=UTC)
+
+
+@task
+def count_rows():
+    return 3
+
+
+@task
+def broken():
+    raise ValueError("bad data")
+
+
+SCHEDULE = {
+    "count": {"task": "tasks.tests.test_scheduler.count_rows", "cron": "*/15 * * * *"},
+    "broken": {"task": "tasks.tests.test_scheduler.broken", "cron": "0 4 * * *"},
+}
+
+
+def at(*args):
+    return datetime.datetime(*args, tzinfo=UTC)
+
+
+class TestCronSchedule(TestCase):
+    def test_next_after(self):
+        cases = [
+            ("*/15 * * * *", NOW, at(2026, 10, 16, 10, 15)),
+            ("30 3 * * *", at(2026, 10, 16, 3, 30), at(2026, 10, 17, 3, 30)),
+            ("0 9 * * 1-5", NOW, at(2026, 10, 19, 9, 0)),
+            ("0 9 * * 7", NOW, at(2026, 10, 18, 9, 0)),
+            ("0 0 1,15 * 3", NOW, at(2026, 10, 21, 0, 0)),
+            ("0 0 29 2 *", NOW, at(2028, 2, 29, 0, 0)),
+            ("0 8-18/4 * 12 *", NOW, at(2026, 12, 1, 8, 0)),
+        ]
+        for expression, after, expected in cases:
+            with self.subTest(expression):
+                self.assertEqual(CronSchedule(expression).next_after(after), expected)
+
+    def test_rejects_invalid_expressions(self):
+        for expression in ["* * * *", "60 * * * *", "*/0 * * * *", "x * * * *"]:
+            with self.subTest(expression), self.assertRaises(ValueError):
+                CronSchedule(expression)
+        with self.assertRaises(ValueError):
+            CronSchedule("0 0 31 2 *").next_after(NOW)
+
+    def test_configured_schedule_is_valid(self):
+        """Test every settings.TASK_SCHEDULE entry names a task and parses."""
+        for name, definition in settings.TASK_SCHEDULE.items():
+            with self.subTest(name):
+                get_task(definition["task"])
+                CronSchedule(definition["cron"]).next_after(NOW)
+
+    def test_lock_key_is_stable_bigint(self):
+        key = lock_key("tasks.scheduler")
+        self.assertEqual(key, lock_key("tasks.scheduler"))
+        self.assertTrue(-(2**63) <= key < 2**63)
+
+
+class TestPeriodicScheduler(TestCase):
+    """Test class for PeriodicScheduler.tick and recorded runs."""
+
+    def setUp(self):
+        self.scheduler = PeriodicScheduler(SCHEDULE)
+
+    def test_fires_due_jobs_once(self):
+        """Test jobs are synced, then fired once per due time."""
+        self.assertEqual(self.scheduler.tick(NOW).data["enqueued"], [])
+        job = PeriodicJob.objects.get(name="count")
+        self.assertEqual(job.next_run_at, at(2026, 10, 16, 10, 15))
+
+        later = at(2026, 10, 16, 10, 16)
+        self.assertEqual(self.scheduler.tick(later).data["enqueued"], ["count"])
+        self.assertEqual(self.scheduler.tick(later).data["enqueued"], [])
+
+        queued = Task.objects.get()
+        self.assertEqual(queued.name, run_periodic_job.name)
+        self.assertEqual(queued.args, ["count", "2026-10-16T10:15:00+00:00"])
+        job.refresh_from_db()
+        self.assertEqual(job.next_run_at, at(2026, 10, 16, 10, 30))
+
+    def test_follows_schedule_changes(self):
+        self.scheduler.tick(NOW)
+
+        PeriodicScheduler({"count": {**SCHEDULE["count"], "cron": "0 12 * * *"}}).tick(
+            NOW
+        )
+
+        jobs = {job.name: job for job in PeriodicJob.objects.all()}
+        self.assertEqual(jobs["count"].next_run_at, at(2026, 10, 16, 12, 0))
+        self.assertFalse(jobs["broken"].enabled)
+
+    def test_only_the_lock_holder_schedules(self):
+        with patch(
+            "tasks.services.scheduler.try_advisory_xact_lock", return_value=False
+        ):
+            response = self.scheduler.tick(NOW)
+
+        self.assertFalse(response.data["leader"])
+        self.assertFalse(PeriodicJob.objects.exists())
+
+    def test_records_runs(self):
+        """Test workers record duration, rows processed and failures."""
+        self.scheduler.tick(NOW)
+        PeriodicJob.objects.update(next_run_at=NOW)
+        self.assertEqual(len(self.scheduler.tick(NOW).data["enqueued"]), 2)
+
+        counts = TaskWorker().run_batch().data
+
+        self.assertEqual((counts["succeeded"], counts["failed"]), (1, 1))
+        runs = {run.job.name: run for run in PeriodicJobRun.objects.all()}
+        self.assertEqual(runs["count"].status, "succeeded")
+        self.assertEqual(runs["count"].rows_processed, 3)
+        self.assertIsNotNone(runs["count"].duration_ms)
+        self.assertEqual(runs["broken"].status, "failed")
+        self.assertIn("bad data", runs["broken"].error)
+        self.assertEqual(PeriodicJob.objects.get(name="broken").last_status, "failed")
+
+    def test_command_and_admin(self):
+        out = io.StringIO()
+        with self.settings(TASK_SCHEDULE=SCHEDULE):
+            call_command("run_scheduler", stdout=out)
+        self.assertEqual(PeriodicJob.objects.count(), 2)
+
+        admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(admin)
+        for name in ["periodicjob", "periodicjobrun"]:
+            response = self.client.get(reverse(f"admin:tasks_{name}_changelist"))
+            self.assertEqual(response.status_code, 200)
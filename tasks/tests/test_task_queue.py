@@ -0,0 +1,143 @@
+# Test the database task queue, worker and throughput benchmark
+import datetime
+import io
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from tasks.benchmark import TaskThroughputBenchmark
+from tasks.models import Task
+from tasks.registry import get_task, task
+from tasks.services.task_metrics import TaskMetricsService
+from tasks.services.worker import TaskWorker, retry_delay
+
+calls = []
+
+
+@task
+def record(value, label="plain"):
+    calls.append((value, label))
+
+
+@task(queue="flaky", max_attempts=2)
+def explode():
+    raise KeyError("boom")
+
+
+@override_settings(TASK_RETRY_BACKOFF_SECONDS=10, TASK_RETRY_BACKOFF_MAX_SECONDS=60)
+class TestTaskQueue(TestCase):
+    """Test class for enqueueing and running tasks."""
+
+    def setUp(self):
+        calls.clear()
+        self.worker = TaskWorker(batch_size=10, worker_id="test")
+
+    def test_runs_enqueued_tasks_with_timings(self):
+        """Test a queued call runs once with its arguments and is timed."""
+        queued = record.delay(1, label="delayed")
+
+        response = self.worker.run_batch()
+
+        self.assertEqual(
+            response.data, {"claimed": 1, "succeeded": 1, "retried": 0, "failed": 0}
+        )
+        self.assertEqual(calls, [(1, "delayed")])
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ("succeeded", 1))
+        self.assertIsNotNone(queued.duration_ms)
+        self.assertIsNotNone(queued.wait_ms)
+        self.assertEqual(self.worker.run_batch().data["claimed"], 0)
+
+    def test_claims_by_priority_and_skips_delayed_tasks(self):
+        record.enqueue(["low"])
+        record.enqueue(["high"], priority=5)
+        record.enqueue(["later"], countdown=3600)
+
+        with self.assertNumQueries(5):
+            # Claim (select + update in a savepoint) and one bulk update
+            self.worker.run_batch()
+
+        self.assertEqual([value for value, _ in calls], ["high", "low"])
+        self.assertEqual(Task.objects.filter(status="queued").count(), 1)
+
+    def test_retries_with_backoff_then_fails(self):
+        """Test a raising task is retried after a growing delay, then failed."""
+        queued = explode.delay()
+
+        self.assertEqual(self.worker.run_batch().data["retried"], 1)
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, "queued")
+        self.assertGreater(
+            queued.run_at, timezone.now() + datetime.timedelta(seconds=5)
+        )
+        self.assertIn("KeyError", queued.last_error)
+
+        Task.objects.update(run_at=timezone.now())
+        self.assertEqual(self.worker.run_batch().data["failed"], 1)
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ("failed", 2))
+        self.assertEqual([retry_delay(n) for n in [1, 2, 3, 4]], [10, 20, 40, 60])
+
+    def test_unknown_tasks_fail_without_retrying(self):
+        Task.objects.create(name="tasks.tests.test_task_queue.missing")
+
+        self.assertEqual(self.worker.run_batch().data["failed"], 1)
+        self.assertEqual(get_task(record.name), record)
+
+    def test_filters_queues(self):
+        explode.delay()
+        record.delay("default")
+
+        response = TaskWorker(queues=["default"]).run_batch()
+
+        self.assertEqual(response.data["claimed"], 1)
+        self.assertEqual(Task.objects.get(queue="flaky").status, "queued")
+
+    @override_settings(TASK_VISIBILITY_TIMEOUT_SECONDS=60)
+    def test_requeues_tasks_of_dead_workers(self):
+        """Test rows left running past the timeout are queued again or failed."""
+        stale = timezone.now() - datetime.timedelta(minutes=5)
+        lost = record.delay("lost")
+        exhausted = explode.delay()
+        Task.objects.update(status="running", started_at=stale)
+        Task.objects.filter(id=exhausted.id).update(attempts=2)
+
+        self.assertEqual(self.worker.requeue_stale(), 1)
+
+        lost.refresh_from_db()
+        exhausted.refresh_from_db()
+        self.assertEqual(lost.status, "queued")
+        self.assertEqual(exhausted.status, "failed")
+
+    def test_metrics_group_by_task_and_status(self):
+        record.delay(1)
+        record.delay(2)
+        Task.objects.create(name=explode.name, max_attempts=1)
+        self.worker.run_batch()
+
+        tasks = TaskMetricsService().get_metrics().data["tasks"]
+
+        self.assertEqual(tasks[record.name]["succeeded"]["count"], 2)
+        self.assertEqual(tasks[explode.name]["failed"]["count"], 1)
+        self.assertIn("max_wait_ms", tasks[record.name]["succeeded"])
+
+    def test_commands(self):
+        record.delay(1)
+        out = io.StringIO()
+
+        call_command("run_tasks", stdout=out)
+        call_command("task_metrics", stdout=out)
+
+        self.assertIn("1 tasks: 1 succeeded", out.getvalue())
+        self.assertIn(f"{record.name} succeeded: 1 tasks", out.getvalue())
+
+    def test_benchmark_reports_throughput(self):
+        """Test the benchmark drains every task and cleans up after itself."""
+        report = TaskThroughputBenchmark(tasks=30, batch_sizes=[1, 10]).run()
+
+        for batch_size in ["1", "10"]:
+            result = report["results"][batch_size]
+            self.assertEqual((result["processed"], result["succeeded"]), (30, 30))
+            self.assertGreater(result["tasks_per_second_per_worker"], 0)
+        self.assertFalse(Task.objects.exists())
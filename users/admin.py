@@ -1,11 +1,24 @@
-from django.contrib import admin
-from .models import UserProfile, UserPreferences, UserCompatibilityPreferences
+from django.contrib import admin, messages
+
+from core.utils.pagination import EstimatedCountPaginator
+from .models import (
+    CompatibilityWeightProfile,
+    UserCompatibilityPreferences,
+    UserPreferences,
+    UserProfile,
+)
+from .utils.compatibility_weights import activate_weight_profile
 
 
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ["user", "email_verified", "location", "phone_number", "created_at"]
     list_filter = ["email_verified", "created_at", "updated_at"]
+    list_select_related = ["user"]
+    # Large tables: newest first by primary key, no exact COUNT(*) per page
+    ordering = ["-id"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     search_fields = [
         "user__username",
         "user__email",
@@ -57,6 +70,10 @@ class UserPreferencesAdmin(admin.ModelAdmin):
         "created_at",
     ]
     list_filter = ["is_complete", "age_range", "completed_at", "created_at"]
+    list_select_related = ["profile__user"]
+    ordering = ["-id"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     search_fields = ["profile__user__username", "profile__user__email"]
     readonly_fields = [
         "created_at",
@@ -67,9 +84,10 @@ class UserPreferencesAdmin(admin.ModelAdmin):
     ]
 
     def completion_percentage_display(self, obj):
-        return f"{obj.calculate_completion_percentage():.1f}%"
+        return f"{obj.completion_percentage:.1f}%"
 
     completion_percentage_display.short_description = "Completion %"
+    completion_percentage_display.admin_order_field = "completion_percentage"
 
     fieldsets = (
         (
@@ -167,6 +185,10 @@ class UserCompatibilityPreferencesAdmin(admin.ModelAdmin):
         "created_at",
     ]
     list_filter = ["preferred_gender", "created_at"]
+    list_select_related = ["profile__user"]
+    ordering = ["-id"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     search_fields = [
         "profile__user__username",
         "profile__user__email",
@@ -215,3 +237,31 @@ class UserCompatibilityPreferencesAdmin(admin.ModelAdmin):
             {"fields": ("created_at", "updated_at"), "classes": ("collapse",)},
         ),
     )
+
+
+@admin.register(CompatibilityWeightProfile)
+class CompatibilityWeightProfileAdmin(admin.ModelAdmin):
+    list_display = ["version", "is_current", "description", "created_at"]
+    readonly_fields = ["is_current", "created_at", "updated_at"]
+    actions = ["activate"]
+
+    def get_readonly_fields(self, request, obj=None):
+        # Workers cache profiles by version, so a stored version never changes
+        if obj is not None:
+            return ["version", "weights", "categories", *self.readonly_fields]
+        return self.readonly_fields
+
+    @admin.action(description="Activate selected weight profile")
+    def activate(self, request, queryset):
+        if queryset.count() != 1:
+            self.message_user(
+                request, "Select exactly one profile to activate", messages.ERROR
+            )
+            return
+        profile = queryset.get()
+        try:
+            activate_weight_profile(profile.version)
+        except ValueError as e:
+            self.message_user(request, str(e), messages.ERROR)
+            return
+        self.message_user(request, f"Activated weight profile {profile.version}")
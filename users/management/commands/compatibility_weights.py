@@ -0,0 +1,98 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from users.models import CompatibilityWeightProfile
+from users.utils.compatibility_weights import (
+    BUILTIN_VERSION,
+    activate_weight_profile,
+    validate_weight_config,
+)
+
+
+class Command(BaseCommand):
+    """Manage versioned compatibility weight profiles"""
+
+    help = (
+        "List, load or activate compatibility weight profiles. Workers pick up "
+        "an activated version within COMPATIBILITY_WEIGHTS_CHECK_INTERVAL "
+        "seconds, no restart needed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["list", "load", "activate"])
+        parser.add_argument(
+            "target",
+            nargs="?",
+            help="JSON file for load ({version, weights, categories, description}),"
+            f" version name for activate ('{BUILTIN_VERSION}' restores the"
+            " shipped weights)",
+        )
+        parser.add_argument(
+            "--activate",
+            action="store_true",
+            help="Activate the profile right after loading it",
+        )
+
+    def handle(self, *args, **options):
+        action = options["action"]
+        if action == "list":
+            return self._list()
+        if not options["target"]:
+            raise CommandError(f"'{action}' needs a target")
+        if action == "load":
+            version = self._load(options["target"])
+            if not options["activate"]:
+                return
+        else:
+            version = options["target"]
+
+        try:
+            activate_weight_profile(version)
+        except CompatibilityWeightProfile.DoesNotExist:
+            raise CommandError(f"Unknown weight profile version: {version}")
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f"Activated weight profile {version}"))
+
+    def _list(self):
+        profiles = CompatibilityWeightProfile.objects.order_by("created_at")
+        if not any(profile.is_current for profile in profiles):
+            self.stdout.write(f"* {BUILTIN_VERSION} (shipped defaults)")
+        for profile in profiles:
+            marker = "*" if profile.is_current else " "
+            self.stdout.write(
+                f"{marker} {profile.version}: {len(profile.weights)} weights"
+                + (f" - {profile.description}" if profile.description else "")
+            )
+
+    def _load(self, path: str) -> str:
+        try:
+            with open(path, encoding="utf-8") as file_obj:
+                config = json.load(file_obj)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read {path}: {e}")
+
+        version = config.get("version")
+        if not version or version == BUILTIN_VERSION:
+            raise CommandError(f"A version other than '{BUILTIN_VERSION}' is required")
+        weights = config.get("weights", {})
+        categories = config.get("categories", {})
+        try:
+            validate_weight_config(weights, categories)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        # Active versions are cached per process, so they are never edited in place
+        profile, created = CompatibilityWeightProfile.objects.get_or_create(
+            version=version,
+            defaults={
+                "weights": weights,
+                "categories": categories,
+                "description": config.get("description"),
+            },
+        )
+        if not created:
+            raise CommandError(f"Weight profile {version} already exists")
+        self.stdout.write(f"Loaded weight profile {version}")
+        return version
@@ -0,0 +1,131 @@
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core.utils.bulk_insert import bulk_insert
+from users.models import (
+    PreferenceSelection,
+    UserCompatibilityPreferences,
+    UserPreferences,
+    UserProfile,
+)
+from users.utils.synthetic_data import SyntheticPreferencesGenerator
+
+
+class Command(BaseCommand):
+    """Seed a large, reproducible dataset for performance testing"""
+
+    help = (
+        "Create N synthetic users with profiles, questionnaire answers and "
+        "compatibility preferences drawn from realistic distributions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--prefix",
+            default="seed_user_",
+            help="Username prefix used to recognise (and clear) seeded users",
+        )
+        parser.add_argument(
+            "--password",
+            default="password123",
+            help="Password shared by every seeded user (hashed once)",
+        )
+        parser.add_argument(
+            "--preferences-ratio",
+            type=float,
+            default=0.85,
+            help="Share of users that started the questionnaire",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete previously seeded users with the same prefix first",
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Use bulk_create even on PostgreSQL instead of COPY",
+        )
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"]
+        seeded = User.objects.filter(username__startswith=prefix)
+        if options["clear"]:
+            deleted, _ = seeded.delete()
+            self.stdout.write(f"Deleted {deleted} previously seeded rows")
+        elif seeded.exists():
+            raise CommandError(
+                f"Users with prefix '{prefix}' already exist, use --clear or --prefix"
+            )
+
+        generator = SyntheticPreferencesGenerator(seed=options["seed"])
+        password_hash = make_password(options["password"])
+        use_copy = not options["no_copy"]
+        total = options["users"]
+        batch_size = options["batch_size"]
+
+        started = time.perf_counter()
+        for start in range(0, total, batch_size):
+            size = min(batch_size, total - start)
+            self._seed_batch(
+                generator,
+                start,
+                size,
+                prefix,
+                password_hash,
+                options["preferences_ratio"],
+                use_copy,
+            )
+            done = start + size
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"  {done}/{total} users ({done / elapsed:.0f} users/sec)"
+            )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Seeded {total} users in {elapsed:.1f}s"))
+
+    def _seed_batch(
+        self, generator, start, size, prefix, password_hash, ratio, use_copy
+    ):
+        now = timezone.now()
+        with transaction.atomic():
+            users = User.objects.bulk_create(
+                [
+                    User(
+                        username=f"{prefix}{i}",
+                        email=f"{prefix}{i}@seed.humanlink.test",
+                        password=password_hash,
+                        first_name=f"Seed{i}",
+                        last_name="User",
+                    )
+                    for i in range(start, start + size)
+                ]
+            )
+            profiles = UserProfile.objects.bulk_create(
+                [UserProfile(user=user, email_verified=True) for user in users]
+            )
+
+            with_preferences = [
+                profile for profile in profiles if generator.random.random() < ratio
+            ]
+            preferences = generator.preferences_batch(
+                with_preferences, completed_at=now
+            )
+            bulk_insert(UserPreferences, preferences, use_copy=use_copy)
+            PreferenceSelection.sync(preferences)
+            bulk_insert(
+                UserCompatibilityPreferences,
+                generator.compatibility_batch(
+                    with_preferences, [p.age_range for p in preferences]
+                ),
+                use_copy=use_copy,
+            )
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.6 on 2026-10-19 06:05
+
+from django.db import migrations, models
+
+# Frozen copy of UserPreferences.calculate_completion_percentage() fields
+COMPLETION_FIELDS = [
+    "age_range",
+    "current_location",
+    "life_situations",
+    "preferred_chat_times",
+    "top_hobbies",
+    "enjoyed_media",
+    "free_day_preference",
+    "outgoing_scale",
+    "stress_handling",
+    "personality_words",
+    "conversation_style",
+    "primary_motivation",
+    "new_things_scale",
+    "important_values",
+    "communication_preference",
+    "favorite_topics",
+    "connection_frequency",
+    "serious_conversation_response",
+    "friendship_goals",
+    "friend_preferences",
+]
+BATCH_SIZE = 2000
+
+
+def backfill_completion_percentage(apps, schema_editor):
+    UserPreferences = apps.get_model("users", "UserPreferences")
+    queryset = UserPreferences.objects.only("id", *COMPLETION_FIELDS).order_by("id")
+
+    batch = []
+    for preferences in queryset.iterator(chunk_size=BATCH_SIZE):
+        completed = sum(1 for field in COMPLETION_FIELDS if getattr(preferences, field))
+        preferences.completion_percentage = (completed / len(COMPLETION_FIELDS)) * 100
+        batch.append(preferences)
+        if len(batch) >= BATCH_SIZE:
+            UserPreferences.objects.bulk_update(batch, ["completion_percentage"])
+            batch = []
+    if batch:
+        UserPreferences.objects.bulk_update(batch, ["completion_percentage"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_rename_userquestionnaire_userpreferences"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userpreferences",
+            name="completion_percentage",
+            field=models.FloatField(db_index=True, default=0),
+        ),
+        migrations.RunPython(backfill_completion_percentage, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Trigram indexes backing the admin changelist searches on PostgreSQL
+
+from django.db import migrations
+
+# (index name, table, column) for every column searched by users/admin.py.
+# Django's icontains compiles to UPPER(column::text) LIKE UPPER(%s), so the
+# indexes are built on the same expression.
+SEARCH_INDEXES = [
+    ("auth_user_username_trgm", "auth_user", "username"),
+    ("auth_user_email_trgm", "auth_user", "email"),
+    ("auth_user_first_name_trgm", "auth_user", "first_name"),
+    ("auth_user_last_name_trgm", "auth_user", "last_name"),
+    ("users_userprofile_location_trgm", "users_userprofile", "location"),
+    (
+        "users_usercompat_geo_pref_trgm",
+        "users_usercompatibilitypreferences",
+        "geographic_preference",
+    ),
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in SEARCH_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" ON "{table}" '
+            f'USING gin ((UPPER("{column}"::text)) gin_trgm_ops)'
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _, _ in SEARCH_INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("users", "0003_userpreferences_completion_percentage"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.6 on 2026-10-19 06:07
+
+from django.db import migrations, models
+
+# Frozen copy of UserPreferences.COMPLETION_SECTIONS; bit i is section i
+COMPLETION_SECTIONS = [
+    ["age_range", "current_location", "life_situations", "preferred_chat_times"],
+    ["top_hobbies", "enjoyed_media", "free_day_preference"],
+    [
+        "outgoing_scale",
+        "stress_handling",
+        "personality_words",
+        "conversation_style",
+        "primary_motivation",
+        "new_things_scale",
+    ],
+    [
+        "important_values",
+        "communication_preference",
+        "favorite_topics",
+        "connection_frequency",
+        "serious_conversation_response",
+    ],
+    ["friendship_goals", "friend_preferences"],
+]
+BATCH_SIZE = 2000
+
+
+def backfill_completed_sections(apps, schema_editor):
+    UserPreferences = apps.get_model("users", "UserPreferences")
+    fields = [field for section in COMPLETION_SECTIONS for field in section]
+    queryset = UserPreferences.objects.only("id", *fields).order_by("id")
+
+    batch = []
+    for preferences in queryset.iterator(chunk_size=BATCH_SIZE):
+        preferences.completed_sections = sum(
+            1 << index
+            for index, section in enumerate(COMPLETION_SECTIONS)
+            if all(getattr(preferences, field) for field in section)
+        )
+        batch.append(preferences)
+        if len(batch) >= BATCH_SIZE:
+            UserPreferences.objects.bulk_update(batch, ["completed_sections"])
+            batch = []
+    if batch:
+        UserPreferences.objects.bulk_update(batch, ["completed_sections"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0004_admin_search_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userpreferences",
+            name="completed_sections",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_completed_sections, migrations.RunPython.noop),
+    ]
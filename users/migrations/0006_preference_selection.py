@@ -0,0 +1,108 @@
+# Generated by Django 5.2.6 on 2026-10-19 06:11
+
+import django.db.models.deletion
+from django.db import migrations, models, transaction
+
+# Frozen copy of UserPreferences.FILTERABLE_FIELDS
+FILTERABLE_FIELDS = [
+    "life_situations",
+    "preferred_chat_times",
+    "top_hobbies",
+    "important_values",
+    "friendship_goals",
+]
+BATCH_SIZE = 2000
+
+
+def create_gin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for field in FILTERABLE_FIELDS:
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "users_pref_{field}_gin" '
+            f'ON "users_userpreferences" USING gin ("{field}")'
+        )
+
+
+def drop_gin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for field in FILTERABLE_FIELDS:
+        schema_editor.execute(
+            f'DROP INDEX CONCURRENTLY IF EXISTS "users_pref_{field}_gin"'
+        )
+
+
+def backfill_selections(apps, schema_editor):
+    if schema_editor.connection.features.supports_json_field_contains:
+        return
+    UserPreferences = apps.get_model("users", "UserPreferences")
+    PreferenceSelection = apps.get_model("users", "PreferenceSelection")
+    queryset = UserPreferences.objects.only("id", *FILTERABLE_FIELDS).order_by("id")
+
+    with transaction.atomic(using=schema_editor.connection.alias):
+        batch = []
+        for preferences in queryset.iterator(chunk_size=BATCH_SIZE):
+            for field in FILTERABLE_FIELDS:
+                for value in dict.fromkeys(getattr(preferences, field) or []):
+                    batch.append(
+                        PreferenceSelection(
+                            preferences_id=preferences.id, field=field, value=value
+                        )
+                    )
+            if len(batch) >= BATCH_SIZE:
+                PreferenceSelection.objects.bulk_create(batch)
+                batch = []
+        PreferenceSelection.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("users", "0005_userpreferences_completed_sections"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PreferenceSelection",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("field", models.CharField(max_length=50)),
+                ("value", models.CharField(max_length=100)),
+                (
+                    "preferences",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="selections",
+                        to="users.userpreferences",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["field", "value", "preferences"],
+                        name="preference_selection_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("preferences", "field", "value"),
+                        name="unique_preference_selection",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_selections, migrations.RunPython.noop),
+        migrations.RunPython(create_gin_indexes, drop_gin_indexes),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-19 06:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0006_preference_selection"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="usercompatibilitypreferences",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["created_at"],
+                name="users_compat_alive_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userpreferences",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["created_at"],
+                name="users_prefs_alive_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userprofile",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["created_at"],
+                name="users_profile_alive_idx",
+            ),
+        ),
+    ]
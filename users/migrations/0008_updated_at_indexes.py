@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-19 06:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0007_alive_created_at_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="usercompatibilitypreferences",
+            index=models.Index(fields=["updated_at"], name="users_compat_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="userpreferences",
+            index=models.Index(fields=["updated_at"], name="users_prefs_updated_idx"),
+        ),
+    ]
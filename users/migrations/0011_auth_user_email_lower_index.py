@@ -0,0 +1,36 @@
+# Case-insensitive email lookups on auth_user (accounts.services.bulk_import)
+
+from django.db import migrations
+
+INDEX_NAME = "auth_user_email_lower_idx"
+
+
+def create_email_index(apps, schema_editor):
+    concurrently = (
+        "CONCURRENTLY " if schema_editor.connection.vendor == "postgresql" else ""
+    )
+    schema_editor.execute(
+        f'CREATE INDEX {concurrently}IF NOT EXISTS "{INDEX_NAME}" '
+        f'ON "auth_user" (LOWER("email"))'
+    )
+
+
+def drop_email_index(apps, schema_editor):
+    concurrently = (
+        "CONCURRENTLY " if schema_editor.connection.vendor == "postgresql" else ""
+    )
+    schema_editor.execute(f'DROP INDEX {concurrently}IF EXISTS "{INDEX_NAME}"')
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("users", "0010_preference_change_events"),
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_email_index, drop_email_index),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.6 on 2026-10-19 08:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def move_current_flag(apps, schema_editor):
+    # is_active marked the scoring version; it now keeps BaseModel's meaning
+    CompatibilityWeightProfile = apps.get_model("users", "CompatibilityWeightProfile")
+    CompatibilityWeightProfile.objects.filter(is_active=True).update(is_current=True)
+    CompatibilityWeightProfile.objects.update(is_active=True)
+
+
+def restore_active_flag(apps, schema_editor):
+    CompatibilityWeightProfile = apps.get_model("users", "CompatibilityWeightProfile")
+    CompatibilityWeightProfile.objects.update(is_active=models.F("is_current"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0011_auth_user_email_lower_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="compatibilityweightprofile",
+            name="users_one_active_weight_profile",
+        ),
+        migrations.AddField(
+            model_name="compatibilityweightprofile",
+            name="is_current",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(move_current_flag, restore_active_flag),
+        migrations.AlterField(
+            model_name="compatibilityweightprofile",
+            name="is_active",
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddConstraint(
+            model_name="compatibilityweightprofile",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_current", True)),
+                fields=("is_current",),
+                name="users_one_current_weight_profile",
+            ),
+        ),
+    ]
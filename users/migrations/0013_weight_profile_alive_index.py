@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-19 08:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0012_compatibility_weight_profile_is_current"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="compatibilityweightprofile",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["created_at"],
+                name="users_weights_alive_idx",
+            ),
+        ),
+    ]
@@ -1,6 +1,15 @@
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models import F
+from django.utils import timezone
 
-from core.models import BaseModel
+from core.models import (
+    AllObjectsManager,
+    BaseModel,
+    SlimBaseModel,
+    SoftDeleteManager,
+    SoftDeleteQuerySet,
+    alive_index,
+)
 
 
 # Create your models here.
@@ -17,10 +26,86 @@ class UserProfile(BaseModel):
     email_verification_token = models.CharField(max_length=500, blank=True, null=True)
     email_verification_sent_at = models.DateTimeField(blank=True, null=True)
 
+    class Meta(BaseModel.Meta):
+        indexes = [alive_index("users_profile_alive_idx")]
+
     def __str__(self):
         return f"{self.user.first_name if self.user.first_name else ''} {self.user.last_name if self.user.last_name else self.user.username}"
 
 
+class ChangeEventsQuerySetMixin:
+    """
+    Queue a PreferenceChangeEvent per profile when rows are soft deleted or
+    archived. The repositories queue them on saves, but these queryset
+    updates bypass the repositories and would leave stored matches stale.
+    """
+
+    change_event_kind = "deleted"
+    change_event_fields = ()
+
+    def soft_delete(self, user=None):
+        with transaction.atomic(using=self.db):
+            self._record_change_events()
+            return super().soft_delete(user)
+
+    def archive(self, user=None):
+        with transaction.atomic(using=self.db):
+            self._record_change_events()
+            return super().archive(user)
+
+    def _record_change_events(self):
+        PreferenceChangeEvent.record(
+            self.values_list("profile_id", flat=True),
+            self.change_event_kind,
+            self.change_event_fields,
+        )
+
+
+class UserPreferencesQuerySet(ChangeEventsQuerySetMixin, SoftDeleteQuerySet):
+    def _uses_selection_table(self):
+        return not connections[self.db].features.supports_json_field_contains
+
+    def contains_all(self, field, values):
+        """Preferences whose list `field` includes every value in `values`"""
+        values = list(values)
+        if not self._uses_selection_table():
+            # jsonb @> served by the GIN index on PostgreSQL
+            return self.filter(**{f"{field}__contains": values})
+
+        queryset = self
+        for value in values:
+            queryset = queryset.filter(
+                pk__in=PreferenceSelection.objects.filter(
+                    field=field, value=value
+                ).values("preferences_id")
+            )
+        return queryset
+
+    def overlaps(self, field, values):
+        """Preferences whose list `field` includes at least one of `values`"""
+        values = list(values)
+        if not self._uses_selection_table():
+            # jsonb ?| served by the GIN index on PostgreSQL
+            return self.filter(**{f"{field}__has_any_keys": values})
+
+        return self.filter(
+            pk__in=PreferenceSelection.objects.filter(
+                field=field, value__in=values
+            ).values("preferences_id")
+        )
+
+    def with_completion_at_least(self, percentage):
+        """Indexed filter on the stored completion percentage"""
+        return self.filter(completion_percentage__gte=percentage)
+
+    def with_sections_complete(self, *sections):
+        """Filter on the per-section completion bitmap"""
+        mask = sum(self.model.SECTION_BITS[section] for section in sections)
+        return self.alias(_completed_mask=F("completed_sections").bitand(mask)).filter(
+            _completed_mask=mask
+        )
+
+
 class UserPreferences(BaseModel):
     """
     Questionnaire model to capture user preferences and personality traits
@@ -198,51 +283,214 @@ class UserPreferences(BaseModel):
     completed_at = models.DateTimeField(blank=True, null=True)
     is_complete = models.BooleanField(default=False)
 
-    def __str__(self):
-        return f"Questionnaire for {self.profile.user.username}"
-
-    def calculate_completion_percentage(self):
-        """Calculate completion percentage based on filled fields"""
-        required_fields = [
+    # Answers that count towards completion, grouped by questionnaire section
+    COMPLETION_SECTIONS = {
+        "demographics": [
             "age_range",
             "current_location",
             "life_situations",
             "preferred_chat_times",
-            "top_hobbies",
-            "enjoyed_media",
-            "free_day_preference",
+        ],
+        "interests": ["top_hobbies", "enjoyed_media", "free_day_preference"],
+        "personality": [
             "outgoing_scale",
             "stress_handling",
             "personality_words",
             "conversation_style",
             "primary_motivation",
             "new_things_scale",
+        ],
+        "values": [
             "important_values",
             "communication_preference",
             "favorite_topics",
             "connection_frequency",
             "serious_conversation_response",
-            "friendship_goals",
-            "friend_preferences",
+        ],
+        "goals": ["friendship_goals", "friend_preferences"],
+    }
+    # List-valued answers that can be filtered on (GIN indexed on PostgreSQL)
+    FILTERABLE_FIELDS = [
+        "life_situations",
+        "preferred_chat_times",
+        "top_hobbies",
+        "important_values",
+        "friendship_goals",
+    ]
+    SECTION_BITS = {
+        section: 1 << index for index, section in enumerate(COMPLETION_SECTIONS)
+    }
+    COMPLETE_THRESHOLD = 80
+
+    # Stored copies of the completion state, kept in sync on save
+    completion_percentage = models.FloatField(default=0, db_index=True)
+    completed_sections = models.PositiveSmallIntegerField(default=0)
+
+    objects = SoftDeleteManager.from_queryset(UserPreferencesQuerySet)()
+    all_objects = AllObjectsManager.from_queryset(UserPreferencesQuerySet)()
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            alive_index("users_prefs_alive_idx"),
+            models.Index(fields=["updated_at"], name="users_prefs_updated_idx"),
         ]
 
-        completed_fields = 0
-        for field in required_fields:
-            value = getattr(self, field)
-            if value:
-                if isinstance(value, list) and len(value) > 0:
-                    completed_fields += 1
-                elif not isinstance(value, list) and value is not None:
-                    completed_fields += 1
+    def __str__(self):
+        return f"Questionnaire for {self.profile.user.username}"
+
+    def save(self, *args, **kwargs):
+        self.refresh_completion()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {
+                *update_fields,
+                "completion_percentage",
+                "completed_sections",
+                "is_complete",
+                "completed_at",
+            }
+        super().save(*args, **kwargs)
+
+        selections = self._filterable_values()
+        if selections != getattr(self, "_saved_filterable_values", None):
+            PreferenceSelection.sync([self], using=self._state.db)
+            self._saved_filterable_values = selections
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_filterable_values = instance._filterable_values()
+        return instance
+
+    def _filterable_values(self):
+        # __dict__ rather than getattr so deferred fields are not loaded
+        return {field: self.__dict__.get(field) for field in self.FILTERABLE_FIELDS}
+
+    def refresh_completion(self, now=None):
+        """
+        Recompute the stored completion fields from the current answers.
+
+        Also marks the questionnaire complete (once) when it reaches
+        COMPLETE_THRESHOLD. save() calls this automatically; bulk paths
+        (bulk_create, COPY) bypass save() and must call it themselves.
+        """
+        self.completion_percentage = self.calculate_completion_percentage()
+        self.completed_sections = sum(
+            self.SECTION_BITS[section]
+            for section, fields in self.COMPLETION_SECTIONS.items()
+            if all(self._is_answered(field) for field in fields)
+        )
+        if (
+            self.completion_percentage >= self.COMPLETE_THRESHOLD
+            and not self.is_complete
+        ):
+            self.is_complete = True
+            self.completed_at = now or timezone.now()
+        return self.completion_percentage
+
+    def _is_answered(self, field):
+        return bool(getattr(self, field))
 
+    def calculate_completion_percentage(self):
+        """Calculate completion percentage based on filled fields"""
+        required_fields = [
+            field for fields in self.COMPLETION_SECTIONS.values() for field in fields
+        ]
+        completed_fields = sum(
+            1 for field in required_fields if self._is_answered(field)
+        )
         return (completed_fields / len(required_fields)) * 100
 
+    def is_section_complete(self, section):
+        return bool(self.completed_sections & self.SECTION_BITS[section])
+
+    @property
+    def completed_section_names(self):
+        return [
+            section
+            for section in self.COMPLETION_SECTIONS
+            if self.is_section_complete(section)
+        ]
+
+
+class PreferenceSelection(models.Model):
+    """
+    Normalized copy of the FILTERABLE_FIELDS answers, one row per selected value.
+
+    Only maintained on databases without JSON containment lookups (SQLite),
+    where it backs UserPreferencesQuerySet.contains_all() and overlaps().
+    """
+
+    preferences = models.ForeignKey(
+        UserPreferences, on_delete=models.CASCADE, related_name="selections"
+    )
+    field = models.CharField(max_length=50)
+    value = models.CharField(max_length=100)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["preferences", "field", "value"],
+                name="unique_preference_selection",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["field", "value", "preferences"],
+                name="preference_selection_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.field}={self.value}"
+
+    @classmethod
+    def sync(cls, preferences_list, using=None):
+        """
+        Rebuild the selection rows of saved preferences.
+
+        save() calls this automatically; bulk paths must call it after
+        inserting (the instances need primary keys).
+        """
+        using = using or "default"
+        if connections[using].features.supports_json_field_contains:
+            return
+        cls.objects.using(using).filter(
+            preferences_id__in=[preferences.pk for preferences in preferences_list]
+        ).delete()
+        cls.objects.using(using).bulk_create(
+            [
+                cls(preferences_id=preferences.pk, field=field, value=value)
+                for preferences in preferences_list
+                for field in UserPreferences.FILTERABLE_FIELDS
+                for value in dict.fromkeys(getattr(preferences, field) or [])
+            ],
+            batch_size=1000,
+        )
+
+
+class CompatibilityPreferencesQuerySet(ChangeEventsQuerySetMixin, SoftDeleteQuerySet):
+    # Without compatibility preferences a user scores with neutral importances
+    change_event_kind = "updated"
+
+    @property
+    def change_event_fields(self):
+        return UserCompatibilityPreferences.IMPORTANCE_FIELDS
+
 
 class UserCompatibilityPreferences(BaseModel):
     """
     Model to store user matching preferences and criteria
     """
 
+    # Fields scaling the compatibility weights (users.utils.compatibility_weights)
+    IMPORTANCE_FIELDS = (
+        "hobby_importance",
+        "personality_importance",
+        "values_importance",
+        "lifestyle_importance",
+    )
+
     profile = models.OneToOneField(
         UserProfile, on_delete=models.CASCADE, related_name="compatibility_prefs"
     )
@@ -272,5 +520,96 @@ class UserCompatibilityPreferences(BaseModel):
     excluded_topics = models.JSONField(default=list, blank=True)
     excluded_personalities = models.JSONField(default=list, blank=True)
 
+    objects = SoftDeleteManager.from_queryset(CompatibilityPreferencesQuerySet)()
+    all_objects = AllObjectsManager.from_queryset(CompatibilityPreferencesQuerySet)()
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            alive_index("users_compat_alive_idx"),
+            models.Index(fields=["updated_at"], name="users_compat_updated_idx"),
+        ]
+
     def __str__(self):
         return f"Compatibility Preferences for {self.profile.user.username}"
+
+
+class CompatibilityWeightProfile(BaseModel):
+    """
+    Versioned weight configuration for compatibility scoring.
+
+    `weights` maps a UserPreferences field to its base weight, `categories`
+    maps an importance field of UserCompatibilityPreferences to the
+    preference fields it scales. At most one profile is current at a time;
+    workers pick up a newly activated version without a restart (see
+    users.utils.compatibility_weights).
+    """
+
+    version = models.CharField(max_length=50, unique=True)
+    description = models.TextField(blank=True, null=True)
+    weights = models.JSONField(default=dict)
+    categories = models.JSONField(default=dict, blank=True)
+    # The version scoring uses; BaseModel's is_active keeps its generic meaning
+    is_current = models.BooleanField(default=False)
+
+    class Meta(BaseModel.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=["is_current"],
+                condition=models.Q(is_current=True),
+                name="users_one_current_weight_profile",
+            )
+        ]
+        indexes = [alive_index("users_weights_alive_idx")]
+
+    def __str__(self):
+        return f"Compatibility weights {self.version}"
+
+
+class PreferenceChangeEvent(SlimBaseModel):
+    """
+    Outbox row written in the same transaction as a questionnaire save.
+
+    Records which UserPreferences fields (or UserCompatibilityPreferences
+    importance fields) changed so the match update consumer
+    (matches.services.match_updates) can skip changes to unscored fields and
+    re-score only the affected user.
+    """
+
+    KIND_CHOICES = [
+        ("created", "Created"),
+        ("updated", "Updated"),
+        ("deleted", "Deleted"),
+    ]
+
+    profile = models.ForeignKey(
+        UserProfile, on_delete=models.CASCADE, related_name="preference_events"
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    changed_fields = models.JSONField(default=list, blank=True)
+    processed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=models.Q(processed_at__isnull=True),
+                name="users_pref_event_pending_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.profile_id}: {', '.join(self.changed_fields)}"
+
+    @classmethod
+    def record(cls, profile_ids, kind: str, changed_fields=()):
+        """Queue one event per profile in the caller's transaction."""
+        cls.objects.bulk_create(
+            [
+                cls(
+                    profile_id=profile_id,
+                    kind=kind,
+                    changed_fields=list(changed_fields),
+                )
+                for profile_id in profile_ids
+            ]
+        )
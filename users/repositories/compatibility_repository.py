@@ -1,6 +1,10 @@
 # Compatibility Preferences Repository
 from core.utils.data_classes import RepositoryResponse
-from users.models import UserCompatibilityPreferences, UserProfile
+from users.models import (
+    PreferenceChangeEvent,
+    UserCompatibilityPreferences,
+    UserProfile,
+)
 from django.core.exceptions import ValidationError
 from django.db import transaction
 from core.utils.logging import LoggingService
@@ -46,8 +50,12 @@ class CompatibilityPreferencesRepository:
         """Create new compatibility preferences for profile"""
         try:
             with transaction.atomic():
-                preferences = UserCompatibilityPreferences.objects.create(
-                    profile=profile, **preferences_data
+                preferences = UserCompatibilityPreferences.objects.create_or_restore(
+                    {"profile": profile}, **preferences_data
+                )
+                # Importances replace the neutral ones the user scored with
+                self._record_change(
+                    profile.id, UserCompatibilityPreferences.IMPORTANCE_FIELDS
                 )
                 return RepositoryResponse(
                     success=True,
@@ -76,11 +84,22 @@ class CompatibilityPreferencesRepository:
         """Update existing compatibility preferences"""
         try:
             with transaction.atomic():
+                changed_fields = []
                 for field, value in update_data.items():
                     if hasattr(preferences, field):
+                        if getattr(preferences, field) != value:
+                            changed_fields.append(field)
                         setattr(preferences, field, value)
 
                 preferences.save()
+                self._record_change(
+                    preferences.profile_id,
+                    [
+                        field
+                        for field in changed_fields
+                        if field in UserCompatibilityPreferences.IMPORTANCE_FIELDS
+                    ],
+                )
                 return RepositoryResponse(
                     success=True,
                     message="Compatibility preferences updated successfully",
@@ -108,6 +127,10 @@ class CompatibilityPreferencesRepository:
         """Delete compatibility preferences"""
         try:
             with transaction.atomic():
+                self._record_change(
+                    preferences.profile_id,
+                    UserCompatibilityPreferences.IMPORTANCE_FIELDS,
+                )
                 preferences.delete()
                 return RepositoryResponse(
                     success=True,
@@ -126,6 +149,15 @@ class CompatibilityPreferencesRepository:
                 error=str(e),
             )
 
+    @staticmethod
+    def _record_change(profile_id: int, importance_fields):
+        """
+        Queue a PreferenceChangeEvent in the caller's transaction when
+        importances, which scale the user's compatibility scores, changed.
+        """
+        if importance_fields:
+            PreferenceChangeEvent.record([profile_id], "updated", importance_fields)
+
     def get_preferences_choices(self) -> RepositoryResponse:
         """Get all available choices for compatibility preferences fields"""
         try:
@@ -1,9 +1,10 @@
 # User Preferences Repository
 from core.utils.data_classes import RepositoryResponse
-from users.models import UserProfile, UserPreferences
+from users.models import PreferenceChangeEvent, UserProfile, UserPreferences
 from users.serializers import UserPreferencesSerializer
 from django.core.exceptions import ValidationError
 from django.db import transaction
+from core.utils.keyset import keyset_values, stream_keyset
 from core.utils.logging import LoggingService
 
 
@@ -41,8 +42,13 @@ class PreferencesRepository:
         """Create new preferences for profile"""
         try:
             with transaction.atomic():
-                preferences = UserPreferences.objects.create(
-                    profile=profile, **preferences_data
+                preferences = UserPreferences.objects.create_or_restore(
+                    {"profile": profile}, **preferences_data
+                )
+                self._record_change(
+                    profile.id,
+                    "created",
+                    [field for field, value in preferences_data.items() if value],
                 )
                 return RepositoryResponse(
                     success=True,
@@ -67,11 +73,18 @@ class PreferencesRepository:
         """Update existing preferences"""
         try:
             with transaction.atomic():
+                changed_fields = []
                 for field, value in update_data.items():
                     if hasattr(preferences, field):
+                        if getattr(preferences, field) != value:
+                            changed_fields.append(field)
                         setattr(preferences, field, value)
 
                 preferences.save()
+                if changed_fields:
+                    self._record_change(
+                        preferences.profile_id, "updated", changed_fields
+                    )
                 return RepositoryResponse(
                     success=True,
                     message="User preferences updated successfully",
@@ -93,6 +106,7 @@ class PreferencesRepository:
         """Delete preferences"""
         try:
             with transaction.atomic():
+                self._record_change(preferences.profile_id, "deleted", [])
                 preferences.delete()
                 return RepositoryResponse(
                     success=True,
@@ -107,6 +121,169 @@ class PreferencesRepository:
                 success=False, message="Failed to delete preferences", error=str(e)
             )
 
+    @staticmethod
+    def _record_change(profile_id: int, kind: str, changed_fields: list):
+        """Queue a PreferenceChangeEvent in the caller's transaction."""
+        PreferenceChangeEvent.record([profile_id], kind, changed_fields)
+
+    def filter_preferences(
+        self, contains: dict = None, overlaps: dict = None, queryset=None
+    ) -> RepositoryResponse:
+        """
+        Filter preferences on their list-valued answers.
+
+        Args:
+            contains (dict): field -> values that must all be selected,
+                e.g. {"top_hobbies": ["hiking", "gaming"]}
+            overlaps (dict): field -> values of which at least one must be
+                selected, e.g. {"friendship_goals": ["activity_partner"]}
+            queryset: optional base queryset, defaults to all preferences
+
+        Business logic:
+            1. Reject fields outside UserPreferences.FILTERABLE_FIELDS.
+            2. Use jsonb containment/overlap (GIN indexed) on PostgreSQL and
+               the PreferenceSelection table on other databases.
+
+        Returns:
+            RepositoryResponse: data is a lazy queryset of UserPreferences
+        """
+        contains = contains or {}
+        overlaps = overlaps or {}
+        try:
+            invalid = (set(contains) | set(overlaps)) - set(
+                UserPreferences.FILTERABLE_FIELDS
+            )
+            if invalid:
+                return RepositoryResponse(
+                    success=False,
+                    message=f"Cannot filter on: {', '.join(sorted(invalid))}",
+                )
+
+            if queryset is None:
+                queryset = UserPreferences.objects.all()
+            for field, values in contains.items():
+                queryset = queryset.contains_all(field, values)
+            for field, values in overlaps.items():
+                queryset = queryset.overlaps(field, values)
+
+            return RepositoryResponse(
+                success=True, message="User preferences filtered", data=queryset
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error filtering preferences: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Failed to filter preferences", error=str(e)
+            )
+
+    def get_preferences_page(
+        self,
+        fields: list,
+        after_id: int = 0,
+        limit: int = 1000,
+        queryset=None,
+        named: bool = False,
+    ) -> RepositoryResponse:
+        """
+        Read one keyset page of preferences as tuples.
+
+        Args:
+            fields (list): field names to project, "id" is always included first
+            after_id (int): return rows with id greater than this cursor
+            limit (int): page size
+            queryset: optional base queryset (e.g. filter_preferences output)
+            named (bool): yield namedtuples instead of plain tuples
+
+        Business logic:
+            1. Validate the requested fields against the model.
+            2. Seek with `id > after_id ORDER BY id LIMIT limit`, which uses
+               the primary key index at any depth (no OFFSET scans).
+            3. Project with values_list so no model instances are built.
+
+        Returns:
+            RepositoryResponse: data is {"rows": [...], "next_after_id": int or None}
+        """
+        try:
+            invalid = self._invalid_bulk_fields(fields)
+            if invalid:
+                return RepositoryResponse(
+                    success=False,
+                    message=f"Unknown preferences fields: {', '.join(invalid)}",
+                )
+
+            if queryset is None:
+                queryset = UserPreferences.objects.all()
+            rows = list(
+                keyset_values(queryset, fields, named=named).filter(id__gt=after_id)[
+                    :limit
+                ]
+            )
+            next_after_id = rows[-1][0] if len(rows) == limit else None
+            return RepositoryResponse(
+                success=True,
+                message="User preferences page retrieved",
+                data={"rows": rows, "next_after_id": next_after_id},
+            )
+        except Exception as e:
+            self.logger.log(
+                f"Error reading preferences page: {str(e)}", level="error", error=e
+            )
+            return RepositoryResponse(
+                success=False, message="Failed to read preferences", error=str(e)
+            )
+
+    def stream_preferences(
+        self,
+        fields: list,
+        chunk_size: int = 2000,
+        after_id: int = 0,
+        queryset=None,
+        named: bool = False,
+    ) -> RepositoryResponse:
+        """
+        Stream every preferences row as tuples in constant memory.
+
+        Args:
+            fields (list): field names to project, "id" is always included first
+            chunk_size (int): rows per keyset page and per cursor fetch
+            after_id (int): resume after this id
+            queryset: optional base queryset (e.g. filter_preferences output)
+            named (bool): yield namedtuples instead of plain tuples
+
+        Business logic:
+            1. Walk the table in keyset pages of `chunk_size` rows.
+            2. Read each page with iterator(chunk_size=...), which uses a
+               server-side cursor on PostgreSQL, so at most one page is held
+               in memory.
+
+        Returns:
+            RepositoryResponse: data is a lazy generator of rows
+        """
+        invalid = self._invalid_bulk_fields(fields)
+        if invalid:
+            return RepositoryResponse(
+                success=False,
+                message=f"Unknown preferences fields: {', '.join(invalid)}",
+            )
+
+        if queryset is None:
+            queryset = UserPreferences.objects.all()
+        rows = stream_keyset(
+            queryset, fields, chunk_size=chunk_size, after=after_id, named=named
+        )
+
+        return RepositoryResponse(
+            success=True, message="Streaming user preferences", data=rows
+        )
+
+    @staticmethod
+    def _invalid_bulk_fields(fields: list) -> list:
+        known = set()
+        for field in UserPreferences._meta.concrete_fields:
+            known.update({field.name, field.attname})
+        return [field for field in fields if field not in known]
+
     def get_preferences_choices(self) -> RepositoryResponse:
         """Get all available choices for preferences fields"""
         try:
@@ -83,7 +83,7 @@ class UserPreferencesSerializer(serializers.ModelSerializer):
         ]
 
     def get_completion_percentage(self, obj):
-        return obj.calculate_completion_percentage()
+        return obj.completion_percentage
 
 
 UserQuestionnaireSerializer = UserPreferencesSerializer
@@ -155,7 +155,7 @@ class UserProfileWithPreferencesSerializer(serializers.ModelSerializer):
         if hasattr(obj, "preferences"):
             return {
                 "completed": obj.preferences.is_complete,
-                "completion_percentage": obj.preferences.calculate_completion_percentage(),
+                "completion_percentage": obj.preferences.completion_percentage,
                 "completed_at": obj.preferences.completed_at,
             }
         return {"completed": False, "completion_percentage": 0, "completed_at": None}
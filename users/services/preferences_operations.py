@@ -3,7 +3,6 @@ from core.utils.data_classes import ServiceResponse
 from users.repositories.preferences_repository import PreferencesRepository
 from users.serializers import UserCompatibilityPreferencesSerializer
 from core.utils.logging import LoggingService
-from django.utils import timezone
 
 
 class PreferencesOperations:
@@ -191,13 +190,6 @@ class PreferencesOperations:
                 preferences = update_response.data
                 status_code = 200
 
-            # Check completion and update if necessary
-            completion_percentage = preferences.calculate_completion_percentage()
-            if completion_percentage >= 80 and not preferences.is_complete:
-                preferences.is_complete = True
-                preferences.completed_at = timezone.now()
-                preferences.save()
-
             # Serialize the final preferences
             final_serializer = UserCompatibilityPreferencesSerializer(preferences)
 
@@ -284,13 +276,13 @@ class PreferencesOperations:
                         "preferences_exist": False,
                         "is_complete": False,
                         "completion_percentage": 0,
+                        "completed_sections": [],
                         "completed_at": None,
                     },
                     status_code=200,
                 )
 
             preferences = repo_response.data
-            completion_percentage = preferences.calculate_completion_percentage()
 
             return ServiceResponse(
                 success=True,
@@ -298,7 +290,8 @@ class PreferencesOperations:
                 data={
                     "preferences_exist": True,
                     "is_complete": preferences.is_complete,
-                    "completion_percentage": completion_percentage,
+                    "completion_percentage": preferences.completion_percentage,
+                    "completed_sections": preferences.completed_section_names,
                     "completed_at": preferences.completed_at,
                 },
                 status_code=200,
@@ -3,7 +3,7 @@ from core.utils.data_classes import ServiceResponse
 from users.repositories.preferences_repository import PreferencesRepository
 from users.serializers import UserPreferencesSerializer
 from core.utils.logging import LoggingService
-from django.utils import timezone
+from users.utils.compatibility_weights import get_weight_profile, importances_of
 
 
 class PreferencesUtils:
@@ -149,13 +149,6 @@ class PreferencesUtils:
                 preferences = update_response.data
                 status_code = 200
 
-            # Check completion and update if necessary
-            completion_percentage = preferences.calculate_completion_percentage()
-            if completion_percentage >= 80 and not preferences.is_complete:
-                preferences.is_complete = True
-                preferences.completed_at = timezone.now()
-                preferences.save()
-
             # Serialize the final preferences
             final_serializer = UserPreferencesSerializer(preferences)
 
@@ -208,56 +201,42 @@ class PreferencesUtils:
             )
 
     def calculate_compatibility_score(
-        self, user1_preferences, user2_preferences
+        self,
+        user1_preferences,
+        user2_preferences,
+        user1_compatibility=None,
+        user2_compatibility=None,
     ) -> ServiceResponse:
-        """Calculate compatibility score between two users' preferences"""
+        """
+        Calculate compatibility score between two users' preferences
+
+        Args:
+            user1_preferences, user2_preferences: UserPreferences to compare
+            user1_compatibility, user2_compatibility: optional
+                UserCompatibilityPreferences whose importance weights scale the
+                field weights; model defaults are used when omitted
+
+        Business logic:
+            Field weights come from the active weight profile of this process
+            (see users.utils.compatibility_weights), no lookup per call.
+        """
         try:
-            score = 0.0
-            total_weight = 0.0
-
-            # Define scoring weights for different categories
-            weights = {
-                "age_range": 0.1,
-                "life_situations": 0.15,
-                "top_hobbies": 0.2,
-                "enjoyed_media": 0.1,
-                "free_day_preference": 0.1,
-                "conversation_style": 0.15,
-                "communication_preference": 0.1,
-                "friendship_goals": 0.1,
-            }
-
-            # Calculate weighted scores
-            for field, weight in weights.items():
-                user1_value = getattr(user1_preferences, field, None)
-                user2_value = getattr(user2_preferences, field, None)
-
-                if user1_value and user2_value:
-                    total_weight += weight
-
-                    if isinstance(user1_value, list) and isinstance(user2_value, list):
-                        # For list fields, calculate overlap percentage
-                        overlap = len(set(user1_value) & set(user2_value))
-                        total_unique = len(set(user1_value + user2_value))
-                        if total_unique > 0:
-                            field_score = overlap / total_unique
-                            score += field_score * weight
-                    elif user1_value == user2_value:
-                        # For exact matches
-                        score += weight
-
-            # Normalize score to percentage
-            compatibility_percentage = (
-                (score / total_weight * 100) if total_weight > 0 else 0
+            profile = get_weight_profile()
+            percentage, total_weight = profile.score(
+                user1_preferences,
+                user2_preferences,
+                profile.vector(importances_of(user1_compatibility)),
+                profile.vector(importances_of(user2_compatibility)),
             )
 
             return ServiceResponse(
                 success=True,
                 message="Compatibility score calculated successfully",
                 data={
-                    "compatibility_percentage": round(compatibility_percentage, 2),
-                    "factors_considered": list(weights.keys()),
+                    "compatibility_percentage": round(percentage, 2),
+                    "factors_considered": list(profile.fields),
                     "total_weight": total_weight,
+                    "weights_version": profile.version,
                 },
                 status_code=200,
             )
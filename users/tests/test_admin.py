@@ -0,0 +1,45 @@
+# Test the users admin changelists
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from users.models import UserPreferences, UserProfile
+
+
+class TestUserPreferencesAdmin(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            "admin", "admin@example.com", "testpass123"
+        )
+        self.client.force_login(self.admin)
+        for username, answers in [
+            ("partial", {"age_range": "25-34"}),
+            ("fuller", {"age_range": "25-34", "top_hobbies": ["reading"]}),
+        ]:
+            user = User.objects.create_user(username, f"{username}@example.com")
+            UserPreferences.objects.create(
+                profile=UserProfile.objects.create(user=user), **answers
+            )
+
+    def test_changelist_sorts_by_stored_completion(self):
+        """Test the completion column is sortable and read from the row"""
+        response = self.client.get(
+            reverse("admin:users_userpreferences_changelist"), {"o": "3"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "5.0%")
+        results = list(response.context["cl"].result_list)
+        self.assertEqual(
+            [preferences.profile.user.username for preferences in results],
+            ["partial", "fuller"],
+        )
+
+    def test_changelist_search(self):
+        """Test searching by username through the profile relation"""
+        response = self.client.get(
+            reverse("admin:users_userpreferences_changelist"), {"q": "full"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["cl"].result_count, 1)
@@ -0,0 +1,175 @@
+# Test versioned compatibility weights and their hot reload
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from users.models import (
+    CompatibilityWeightProfile,
+    UserCompatibilityPreferences,
+    UserPreferences,
+    UserProfile,
+)
+from users.services.preferences_utils import PreferencesUtils
+from users.utils.compatibility_weights import (
+    BUILTIN_VERSION,
+    WeightProfile,
+    activate_weight_profile,
+    importances_of,
+    weight_registry,
+)
+
+
+class TestCompatibilityWeights(TestCase):
+    def setUp(self):
+        cache.clear()
+        weight_registry.invalidate()
+        self.addCleanup(cache.clear)
+        self.addCleanup(weight_registry.invalidate)
+        self.utils = PreferencesUtils()
+        self.preferences = []
+        self.compatibility = []
+        for i, hobbies in enumerate([["reading", "hiking"], ["reading"]]):
+            user = User.objects.create_user(f"member{i}", f"member{i}@example.com")
+            profile = UserProfile.objects.create(user=user)
+            self.preferences.append(
+                UserPreferences.objects.create(
+                    profile=profile,
+                    age_range="25-34",
+                    top_hobbies=hobbies,
+                    conversation_style="deep_meaningful",
+                )
+            )
+            self.compatibility.append(
+                UserCompatibilityPreferences.objects.create(profile=profile)
+            )
+
+    def _score(self, *compatibility):
+        response = self.utils.calculate_compatibility_score(
+            *self.preferences, *compatibility
+        )
+        self.assertTrue(response.success)
+        return response.data
+
+    def test_builtin_weights_without_profiles(self):
+        """Test the shipped weights are used when no profile is active"""
+        data = self._score()
+
+        self.assertEqual(data["weights_version"], BUILTIN_VERSION)
+        self.assertIn("top_hobbies", data["factors_considered"])
+        # No compatibility preferences: neutral importances, the base weights
+        self.assertAlmostEqual(data["total_weight"], 0.1 + 0.2 + 0.15)
+        # Half the hobbies overlap: (0.1 + 0.2 * 0.5 + 0.15) / 0.45
+        self.assertEqual(data["compatibility_percentage"], 77.78)
+
+        # Stored default importances: age_range 0.1*6/5, style 0.15*7/5
+        data = self._score(*self.compatibility)
+        self.assertAlmostEqual(data["total_weight"], 0.12 + 0.2 + 0.21)
+        self.assertEqual(data["compatibility_percentage"], 81.13)
+
+    def test_importance_scales_field_weights(self):
+        """Test users who care more about hobbies weigh the hobby overlap higher"""
+        baseline = self._score(*self.compatibility)["compatibility_percentage"]
+        for compatibility in self.compatibility:
+            compatibility.hobby_importance = 10
+        hobby_focused = self._score(*self.compatibility)["compatibility_percentage"]
+
+        self.assertLess(hobby_focused, baseline)
+
+    def test_vectors_are_memoised(self):
+        """Test the per-user vector is built once per importance tuple"""
+        profile = WeightProfile("test", {"age_range": 1.0}, {})
+        importances = importances_of(self.compatibility[0])
+
+        self.assertIs(profile.vector(importances), profile.vector(importances))
+        self.assertEqual(importances_of(None), (5, 5, 5, 5))
+
+    def test_scoring_reuses_loaded_profile(self):
+        """Test scoring does not touch the database once the profile is loaded"""
+        self._score()
+        with self.assertNumQueries(0):
+            self._score(*self.compatibility)
+
+    @override_settings(COMPATIBILITY_WEIGHTS_CHECK_INTERVAL=30)
+    def test_activated_version_picked_up_after_interval(self):
+        """Test a new version reaches the worker on its next check, no restart"""
+        self.assertEqual(self._score()["weights_version"], BUILTIN_VERSION)
+        CompatibilityWeightProfile.objects.create(
+            version="v2", weights={"age_range": 1.0, "top_hobbies": 1.0}
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            activate_weight_profile("v2")
+
+        # Another worker still serves its loaded version until its next check
+        weight_registry._profile = WeightProfile(
+            BUILTIN_VERSION, {"age_range": 1.0}, {}
+        )
+        weight_registry._checked_at = 0.0
+        with mock.patch("time.monotonic", return_value=10.0):
+            self.assertEqual(self._score()["weights_version"], BUILTIN_VERSION)
+        with mock.patch("time.monotonic", return_value=31.0):
+            data = self._score()
+        self.assertEqual(data["weights_version"], "v2")
+        self.assertEqual(data["factors_considered"], ["age_range", "top_hobbies"])
+
+    @override_settings(COMPATIBILITY_WEIGHTS_CHECK_INTERVAL=30)
+    def test_activation_reaches_processes_without_a_shared_cache(self):
+        """Test the cached version expires, so per-process caches reload it"""
+        self._score()
+        with mock.patch.object(cache, "set", wraps=cache.set) as cache_set:
+            weight_registry.invalidate()
+            cache.delete("compatibility_weights:active_version")
+            self._score()
+        cache_set.assert_called_once_with(
+            "compatibility_weights:active_version", BUILTIN_VERSION, 30
+        )
+
+
+class TestCompatibilityWeightsCommand(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.addCleanup(weight_registry.invalidate)
+
+    def _config_file(self, config):
+        file_obj = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+        self.addCleanup(os.unlink, file_obj.name)
+        with file_obj:
+            json.dump(config, file_obj)
+        return file_obj.name
+
+    def test_load_and_activate(self):
+        """Test a profile file is validated, stored and activated"""
+        path = self._config_file(
+            {
+                "version": "v2",
+                "weights": {"top_hobbies": 0.5, "age_range": 0.5},
+                "categories": {"hobby_importance": ["top_hobbies"]},
+            }
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command(
+                "compatibility_weights",
+                "load",
+                path,
+                "--activate",
+                stdout=io.StringIO(),
+            )
+
+        profile = CompatibilityWeightProfile.objects.get(version="v2")
+        self.assertTrue(profile.is_current)
+        self.assertTrue(profile.is_active)
+        self.assertEqual(cache.get("compatibility_weights:active_version"), "v2")
+
+    def test_invalid_profile_rejected(self):
+        """Test unknown fields are rejected before anything is stored"""
+        path = self._config_file({"version": "v3", "weights": {"shoe_size": 1}})
+        with self.assertRaisesMessage(CommandError, "shoe_size"):
+            call_command("compatibility_weights", "load", path, stdout=io.StringIO())
+        self.assertFalse(CompatibilityWeightProfile.objects.exists())
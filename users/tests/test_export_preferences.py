@@ -0,0 +1,131 @@
+# Test the export_preferences management command
+import datetime
+import gzip
+import io
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock, skipIf
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from core.utils import exporters
+from users.models import UserCompatibilityPreferences, UserPreferences, UserProfile
+
+
+class TestExportPreferences(TestCase):
+    def setUp(self):
+        self.output_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.output_dir)
+        self.preferences = []
+        for i in range(3):
+            user = User.objects.create_user(f"member{i}", f"member{i}@example.com")
+            profile = UserProfile.objects.create(user=user)
+            self.preferences.append(
+                UserPreferences.objects.create(
+                    profile=profile, age_range="25-34", top_hobbies=["reading"]
+                )
+            )
+            UserCompatibilityPreferences.objects.create(profile=profile)
+
+    def _export(self, *args):
+        call_command(
+            "export_preferences",
+            "--output-dir",
+            str(self.output_dir),
+            *args,
+            stdout=io.StringIO(),
+        )
+
+    def _read(self, pattern):
+        rows = []
+        for path in sorted(self.output_dir.glob(pattern)):
+            opener = gzip.open if path.suffix == ".gz" else open
+            with opener(path, "rt", encoding="utf-8") as file_obj:
+                rows.extend(json.loads(line) for line in file_obj)
+        return rows
+
+    def test_jsonl_export_includes_soft_deleted_rows(self):
+        """Test both models are exported in chunks, soft deleted rows flagged"""
+        UserPreferences.objects.filter(id=self.preferences[2].id).soft_delete()
+        self._export("--chunk-size", "2")
+
+        rows = self._read("preferences_*.jsonl")
+        self.assertEqual([row["id"] for row in rows], [p.id for p in self.preferences])
+        self.assertEqual(rows[0]["top_hobbies"], ["reading"])
+        self.assertEqual(rows[0]["profile_id"], self.preferences[0].profile_id)
+        self.assertTrue(rows[2]["is_deleted"])
+        self.assertNotIn("notes", rows[0])
+        self.assertEqual(len(self._read("compatibility_*.jsonl")), 3)
+
+    def test_compressed_export(self):
+        """Test --compress writes gzip files"""
+        self._export("--compress", "--models", "preferences")
+
+        self.assertEqual(len(self._read("preferences_*.jsonl.gz")), 3)
+        self.assertFalse(list(self.output_dir.glob("compatibility_*")))
+
+    def test_incremental_export_uses_watermark(self):
+        """Test a second incremental run only exports rows changed since the first"""
+        self._export("--models", "preferences")
+        watermarks = json.loads((self.output_dir / "export_watermark.json").read_text())
+        self.assertIn("preferences", watermarks)
+
+        for path in self.output_dir.glob("preferences_*"):
+            path.unlink()
+        later = timezone.now() + datetime.timedelta(seconds=5)
+        UserPreferences.objects.filter(id=self.preferences[1].id).update(
+            current_location="Kigali", updated_at=later
+        )
+        with mock.patch(
+            "django.utils.timezone.now",
+            return_value=later + datetime.timedelta(seconds=1),
+        ):
+            self._export(
+                "--models", "preferences", "--incremental", "--overlap-seconds", "0"
+            )
+
+        rows = self._read("preferences_*.jsonl")
+        self.assertEqual([row["id"] for row in rows], [self.preferences[1].id])
+        self.assertEqual(rows[0]["current_location"], "Kigali")
+
+    def test_incremental_export_rereads_late_commits(self):
+        """Test a row stamped before the watermark but committed later is exported"""
+        self._export("--models", "preferences")
+        watermark = datetime.datetime.fromisoformat(
+            json.loads((self.output_dir / "export_watermark.json").read_text())[
+                "preferences"
+            ]
+        )
+        for path in self.output_dir.glob("preferences_*"):
+            path.unlink()
+
+        # Saved just before the first run, its transaction committed after it
+        UserPreferences.objects.filter(id=self.preferences[0].id).update(
+            current_location="Kigali",
+            updated_at=watermark - datetime.timedelta(seconds=30),
+        )
+        UserPreferences.objects.exclude(id=self.preferences[0].id).update(
+            updated_at=watermark - datetime.timedelta(hours=1)
+        )
+        with self.settings(EXPORT_WATERMARK_OVERLAP_SECONDS=60):
+            self._export("--models", "preferences", "--incremental")
+
+        rows = self._read("preferences_*.jsonl")
+        self.assertEqual([row["id"] for row in rows], [self.preferences[0].id])
+        self.assertEqual(rows[0]["current_location"], "Kigali")
+
+    def test_unknown_model_rejected(self):
+        """Test an unknown --models entry fails before anything is written"""
+        with self.assertRaises(CommandError):
+            self._export("--models", "messages")
+
+    @skipIf(exporters.pyarrow is not None, "pyarrow is installed")
+    def test_parquet_requires_pyarrow(self):
+        """Test Parquet export fails with a clear error without pyarrow"""
+        with self.assertRaisesMessage(CommandError, "pyarrow"):
+            self._export("--format", "parquet")
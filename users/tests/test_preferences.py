@@ -69,3 +69,51 @@ class PreferencesTestCase(TestCase):
 
         # Test accessing profile from preferences
         self.assertEqual(preferences.profile, self.profile)
+
+    def test_completion_percentage_is_stored_on_save(self):
+        """Test the stored completion percentage follows the answers"""
+        preferences = UserPreferences.objects.create(
+            profile=self.profile, age_range="25-34", top_hobbies=["reading"]
+        )
+        self.assertEqual(preferences.completion_percentage, 10.0)
+
+        preferences.current_location = "Kigali, Rwanda"
+        preferences.save(update_fields=["current_location"])
+        preferences.refresh_from_db()
+        self.assertEqual(preferences.completion_percentage, 15.0)
+        self.assertEqual(
+            UserPreferences.objects.filter(completion_percentage__gte=15).count(), 1
+        )
+
+    def test_completed_sections_bitmap(self):
+        """Test the per-section bitmap and the queryset filters built on it"""
+        preferences = UserPreferences.objects.create(
+            profile=self.profile,
+            top_hobbies=["reading"],
+            enjoyed_media=["books"],
+            free_day_preference="cozy_at_home",
+            friendship_goals=["casual_chats"],
+        )
+
+        self.assertEqual(preferences.completed_section_names, ["interests"])
+        self.assertTrue(preferences.is_section_complete("interests"))
+        self.assertFalse(preferences.is_complete)
+        self.assertEqual(
+            UserPreferences.objects.with_sections_complete("interests").count(), 1
+        )
+        self.assertEqual(
+            UserPreferences.objects.with_sections_complete(
+                "interests", "goals"
+            ).count(),
+            0,
+        )
+
+    def test_complete_is_set_in_the_same_write(self):
+        """Test reaching the threshold marks the questionnaire complete on save"""
+        preferences = PreferencesFactory(profile=self.profile, is_complete=False)
+        preferences.refresh_from_db()
+
+        self.assertGreaterEqual(preferences.completion_percentage, 80)
+        self.assertTrue(preferences.is_complete)
+        self.assertIsNotNone(preferences.completed_at)
+        self.assertIn(preferences, UserPreferences.objects.with_completion_at_least(80))
@@ -0,0 +1,68 @@
+# Test the bulk preferences read API
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from users.models import UserPreferences, UserProfile
+from users.repositories.preferences_repository import PreferencesRepository
+
+
+class TestBulkReadPreferences(TestCase):
+    def setUp(self):
+        self.repository = PreferencesRepository()
+        self.preferences = []
+        for i, age_range in enumerate(["18-24", "25-34", "35-44", "45-54", "55+"]):
+            user = User.objects.create_user(f"member{i}", f"member{i}@example.com")
+            self.preferences.append(
+                UserPreferences.objects.create(
+                    profile=UserProfile.objects.create(user=user),
+                    age_range=age_range,
+                    top_hobbies=["hiking"] if i % 2 else ["reading"],
+                )
+            )
+        self.ids = [preferences.id for preferences in self.preferences]
+
+    def test_stream_walks_keyset_pages(self):
+        """Test every row is streamed once, in id order, one query per page"""
+        response = self.repository.stream_preferences(
+            ["age_range", "profile_id"], chunk_size=2
+        )
+        self.assertTrue(response.success)
+
+        with self.assertNumQueries(3):
+            rows = list(response.data)
+
+        self.assertEqual([row[0] for row in rows], self.ids)
+        self.assertEqual(
+            rows[1], (self.ids[1], "25-34", self.preferences[1].profile_id)
+        )
+
+    def test_stream_resumes_and_filters(self):
+        """Test streaming after a cursor over a filtered queryset"""
+        hikers = self.repository.filter_preferences(
+            contains={"top_hobbies": ["hiking"]}
+        ).data
+        response = self.repository.stream_preferences(
+            ["top_hobbies"], after_id=self.ids[1], queryset=hikers, named=True
+        )
+
+        rows = list(response.data)
+        self.assertEqual([row.id for row in rows], [self.ids[3]])
+        self.assertEqual(rows[0].top_hobbies, ["hiking"])
+
+    def test_page_returns_next_cursor(self):
+        """Test keyset pages hand back the cursor for the next call"""
+        first = self.repository.get_preferences_page(["age_range"], limit=3).data
+        self.assertEqual(first["next_after_id"], self.ids[2])
+
+        second = self.repository.get_preferences_page(
+            ["age_range"], after_id=first["next_after_id"], limit=3
+        ).data
+        self.assertEqual([row[1] for row in second["rows"]], ["45-54", "55+"])
+        self.assertIsNone(second["next_after_id"])
+
+    def test_unknown_fields_are_rejected(self):
+        """Test projections are limited to model fields"""
+        response = self.repository.stream_preferences(["age_range", "password"])
+
+        self.assertFalse(response.success)
+        self.assertIn("password", response.message)
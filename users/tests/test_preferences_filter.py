@@ -0,0 +1,79 @@
+# Test filtering preferences on list-valued answers
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+
+from users.models import PreferenceSelection, UserPreferences, UserProfile
+from users.repositories.preferences_repository import PreferencesRepository
+
+
+class TestFilterPreferences(TestCase):
+    def setUp(self):
+        self.repository = PreferencesRepository()
+        self.hiker = self._preferences(
+            "hiker",
+            top_hobbies=["hiking", "reading"],
+            friendship_goals=["gaming_partner"],
+        )
+        self.reader = self._preferences(
+            "reader", top_hobbies=["reading"], friendship_goals=["casual_chats"]
+        )
+        self.walker = self._preferences(
+            "walker", top_hobbies=["hiking"], friendship_goals=["casual_chats"]
+        )
+
+    def _preferences(self, username, **answers):
+        user = User.objects.create_user(username, f"{username}@example.com")
+        return UserPreferences.objects.create(
+            profile=UserProfile.objects.create(user=user), **answers
+        )
+
+    def _filter(self, **kwargs):
+        response = self.repository.filter_preferences(**kwargs)
+        self.assertTrue(response.success)
+        return set(response.data)
+
+    def test_contains_and_overlaps(self):
+        """Test 'likes hiking and wants a gaming partner' style lookups"""
+        self.assertEqual(
+            self._filter(contains={"top_hobbies": ["hiking"]}),
+            {self.hiker, self.walker},
+        )
+        self.assertEqual(
+            self._filter(contains={"top_hobbies": ["hiking", "reading"]}),
+            {self.hiker},
+        )
+        self.assertEqual(
+            self._filter(
+                contains={"top_hobbies": ["hiking"]},
+                overlaps={"friendship_goals": ["gaming_partner", "motivation_boost"]},
+            ),
+            {self.hiker},
+        )
+
+    def test_filter_follows_updates(self):
+        """Test changed answers are reflected in the next lookup"""
+        self.reader.top_hobbies = ["hiking"]
+        self.reader.save()
+
+        self.assertIn(self.reader, self._filter(contains={"top_hobbies": ["hiking"]}))
+
+    def test_filter_rejects_unknown_fields(self):
+        """Test only the indexed list fields can be filtered on"""
+        response = self.repository.filter_preferences(contains={"age_range": ["18-24"]})
+
+        self.assertFalse(response.success)
+        self.assertIn("age_range", response.message)
+
+    def test_query_plan_uses_index(self):
+        """Test the lookup is served by an index instead of a table scan"""
+        queryset = self.repository.filter_preferences(
+            contains={"top_hobbies": ["hiking"]}
+        ).data
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            self.assertIn("users_pref_top_hobbies_gin", queryset.explain())
+        else:
+            self.assertTrue(PreferenceSelection.objects.exists())
+            self.assertIn("preference_selection_idx", queryset.explain())
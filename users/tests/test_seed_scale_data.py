@@ -0,0 +1,83 @@
+# Test the synthetic data generator and seed_scale_data command
+import io
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from users.models import (
+    UserCompatibilityPreferences,
+    UserPreferences,
+    UserProfile,
+)
+from users.repositories.preferences_repository import PreferencesRepository
+from users.utils.synthetic_data import SyntheticPreferencesGenerator
+
+
+class TestSyntheticPreferencesGenerator(TestCase):
+    def test_columns_are_reproducible(self):
+        """Test the same seed produces the same answers."""
+        first = SyntheticPreferencesGenerator(seed=7).preferences_columns(50)
+        second = SyntheticPreferencesGenerator(seed=7).preferences_columns(50)
+        self.assertEqual(first, second)
+
+    def test_columns_use_valid_choices(self):
+        """Test generated values are valid model choices."""
+        columns = SyntheticPreferencesGenerator(seed=1).preferences_columns(200)
+        valid_hobbies = {value for value, _ in UserPreferences.HOBBY_CHOICES}
+        valid_ages = {value for value, _ in UserPreferences.AGE_CHOICES}
+
+        for hobbies in columns["top_hobbies"]:
+            self.assertLessEqual(len(hobbies), 3)
+            self.assertEqual(len(hobbies), len(set(hobbies)))
+            self.assertTrue(set(hobbies) <= valid_hobbies)
+        self.assertTrue(set(columns["age_range"]) - {None} <= valid_ages)
+
+    def test_weighted_distribution(self):
+        """Test common choices dominate and some answers are left blank."""
+        columns = SyntheticPreferencesGenerator(seed=3).preferences_columns(5000)
+        ages = columns["age_range"]
+        self.assertGreater(ages.count("25-34"), ages.count("55+") * 2)
+        self.assertGreater(ages.count(None), 0)
+
+
+class TestSeedScaleDataCommand(TestCase):
+    def _seed(self, *args):
+        call_command("seed_scale_data", "--batch-size=15", *args, stdout=io.StringIO())
+
+    def test_seed_success(self):
+        """Test users, profiles and both preference tables are populated."""
+        self._seed("--users=40", "--preferences-ratio=1")
+
+        self.assertEqual(
+            User.objects.filter(username__startswith="seed_user_").count(), 40
+        )
+        self.assertEqual(UserProfile.objects.count(), 40)
+        self.assertEqual(UserPreferences.objects.count(), 40)
+        self.assertEqual(UserCompatibilityPreferences.objects.count(), 40)
+        self.assertTrue(
+            User.objects.get(username="seed_user_0").check_password("password123")
+        )
+
+        for preferences in UserPreferences.objects.filter(is_complete=True):
+            self.assertGreaterEqual(preferences.calculate_completion_percentage(), 80)
+
+        hikers = PreferencesRepository().filter_preferences(
+            contains={"top_hobbies": ["hiking"]}
+        )
+        self.assertEqual(
+            hikers.data.count(),
+            sum("hiking" in p.top_hobbies for p in UserPreferences.objects.all()),
+        )
+
+    def test_seed_requires_clear_for_existing_prefix(self):
+        """Test reseeding the same prefix fails unless --clear is passed."""
+        self._seed("--users=5")
+        with self.assertRaises(CommandError):
+            self._seed("--users=5")
+
+        self._seed("--users=8", "--clear")
+        self.assertEqual(
+            User.objects.filter(username__startswith="seed_user_").count(), 8
+        )
@@ -0,0 +1,270 @@
+# Versioned compatibility weights, loaded once per process and hot-reloadable
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from core.utils.logging import LoggingService
+from users.models import (
+    CompatibilityWeightProfile,
+    UserCompatibilityPreferences,
+    UserPreferences,
+)
+
+BUILTIN_VERSION = "builtin"
+ACTIVE_VERSION_CACHE_KEY = "compatibility_weights:active_version"
+
+# Base weight per UserPreferences field
+DEFAULT_WEIGHTS = {
+    "age_range": 0.1,
+    "life_situations": 0.15,
+    "top_hobbies": 0.2,
+    "enjoyed_media": 0.1,
+    "free_day_preference": 0.1,
+    "conversation_style": 0.15,
+    "communication_preference": 0.1,
+    "friendship_goals": 0.1,
+}
+
+# UserCompatibilityPreferences importance field -> preference fields it scales
+DEFAULT_CATEGORIES = {
+    "hobby_importance": ["top_hobbies", "enjoyed_media", "free_day_preference"],
+    "personality_importance": ["conversation_style"],
+    "values_importance": ["communication_preference", "friendship_goals"],
+    "lifestyle_importance": ["age_range", "life_situations"],
+}
+
+IMPORTANCE_FIELDS = UserCompatibilityPreferences.IMPORTANCE_FIELDS
+# Importance is stored on a 1-10 scale; 5 leaves the base weight unchanged
+NEUTRAL_IMPORTANCE = 5
+MAX_IMPORTANCE = 10
+NEUTRAL_IMPORTANCES = (NEUTRAL_IMPORTANCE,) * len(IMPORTANCE_FIELDS)
+
+
+def validate_weight_config(weights: dict, categories: dict):
+    """
+    Check a weight configuration before it is stored or activated.
+
+    Raises:
+        ValueError: unknown fields or categories, or negative weights
+    """
+    field_names = {field.name for field in UserPreferences._meta.concrete_fields}
+    if not weights:
+        raise ValueError("At least one weight is required")
+    for field, weight in weights.items():
+        if field not in field_names:
+            raise ValueError(f"Unknown preferences field: {field}")
+        if not isinstance(weight, (int, float)) or weight < 0:
+            raise ValueError(f"Weight of {field} must be a non-negative number")
+    for category, fields in categories.items():
+        if category not in IMPORTANCE_FIELDS:
+            raise ValueError(
+                f"Unknown category {category}. Must be one of: "
+                f"{', '.join(IMPORTANCE_FIELDS)}"
+            )
+        unknown = set(fields) - set(weights)
+        if unknown:
+            raise ValueError(
+                f"Category {category} references unweighted fields: "
+                f"{', '.join(sorted(unknown))}"
+            )
+
+
+def importances_of(compatibility_preferences=None) -> tuple:
+    """
+    Importance weights of one user as a hashable tuple in IMPORTANCE_FIELDS order.
+
+    Users without compatibility preferences are neutral (every base weight
+    unchanged), so their scores match the unweighted ones. A missing value
+    on stored preferences falls back to the model default.
+    """
+    if compatibility_preferences is None:
+        return NEUTRAL_IMPORTANCES
+    values = []
+    for name in IMPORTANCE_FIELDS:
+        value = getattr(compatibility_preferences, name, None)
+        if value is None:
+            value = UserCompatibilityPreferences._meta.get_field(name).default
+        values.append(min(max(int(value), 0), MAX_IMPORTANCE))
+    return tuple(values)
+
+
+class WeightProfile:
+    """
+    Precomputed scoring vectors of one weight version.
+
+    Instances are immutable once built; per-user vectors are memoised by
+    importance tuple, of which there are at most 11**4.
+    """
+
+    def __init__(self, version: str, weights: dict, categories: dict):
+        self.version = version
+        self.fields = tuple(weights)
+        self.base = tuple(float(weights[field]) for field in self.fields)
+        category_of = {
+            field: IMPORTANCE_FIELDS.index(category)
+            for category, fields in categories.items()
+            for field in fields
+        }
+        self.category_index = tuple(category_of.get(field, -1) for field in self.fields)
+        self._vectors = {}
+
+    def vector(self, importances: tuple) -> tuple:
+        """Field weights of a user with the given importances."""
+        vector = self._vectors.get(importances)
+        if vector is None:
+            vector = tuple(
+                base if index < 0 else base * importances[index] / NEUTRAL_IMPORTANCE
+                for base, index in zip(self.base, self.category_index)
+            )
+            self._vectors[importances] = vector
+        return vector
+
+    def score(self, preferences1, preferences2, vector1, vector2) -> tuple:
+        """
+        Weighted similarity of two UserPreferences.
+
+        Business logic:
+            1. The weight of a field is the mean of both users' weights.
+            2. Fields missing on either side are left out of the total.
+            3. List fields score their Jaccard overlap, others exact matches.
+
+        Returns:
+            tuple: (percentage 0-100, total weight considered)
+        """
+        score = 0.0
+        total_weight = 0.0
+        for field, weight1, weight2 in zip(self.fields, vector1, vector2):
+            value1 = getattr(preferences1, field, None)
+            value2 = getattr(preferences2, field, None)
+            if not value1 or not value2:
+                continue
+
+            weight = (weight1 + weight2) / 2
+            total_weight += weight
+            if isinstance(value1, list) and isinstance(value2, list):
+                values1, values2 = set(value1), set(value2)
+                score += len(values1 & values2) / len(values1 | values2) * weight
+            elif value1 == value2:
+                score += weight
+
+        percentage = score / total_weight * 100 if total_weight > 0 else 0
+        return percentage, total_weight
+
+
+BUILTIN_PROFILE = WeightProfile(BUILTIN_VERSION, DEFAULT_WEIGHTS, DEFAULT_CATEGORIES)
+
+
+class WeightRegistry:
+    """
+    Process-local holder of the active WeightProfile.
+
+    Business logic:
+        1. The profile is built once and reused by every request.
+        2. At most every COMPATIBILITY_WEIGHTS_CHECK_INTERVAL seconds the
+           active version name is read from the cache (one cache GET,
+           falling back to the database on a miss). The cached name expires
+           after one interval, so with a per-process cache (LocMem, no
+           REDIS_URL) an activation still reaches every worker from the
+           database within two intervals.
+        3. Only when that name changed is the new profile loaded and its
+           vectors rebuilt, so activating a version reaches every worker
+           within one interval without a restart.
+    """
+
+    def __init__(self):
+        self.logger = LoggingService()
+        self._profile = None
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    @property
+    def check_interval(self) -> float:
+        return getattr(settings, "COMPATIBILITY_WEIGHTS_CHECK_INTERVAL", 30)
+
+    def get(self) -> WeightProfile:
+        """Return the active profile, reloading it if a new version was activated."""
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return self._profile
+        with self._lock:
+            now = time.monotonic()
+            if now - self._checked_at >= self.check_interval:
+                self._refresh()
+                self._checked_at = now
+        return self._profile
+
+    def invalidate(self):
+        """Force the next get() to check the active version."""
+        self._checked_at = float("-inf")
+
+    def _refresh(self):
+        try:
+            version = cache.get(ACTIVE_VERSION_CACHE_KEY)
+            if version is None:
+                version = self._active_version()
+                cache.set(ACTIVE_VERSION_CACHE_KEY, version, self.check_interval)
+            if self._profile is None or self._profile.version != version:
+                self._profile = self._load(version)
+        except Exception as e:
+            self.logger.log(
+                f"Error loading compatibility weights: {str(e)}",
+                level="error",
+                error=e,
+            )
+            if self._profile is None:
+                self._profile = BUILTIN_PROFILE
+
+    @staticmethod
+    def _active_version() -> str:
+        version = (
+            CompatibilityWeightProfile.objects.filter(is_current=True)
+            .values_list("version", flat=True)
+            .first()
+        )
+        return version or BUILTIN_VERSION
+
+    @staticmethod
+    def _load(version: str) -> WeightProfile:
+        if version == BUILTIN_VERSION:
+            return BUILTIN_PROFILE
+        stored = CompatibilityWeightProfile.objects.filter(version=version).first()
+        if stored is None:
+            return BUILTIN_PROFILE
+        return WeightProfile(stored.version, stored.weights, stored.categories)
+
+
+weight_registry = WeightRegistry()
+
+
+def get_weight_profile() -> WeightProfile:
+    """Return the active compatibility weight profile of this process."""
+    return weight_registry.get()
+
+
+def activate_weight_profile(version: str):
+    """
+    Make `version` the active weight profile for every worker.
+
+    Pass BUILTIN_VERSION to fall back to the weights shipped in code.
+
+    Raises:
+        CompatibilityWeightProfile.DoesNotExist: unknown version
+    """
+    with transaction.atomic():
+        CompatibilityWeightProfile.objects.filter(is_current=True).update(
+            is_current=False, updated_at=timezone.now()
+        )
+        if version != BUILTIN_VERSION:
+            profile = CompatibilityWeightProfile.objects.get(version=version)
+            validate_weight_config(profile.weights, profile.categories)
+            profile.is_current = True
+            profile.save(update_fields=["is_current", "updated_at"])
+        transaction.on_commit(
+            lambda: cache.set(
+                ACTIVE_VERSION_CACHE_KEY, version, weight_registry.check_interval
+            )
+        )
+    weight_registry.invalidate()
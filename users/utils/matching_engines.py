@@ -0,0 +1,389 @@
+# Interchangeable top-K matching engines built on the compatibility weights
+import heapq
+import random
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass
+
+from users.services.preferences_utils import PreferencesUtils
+from users.utils.compatibility_weights import get_weight_profile, importances_of
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - optional dependency
+    numpy = None
+
+
+@dataclass
+class MatchCandidate:
+    """One user as seen by the matching engines (instances need not be saved)."""
+
+    id: int
+    preferences: object
+    compatibility: object = None
+
+
+def _rank_key(item):
+    return -item[1], item[0]
+
+
+def _top_k(scored, k: int) -> list:
+    """
+    Best `k` (id, score) pairs, best first.
+
+    Scores are rounded to the 2 decimals the API reports and ties broken by
+    id, so every engine orders equal scores the same way.
+    """
+    return heapq.nsmallest(
+        k, ((id, round(score, 2)) for id, score in scored), key=_rank_key
+    )
+
+
+class MatchingEngine:
+    """
+    Base class: `build()` indexes the candidate pool once, `top_k()` ranks it
+    for one query user. `last_scored` is the number of exact scores computed
+    by the latest query, to compare how much work candidate generation saves.
+    """
+
+    name = ""
+
+    def build(self, candidates: list):
+        self.candidates = candidates
+        self.last_scored = 0
+
+    def top_k(self, query: MatchCandidate, k: int) -> list:
+        raise NotImplementedError
+
+
+class PairwiseEngine(MatchingEngine):
+    """
+    Reference: the production scoring service called once per pair.
+
+    Keeps every score of the latest query in `last_scores` so other engines
+    can be checked against it.
+    """
+
+    name = "pairwise"
+
+    def build(self, candidates):
+        super().build(candidates)
+        self.utils = PreferencesUtils()
+
+    def top_k(self, query, k):
+        scored = []
+        for candidate in self.candidates:
+            if candidate.id == query.id:
+                continue
+            response = self.utils.calculate_compatibility_score(
+                query.preferences,
+                candidate.preferences,
+                query.compatibility,
+                candidate.compatibility,
+            )
+            scored.append((candidate.id, response.data["compatibility_percentage"]))
+        self.last_scored = len(scored)
+        self.last_scores = dict(scored)
+        return _top_k(scored, k)
+
+
+class _ExactRerankMixin:
+    """
+    Exact scores for a candidate subset with the active weight profile.
+
+    Engines using it can also be kept up to date one user at a time with
+    add() and remove(), for long running consumers.
+    """
+
+    def _prepare_vectors(self, candidates):
+        self.profile = get_weight_profile()
+        self.vectors = {}
+        self.by_id = {}
+        for candidate in candidates:
+            self.add(candidate)
+
+    def add(self, candidate: MatchCandidate):
+        """Insert or replace one candidate in the index."""
+        if candidate.id in self.by_id:
+            self.remove(candidate.id)
+        self.by_id[candidate.id] = candidate
+        self.vectors[candidate.id] = self.profile.vector(
+            importances_of(candidate.compatibility)
+        )
+        self._index(candidate)
+
+    def remove(self, id: int):
+        """Drop one candidate from the index, if present."""
+        candidate = self.by_id.pop(id, None)
+        if candidate is not None:
+            del self.vectors[id]
+            self._unindex(candidate)
+
+    def _index(self, candidate):
+        pass
+
+    def _unindex(self, candidate):
+        pass
+
+    def score_ids(self, query, ids) -> list:
+        """Exact (id, score) of `query` against the given indexed ids."""
+        query_vector = self.profile.vector(importances_of(query.compatibility))
+        scored = []
+        for id in ids:
+            if id == query.id or id not in self.by_id:
+                continue
+            percentage, _ = self.profile.score(
+                query.preferences,
+                self.by_id[id].preferences,
+                query_vector,
+                self.vectors[id],
+            )
+            scored.append((id, percentage))
+        return scored
+
+    def _rerank(self, query, ids, k):
+        scored = self.score_ids(query, ids)
+        self.last_scored = len(scored)
+        return _top_k(scored, k)
+
+
+class ExactEngine(_ExactRerankMixin, MatchingEngine):
+    """Every indexed candidate scored exactly, without the service overhead."""
+
+    name = "exact"
+
+    def build(self, candidates):
+        super().build(candidates)
+        self._prepare_vectors(candidates)
+
+    def top_k(self, query, k):
+        return self._rerank(query, list(self.by_id), k)
+
+
+class PrefilterEngine(_ExactRerankMixin, MatchingEngine):
+    """
+    Only score candidates sharing at least one value with the query in a
+    selective list field, mirroring the indexed `overlaps()` filter.
+
+    Candidates with nothing in common on those fields are never scored,
+    which is where recall can be lost.
+    """
+
+    name = "prefilter"
+    fields = ("top_hobbies", "friendship_goals")
+
+    def build(self, candidates):
+        super().build(candidates)
+        self.index = defaultdict(set)
+        self._prepare_vectors(candidates)
+
+    def _keys(self, preferences):
+        for field in self.fields:
+            for value in getattr(preferences, field, None) or []:
+                yield (field, value)
+
+    def _index(self, candidate):
+        for key in self._keys(candidate.preferences):
+            self.index[key].add(candidate.id)
+
+    def _unindex(self, candidate):
+        for key in self._keys(candidate.preferences):
+            self.index[key].discard(candidate.id)
+
+    def top_k(self, query, k):
+        ids = set()
+        for key in self._keys(query.preferences):
+            ids |= self.index.get(key, set())
+        return self._rerank(query, ids, k)
+
+
+class AnnEngine(_ExactRerankMixin, MatchingEngine):
+    """
+    Approximate nearest neighbours with MinHash LSH over answer tokens.
+
+    Business logic:
+        1. Each user becomes a set of "field=value" tokens over the weighted
+           fields; `num_perm` MinHash values approximate Jaccard similarity.
+        2. Signatures are split into `bands`; users sharing any band bucket
+           with the query become candidates.
+        3. Candidates are re-scored exactly, so only recall is approximate.
+    """
+
+    name = "ann"
+    prime = (1 << 61) - 1
+
+    def __init__(self, num_perm: int = 32, bands: int = 16, seed: int = 7):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(seed)
+        self.salts = [
+            (rng.randrange(1, self.prime), rng.randrange(0, self.prime))
+            for _ in range(num_perm)
+        ]
+
+    def build(self, candidates):
+        super().build(candidates)
+        self.buckets = defaultdict(set)
+        # _tokens() needs the profile before the first candidate is indexed
+        self.profile = get_weight_profile()
+        self._prepare_vectors(candidates)
+
+    def _index(self, candidate):
+        for key in self._band_keys(candidate.preferences):
+            self.buckets[key].add(candidate.id)
+
+    def _unindex(self, candidate):
+        for key in self._band_keys(candidate.preferences):
+            self.buckets[key].discard(candidate.id)
+
+    def top_k(self, query, k):
+        ids = set()
+        for key in self._band_keys(query.preferences):
+            ids.update(self.buckets.get(key, ()))
+        return self._rerank(query, ids, k)
+
+    def _tokens(self, preferences) -> list:
+        tokens = []
+        for field in self.profile.fields:
+            value = getattr(preferences, field, None)
+            if not value:
+                continue
+            for item in value if isinstance(value, list) else [value]:
+                tokens.append(zlib.crc32(f"{field}={item}".encode()))
+        return tokens
+
+    def _band_keys(self, preferences) -> list:
+        tokens = self._tokens(preferences)
+        if not tokens:
+            return []
+        signature = [
+            min((a * token + b) % self.prime for token in tokens) for a, b in self.salts
+        ]
+        return [
+            (band, tuple(signature[band * self.rows : (band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+
+
+class VectorizedEngine(MatchingEngine):
+    """
+    Exact scores against the whole pool with numpy array operations.
+
+    The pool is encoded once: a code column per scalar field, a multi-hot
+    matrix per list field and a weight matrix from every user's importances.
+    A query is then a handful of vector operations instead of N calls.
+    Requires numpy (optional dependency).
+    """
+
+    name = "vectorized"
+
+    def build(self, candidates):
+        if numpy is None:
+            raise ImportError(
+                "The vectorized engine requires numpy (pip install numpy)"
+            )
+        super().build(candidates)
+        self.profile = get_weight_profile()
+        self.ids = numpy.array([candidate.id for candidate in candidates])
+        self.weights = numpy.array(
+            [
+                self.profile.vector(importances_of(candidate.compatibility))
+                for candidate in candidates
+            ]
+        )
+        self.columns = []
+        for field in self.profile.fields:
+            values = [
+                getattr(candidate.preferences, field, None) for candidate in candidates
+            ]
+            if any(isinstance(value, list) for value in values):
+                self.columns.append(self._encode_list(field, values))
+            else:
+                self.columns.append(self._encode_scalar(field, values))
+
+    @staticmethod
+    def _encode_scalar(field, values):
+        vocabulary = {}
+        codes = numpy.array(
+            [
+                vocabulary.setdefault(value, len(vocabulary)) if value else -1
+                for value in values
+            ]
+        )
+        return ("scalar", field, vocabulary, codes)
+
+    @staticmethod
+    def _encode_list(field, values):
+        vocabulary = {}
+        for items in values:
+            for item in items or []:
+                vocabulary.setdefault(item, len(vocabulary))
+        matrix = numpy.zeros((len(values), max(len(vocabulary), 1)), dtype=numpy.int32)
+        for row, items in enumerate(values):
+            for item in set(items or []):
+                matrix[row, vocabulary[item]] = 1
+        return ("list", field, vocabulary, (matrix, matrix.sum(axis=1)))
+
+    def top_k(self, query, k):
+        query_weights = numpy.array(
+            self.profile.vector(importances_of(query.compatibility))
+        )
+        pair_weights = (self.weights + query_weights) / 2
+        similarity = numpy.zeros(self.weights.shape)
+        present = numpy.zeros(self.weights.shape, dtype=bool)
+
+        for column, (kind, field, vocabulary, data) in enumerate(self.columns):
+            value = getattr(query.preferences, field, None)
+            if not value:
+                continue
+            if kind == "scalar":
+                present[:, column] = data >= 0
+                code = vocabulary.get(value, -2)
+                similarity[:, column] = data == code
+            else:
+                matrix, sizes = data
+                query_items = [
+                    vocabulary[item] for item in set(value) if item in vocabulary
+                ]
+                intersection = matrix[:, query_items].sum(axis=1)
+                union = sizes + len(set(value)) - intersection
+                present[:, column] = sizes > 0
+                similarity[:, column] = numpy.divide(
+                    intersection, union, out=numpy.zeros(len(sizes)), where=union > 0
+                )
+
+        used_weights = numpy.where(present, pair_weights, 0.0)
+        totals = used_weights.sum(axis=1)
+        scores = numpy.divide(
+            (used_weights * similarity).sum(axis=1) * 100,
+            totals,
+            out=numpy.zeros(len(totals)),
+            where=totals > 0,
+        )
+        scores = numpy.round(scores, 2)
+        mask = self.ids != query.id
+        ids, scores = self.ids[mask], scores[mask]
+        self.last_scored = len(ids)
+
+        if len(ids) > k:
+            # Keep every id tied with the k-th best score, then sort exactly
+            threshold = numpy.partition(scores, len(scores) - k)[len(scores) - k]
+            keep = scores >= threshold
+            ids, scores = ids[keep], scores[keep]
+        order = numpy.lexsort((ids, -scores))[:k]
+        return [(int(ids[i]), float(scores[i])) for i in order]
+
+
+ENGINES = {
+    engine.name: engine
+    for engine in [
+        PairwiseEngine,
+        ExactEngine,
+        VectorizedEngine,
+        PrefilterEngine,
+        AnnEngine,
+    ]
+}
@@ -0,0 +1,276 @@
+# Synthetic questionnaire data for scale testing
+import random
+
+from users.models import UserPreferences, UserCompatibilityPreferences
+
+# Relative weights per choice value, loosely based on the audience described
+# in Questionnaire.md (young professionals and students dominate).
+AGE_WEIGHTS = {"18-24": 28, "25-34": 34, "35-44": 18, "45-54": 12, "55+": 8}
+LIFE_SITUATION_WEIGHTS = {
+    "student": 25,
+    "working_professional": 40,
+    "parent": 15,
+    "retiree": 7,
+    "remote_worker": 13,
+}
+CHAT_TIME_WEIGHTS = {"mornings": 20, "evenings": 50, "weekends": 30}
+HOBBY_WEIGHTS = {
+    "gaming": 22,
+    "reading": 16,
+    "hiking": 10,
+    "cooking": 12,
+    "music": 18,
+    "art": 7,
+    "sports": 11,
+    "other": 4,
+}
+MEDIA_WEIGHTS = {"movies_tv": 50, "books_podcasts": 22, "music": 28}
+FREE_DAY_WEIGHTS = {
+    "outdoors_adventure": 24,
+    "cozy_at_home": 38,
+    "social_gathering": 20,
+    "learning_new": 18,
+}
+STRESS_WEIGHTS = {
+    "talk_it_out": 30,
+    "exercise": 22,
+    "watch_funny_videos": 26,
+    "meditate": 14,
+    "other": 8,
+}
+CONVERSATION_STYLE_WEIGHTS = {"listener": 38, "talker": 17, "balanced": 45}
+MOTIVATION_WEIGHTS = {
+    "personal_growth": 34,
+    "fun_adventures": 26,
+    "helping_others": 18,
+    "achieving_goals": 22,
+}
+VALUES_WEIGHTS = {
+    "honesty": 30,
+    "loyalty": 22,
+    "humor": 20,
+    "respect": 16,
+    "empathy": 12,
+}
+COMMUNICATION_WEIGHTS = {
+    "casual_fun": 42,
+    "deep_thoughtful": 28,
+    "quick_checkins": 20,
+    "structured": 10,
+}
+TOPIC_WEIGHTS = {
+    "life_advice": 20,
+    "gaming": 18,
+    "movies": 16,
+    "travel": 14,
+    "technology": 12,
+    "food": 10,
+    "sports": 10,
+}
+CONNECTION_FREQUENCY_WEIGHTS = {"daily": 25, "weekly": 50, "as_needed": 25}
+SERIOUS_CONVERSATION_WEIGHTS = {
+    "offer_support": 60,
+    "lighten_with_humor": 28,
+    "change_topic": 12,
+}
+FRIENDSHIP_GOALS_WEIGHTS = {
+    "combat_loneliness": 26,
+    "gaming_partner": 18,
+    "motivation_boost": 16,
+    "cultural_exchange": 12,
+    "casual_chats": 28,
+}
+FRIEND_PREFERENCES_WEIGHTS = {
+    "similar_age": 40,
+    "shared_culture": 22,
+    "same_gender": 20,
+    "focus_on_hobbies": 18,
+}
+GENDER_WEIGHTS = {"any": 55, "female": 20, "male": 18, "non_binary": 7}
+# A long tail of locations: a few big cities hold most of the users
+LOCATION_WEIGHTS = {
+    "Kigali, Rwanda": 18,
+    "Nairobi, Kenya": 14,
+    "Lagos, Nigeria": 12,
+    "London, UK": 10,
+    "New York, USA": 9,
+    "Toronto, Canada": 7,
+    "Berlin, Germany": 6,
+    "Paris, France": 6,
+    "Cape Town, South Africa": 5,
+    "Sydney, Australia": 4,
+    "Tokyo, Japan": 4,
+    "Sao Paulo, Brazil": 3,
+    "Mumbai, India": 2,
+}
+ROUTINE_WORDS = ["Busy", "Relaxed", "Adventurous", "Structured", "Chaotic", "Calm"]
+PERSONALITY_WORDS = [
+    "Curious",
+    "Empathetic",
+    "Adventurous",
+    "Creative",
+    "Calm",
+    "Funny",
+    "Loyal",
+    "Thoughtful",
+]
+EXCLUDED_TOPICS = ["politics", "religion", "work_stress"]
+EXCLUDED_PERSONALITIES = ["aggressive", "pessimistic", "closed_minded"]
+AGE_BOUNDS = {
+    "18-24": (18, 24),
+    "25-34": (25, 34),
+    "35-44": (35, 44),
+    "45-54": (45, 54),
+    "55+": (55, 75),
+}
+
+# Share of users per questionnaire engagement level and the probability that
+# such a user answered any given question.
+ENGAGEMENT_LEVELS = {0.97: 60, 0.6: 25, 0.2: 15}
+
+
+class SyntheticPreferencesGenerator:
+    """
+    Generate realistic UserPreferences / UserCompatibilityPreferences rows.
+
+    Values are generated column by column for a whole batch with weighted
+    `random.choices(k=n)` draws, which keeps generation cheap enough for
+    millions of rows. Output is fully determined by `seed` and the batch sizes.
+
+    Usage:
+        generator = SyntheticPreferencesGenerator(seed=42)
+        preferences = generator.preferences_batch(profiles)
+    """
+
+    def __init__(self, seed: int = 42):
+        self.random = random.Random(seed)
+
+    def choice_column(self, weights: dict, n: int) -> list:
+        return self.random.choices(list(weights), weights=list(weights.values()), k=n)
+
+    def multi_choice_column(self, weights: dict, n: int, max_items: int = 3) -> list:
+        """Weighted samples without replacement, 1..max_items values per row."""
+        values = list(weights)
+        sizes = self.random.choices(
+            range(1, max_items + 1), weights=range(max_items, 0, -1), k=n
+        )
+        column = []
+        for size in sizes:
+            picked = []
+            pool = dict(weights)
+            for _ in range(min(size, len(values))):
+                value = self.random.choices(list(pool), weights=list(pool.values()))[0]
+                picked.append(value)
+                del pool[value]
+            column.append(picked)
+        return column
+
+    def scale_column(self, mode: float, n: int) -> list:
+        return [round(self.random.triangular(1, 10, mode)) for _ in range(n)]
+
+    def normal_int_column(self, mean: float, sd: float, n: int, low=1, high=10):
+        return [
+            min(high, max(low, round(self.random.gauss(mean, sd)))) for _ in range(n)
+        ]
+
+    def _blank_out(self, columns: dict, n: int):
+        """Drop answers according to each user's engagement level."""
+        levels = self.choice_column(ENGAGEMENT_LEVELS, n)
+        for name, column in columns.items():
+            internal_type = UserPreferences._meta.get_field(name).get_internal_type()
+            if internal_type == "BooleanField":
+                continue
+            empty = [] if internal_type == "JSONField" else None
+            for i, level in enumerate(levels):
+                if self.random.random() > level:
+                    column[i] = empty
+
+    def preferences_columns(self, n: int) -> dict:
+        columns = {
+            "age_range": self.choice_column(AGE_WEIGHTS, n),
+            "current_location": self.choice_column(LOCATION_WEIGHTS, n),
+            "life_situations": self.multi_choice_column(LIFE_SITUATION_WEIGHTS, n, 2),
+            "preferred_chat_times": self.multi_choice_column(CHAT_TIME_WEIGHTS, n, 2),
+            "daily_routine_word": self.random.choices(ROUTINE_WORDS, k=n),
+            "top_hobbies": self.multi_choice_column(HOBBY_WEIGHTS, n, 3),
+            "enjoyed_media": self.multi_choice_column(MEDIA_WEIGHTS, n, 2),
+            "free_day_preference": self.choice_column(FREE_DAY_WEIGHTS, n),
+            "interested_in_learning": [self.random.random() < 0.55 for _ in range(n)],
+            "outgoing_scale": self.scale_column(5, n),
+            "stress_handling": self.choice_column(STRESS_WEIGHTS, n),
+            "personality_words": [
+                " ".join(self.random.sample(PERSONALITY_WORDS, 3)) for _ in range(n)
+            ],
+            "conversation_style": self.choice_column(CONVERSATION_STYLE_WEIGHTS, n),
+            "primary_motivation": self.choice_column(MOTIVATION_WEIGHTS, n),
+            "new_things_scale": self.scale_column(7, n),
+            "important_values": self.multi_choice_column(VALUES_WEIGHTS, n, 3),
+            "communication_preference": self.choice_column(COMMUNICATION_WEIGHTS, n),
+            "favorite_topics": self.multi_choice_column(TOPIC_WEIGHTS, n, 3),
+            "topics_to_avoid": self.multi_choice_column(
+                {topic: 1 for topic in EXCLUDED_TOPICS}, n, 1
+            ),
+            "connection_frequency": self.choice_column(CONNECTION_FREQUENCY_WEIGHTS, n),
+            "serious_conversation_response": self.choice_column(
+                SERIOUS_CONVERSATION_WEIGHTS, n
+            ),
+            "friendship_goals": self.multi_choice_column(
+                FRIENDSHIP_GOALS_WEIGHTS, n, 2
+            ),
+            "friend_preferences": self.multi_choice_column(
+                FRIEND_PREFERENCES_WEIGHTS, n, 2
+            ),
+        }
+        self._blank_out(columns, n)
+        return columns
+
+    def preferences_batch(self, profiles: list, completed_at=None) -> list:
+        """Unsaved UserPreferences instances, one per profile."""
+        columns = self.preferences_columns(len(profiles))
+        batch = []
+        for i, profile in enumerate(profiles):
+            preferences = UserPreferences(
+                profile=profile,
+                **{name: column[i] for name, column in columns.items()},
+            )
+            preferences.refresh_completion(now=completed_at)
+            batch.append(preferences)
+        return batch
+
+    def compatibility_batch(self, profiles: list, age_ranges: list = None) -> list:
+        """Unsaved UserCompatibilityPreferences instances, one per profile."""
+        n = len(profiles)
+        age_ranges = age_ranges or self.choice_column(AGE_WEIGHTS, n)
+        genders = self.choice_column(GENDER_WEIGHTS, n)
+        hobby = self.normal_int_column(5, 2, n)
+        personality = self.normal_int_column(7, 1.5, n)
+        values = self.normal_int_column(8, 1.5, n)
+        lifestyle = self.normal_int_column(6, 2, n)
+
+        batch = []
+        for i, profile in enumerate(profiles):
+            low, high = AGE_BOUNDS.get(age_ranges[i] or "25-34")
+            batch.append(
+                UserCompatibilityPreferences(
+                    profile=profile,
+                    preferred_age_range_min=max(18, low - self.random.randint(0, 5)),
+                    preferred_age_range_max=high + self.random.randint(0, 8),
+                    preferred_gender=genders[i],
+                    geographic_preference=(
+                        self.choice_column(LOCATION_WEIGHTS, 1)[0]
+                        if self.random.random() < 0.2
+                        else None
+                    ),
+                    hobby_importance=hobby[i],
+                    personality_importance=personality[i],
+                    values_importance=values[i],
+                    lifestyle_importance=lifestyle[i],
+                    excluded_topics=self.random.sample(
+                        EXCLUDED_TOPICS, self.random.choice([0, 0, 0, 1, 2])
+                    ),
+                    excluded_personalities=self.random.sample(
+                        EXCLUDED_PERSONALITIES, self.random.choice([0, 0, 1])
+                    ),
+                )
+            )
+        return batch